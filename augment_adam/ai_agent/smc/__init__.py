@@ -7,8 +7,9 @@ Version: 0.1.0
 Created: 2025-04-27
 """
 
+from augment_adam.ai_agent.smc.automaton import DFA, UnsupportedPatternError, compile_regex, compile_grammar
 from augment_adam.ai_agent.smc.particle import Particle
-from augment_adam.ai_agent.smc.potential import Potential, GrammarPotential, SemanticPotential
+from augment_adam.ai_agent.smc.potential import Potential, GrammarPotential, SemanticPotential, RegexPotential
 from augment_adam.ai_agent.smc.sampler import SequentialMonteCarlo
 
 __all__ = [
@@ -16,5 +17,10 @@ __all__ = [
     "Potential",
     "GrammarPotential",
     "SemanticPotential",
+    "RegexPotential",
+    "DFA",
+    "UnsupportedPatternError",
+    "compile_regex",
+    "compile_grammar",
     "SequentialMonteCarlo",
 ]
@@ -0,0 +1,761 @@
+"""Finite Automata for Sequential Monte Carlo Potentials.
+
+This module compiles regular expressions and regular grammars into
+deterministic finite automata (DFAs), so potentials can advance a particle's
+automaton state over only the characters it just generated, reject particles
+as soon as they enter a dead state, and compute which next characters keep a
+particle viable.
+
+The supported regex syntax is the regular subset of Python's: literals and
+escapes, character classes, ".", groups, alternation, the greedy and lazy
+quantifiers, "^" at the start and "$" at the end of the pattern. Patterns
+with other constructs (backreferences, lookarounds, inline flags, word
+boundaries, ...) raise UnsupportedPatternError.
+
+Version: 0.1.0
+Created: 2025-04-28
+"""
+
+import logging
+import re
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Mapping, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+# Sorted, disjoint, inclusive code point intervals
+CharSet = Tuple[Tuple[int, int], ...]
+
+MAX_CODE_POINT = sys.maxunicode
+
+# State 0 of every DFA is the dead state: no string leads from it to acceptance
+DEAD = 0
+
+
+class UnsupportedPatternError(ValueError):
+    """Raised for patterns that cannot be compiled into a DFA."""
+
+
+def _normalize(intervals: List[Tuple[int, int]]) -> CharSet:
+    """Sort and merge code point intervals.
+
+    Args:
+        intervals: The intervals
+
+    Returns:
+        The equivalent sorted, disjoint intervals
+    """
+    merged: List[Tuple[int, int]] = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1] + 1:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return tuple(merged)
+
+
+def _negate(charset: CharSet) -> CharSet:
+    """Get the complement of a character set.
+
+    Args:
+        charset: The character set
+
+    Returns:
+        Every code point not in the set
+    """
+    complement = []
+    start = 0
+    for low, high in charset:
+        if low > start:
+            complement.append((start, low - 1))
+        start = high + 1
+    if start <= MAX_CODE_POINT:
+        complement.append((start, MAX_CODE_POINT))
+    return tuple(complement)
+
+
+@lru_cache(maxsize=None)
+def _category(name: str) -> CharSet:
+    """Get the character set of a Unicode regex category.
+
+    Computed once per process by scanning every code point with the same
+    predicates the re module uses.
+
+    Args:
+        name: "d", "s" or "w"
+
+    Returns:
+        The character set
+    """
+    predicate = {
+        "d": str.isdecimal,
+        "s": str.isspace,
+        "w": lambda char: char.isalnum() or char == "_",
+    }[name]
+
+    intervals = []
+    start = None
+    for code_point in range(MAX_CODE_POINT + 2):
+        inside = code_point <= MAX_CODE_POINT and predicate(chr(code_point))
+        if inside and start is None:
+            start = code_point
+        elif not inside and start is not None:
+            intervals.append((start, code_point - 1))
+            start = None
+    return tuple(intervals)
+
+
+def _escape_charset(letter: str) -> CharSet:
+    """Get the character set of a class escape such as \\d or \\W.
+
+    Args:
+        letter: The escape letter
+
+    Returns:
+        The character set
+    """
+    charset = _category(letter.lower())
+    return _negate(charset) if letter.isupper() else charset
+
+
+ANY_EXCEPT_NEWLINE = _negate(((10, 10),))
+
+SIMPLE_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "a": "\a", "0": "\0"}
+
+
+class _Parser:
+    """Recursive descent parser from regex syntax to a syntax tree.
+
+    Nodes are tuples: ("chars", CharSet), ("concat", [nodes]),
+    ("alt", [nodes]) and ("repeat", node, minimum, maximum or None).
+    """
+
+    def __init__(self, pattern: str):
+        """Initialize the parser.
+
+        Args:
+            pattern: The pattern
+        """
+        self.pattern = pattern
+        self.position = 0
+
+    def error(self, message: str) -> UnsupportedPatternError:
+        """Create an error at the current position.
+
+        Args:
+            message: The error message
+
+        Returns:
+            The error
+        """
+        return UnsupportedPatternError(f"{message} at position {self.position} in {self.pattern!r}")
+
+    def peek(self) -> Optional[str]:
+        """Get the next character without consuming it."""
+        return self.pattern[self.position] if self.position < len(self.pattern) else None
+
+    def take(self) -> str:
+        """Consume the next character."""
+        if self.position >= len(self.pattern):
+            raise self.error("Unexpected end of pattern")
+        char = self.pattern[self.position]
+        self.position += 1
+        return char
+
+    def parse(self) -> Tuple[Any, bool]:
+        """Parse the whole pattern.
+
+        Returns:
+            Tuple of (syntax tree, whether the pattern ends with "$")
+        """
+        if self.pattern.startswith("^"):
+            self.position = 1
+
+        node = self.parse_alternation()
+        anchored_end = False
+        if self.peek() == "$" and self.position == len(self.pattern) - 1 and node[0] != "alt":
+            anchored_end = True
+            self.position += 1
+        if self.position != len(self.pattern):
+            raise self.error(f"Unsupported {self.peek()!r}")
+        return node, anchored_end
+
+    def parse_alternation(self) -> Any:
+        """Parse alternatives separated by "|"."""
+        alternatives = [self.parse_concatenation()]
+        while self.peek() == "|":
+            self.position += 1
+            alternatives.append(self.parse_concatenation())
+        return alternatives[0] if len(alternatives) == 1 else ("alt", alternatives)
+
+    def parse_concatenation(self) -> Any:
+        """Parse a sequence of quantified atoms."""
+        items = []
+        while self.peek() is not None and self.peek() not in "|)":
+            if self.peek() == "$":
+                # Only supported as the last character of the whole pattern
+                if self.position == len(self.pattern) - 1:
+                    break
+                raise self.error("Unsupported '$'")
+            items.append(self.parse_quantified())
+        return items[0] if len(items) == 1 else ("concat", items)
+
+    def parse_quantified(self) -> Any:
+        """Parse an atom and its quantifiers."""
+        node = self.parse_atom()
+        while True:
+            char = self.peek()
+            if char in ("*", "+", "?"):
+                self.position += 1
+                minimum, maximum = {"*": (0, None), "+": (1, None), "?": (0, 1)}[char]
+            elif char == "{":
+                bounds = re.match(r"\{(\d*)(?:(,)(\d*))?\}", self.pattern[self.position:])
+                if not bounds or (not bounds.group(1) and not bounds.group(2)):
+                    return node
+                self.position += bounds.end()
+                minimum = int(bounds.group(1) or 0)
+                if bounds.group(2):
+                    maximum = int(bounds.group(3)) if bounds.group(3) else None
+                else:
+                    maximum = minimum
+                if maximum is not None and maximum < minimum:
+                    raise self.error("Bad repeat bounds")
+            else:
+                return node
+
+            # Lazy quantifiers accept the same language; possessive ones don't
+            if self.peek() == "?":
+                self.position += 1
+            elif self.peek() == "+":
+                raise self.error("Unsupported possessive quantifier")
+            node = ("repeat", node, minimum, maximum)
+
+    def parse_atom(self) -> Any:
+        """Parse a literal, class, group or escape."""
+        char = self.take()
+        if char == "(":
+            if self.peek() == "?":
+                if self.pattern.startswith("?:", self.position):
+                    self.position += 2
+                else:
+                    raise self.error("Unsupported group")
+            node = self.parse_alternation()
+            if self.take() != ")":
+                raise self.error("Missing ')'")
+            return node
+        if char == "[":
+            return ("chars", self.parse_class())
+        if char == ".":
+            return ("chars", ANY_EXCEPT_NEWLINE)
+        if char == "\\":
+            return ("chars", self.parse_escape(in_class=False))
+        if char in "*+?":
+            raise self.error("Nothing to repeat")
+        if char in "^$)":
+            raise self.error(f"Unsupported {char!r}")
+        return ("chars", ((ord(char), ord(char)),))
+
+    def parse_escape(self, in_class: bool) -> CharSet:
+        """Parse the character set of an escape, after the backslash.
+
+        Args:
+            in_class: Whether the escape is inside a character class
+
+        Returns:
+            The character set
+        """
+        char = self.take()
+        if char in "dDsSwW":
+            return _escape_charset(char)
+        if char in SIMPLE_ESCAPES and not (char == "0" and self.peek() is not None and self.peek().isdigit()):
+            code_point = ord(SIMPLE_ESCAPES[char])
+        elif char == "b" and in_class:
+            code_point = 8
+        elif char in "xuU":
+            length = {"x": 2, "u": 4, "U": 8}[char]
+            digits = self.pattern[self.position:self.position + length]
+            if len(digits) != length or not all(d in "0123456789abcdefABCDEF" for d in digits):
+                raise self.error("Bad hex escape")
+            self.position += length
+            code_point = int(digits, 16)
+        elif char.isalnum():
+            raise self.error(f"Unsupported escape '\\{char}'")
+        else:
+            code_point = ord(char)
+        return ((code_point, code_point),)
+
+    def parse_class(self) -> CharSet:
+        """Parse a character class, after the "["."""
+        negated = self.peek() == "^"
+        if negated:
+            self.position += 1
+
+        intervals: List[Tuple[int, int]] = []
+        first = True
+        while True:
+            char = self.take()
+            if char == "]" and not first:
+                break
+            first = False
+
+            if char == "\\":
+                charset = self.parse_escape(in_class=True)
+                if len(charset) != 1 or charset[0][0] != charset[0][1]:
+                    intervals.extend(charset)
+                    continue
+                low = charset[0][0]
+            else:
+                low = ord(char)
+
+            # A range, unless the "-" is the last character of the class
+            if self.peek() == "-" and self.pattern[self.position + 1:self.position + 2] not in ("]", ""):
+                self.position += 1
+                char = self.take()
+                if char == "\\":
+                    charset = self.parse_escape(in_class=True)
+                    if len(charset) != 1 or charset[0][0] != charset[0][1]:
+                        raise self.error("Bad character range")
+                    high = charset[0][0]
+                else:
+                    high = ord(char)
+                if high < low:
+                    raise self.error("Bad character range")
+                intervals.append((low, high))
+            else:
+                intervals.append((low, low))
+
+        charset = _normalize(intervals)
+        return _negate(charset) if negated else charset
+
+
+class _NFA:
+    """Thompson NFA built from a syntax tree.
+
+    Attributes:
+        epsilon: Epsilon transitions of each state
+        edges: Character transitions (CharSet, target) of each state
+    """
+
+    def __init__(self):
+        """Initialize an empty NFA."""
+        self.epsilon: List[List[int]] = []
+        self.edges: List[List[Tuple[CharSet, int]]] = []
+
+    def new_state(self) -> int:
+        """Add a state."""
+        self.epsilon.append([])
+        self.edges.append([])
+        return len(self.epsilon) - 1
+
+    def build(self, node: Any) -> Tuple[int, int]:
+        """Add the states of a syntax tree.
+
+        Args:
+            node: The syntax tree
+
+        Returns:
+            Tuple of (start state, accepting state) of the fragment
+        """
+        kind = node[0]
+        start = self.new_state()
+
+        if kind == "chars":
+            end = self.new_state()
+            self.edges[start].append((node[1], end))
+            return start, end
+
+        if kind == "concat":
+            end = start
+            for item in node[1]:
+                item_start, item_end = self.build(item)
+                self.epsilon[end].append(item_start)
+                end = item_end
+            return start, end
+
+        if kind == "alt":
+            end = self.new_state()
+            for item in node[1]:
+                item_start, item_end = self.build(item)
+                self.epsilon[start].append(item_start)
+                self.epsilon[item_end].append(end)
+            return start, end
+
+        # Repeat: the mandatory copies, then optional copies or a loop
+        _, item, minimum, maximum = node
+        end = start
+        for _ in range(minimum):
+            item_start, item_end = self.build(item)
+            self.epsilon[end].append(item_start)
+            end = item_end
+
+        if maximum is None:
+            item_start, item_end = self.build(item)
+            loop = self.new_state()
+            self.epsilon[end].append(loop)
+            self.epsilon[loop].append(item_start)
+            self.epsilon[item_end].append(loop)
+            return start, loop
+
+        final = self.new_state()
+        self.epsilon[end].append(final)
+        for _ in range(maximum - minimum):
+            item_start, item_end = self.build(item)
+            self.epsilon[end].append(item_start)
+            self.epsilon[item_end].append(final)
+            end = item_end
+        return start, final
+
+    def closure(self, states: FrozenSet[int]) -> FrozenSet[int]:
+        """Get the epsilon closure of a set of states."""
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for target in self.epsilon[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+
+class DFA:
+    """Deterministic finite automaton over Unicode code points.
+
+    Code points are grouped into classes that every transition treats alike,
+    so each state has one row in a transition table indexed by class. State
+    DEAD (0) is absorbing, and every state from which no accepting state is
+    reachable is merged into it.
+
+    Attributes:
+        boundaries: The first code point of each class
+        table: The next state for each state and class
+        accepting: Whether each state is accepting
+        start: The start state
+        anchored_end: Whether the source pattern ended with "$"
+    """
+
+    def __init__(
+        self,
+        boundaries: List[int],
+        table: List[List[int]],
+        accepting: List[bool],
+        start: int,
+        anchored_end: bool = False
+    ):
+        """Initialize the DFA.
+
+        Args:
+            boundaries: The first code point of each class
+            table: The next state for each state and class
+            accepting: Whether each state is accepting
+            start: The start state
+            anchored_end: Whether the source pattern ended with "$"
+        """
+        self.boundaries = boundaries
+        self.table = table
+        self.accepting = accepting
+        self.start = start
+        self.anchored_end = anchored_end
+
+        self._classes: Dict[str, int] = {}
+        self._allowed: Dict[int, CharSet] = {}
+
+    @property
+    def num_states(self) -> int:
+        """The number of states, including the dead state."""
+        return len(self.table)
+
+    @classmethod
+    def from_regex(cls, pattern: str) -> "DFA":
+        """Compile a regular expression.
+
+        Args:
+            pattern: The pattern, in Python regex syntax
+
+        Returns:
+            The DFA of the strings the pattern matches in full
+
+        Raises:
+            UnsupportedPatternError: If the pattern uses non-regular features
+        """
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise UnsupportedPatternError(f"Invalid pattern {pattern!r}: {e}")
+
+        node, anchored_end = _Parser(pattern).parse()
+        return cls._from_tree(node, anchored_end)
+
+    @classmethod
+    def _from_tree(cls, node: Any, anchored_end: bool) -> "DFA":
+        """Build a DFA from a syntax tree by subset construction.
+
+        Args:
+            node: The syntax tree
+            anchored_end: Whether the source pattern ended with "$"
+
+        Returns:
+            The DFA
+        """
+        nfa = _NFA()
+        nfa_start, nfa_accept = nfa.build(node)
+
+        # Split the code points into classes at every interval boundary
+        cuts = {0}
+        for edges in nfa.edges:
+            for charset, _ in edges:
+                for low, high in charset:
+                    cuts.add(low)
+                    cuts.add(high + 1)
+        boundaries = sorted(cut for cut in cuts if cut <= MAX_CODE_POINT)
+        num_classes = len(boundaries)
+
+        # Classes covered by each edge
+        edge_classes: Dict[CharSet, List[int]] = {}
+        for edges in nfa.edges:
+            for charset, _ in edges:
+                if charset not in edge_classes:
+                    covered = []
+                    for low, high in charset:
+                        covered.extend(range(bisect_right(boundaries, low) - 1, bisect_right(boundaries, high)))
+                    edge_classes[charset] = covered
+
+        # Subset construction; index 0 is the empty set
+        subsets: List[FrozenSet[int]] = [frozenset()]
+        index: Dict[FrozenSet[int], int] = {frozenset(): 0}
+        rows: List[List[int]] = [[0] * num_classes]
+
+        start = nfa.closure(frozenset([nfa_start]))
+        index[start] = 1
+        subsets.append(start)
+        rows.append(None)
+
+        pending = [1]
+        while pending:
+            state = pending.pop()
+            buckets: Dict[int, set] = {}
+            for nfa_state in subsets[state]:
+                for charset, target in nfa.edges[nfa_state]:
+                    for class_index in edge_classes[charset]:
+                        buckets.setdefault(class_index, set()).add(target)
+
+            row = [0] * num_classes
+            targets: Dict[FrozenSet[int], int] = {}
+            for class_index, bucket in buckets.items():
+                key = frozenset(bucket)
+                if key not in targets:
+                    closure = nfa.closure(key)
+                    if closure not in index:
+                        index[closure] = len(subsets)
+                        subsets.append(closure)
+                        rows.append(None)
+                        pending.append(index[closure])
+                    targets[key] = index[closure]
+                row[class_index] = targets[key]
+            rows[state] = row
+
+        accepting = [nfa_accept in subset for subset in subsets]
+
+        # Merge the states that cannot reach acceptance into the dead state
+        predecessors: List[set] = [set() for _ in rows]
+        for state, row in enumerate(rows):
+            for target in row:
+                predecessors[target].add(state)
+        live = set(state for state, accepts in enumerate(accepting) if accepts)
+        stack = list(live)
+        while stack:
+            for state in predecessors[stack.pop()]:
+                if state not in live:
+                    live.add(state)
+                    stack.append(state)
+
+        numbering = {DEAD: DEAD}
+        for state in range(1, len(rows)):
+            if state in live:
+                numbering[state] = len(numbering)
+        renumber = lambda state: numbering.get(state, DEAD)
+
+        table = [[DEAD] * num_classes]
+        final_accepting = [False]
+        for state in range(1, len(rows)):
+            if state in live:
+                table.append([renumber(target) for target in rows[state]])
+                final_accepting.append(accepting[state])
+
+        return cls(boundaries, table, final_accepting, renumber(1), anchored_end)
+
+    def char_class(self, char: str) -> int:
+        """Get the class of a character.
+
+        Args:
+            char: The character
+
+        Returns:
+            The class index
+        """
+        class_index = self._classes.get(char)
+        if class_index is None:
+            class_index = bisect_right(self.boundaries, ord(char)) - 1
+            self._classes[char] = class_index
+        return class_index
+
+    def step(self, state: int, char: str) -> int:
+        """Advance a state over one character.
+
+        Args:
+            state: The state
+            char: The character
+
+        Returns:
+            The next state
+        """
+        return self.table[state][self.char_class(char)]
+
+    def scan(self, state: int, text: str, stop_on_accept: bool = False) -> Tuple[int, int, bool]:
+        """Advance a state over a text, stopping early in the dead state.
+
+        Args:
+            state: The state
+            text: The text
+            stop_on_accept: Whether to stop at the first accepting state
+
+        Returns:
+            Tuple of (state, previous state, accepted): the final state, the
+            state before the last character, and whether an accepting state
+            was entered
+        """
+        table = self.table
+        accepting = self.accepting
+        classes = self._classes
+        previous = state
+        accepted = False
+
+        for position, char in enumerate(text):
+            class_index = classes.get(char)
+            if class_index is None:
+                class_index = self.char_class(char)
+
+            previous = state
+            state = table[state][class_index]
+            if state == DEAD:
+                # The state before the last character is only known to be
+                # dead too if the scan stopped before the last character
+                if position < len(text) - 1:
+                    previous = DEAD
+                return DEAD, previous, accepted
+            if accepting[state]:
+                accepted = True
+                if stop_on_accept:
+                    return state, previous, True
+
+        return state, previous, accepted
+
+    def fullmatch(self, text: str) -> bool:
+        """Check whether the DFA accepts a whole text.
+
+        Args:
+            text: The text
+
+        Returns:
+            True if the text is accepted
+        """
+        return self.accepting[self.scan(self.start, text)[0]]
+
+    def allowed_characters(self, state: int) -> CharSet:
+        """Get the characters that lead from a state to a live state.
+
+        The result is cached per state.
+
+        Args:
+            state: The state
+
+        Returns:
+            The character set
+        """
+        allowed = self._allowed.get(state)
+        if allowed is None:
+            row = self.table[state]
+            ends = self.boundaries[1:] + [MAX_CODE_POINT + 1]
+            allowed = _normalize([
+                (self.boundaries[class_index], ends[class_index] - 1)
+                for class_index, target in enumerate(row)
+                if target != DEAD
+            ])
+            self._allowed[state] = allowed
+        return allowed
+
+
+def expand_grammar(rules: Mapping[str, str], start: str = "start") -> str:
+    """Expand a regular grammar into one pattern.
+
+    Rule bodies use regex syntax, and may refer to other rules as <name>.
+
+    Args:
+        rules: Mapping from rule names to bodies
+        start: The name of the start rule
+
+    Returns:
+        The pattern of the start rule
+
+    Raises:
+        UnsupportedPatternError: If a rule is missing or recursive (a
+            recursive grammar is not regular)
+    """
+    reference = re.compile(r"(?<!\\)<([A-Za-z_][A-Za-z0-9_]*)>")
+    expanded: Dict[str, str] = {}
+
+    def expand(name: str, stack: Tuple[str, ...]) -> str:
+        if name in stack:
+            raise UnsupportedPatternError(f"Recursive grammar rule: {' -> '.join(stack + (name,))}")
+        if name not in rules:
+            raise UnsupportedPatternError(f"Unknown grammar rule: {name}")
+        if name not in expanded:
+            body = reference.sub(lambda match: "(?:" + expand(match.group(1), stack + (name,)) + ")", rules[name])
+            expanded[name] = body
+        return expanded[name]
+
+    return expand(start, ())
+
+
+def compile_regex(pattern: str) -> DFA:
+    """Compile a regular expression into a DFA.
+
+    Args:
+        pattern: The pattern, in Python regex syntax
+
+    Returns:
+        The DFA
+
+    Raises:
+        UnsupportedPatternError: If the pattern uses non-regular features
+    """
+    return _compile_cached(pattern)
+
+
+@lru_cache(maxsize=128)
+def _compile_cached(pattern: str) -> DFA:
+    """Compile a pattern, sharing the DFA between potentials with the same pattern."""
+    return DFA.from_regex(pattern)
+
+
+def compile_grammar(rules: Mapping[str, str], start: str = "start") -> DFA:
+    """Compile a regular grammar into a DFA.
+
+    Args:
+        rules: Mapping from rule names to bodies in regex syntax, which may
+            refer to other rules as <name>
+        start: The name of the start rule
+
+    Returns:
+        The DFA
+
+    Raises:
+        UnsupportedPatternError: If the grammar is not regular or uses
+            unsupported syntax
+    """
+    pattern = expand_grammar(rules, start)
+    if pattern.endswith("$") or pattern.startswith("^"):
+        raise UnsupportedPatternError("Anchors are not supported in grammars")
+    return compile_regex(pattern)
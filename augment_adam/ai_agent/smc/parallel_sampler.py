@@ -10,10 +10,10 @@ Created: 2025-04-28
 import logging
 import random
 import time
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable
 import numpy as np
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import torch
 
 from augment_adam.core.errors import (
@@ -25,6 +25,179 @@ from augment_adam.ai_agent.smc.sampler import SequentialMonteCarlo
 
 logger = logging.getLogger(__name__)
 
+# Token ids below this are Unicode code points of single-character tokens;
+# longer tokens get ids from this value up, assigned by a TokenCodec
+MULTI_CHAR_TOKEN_BASE = 0x110000
+
+
+class TokenCodec:
+    """Codec between token sequences and compact token-id arrays.
+    
+    Single-character tokens (the common case, since prompts are split into
+    characters) are encoded as their code points, so both sides of a process
+    boundary agree on them without sharing any state. Longer tokens are
+    assigned ids from MULTI_CHAR_TOKEN_BASE up, and only the entries a batch
+    uses are sent along with it.
+    
+    Attributes:
+        token_ids: Mapping from multi-character tokens to ids
+        tokens: Mapping from ids to multi-character tokens
+    """
+    
+    def __init__(self):
+        """Initialize an empty TokenCodec."""
+        self.token_ids: Dict[str, int] = {}
+        self.tokens: Dict[int, str] = {}
+    
+    def token_id(self, token: str) -> int:
+        """Get the id of a token, assigning one to new multi-character tokens.
+        
+        Args:
+            token: The token
+        
+        Returns:
+            The token id
+        """
+        if len(token) == 1:
+            return ord(token)
+        
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            token_id = MULTI_CHAR_TOKEN_BASE + len(self.token_ids)
+            self.token_ids[token] = token_id
+            self.tokens[token_id] = token
+        return token_id
+    
+    def encode_batch(self, sequences: List[List[str]]) -> Tuple[np.ndarray, np.ndarray, Dict[int, str]]:
+        """Encode token sequences as one flat id array.
+        
+        Args:
+            sequences: The token sequences
+        
+        Returns:
+            Tuple of (ids, offsets, table): the concatenated token ids, the
+            start of each sequence in them (plus the total length), and the
+            multi-character tokens the ids refer to
+        """
+        lengths = [len(sequence) for sequence in sequences]
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        
+        ids = np.fromiter(
+            (self.token_id(token) for sequence in sequences for token in sequence),
+            dtype=np.int32,
+            count=int(offsets[-1])
+        )
+        
+        table = {}
+        if self.tokens:
+            for token_id in np.unique(ids[ids >= MULTI_CHAR_TOKEN_BASE]).tolist():
+                table[token_id] = self.tokens[token_id]
+        
+        return ids, offsets, table
+
+
+def decode_batch(ids: np.ndarray, offsets: np.ndarray, table: Dict[int, str]) -> List[List[str]]:
+    """Decode a flat id array produced by TokenCodec.encode_batch.
+    
+    Args:
+        ids: The concatenated token ids
+        offsets: The start of each sequence in ids (plus the total length)
+        table: The multi-character tokens the ids refer to
+    
+    Returns:
+        The token sequences
+    """
+    tokens = [chr(token_id) if token_id < MULTI_CHAR_TOKEN_BASE else table[token_id] for token_id in ids.tolist()]
+    return [tokens[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+# Sampler of a worker process, created once by _init_worker
+_worker_sampler: Optional[SequentialMonteCarlo] = None
+
+
+def _init_worker(model: Any, model_factory: Optional[Callable[[], Any]], potentials: List[Potential]) -> None:
+    """Load the model and potentials into a worker process.
+    
+    Args:
+        model: The language model (ignored if model_factory is given)
+        model_factory: Function that loads the model in the worker
+        potentials: The potentials the worker evaluates
+    """
+    global _worker_sampler
+    if model_factory is not None:
+        model = model_factory()
+    _worker_sampler = SequentialMonteCarlo(num_particles=0, potentials=potentials, model=model)
+
+
+def _extend_batch(
+    ids: np.ndarray,
+    offsets: np.ndarray,
+    table: Dict[int, str],
+    num_candidates: int,
+    temperature: float,
+    seed: int
+) -> Tuple[np.ndarray, Dict[int, str]]:
+    """Generate candidate tokens for a batch of particles in a worker process.
+    
+    Args:
+        ids: The concatenated token ids of the particles
+        offsets: The start of each particle in ids (plus the total length)
+        table: The multi-character tokens the ids refer to
+        num_candidates: Number of candidate tokens per particle
+        temperature: Temperature for token sampling
+        seed: Seed for the worker's random number generators
+    
+    Returns:
+        Tuple of (candidate ids, new tokens): an array of shape
+        (particles, num_candidates), in which the multi-character tokens
+        are negative ids into the returned table
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    
+    new_tokens: Dict[int, str] = {}
+    new_ids: Dict[str, int] = {}
+    candidate_ids = np.empty((len(offsets) - 1, num_candidates), dtype=np.int32)
+    
+    for i, sequence in enumerate(decode_batch(ids, offsets, table)):
+        candidates = _worker_sampler._generate_candidate_tokens(
+            "".join(sequence),
+            _worker_sampler.model,
+            num_candidates,
+            temperature
+        )
+        for j, token in enumerate(candidates):
+            if len(token) == 1:
+                candidate_ids[i, j] = ord(token)
+            else:
+                token_id = new_ids.setdefault(token, -1 - len(new_ids))
+                new_tokens[token_id] = token
+                candidate_ids[i, j] = token_id
+    
+    return candidate_ids, new_tokens
+
+
+def _evaluate_batch(ids: np.ndarray, offsets: np.ndarray, table: Dict[int, str]) -> np.ndarray:
+    """Evaluate the worker's potentials on a batch of particles.
+    
+    Args:
+        ids: The concatenated token ids of the particles
+        offsets: The start of each particle in ids (plus the total length)
+        table: The multi-character tokens the ids refer to
+    
+    Returns:
+        The product of the potentials for each particle
+    """
+    sequences = decode_batch(ids, offsets, table)
+    weights = np.ones(len(sequences))
+    
+    for potential in _worker_sampler.efficient_potentials:
+        for i, sequence in enumerate(sequences):
+            weights[i] *= potential.evaluate(sequence)
+    
+    return weights
+
 
 class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
     """Parallel Sequential Monte Carlo Sampler.
@@ -32,6 +205,11 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
     This class implements a parallel version of the Sequential Monte Carlo algorithm
     for controlled generation from language models.
 
+    On CPU, particles are processed in a worker pool that is started on first
+    use and kept until close() is called (or the sampler's with block exits).
+    Each worker loads the model and the efficient potentials once, in its
+    initializer, and each step only ships the particles, as token-id arrays.
+
     Attributes:
         num_particles: Number of particles
         potentials: List of potential functions
@@ -40,6 +218,9 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
         num_workers: Number of parallel workers
         use_gpu: Whether to use GPU for parallelization
         batch_size: Batch size for parallel processing
+        model_factory: Function that loads the model in each worker
+        persistent: Whether to keep the worker pool between steps
+        codec: Codec for the token-id arrays sent to the workers
     """
 
     def __init__(
@@ -50,7 +231,9 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
         model: Any = None,
         num_workers: int = None,
         use_gpu: bool = False,
-        batch_size: int = 10
+        batch_size: int = 10,
+        model_factory: Optional[Callable[[], Any]] = None,
+        persistent: bool = True
     ):
         """Initialize the Parallel Sequential Monte Carlo Sampler.
 
@@ -62,6 +245,11 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
             num_workers: Number of parallel workers (if None, use CPU count)
             use_gpu: Whether to use GPU for parallelization
             batch_size: Batch size for parallel processing
+            model_factory: Picklable function that loads the model; if given,
+                each worker calls it once instead of receiving a pickled copy
+                of the model
+            persistent: Whether to keep the worker pool between steps (if
+                False, every step starts and stops its own pool)
         """
         super().__init__(
             num_particles=num_particles,
@@ -74,6 +262,13 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
         self.num_workers = num_workers or mp.cpu_count()
         self.use_gpu = use_gpu and torch.cuda.is_available()
         self.batch_size = batch_size
+        self.model_factory = model_factory
+        self.persistent = persistent
+        self.codec = TokenCodec()
+        
+        # Worker pool and the model its workers hold
+        self._executor: Optional[Executor] = None
+        self._executor_model: Any = None
         
         # If using GPU, adjust workers based on GPU count
         if self.use_gpu:
@@ -87,12 +282,114 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
         
         logger.info(f"Initialized Parallel SMC sampler with {num_particles} particles and {self.num_workers} workers")
     
-    def _process_particle_batch(self, particles: List[Particle], model: Any) -> List[Particle]:
+    def __enter__(self) -> "ParallelSequentialMonteCarlo":
+        """Enter the sampler's context.
+        
+        Returns:
+            The sampler
+        """
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Shut down the worker pool when leaving the sampler's context."""
+        self.close()
+    
+    def close(self) -> None:
+        """Shut down the worker pool, waiting for running tasks to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_model = None
+            logger.info("Shut down Parallel SMC worker pool")
+    
+    def _get_executor(self, model: Any = None) -> Executor:
+        """Get the worker pool for a model, starting it if needed.
+        
+        A running pool whose workers hold a different model is restarted.
+        
+        Args:
+            model: The language model the workers should use (if None, any
+                running pool, or else the model from initialization)
+        
+        Returns:
+            The worker pool
+        """
+        if model is None:
+            model = self._executor_model if self._executor is not None else self.model
+        
+        if self._executor is not None and self._executor_model is not model:
+            self.close()
+        
+        if self._executor is None:
+            if self.use_gpu:
+                # Use a thread pool for GPU processing (shared memory)
+                self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.num_workers,
+                    initializer=_init_worker,
+                    initargs=(
+                        None if self.model_factory is not None else model,
+                        self.model_factory,
+                        self._worker_potentials()
+                    )
+                )
+            self._executor_model = model
+            logger.info(f"Started Parallel SMC worker pool with {self.num_workers} workers")
+        
+        return self._executor
+    
+    def _release_executor(self) -> None:
+        """Shut down the worker pool after a step unless it is persistent."""
+        if not self.persistent:
+            self.close()
+    
+    def update_potentials(self, potentials: List[Potential]) -> None:
+        """Update the potential functions.
+        
+        The worker pool holds the old potentials, so it is shut down and
+        restarted on next use.
+        
+        Args:
+            potentials: List of potential functions
+        """
+        super().update_potentials(potentials)
+        self.close()
+    
+    def _worker_potentials(self) -> List[Potential]:
+        """Get the efficient potentials the workers evaluate.
+        
+        Incremental potentials keep state on the particles, which workers
+        only see copies of, so they are evaluated in the main process.
+        
+        Returns:
+            The efficient, non-incremental potentials
+        """
+        return [p for p in self.efficient_potentials if not p.is_incremental()]
+    
+    def _split_particles(self) -> List[List[Particle]]:
+        """Split the particles into one batch per worker.
+        
+        Returns:
+            List of particle batches
+        """
+        batch_size = max(1, -(-len(self.particles) // self.num_workers))
+        return [self.particles[i:i + batch_size] for i in range(0, len(self.particles), batch_size)]
+    
+    def _process_particle_batch(
+        self,
+        particles: List[Particle],
+        model: Any,
+        num_candidates: int = 5,
+        temperature: float = 0.8
+    ) -> List[Particle]:
         """Process a batch of particles in parallel.
         
         Args:
             particles: List of particles to process
             model: The language model to use
+            num_candidates: Number of candidate tokens to consider for each particle
+            temperature: Temperature for token sampling
             
         Returns:
             List of extended particles
@@ -110,8 +407,8 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
             # Batch process all prompts
             batch_candidates = model.batch_get_token_probabilities(
                 prompts=prompts,
-                temperature=0.8,
-                top_k=5
+                temperature=temperature,
+                top_k=num_candidates
             )
             all_candidates = batch_candidates
         else:
@@ -120,8 +417,8 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
                 candidates = self._generate_candidate_tokens(
                     prompt,
                     model,
-                    5,  # num_candidates
-                    0.8  # temperature
+                    num_candidates,
+                    temperature
                 )
                 all_candidates.append(candidates)
         
@@ -134,48 +431,64 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
         
         return new_particles
     
-    def _parallel_extend_particles(self, model: Any) -> List[Particle]:
+    def _parallel_extend_particles(
+        self,
+        model: Any,
+        num_candidates: int = 5,
+        temperature: float = 0.8
+    ) -> List[Particle]:
         """Extend particles in parallel.
         
         Args:
             model: The language model to use
+            num_candidates: Number of candidate tokens to consider for each particle
+            temperature: Temperature for token sampling
             
         Returns:
             List of extended particles
         """
         model_to_use = model or self.model
-        
-        # Split particles into batches
-        particle_batches = []
-        batch_size = max(1, len(self.particles) // self.num_workers)
-        
-        for i in range(0, len(self.particles), batch_size):
-            batch = self.particles[i:i+batch_size]
-            particle_batches.append(batch)
+        particle_batches = self._split_particles()
+        executor = self._get_executor(model_to_use)
         
         # Process batches in parallel
         new_particles = []
         
-        if self.use_gpu:
-            # Use thread pool for GPU processing (shared memory)
-            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+        try:
+            if self.use_gpu:
                 futures = [
-                    executor.submit(self._process_particle_batch, batch, model_to_use)
+                    executor.submit(self._process_particle_batch, batch, model_to_use, num_candidates, temperature)
                     for batch in particle_batches
                 ]
                 
                 for future in futures:
                     new_particles.extend(future.result())
-        else:
-            # Use process pool for CPU processing
-            with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            else:
+                # Ship token ids; the workers already hold the model
                 futures = [
-                    executor.submit(self._process_particle_batch, batch, model_to_use)
+                    executor.submit(
+                        _extend_batch,
+                        *self.codec.encode_batch([particle.sequence for particle in batch]),
+                        num_candidates,
+                        temperature,
+                        random.getrandbits(32)
+                    )
                     for batch in particle_batches
                 ]
                 
-                for future in futures:
-                    new_particles.extend(future.result())
+                for batch, future in zip(particle_batches, futures):
+                    candidate_ids, new_tokens = future.result()
+                    for particle, row in zip(batch, candidate_ids.tolist()):
+                        for token_id in row:
+                            if token_id < 0:
+                                token = new_tokens[token_id]
+                            elif token_id < MULTI_CHAR_TOKEN_BASE:
+                                token = chr(token_id)
+                            else:
+                                token = self.codec.tokens[token_id]
+                            new_particles.append(particle.extend(token))
+        finally:
+            self._release_executor()
         
         return new_particles
     
@@ -190,7 +503,7 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
         try:
             # Use parallel extension if we have enough particles
             if len(self.particles) >= self.num_workers * 2:
-                new_particles = self._parallel_extend_particles(model)
+                new_particles = self._parallel_extend_particles(model, num_candidates, temperature)
             else:
                 # Fall back to sequential processing for small number of particles
                 new_particles = []
@@ -238,7 +551,7 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
             super().extend_particles(model, num_candidates, temperature)
     
     def _parallel_evaluate_potentials(self, particles: List[Particle], potentials: List[Potential]) -> List[float]:
-        """Evaluate potentials on particles in parallel.
+        """Evaluate potentials on particles.
         
         Args:
             particles: List of particles to evaluate
@@ -259,34 +572,52 @@ class ParallelSequentialMonteCarlo(SequentialMonteCarlo):
     def reweight_particles(self) -> None:
         """Reweight particles using potential functions in parallel."""
         try:
-            # Split particles into batches
-            particle_batches = []
-            batch_size = max(1, len(self.particles) // self.num_workers)
-            
-            for i in range(0, len(self.particles), batch_size):
-                batch = self.particles[i:i+batch_size]
-                particle_batches.append(batch)
+            particle_batches = self._split_particles()
             
             # Process efficient potentials in parallel
-            with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-                futures = [
-                    executor.submit(self._parallel_evaluate_potentials, batch, self.efficient_potentials)
-                    for batch in particle_batches
-                ]
+            worker_potentials = self._worker_potentials()
+            if worker_potentials:
+                executor = self._get_executor()
+                try:
+                    if self.use_gpu:
+                        futures = [
+                            executor.submit(self._parallel_evaluate_potentials, batch, worker_potentials)
+                            for batch in particle_batches
+                        ]
+                    else:
+                        # The workers already hold the potentials
+                        futures = [
+                            executor.submit(
+                                _evaluate_batch,
+                                *self.codec.encode_batch([particle.sequence for particle in batch])
+                            )
+                            for batch in particle_batches
+                        ]
                 
-                # Collect weights
-                all_weights = []
-                for future in futures:
-                    all_weights.extend(future.result())
+                    # Collect weights
+                    all_weights = []
+                    for future in futures:
+                        all_weights.extend(future.result())
+                finally:
+                    self._release_executor()
+            else:
+                all_weights = [1.0] * len(self.particles)
                 
-                # Update particle weights
+            # Advance incremental potentials on the particles themselves
+            incremental_potentials = [p for p in self.efficient_potentials if p.is_incremental()]
+            for potential in incremental_potentials:
+                for i, particle in enumerate(self.particles):
+                    all_weights[i] *= potential.evaluate_particle(particle)
+            
+            # Update particle weights
+            if self.efficient_potentials:
                 for i, weight in enumerate(all_weights):
-                    self.particles[i].update_weight(weight)
+                    self.particles[i].update_weight(float(weight))
             
             # Apply expensive potentials sequentially (less frequently)
             for potential in self.expensive_potentials:
                 for particle in self.particles:
-                    weight = potential.evaluate(particle.sequence)
+                    weight = potential.evaluate_particle(particle)
                     particle.update_weight(weight)
             
             # Normalize weights
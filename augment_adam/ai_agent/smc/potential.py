@@ -9,11 +9,15 @@ Created: 2025-04-27
 import logging
 import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Mapping
 
 from augment_adam.core.errors import (
     ResourceError, ValidationError, wrap_error, log_error, ErrorCategory
 )
+from augment_adam.ai_agent.smc.automaton import (
+    DFA, DEAD, MAX_CODE_POINT, CharSet, UnsupportedPatternError, compile_grammar, compile_regex
+)
+from augment_adam.ai_agent.smc.particle import Particle
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +51,21 @@ class Potential(ABC):
         """
         pass
     
+    def evaluate_particle(self, particle: Particle) -> float:
+        """Evaluate the potential for a particle.
+        
+        Incremental potentials override this to keep their state in the
+        particle's metadata, so each call only looks at the tokens added
+        since the last one.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            The potential value (non-negative)
+        """
+        return self.evaluate(particle.sequence)
+    
     def is_efficient(self) -> bool:
         """Check if the potential is efficient.
         
@@ -57,15 +76,30 @@ class Potential(ABC):
         """
         return True
 
+    def is_incremental(self) -> bool:
+        """Check if the potential keeps per-particle state.
+        
+        Incremental potentials must see the same particle objects on every
+        step, so parallel samplers evaluate them in the main process.
+        
+        Returns:
+            True if evaluate_particle is incremental, False otherwise
+        """
+        return False
+
 
 class GrammarPotential(Potential):
     """Grammar-based Potential Function.
     
-    This potential enforces a grammar constraint.
+    This potential enforces a grammar constraint. Regular grammars, given as
+    a mapping from rule names to regex bodies (see compile_grammar) or as a
+    DFA, are compiled into an automaton whose state is kept on each particle,
+    so a sequence is valid while it is a prefix of some string the grammar
+    accepts. Other grammars are accepted as placeholders and always valid.
     
     Attributes:
         grammar: The grammar to enforce
-        parser: The parser for the grammar
+        parser: The automaton for the grammar, or None
     """
     
     def __init__(self, grammar: Any, name: str = "grammar_potential"):
@@ -74,13 +108,26 @@ class GrammarPotential(Potential):
         Args:
             grammar: The grammar to enforce
             name: The name of the potential
+        
+        Raises:
+            UnsupportedPatternError: If a rule mapping is not a regular grammar
         """
         super().__init__(name=name)
         self.grammar = grammar
-        self.parser = None  # Initialize parser based on grammar type
         
-        # This is a placeholder for actual grammar parsing
-        # In a real implementation, use a proper grammar parser
+        if isinstance(grammar, DFA):
+            self.parser = grammar
+        elif isinstance(grammar, Mapping):
+            self.parser = compile_grammar(grammar)
+        else:
+            # Placeholder for grammars without an automaton
+            self.parser = None
+        
+        # Metadata key of the automaton state, unique to this potential
+        self._state_key = f"_grammar_state_{id(self)}"
+        
+        # Next-token masks per automaton state
+        self._masks: Dict[int, Dict[str, bool]] = {}
         
         logger.info(f"Initialized {name} with grammar")
     
@@ -94,11 +141,11 @@ class GrammarPotential(Potential):
             1.0 if the sequence is valid, 0.0 otherwise
         """
         try:
-            # This is a placeholder for actual grammar checking
-            # In a real implementation, use a proper grammar parser
+            if self.parser is None:
+                return 1.0
             
-            # For now, always return 1.0 (valid)
-            return 1.0
+            state = self.parser.scan(self.parser.start, "".join(sequence))[0]
+            return 0.0 if state == DEAD else 1.0
         except Exception as e:
             error = wrap_error(
                 e,
@@ -109,6 +156,106 @@ class GrammarPotential(Potential):
             log_error(error, logger=logger)
             return 0.0
     
+    def evaluate_particle(self, particle: Particle) -> float:
+        """Evaluate the potential for a particle, advancing its automaton state.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            1.0 if the sequence is valid, 0.0 otherwise
+        """
+        if self.parser is None:
+            return 1.0
+        
+        try:
+            return 0.0 if self._advance(particle) == DEAD else 1.0
+        except Exception as e:
+            error = wrap_error(
+                e,
+                message="Failed to evaluate grammar potential",
+                category=ErrorCategory.VALIDATION,
+                details={"sequence_length": len(particle.sequence)},
+            )
+            log_error(error, logger=logger)
+            return 0.0
+    
+    def _advance(self, particle: Particle) -> int:
+        """Advance a particle's automaton state over its new tokens.
+        
+        Sequences only grow by appending tokens, so the state after the
+        first num_tokens tokens is still valid for the current sequence.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            The automaton state
+        """
+        num_tokens, state = particle.metadata.get(self._state_key, (0, self.parser.start))
+        if num_tokens > len(particle.sequence):
+            num_tokens, state = 0, self.parser.start
+        
+        if num_tokens < len(particle.sequence):
+            state = self.parser.scan(state, "".join(particle.sequence[num_tokens:]))[0]
+            particle.metadata[self._state_key] = (len(particle.sequence), state)
+        
+        return state
+    
+    def is_complete(self, particle: Particle) -> bool:
+        """Check if a particle's sequence is a complete sentence of the grammar.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            True if the grammar accepts the sequence as it is
+        """
+        if self.parser is None:
+            return True
+        return self.parser.accepting[self._advance(particle)]
+    
+    def allowed_characters(self, particle: Particle) -> CharSet:
+        """Get the characters that keep a particle's sequence valid.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            Sorted, inclusive code point intervals
+        """
+        if self.parser is None:
+            return ((0, MAX_CODE_POINT),)
+        return self.parser.allowed_characters(self._advance(particle))
+    
+    def mask_tokens(self, particle: Particle, tokens: List[str]) -> List[bool]:
+        """Check which candidate next tokens keep a particle's sequence valid.
+        
+        Results are cached per automaton state, so masking a fixed vocabulary
+        costs one scan per token and state the first time and a dictionary
+        lookup afterwards.
+        
+        Args:
+            particle: The particle
+            tokens: The candidate tokens
+        
+        Returns:
+            Whether each token is allowed
+        """
+        if self.parser is None:
+            return [True] * len(tokens)
+        
+        state = self._advance(particle)
+        masks = self._masks.setdefault(state, {})
+        allowed = []
+        for token in tokens:
+            mask = masks.get(token)
+            if mask is None:
+                mask = self.parser.scan(state, token)[0] != DEAD
+                masks[token] = mask
+            allowed.append(mask)
+        return allowed
+    
     def is_efficient(self) -> bool:
         """Check if the potential is efficient.
         
@@ -118,6 +265,14 @@ class GrammarPotential(Potential):
             True
         """
         return True
+    
+    def is_incremental(self) -> bool:
+        """Check if the potential keeps per-particle state.
+        
+        Returns:
+            True if the grammar was compiled into an automaton
+        """
+        return self.parser is not None
 
 
 class SemanticPotential(Potential):
@@ -180,11 +335,18 @@ class SemanticPotential(Potential):
 class RegexPotential(Potential):
     """Regex-based Potential Function.
     
-    This potential enforces a regex constraint.
+    This potential enforces a regex constraint, with the semantics of
+    re.match: some prefix of the text must match the pattern (all of it,
+    up to a final newline, if the pattern ends with "$"). Patterns in the
+    regular subset of the syntax (see the automaton module) are also
+    compiled into a DFA whose state is kept on each particle, so
+    evaluate_particle only scans the characters added since the last call
+    and rejects a particle for good once it reaches the dead state.
     
     Attributes:
         pattern: The regex pattern to enforce
         regex: The compiled regex
+        automaton: The DFA of the pattern, or None if it is not supported
     """
     
     def __init__(self, pattern: str, name: str = "regex_potential"):
@@ -198,6 +360,15 @@ class RegexPotential(Potential):
         self.pattern = pattern
         self.regex = re.compile(pattern)
         
+        try:
+            self.automaton = compile_regex(pattern)
+        except UnsupportedPatternError as e:
+            logger.debug(f"Evaluating {name} with re: {e}")
+            self.automaton = None
+        
+        # Metadata key of the automaton state, unique to this potential
+        self._state_key = f"_regex_state_{id(self)}"
+        
         logger.info(f"Initialized {name} with pattern: {pattern}")
     
     def evaluate(self, sequence: List[str]) -> float:
@@ -223,3 +394,69 @@ class RegexPotential(Potential):
             )
             log_error(error, logger=logger)
             return 0.0
+
+    def evaluate_particle(self, particle: Particle) -> float:
+        """Evaluate the potential for a particle, advancing its automaton state.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            1.0 if the sequence matches the pattern, 0.0 otherwise
+        """
+        if self.automaton is None:
+            return self.evaluate(particle.sequence)
+        
+        try:
+            return 1.0 if self._advance(particle) else 0.0
+        except Exception as e:
+            error = wrap_error(
+                e,
+                message="Failed to evaluate regex potential",
+                category=ErrorCategory.VALIDATION,
+                details={"sequence_length": len(particle.sequence)},
+            )
+            log_error(error, logger=logger)
+            return 0.0
+    
+    def _advance(self, particle: Particle) -> bool:
+        """Advance a particle's automaton state over its new tokens.
+        
+        The state is (number of tokens scanned, DFA state, DFA state before
+        the last character, matched). Without a "$", a match of any prefix is
+        final, so nothing more is scanned once matched is True.
+        
+        Args:
+            particle: The particle
+        
+        Returns:
+            Whether the sequence matches the pattern
+        """
+        automaton = self.automaton
+        start = automaton.start
+        saved = particle.metadata.get(self._state_key)
+        if saved is None or saved[0] > len(particle.sequence):
+            saved = (0, start, DEAD, automaton.accepting[start])
+        num_tokens, state, previous, matched = saved
+        
+        if num_tokens == len(particle.sequence):
+            return matched
+        
+        text = "".join(particle.sequence[num_tokens:])
+        if automaton.anchored_end:
+            if text:
+                state, previous, _ = automaton.scan(state, text)
+                matched = automaton.accepting[state] or (text[-1] == "\n" and automaton.accepting[previous])
+        elif not matched:
+            state, previous, matched = automaton.scan(state, text, stop_on_accept=True)
+        
+        particle.metadata[self._state_key] = (len(particle.sequence), state, previous, matched)
+        return matched
+    
+    def is_incremental(self) -> bool:
+        """Check if the potential keeps per-particle state.
+        
+        Returns:
+            True if the pattern was compiled into an automaton
+        """
+        return self.automaton is not None
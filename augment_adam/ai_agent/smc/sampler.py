@@ -227,14 +227,14 @@ class SequentialMonteCarlo:
         # Apply efficient potentials
         for potential in self.efficient_potentials:
             for particle in self.particles:
-                weight = potential.evaluate(particle.sequence)
+                weight = potential.evaluate_particle(particle)
                 particle.update_weight(weight)
 
         # Apply expensive potentials (less frequently)
         # In a real implementation, apply these less frequently
         for potential in self.expensive_potentials:
             for particle in self.particles:
-                weight = potential.evaluate(particle.sequence)
+                weight = potential.evaluate_particle(particle)
                 particle.update_weight(weight)
 
         # Normalize weights
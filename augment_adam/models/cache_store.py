@@ -0,0 +1,317 @@
+"""Single-file storage for the model cache.
+
+This module provides a SQLite store for cached embeddings and generations,
+with an in-process LRU tier in front of it.
+
+Version: 0.1.0
+Created: 2025-04-28
+"""
+
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from array import array
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Entry kinds
+EMBEDDING = "embedding"
+GENERATION = "generation"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+def encode_embedding(embedding: List[float]) -> bytes:
+    """Encode an embedding as a float32 blob.
+
+    Args:
+        embedding: The embedding
+
+    Returns:
+        The blob
+    """
+    return array("f", embedding).tobytes()
+
+
+def decode_embedding(blob: bytes) -> List[float]:
+    """Decode a float32 blob into an embedding.
+
+    Args:
+        blob: The blob
+
+    Returns:
+        The embedding
+    """
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def _close_at_exit(close: weakref.WeakMethod) -> None:
+    """Close a store at interpreter exit, if it still exists.
+
+    Args:
+        close: Weak reference to the store's close method
+    """
+    method = close()
+    if method is not None:
+        method()
+
+
+class SQLiteCacheStore:
+    """SQLite store for cached embeddings and generations.
+
+    All entries live in one database file in WAL mode, so a lookup is an
+    indexed read rather than a file open, and startup only reads the total
+    size. Recently used values are kept decoded in a bounded in-process LRU.
+    Access times are only used to pick entries to evict, so they are
+    collected in memory and written in one transaction every flush_interval
+    seconds, once max_pending_access of them are waiting, or when flush() or
+    close() is called. The store is closed at interpreter exit if it is
+    still open, so no access times are lost.
+
+    The store is safe to share between threads.
+
+    Attributes:
+        path: Path of the database file
+        memory_cache_size: Maximum number of values in the LRU tier
+        flush_interval: Seconds between access-time flushes
+        max_pending_access: Number of waiting access times that triggers a flush
+        total_size: Total size of the stored values in bytes
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_cache_size: int = 1024,
+        flush_interval: float = 5.0,
+        max_pending_access: int = 1024
+    ):
+        """Initialize the store, creating the database if needed.
+
+        Args:
+            path: Path of the database file
+            memory_cache_size: Maximum number of values in the LRU tier
+            flush_interval: Seconds between access-time flushes
+            max_pending_access: Number of waiting access times that triggers a flush
+        """
+        self.path = path
+        self.memory_cache_size = memory_cache_size
+        self.flush_interval = flush_interval
+        self.max_pending_access = max_pending_access
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._pending_access: Dict[Tuple[str, str], float] = {}
+        self._last_flush = time.monotonic()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+        self.total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        # Close at exit without keeping the store alive until then; the hook
+        # is unregistered when the store is closed or collected
+        self._exit_hook = partial(_close_at_exit, weakref.WeakMethod(self.close))
+        atexit.register(self._exit_hook)
+        weakref.finalize(self, atexit.unregister, self._exit_hook)
+
+    def __len__(self) -> int:
+        """Get the number of stored entries."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Get a value.
+
+        Args:
+            kind: EMBEDDING or GENERATION
+            key: The entry key
+
+        Returns:
+            The value if found, None otherwise
+        """
+        entry = (kind, key)
+        with self._lock:
+            value = self._memory.get(entry)
+            if value is not None:
+                self._memory.move_to_end(entry)
+            else:
+                row = self._connection.execute(
+                    "SELECT value FROM entries WHERE kind = ? AND key = ?", entry
+                ).fetchone()
+                if row is None:
+                    return None
+                value = decode_embedding(row[0]) if kind == EMBEDDING else row[0]
+                self._remember(entry, value)
+
+            self._pending_access[entry] = time.time()
+            self._maybe_flush()
+
+        # Callers may modify the embedding they get, so hand out a copy
+        return list(value) if kind == EMBEDDING else value
+
+    def put(self, kind: str, key: str, value: Any, last_access: Optional[float] = None) -> int:
+        """Store a value, replacing any previous value for the key.
+
+        Args:
+            kind: EMBEDDING or GENERATION
+            key: The entry key
+            value: An embedding or a generated text
+            last_access: The access time to record (defaults to now)
+
+        Returns:
+            The change in total size in bytes
+        """
+        return self.put_many(kind, [(key, value, last_access)])
+
+    def put_many(self, kind: str, items: Iterable[Tuple[str, Any, Optional[float]]]) -> int:
+        """Store values in one transaction.
+
+        Args:
+            kind: EMBEDDING or GENERATION
+            items: (key, value, last_access) tuples; a last_access of None
+                means now
+
+        Returns:
+            The change in total size in bytes
+        """
+        now = time.time()
+        rows = []
+        for key, value, last_access in items:
+            if kind == EMBEDDING:
+                blob = encode_embedding(value)
+                size = len(blob)
+            else:
+                blob = value
+                size = len(value.encode())
+            rows.append((kind, key, blob, size, last_access or now))
+
+        with self._lock:
+            before = self.total_size
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                for row in rows:
+                    old = connection.execute(
+                        "SELECT size FROM entries WHERE kind = ? AND key = ?", (kind, row[1])
+                    ).fetchone()
+                    if old is not None:
+                        self.total_size -= old[0]
+                    self.total_size += row[3]
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries (kind, key, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                self.total_size = before
+                raise
+
+            for row in rows:
+                self._pending_access.pop((kind, row[1]), None)
+                self._memory.pop((kind, row[1]), None)
+            return self.total_size - before
+
+    def _remember(self, entry: Tuple[str, str], value: Any) -> None:
+        """Add a value to the LRU tier, evicting the least recently used."""
+        if self.memory_cache_size <= 0:
+            return
+        self._memory[entry] = value
+        if len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+
+    def _maybe_flush(self) -> None:
+        """Flush the access times if the flush interval has passed or enough are waiting."""
+        if (len(self._pending_access) >= self.max_pending_access
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending access times in one transaction."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending_access:
+                return
+
+            updates = [(last_access, kind, key) for (kind, key), last_access in self._pending_access.items()]
+            self._pending_access.clear()
+            self._connection.execute("BEGIN")
+            self._connection.executemany("UPDATE entries SET last_access = ? WHERE kind = ? AND key = ?", updates)
+            self._connection.execute("COMMIT")
+
+    def evict(self, num_bytes: int, before: Optional[float] = None) -> int:
+        """Remove the least recently used entries.
+
+        Args:
+            num_bytes: The number of bytes to free
+            before: Only remove entries last accessed before this time
+
+        Returns:
+            The number of bytes freed
+        """
+        freed = 0
+        with self._lock:
+            self.flush()
+            while freed < num_bytes:
+                rows = self._connection.execute(
+                    "SELECT kind, key, size FROM entries WHERE last_access < ? ORDER BY last_access, rowid LIMIT 256",
+                    (before if before is not None else float("inf"),)
+                ).fetchall()
+                if not rows:
+                    break
+
+                victims = []
+                for kind, key, size in rows:
+                    victims.append((kind, key))
+                    freed += size
+                    if freed >= num_bytes:
+                        break
+
+                self._connection.execute("BEGIN")
+                self._connection.executemany("DELETE FROM entries WHERE kind = ? AND key = ?", victims)
+                self._connection.execute("COMMIT")
+                for entry in victims:
+                    self._memory.pop(entry, None)
+
+            self.total_size -= freed
+        return freed
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._memory.clear()
+            self._pending_access.clear()
+            self.total_size = 0
+
+    def close(self) -> None:
+        """Flush the access times and close the database."""
+        with self._lock:
+            if self._connection is None:
+                return
+            atexit.unregister(self._exit_hook)
+            try:
+                self.flush()
+            finally:
+                self._connection.close()
+                self._connection = None
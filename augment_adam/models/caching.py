@@ -18,6 +18,7 @@ from pathlib import Path
 from augment_adam.core.errors import (
     ResourceError, wrap_error, log_error, ErrorCategory
 )
+from augment_adam.models.cache_store import SQLiteCacheStore, EMBEDDING, GENERATION
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,9 @@ DOCKER_CACHE_DIR = "/cache"
 # Use Docker volume if available, otherwise use default
 CACHE_DIR = DOCKER_CACHE_DIR if os.path.exists(DOCKER_CACHE_DIR) else DEFAULT_CACHE_DIR
 
+# Database file of the sqlite backend, inside the cache directory
+CACHE_DB_NAME = "cache.db"
+
 
 class ModelCache:
     """Cache for model artifacts.
@@ -40,12 +44,20 @@ class ModelCache:
     This class provides a caching system for model artifacts like
     tokenizers, embeddings, and generated text.
     
+    With the default "sqlite" backend, embeddings (as float32) and
+    generations are kept in a single SQLiteCacheStore database with an
+    in-memory LRU tier, and entries left by the "files" backend (one file
+    per entry, tracked in metadata.json) are migrated into it on startup.
+    Tokenizers and model weights are always stored as directories.
+    
     Attributes:
         cache_dir: Directory for cache storage
         model_name: Name of the model
         provider: Provider of the model
         max_cache_size: Maximum cache size in bytes
         current_cache_size: Current cache size in bytes
+        backend: "sqlite" or "files"
+        store: The embedding and generation store, or None for "files"
     """
     
     def __init__(
@@ -54,6 +66,9 @@ class ModelCache:
         provider: str,
         cache_dir: Optional[str] = None,
         max_cache_size: int = 1024 * 1024 * 1024,  # 1 GB
+        backend: str = "sqlite",
+        memory_cache_size: int = 1024,
+        flush_interval: float = 5.0,
         **kwargs
     ):
         """Initialize the Model Cache.
@@ -63,11 +78,24 @@ class ModelCache:
             provider: Provider of the model
             cache_dir: Directory for cache storage
             max_cache_size: Maximum cache size in bytes
+            backend: "sqlite" for a single database file, or "files" for
+                one file per embedding and generation
+            memory_cache_size: Maximum number of values kept in memory by
+                the sqlite backend
+            flush_interval: Seconds between writes of batched access times
+                by the sqlite backend
             **kwargs: Additional parameters
+        
+        Raises:
+            ValueError: If the backend is unknown
         """
+        if backend not in ("sqlite", "files"):
+            raise ValueError(f"Unknown cache backend: {backend}")
+        
         self.model_name = model_name
         self.provider = provider
         self.max_cache_size = max_cache_size
+        self.backend = backend
         
         # Set cache directory
         if cache_dir:
@@ -95,6 +123,16 @@ class ModelCache:
         self.metadata_path = os.path.join(self.cache_dir, "metadata.json")
         self.metadata = self._load_metadata()
         
+        # Open the embedding and generation store
+        self.store = None
+        if backend == "sqlite":
+            self.store = SQLiteCacheStore(
+                os.path.join(self.cache_dir, CACHE_DB_NAME),
+                memory_cache_size=memory_cache_size,
+                flush_interval=flush_interval
+            )
+            self._migrate_file_entries()
+        
         # Calculate current cache size
         self.current_cache_size = self._calculate_cache_size()
         
@@ -133,12 +171,64 @@ class ModelCache:
         except Exception as e:
             logger.warning(f"Failed to save cache metadata: {e}")
     
+    def _migrate_file_entries(self) -> None:
+        """Move embeddings and generations of the files backend into the store.
+        
+        Entries keep their keys and last access times. Files that cannot be
+        read are dropped.
+        """
+        if not self.metadata["embeddings"] and not self.metadata["generations"]:
+            return
+        
+        last_access = self.metadata["last_access"]
+        migrated = 0
+        
+        for kind, cache_type, directory, suffix in [
+            (EMBEDDING, "embeddings", self.embeddings_dir, ".pkl"),
+            (GENERATION, "generations", self.generations_dir, ".txt"),
+        ]:
+            items = []
+            for key in self.metadata[cache_type]:
+                file_path = os.path.join(directory, f"{key}{suffix}")
+                try:
+                    if kind == EMBEDDING:
+                        with open(file_path, "rb") as f:
+                            value = [float(x) for x in pickle.load(f)]
+                    else:
+                        with open(file_path, "r") as f:
+                            value = f.read()
+                    items.append((key, value, last_access.get(key)))
+                except Exception as e:
+                    logger.warning(f"Failed to migrate cache entry {key}: {e}")
+            
+            self.store.put_many(kind, items)
+            migrated += len(items)
+            
+            # Remove the migrated files
+            for key in self.metadata[cache_type]:
+                file_path = os.path.join(directory, f"{key}{suffix}")
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                last_access.pop(key, None)
+            self.metadata[cache_type] = {}
+        
+        self._save_metadata()
+        logger.info(f"Migrated {migrated} cache entries to {self.store.path}")
+    
     def _calculate_cache_size(self) -> int:
         """Calculate current cache size.
         
         Returns:
             Current cache size in bytes
         """
+        if self.store is not None:
+            # Tokenizer and model sizes are recorded when they are saved
+            return self.store.total_size + sum(
+                info.get("size", 0)
+                for cache_type in ["tokenizer", "model"]
+                for info in self.metadata[cache_type].values()
+            )
+        
         total_size = 0
         
         for dirpath, _, filenames in os.walk(self.cache_dir):
@@ -153,6 +243,10 @@ class ModelCache:
         if self.current_cache_size <= self.max_cache_size:
             return
         
+        if self.store is not None:
+            self._cleanup_store()
+            return
+        
         # Get all cache entries with their last access time
         entries = []
         
@@ -187,6 +281,33 @@ class ModelCache:
             elif cache_type == "model":
                 self._remove_model(key)
     
+    def _cleanup_store(self) -> None:
+        """Clean up the sqlite backend, oldest entries first.
+        
+        Store entries older than each tokenizer or model directory are
+        evicted before it.
+        """
+        directories = sorted(
+            (
+                (self.metadata["last_access"].get(key, 0.0), cache_type, key)
+                for cache_type in ["tokenizer", "model"]
+                for key in self.metadata[cache_type]
+            ),
+            key=lambda entry: entry[0]
+        )
+        
+        for last_access, cache_type, key in directories + [(None, None, None)]:
+            excess = self.current_cache_size - self.max_cache_size
+            if excess <= 0:
+                break
+            
+            self.current_cache_size -= self.store.evict(excess, before=last_access)
+            
+            if cache_type == "tokenizer" and self.current_cache_size > self.max_cache_size:
+                self._remove_tokenizer(key)
+            elif cache_type == "model" and self.current_cache_size > self.max_cache_size:
+                self._remove_model(key)
+    
     def _remove_embedding(self, key: str) -> None:
         """Remove an embedding from the cache.
         
@@ -293,6 +414,13 @@ class ModelCache:
         # Create a key for the embedding
         key = hashlib.md5(text.encode()).hexdigest()
         
+        if self.store is not None:
+            try:
+                return self.store.get(EMBEDDING, key)
+            except Exception as e:
+                logger.warning(f"Failed to load embedding from cache: {e}")
+                return None
+        
         # Check if embedding exists in cache
         if key in self.metadata["embeddings"]:
             file_path = os.path.join(self.embeddings_dir, f"{key}.pkl")
@@ -321,6 +449,14 @@ class ModelCache:
         # Create a key for the embedding
         key = hashlib.md5(text.encode()).hexdigest()
         
+        if self.store is not None:
+            try:
+                self.current_cache_size += self.store.put(EMBEDDING, key, embedding)
+                self._cleanup_cache()
+            except Exception as e:
+                logger.warning(f"Failed to save embedding to cache: {e}")
+            return
+        
         # Save embedding to cache
         file_path = os.path.join(self.embeddings_dir, f"{key}.pkl")
         
@@ -359,6 +495,13 @@ class ModelCache:
         params_str = json.dumps(params, sort_keys=True)
         key = hashlib.md5((prompt + params_str).encode()).hexdigest()
         
+        if self.store is not None:
+            try:
+                return self.store.get(GENERATION, key)
+            except Exception as e:
+                logger.warning(f"Failed to load generation from cache: {e}")
+                return None
+        
         # Check if generation exists in cache
         if key in self.metadata["generations"]:
             file_path = os.path.join(self.generations_dir, f"{key}.txt")
@@ -389,6 +532,14 @@ class ModelCache:
         params_str = json.dumps(params, sort_keys=True)
         key = hashlib.md5((prompt + params_str).encode()).hexdigest()
         
+        if self.store is not None:
+            try:
+                self.current_cache_size += self.store.put(GENERATION, key, generation)
+                self._cleanup_cache()
+            except Exception as e:
+                logger.warning(f"Failed to save generation to cache: {e}")
+            return
+        
         # Save generation to cache
         file_path = os.path.join(self.generations_dir, f"{key}.txt")
         
@@ -542,9 +693,13 @@ class ModelCache:
             # Remove all files
             for dirpath, dirnames, filenames in os.walk(self.cache_dir):
                 for filename in filenames:
-                    if filename != "metadata.json":  # Keep metadata file
+                    # Keep metadata file and the open database
+                    if filename != "metadata.json" and not filename.startswith(CACHE_DB_NAME):
                         os.remove(os.path.join(dirpath, filename))
             
+            if self.store is not None:
+                self.store.clear()
+            
             # Reset metadata
             self.metadata = {
                 "model_name": self.model_name,
@@ -563,6 +718,16 @@ class ModelCache:
             logger.info(f"Cleared cache for {self.provider}/{self.model_name}")
         except Exception as e:
             logger.warning(f"Failed to clear cache: {e}")
+    
+    def flush(self) -> None:
+        """Write batched access times to disk."""
+        if self.store is not None:
+            self.store.flush()
+    
+    def close(self) -> None:
+        """Write batched access times and close the store."""
+        if self.store is not None:
+            self.store.close()
 
 
 # Global cache registry
@@ -45,6 +45,8 @@ class HuggingFaceModel(ModelInterface):
         model_type: The type of model (causal or seq2seq)
     """
 
+    local_token_count = True
+
     def __init__(
         self,
         model_name: str = "mistralai/Mistral-7B-Instruct-v0.2",
@@ -413,6 +415,127 @@ class HuggingFaceModel(ModelInterface):
             log_error(error, logger=logger)
             return f"Error generating text: {str(error)}"
 
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        top_p: float = 1.0,
+        stop: Optional[List[str]] = None,
+        use_cache: Optional[bool] = None,
+        use_monte_carlo: bool = True,
+        monte_carlo_particles: int = 50,
+        monte_carlo_potentials: Optional[List[Any]] = None,
+        **kwargs
+    ) -> List[str]:
+        """Generate text for several prompts with one call to the model.
+
+        Prompts that are not cached are padded to the same length and
+        generated together; stop sequences are applied to each text
+        afterwards. Requests for Monte Carlo sampling with potentials cannot
+        be batched, so their prompts are generated one at a time.
+
+        Args:
+            prompts: The prompts to generate from
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (higher = more random)
+            top_p: Nucleus sampling parameter (1.0 = no nucleus sampling)
+            stop: List of strings that stop generation when encountered
+            use_cache: Whether to use the cache (if None, use the instance setting)
+            use_monte_carlo: Whether to use Monte Carlo sampling
+            monte_carlo_particles: Number of particles for Monte Carlo sampling
+            monte_carlo_potentials: Potentials for Monte Carlo sampling
+            **kwargs: Additional model-specific parameters
+
+        Returns:
+            The generated texts, in the order of the prompts
+        """
+        if use_monte_carlo and monte_carlo_potentials:
+            return [
+                self.generate(
+                    prompt, max_tokens, temperature, top_p, stop, use_cache,
+                    use_monte_carlo, monte_carlo_particles, monte_carlo_potentials, **kwargs
+                )
+                for prompt in prompts
+            ]
+
+        try:
+            # Check if we should use the cache
+            should_use_cache = (self.use_cache if use_cache is None else use_cache) and self.cache
+
+            # Same cache key parameters as generate
+            cache_params = {
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "top_p": top_p,
+                "stop": stop,
+                "use_monte_carlo": use_monte_carlo,
+                "monte_carlo_particles": monte_carlo_particles,
+                **kwargs
+            }
+
+            # Look up each distinct prompt in the cache
+            texts: Dict[str, str] = {}
+            missing = []
+            for prompt in dict.fromkeys(prompts):
+                cached_result = self.cache.get_generation(prompt, cache_params) if should_use_cache else None
+                if cached_result:
+                    texts[prompt] = cached_result
+                else:
+                    missing.append(prompt)
+
+            if missing:
+                # Decoder-only models continue from the end of the prompt, so pad on the left
+                if self.tokenizer.pad_token is None:
+                    self.tokenizer.pad_token = self.tokenizer.eos_token
+                if self.model_type == "causal":
+                    self.tokenizer.padding_side = "left"
+
+                inputs = self.tokenizer(
+                    [self._format_prompt(prompt) for prompt in missing],
+                    return_tensors="pt",
+                    padding=True
+                ).to(self.device)
+
+                generation_kwargs = {
+                    "max_new_tokens": max_tokens,
+                    "temperature": temperature,
+                    "top_p": top_p,
+                    "do_sample": temperature > 0,
+                    "pad_token_id": self.tokenizer.pad_token_id,
+                    **kwargs
+                }
+
+                with torch.inference_mode():
+                    outputs = self.model.generate(**inputs, **generation_kwargs)
+
+                # Causal outputs start with the (padded) prompt
+                if self.model_type == "causal":
+                    outputs = outputs[:, inputs["input_ids"].shape[1]:]
+
+                for prompt, generated_text in zip(missing, self.tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                    # Cut each text at its first stop sequence
+                    for sequence in stop or []:
+                        position = generated_text.find(sequence)
+                        if position >= 0:
+                            generated_text = generated_text[:position]
+
+                    texts[prompt] = generated_text
+                    if should_use_cache:
+                        self.cache.save_generation(prompt, cache_params, generated_text)
+
+            logger.info(f"Generated a batch of {len(missing)} texts ({len(prompts) - len(missing)} cached or repeated) with {self.model_name}")
+            return [texts[prompt] for prompt in prompts]
+        except Exception as e:
+            error = wrap_error(
+                e,
+                message="Failed to generate a batch with Hugging Face Model",
+                category=ErrorCategory.RESOURCE,
+                details={"model_name": self.model_name, "batch_size": len(prompts)}
+            )
+            log_error(error, logger=logger)
+            return [f"Error generating text: {str(error)}" for _ in prompts]
+
     def generate_stream(
         self,
         prompt: str,
@@ -620,6 +743,100 @@ class HuggingFaceModel(ModelInterface):
             # Return a zero vector as fallback
             return [0.0] * 384  # Default embedding size for all-MiniLM-L6-v2
 
+    def get_embeddings(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        use_cache: Optional[bool] = None
+    ) -> List[List[float]]:
+        """Get the embeddings for several texts, in batches.
+
+        Texts that are not cached are embedded once each, longest first, so
+        each batch holds texts of similar length and little padding. If a
+        batch fails, only its texts get zero vectors, and those are not cached.
+
+        Args:
+            texts: The texts to get embeddings for
+            batch_size: Maximum number of texts per forward pass
+            use_cache: Whether to use the cache (if None, use the instance setting)
+
+        Returns:
+            The embeddings, in the order of the texts
+        """
+        try:
+            if not self.has_embeddings:
+                raise ResourceError(
+                    message="Embeddings are not available for this model",
+                    details={"model_name": self.model_name}
+                )
+
+            # Check if we should use the cache
+            should_use_cache = (self.use_cache if use_cache is None else use_cache) and self.cache
+
+            # Look up each distinct text in the cache
+            embeddings: Dict[str, List[float]] = {}
+            missing = []
+            for text in dict.fromkeys(texts):
+                cached_embedding = self.cache.get_embedding(text) if should_use_cache else None
+                if cached_embedding:
+                    embeddings[text] = cached_embedding
+                else:
+                    missing.append(text)
+
+            # Sort by length to minimize padding within each batch
+            missing.sort(key=len, reverse=True)
+
+            failed: List[str] = []
+            with torch.inference_mode():
+                for start in range(0, len(missing), batch_size):
+                    batch = missing[start:start + batch_size]
+                    try:
+                        vectors = self.embedding_model.encode(
+                            batch,
+                            batch_size=len(batch),
+                            convert_to_numpy=True,
+                            show_progress_bar=False
+                        )
+                    except Exception as e:
+                        error = wrap_error(
+                            e,
+                            message="Failed to embed a batch with Hugging Face Model",
+                            category=ErrorCategory.RESOURCE,
+                            details={"model_name": self.model_name, "batch_size": len(batch)}
+                        )
+                        log_error(error, logger=logger)
+
+                        failed.extend(batch)
+                        continue
+
+                    for text, vector in zip(batch, vectors):
+                        embeddings[text] = vector.tolist()
+                        if should_use_cache:
+                            self.cache.save_embedding(text, embeddings[text])
+
+            # Return zero vectors as fallback for the texts of failed batches only
+            if failed:
+                dimension = len(next(iter(embeddings.values()))) if embeddings else 384
+                for text in failed:
+                    embeddings[text] = [0.0] * dimension
+
+            logger.info(
+                f"Generated {len(missing) - len(failed)} embeddings "
+                f"({len(texts) - len(missing)} cached or repeated, {len(failed)} failed)"
+            )
+            return [embeddings[text] for text in texts]
+        except Exception as e:
+            error = wrap_error(
+                e,
+                message="Failed to get embeddings with Hugging Face Model",
+                category=ErrorCategory.RESOURCE,
+                details={"model_name": self.model_name, "num_texts": len(texts)}
+            )
+            log_error(error, logger=logger)
+
+            # Return zero vectors as fallback
+            return [[0.0] * 384 for _ in texts]
+
     def get_token_probabilities(
         self,
         prompt: str,
@@ -17,8 +17,14 @@ class ModelInterface(ABC):
     """Interface for language models.
     
     This interface defines the core methods that all language models must implement.
+    
+    Attributes:
+        local_token_count: Whether get_token_count counts with a local
+            tokenizer, without a request to the provider
     """
     
+    local_token_count = False
+    
     @abstractmethod
     def generate(
         self,
@@ -93,6 +99,21 @@ class ModelInterface(ABC):
         """
         pass
     
+    def get_embeddings(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+        """Get the embeddings for several texts.
+        
+        Backends that can embed several texts per call override this; the
+        default embeds them one at a time.
+        
+        Args:
+            texts: The texts to get embeddings for
+            batch_size: Maximum number of texts per call to the backend
+        
+        Returns:
+            The embeddings, in the order of the texts
+        """
+        return [self.get_embedding(text) for text in texts]
+    
     @abstractmethod
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the model.
@@ -6,11 +6,16 @@ Version: 0.1.0
 Created: 2025-04-28
 """
 
+import asyncio
 import logging
-import os
 import json
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union, Tuple, Generator
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 
 from augment_adam.core.errors import (
     ResourceError, NetworkError, wrap_error, log_error, ErrorCategory
@@ -20,20 +25,50 @@ from augment_adam.models.model_interface import ModelInterface
 logger = logging.getLogger(__name__)
 
 
+async def _close_with_loop(session: aiohttp.ClientSession):
+    """Hold an aiohttp session until its event loop shuts down, then close it.
+
+    Once started, the generator is registered with the running loop, which
+    closes it when its async generators are shut down (as asyncio.run does
+    before closing the loop), so the session is closed on its own loop.
+
+    Args:
+        session: The session
+    """
+    try:
+        yield
+    finally:
+        if not session.closed:
+            await session.close()
+
+
 class OllamaModel(ModelInterface):
     """Ollama Model implementation.
 
     This class provides an implementation of the ModelInterface for Ollama models.
 
+    Synchronous calls share one requests session, so they reuse pooled
+    keep-alive connections. The async methods (agenerate, aget_embedding,
+    aget_embeddings) share one aiohttp session per event loop, created on
+    first use, whose connector allows at most max_concurrency requests at a
+    time; it is closed when its loop shuts down. Call close() and aclose()
+    to release the connections earlier.
+
     Attributes:
         model_name: The name of the Ollama model to use
         base_url: The base URL for the Ollama API
+        timeout: Timeout for each request in seconds
+        max_concurrency: Maximum number of concurrent async requests
+        session: The session for synchronous requests
     """
 
     def __init__(
         self,
         model_name: str = "llama3",
         base_url: str = "http://localhost:11434",
+        pool_maxsize: int = 16,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = 300.0,
         **kwargs
     ):
         """Initialize the Ollama Model.
@@ -41,11 +76,29 @@ class OllamaModel(ModelInterface):
         Args:
             model_name: The name of the Ollama model to use
             base_url: The base URL for the Ollama API
+            pool_maxsize: Maximum number of pooled connections kept open by
+                the synchronous session
+            max_concurrency: Maximum number of concurrent async requests
+            timeout: Timeout for each request in seconds (None for no timeout)
             **kwargs: Additional parameters for the Ollama API
         """
         try:
             self.model_name = model_name
             self.base_url = base_url
+            self.timeout = timeout
+            self.max_concurrency = max_concurrency
+
+            # Pooled session for synchronous requests
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+            # aiohttp session for async requests, bound to the loop it was created in
+            self._async_session: Optional[aiohttp.ClientSession] = None
+            self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+            self._async_guard = None
+            self._async_semaphore: Optional[asyncio.Semaphore] = None
 
             # Check if the model is available
             self._check_model_availability()
@@ -69,7 +122,7 @@ class OllamaModel(ModelInterface):
         """
         try:
             # Get list of models
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
             response.raise_for_status()
 
             # Check if the model is in the list
@@ -112,25 +165,10 @@ class OllamaModel(ModelInterface):
         """
         try:
             # Prepare request data
-            data = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                    "top_p": top_p,
-                    "stop": stop or []
-                }
-            }
-
-            # Add additional options
-            for key, value in kwargs.items():
-                if key not in data["options"]:
-                    data["options"][key] = value
+            data = self._generate_request(prompt, max_tokens, temperature, top_p, stop, False, kwargs)
 
             # Generate completion
-            response = requests.post(f"{self.base_url}/api/generate", json=data)
+            response = self.session.post(f"{self.base_url}/api/generate", json=data, timeout=self.timeout)
             response.raise_for_status()
 
             # Extract generated text
@@ -173,25 +211,10 @@ class OllamaModel(ModelInterface):
         """
         try:
             # Prepare request data
-            data = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": True,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                    "top_p": top_p,
-                    "stop": stop or []
-                }
-            }
-
-            # Add additional options
-            for key, value in kwargs.items():
-                if key not in data["options"]:
-                    data["options"][key] = value
+            data = self._generate_request(prompt, max_tokens, temperature, top_p, stop, True, kwargs)
 
             # Generate streaming completion
-            response = requests.post(f"{self.base_url}/api/generate", json=data, stream=True)
+            response = self.session.post(f"{self.base_url}/api/generate", json=data, stream=True, timeout=self.timeout)
             response.raise_for_status()
 
             # Yield chunks of generated text
@@ -230,7 +253,7 @@ class OllamaModel(ModelInterface):
             }
 
             # Get token count
-            response = requests.post(f"{self.base_url}/api/tokenize", json=data)
+            response = self.session.post(f"{self.base_url}/api/tokenize", json=data, timeout=self.timeout)
             response.raise_for_status()
 
             # Extract token count
@@ -267,7 +290,7 @@ class OllamaModel(ModelInterface):
             }
 
             # Get embedding
-            response = requests.post(f"{self.base_url}/api/embeddings", json=data)
+            response = self.session.post(f"{self.base_url}/api/embeddings", json=data, timeout=self.timeout)
             response.raise_for_status()
 
             # Extract embedding
@@ -288,6 +311,25 @@ class OllamaModel(ModelInterface):
             # Return a zero vector as fallback (assuming 4096 dimensions)
             return [0.0] * 4096
 
+    def get_embeddings(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+        """Get the embeddings for several texts, with concurrent requests.
+
+        The embeddings endpoint takes one text per request, so batch_size
+        is unused; up to max_concurrency requests share the pooled session.
+
+        Args:
+            texts: The texts to get embeddings for
+            batch_size: Unused
+
+        Returns:
+            The embeddings, in the order of the texts
+        """
+        if len(texts) <= 1:
+            return [self.get_embedding(text) for text in texts]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(texts))) as executor:
+            return list(executor.map(self.get_embedding, texts))
+
     def get_token_probabilities(
         self,
         prompt: str,
@@ -311,6 +353,7 @@ class OllamaModel(ModelInterface):
             data = {
                 "model": self.model_name,
                 "prompt": prompt,
+                "stream": False,
                 "options": {
                     "temperature": temperature,
                     "top_k": top_k
@@ -326,7 +369,7 @@ class OllamaModel(ModelInterface):
             data["options"]["logprobs"] = True
 
             # Make request
-            response = requests.post(f"{self.base_url}/api/generate", json=data)
+            response = self.session.post(f"{self.base_url}/api/generate", json=data, timeout=self.timeout)
             response.raise_for_status()
 
             # Extract token probabilities
@@ -341,7 +384,7 @@ class OllamaModel(ModelInterface):
                 # Convert logprobs to probs
                 for token, logprob in logprobs.items():
                     tokens.append(token)
-                    probs.append(np.exp(logprob))
+                    probs.append(math.exp(logprob))
 
                 # Normalize probabilities
                 total_prob = sum(probs)
@@ -357,20 +400,17 @@ class OllamaModel(ModelInterface):
             else:
                 # If logprobs are not available, generate multiple completions
                 # and use the first token of each as a proxy for token probabilities
-                tokens = []
-
-                # Generate multiple completions
-                for _ in range(min(5, top_k)):
-                    try:
-                        data["options"]["temperature"] = temperature + random.uniform(-0.1, 0.1)
-                        response = requests.post(f"{self.base_url}/api/generate", json=data)
-                        response.raise_for_status()
-                        result = response.json()
-
-                        if "response" in result and result["response"]:
-                            tokens.append(result["response"][0])
-                    except Exception:
-                        pass
+                num_samples = min(5, top_k)
+                samples = []
+                for _ in range(num_samples):
+                    sample = dict(data, options=dict(data["options"]))
+                    sample["options"]["temperature"] = temperature + random.uniform(-0.1, 0.1)
+                    samples.append(sample)
+
+                # Generate the completions concurrently over the pooled session
+                with ThreadPoolExecutor(max_workers=num_samples) as executor:
+                    first_tokens = list(executor.map(self._sample_first_token, samples))
+                tokens = [token for token in first_tokens if token]
 
                 # Count token frequencies
                 token_counts = {}
@@ -393,6 +433,26 @@ class OllamaModel(ModelInterface):
             logger.warning(f"Error getting token probabilities: {e}")
             return [(" ", 1.0)]  # Return a default token with probability 1.0
 
+    def _sample_first_token(self, data: Dict[str, Any]) -> Optional[str]:
+        """Generate a completion and get its first character.
+
+        Args:
+            data: The generate request
+
+        Returns:
+            The first character, or None if the request failed
+        """
+        try:
+            response = self.session.post(f"{self.base_url}/api/generate", json=data, timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()
+
+            if "response" in result and result["response"]:
+                return result["response"][0]
+        except Exception:
+            pass
+        return None
+
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the model.
 
@@ -401,7 +461,7 @@ class OllamaModel(ModelInterface):
         """
         try:
             # Get model information
-            response = requests.get(f"{self.base_url}/api/show?name={self.model_name}")
+            response = self.session.get(f"{self.base_url}/api/show?name={self.model_name}", timeout=self.timeout)
             response.raise_for_status()
 
             # Extract model information
@@ -432,3 +492,192 @@ class OllamaModel(ModelInterface):
                 "max_tokens": 4096,  # Default context size
                 "embedding_dimensions": 4096  # Default embedding size
             }
+
+    def _generate_request(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        top_p: float,
+        stop: Optional[List[str]],
+        stream: bool,
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the body of a generate request.
+
+        Args:
+            prompt: The prompt to generate from
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature
+            top_p: Nucleus sampling parameter
+            stop: List of strings that stop generation when encountered
+            stream: Whether to stream the response
+            options: Additional model-specific parameters
+
+        Returns:
+            The request body
+        """
+        data = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+                "top_p": top_p,
+                "stop": stop or []
+            }
+        }
+
+        # Add additional options
+        for key, value in options.items():
+            if key not in data["options"]:
+                data["options"][key] = value
+
+        return data
+
+    async def _ensure_async_session(self) -> aiohttp.ClientSession:
+        """Ensure that an aiohttp session exists for the running event loop.
+
+        The session is closed when the loop shuts down its async generators
+        (see _close_with_loop), and a session left from another event loop is
+        closed before it is replaced.
+
+        Returns:
+            The session
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            await self.aclose()
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self._async_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._async_loop = loop
+            self._async_guard = _close_with_loop(self._async_session)
+            await self._async_guard.__anext__()
+
+            # Requests wait here rather than in the connector, so the wait
+            # does not count towards their timeout
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._async_session
+
+    async def _apost(self, path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request with the aiohttp session.
+
+        Args:
+            path: The API path
+            data: The request body
+
+        Returns:
+            The decoded response
+        """
+        session = await self._ensure_async_session()
+        async with self._async_semaphore:
+            async with session.post(f"{self.base_url}{path}", json=data) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        top_p: float = 1.0,
+        stop: Optional[List[str]] = None,
+        **kwargs
+    ) -> str:
+        """Generate text based on a prompt, asynchronously.
+
+        Args:
+            prompt: The prompt to generate from
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (higher = more random)
+            top_p: Nucleus sampling parameter (1.0 = no nucleus sampling)
+            stop: List of strings that stop generation when encountered
+            **kwargs: Additional model-specific parameters
+
+        Returns:
+            The generated text
+        """
+        try:
+            data = self._generate_request(prompt, max_tokens, temperature, top_p, stop, False, kwargs)
+            result = await self._apost("/api/generate", data)
+            generated_text = result.get("response", "")
+
+            logger.info(f"Generated {len(generated_text)} characters with {self.model_name}")
+            return generated_text
+        except Exception as e:
+            error = wrap_error(
+                e,
+                message="Failed to generate text with Ollama Model",
+                category=ErrorCategory.NETWORK,
+                details={"model_name": self.model_name}
+            )
+            log_error(error, logger=logger)
+            return f"Error generating text: {str(error)}"
+
+    async def aget_embedding(self, text: str) -> List[float]:
+        """Get the embedding for a text, asynchronously.
+
+        Args:
+            text: The text to get an embedding for
+
+        Returns:
+            The embedding as a list of floats
+        """
+        try:
+            result = await self._apost("/api/embeddings", {"model": self.model_name, "prompt": text})
+            return result.get("embedding", [])
+        except Exception as e:
+            error = wrap_error(
+                e,
+                message="Failed to get embedding with Ollama Model",
+                category=ErrorCategory.NETWORK,
+                details={"model_name": self.model_name}
+            )
+            log_error(error, logger=logger)
+
+            # Return a zero vector as fallback (assuming 4096 dimensions)
+            return [0.0] * 4096
+
+    async def aget_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get the embeddings for several texts, with concurrent requests.
+
+        At most max_concurrency requests are in flight at a time.
+
+        Args:
+            texts: The texts to get embeddings for
+
+        Returns:
+            The embeddings, in the order of the texts
+        """
+        embeddings = await asyncio.gather(*(self.aget_embedding(text) for text in texts))
+
+        logger.info(f"Generated {len(embeddings)} embeddings with {self.model_name}")
+        return list(embeddings)
+
+    def close(self) -> None:
+        """Close the pooled connections of the synchronous session."""
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """Close the aiohttp session.
+
+        A session created on another event loop is closed on that loop if it
+        is still running. A session whose loop has shut down was already
+        closed by that loop.
+        """
+        session, session_loop, guard = self._async_session, self._async_loop, self._async_guard
+        if session is not None and not session.closed:
+            if session_loop is asyncio.get_running_loop():
+                await guard.aclose()
+            elif session_loop is not None and session_loop.is_running():
+                asyncio.run_coroutine_threadsafe(guard.aclose(), session_loop)
+            else:
+                logger.warning(f"aiohttp session of {self.model_name} was not closed before its event loop ended")
+        self._async_session = None
+        self._async_loop = None
+        self._async_guard = None
+        self._async_semaphore = None
@@ -33,6 +33,8 @@ class OpenAIModel(ModelInterface):
         encoding: The tokenizer encoding
     """
     
+    local_token_count = True
+    
     def __init__(
         self,
         model_name: str = "gpt-4o",
@@ -247,6 +249,44 @@ class OpenAIModel(ModelInterface):
             # Return a zero vector as fallback
             return [0.0] * 1536  # Default embedding size for OpenAI
     
+    def get_embeddings(self, texts: List[str], batch_size: int = 256) -> List[List[float]]:
+        """Get the embeddings for several texts, with one request per batch.
+        
+        Args:
+            texts: The texts to get embeddings for
+            batch_size: Maximum number of texts per request
+        
+        Returns:
+            The embeddings, in the order of the texts
+        """
+        embeddings = []
+        
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            try:
+                response = self.client.embeddings.create(
+                    model="text-embedding-3-large",
+                    input=batch
+                )
+                
+                # The response lists the embeddings with their input index
+                data = sorted(response.data, key=lambda item: item.index)
+                embeddings.extend(item.embedding for item in data)
+            except Exception as e:
+                error = wrap_error(
+                    e,
+                    message="Failed to get embeddings with OpenAI Model",
+                    category=ErrorCategory.NETWORK,
+                    details={"model_name": self.model_name, "batch_size": len(batch)}
+                )
+                log_error(error, logger=logger)
+                
+                # Return zero vectors for the failed batch
+                embeddings.extend([0.0] * 1536 for _ in batch)
+        
+        logger.info(f"Generated {len(embeddings)} embeddings in batches of up to {batch_size}")
+        return embeddings
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the model.
         
@@ -7,13 +7,15 @@ Version: 0.1.0
 Created: 2025-04-29
 """
 
+import asyncio
 import logging
 import os
 import json
 import time
-from typing import Dict, List, Any, Optional, Union
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
+from typing import Dict, List, Any, Optional, Union, AsyncIterator, Iterator, Tuple
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -22,6 +24,7 @@ from augment_adam.ai_agent import create_agent
 from augment_adam.utils.hardware_optimizer import (
     get_hardware_info, get_optimal_model_settings
 )
+from augment_adam.server.scheduler import ModelScheduler, QueueFullError
 
 # Configure logging
 logging.basicConfig(
@@ -50,6 +53,22 @@ app.add_middleware(
 model_registry = {}
 agent_registry = {}
 
+# Schedulers by model ID, created on first use
+scheduler_registry = {}
+
+# Scheduler settings
+SCHEDULER_SETTINGS = {
+    "max_workers": int(os.environ.get("AUGMENT_SERVER_WORKERS", "4")),
+    "max_batch_size": int(os.environ.get("AUGMENT_SERVER_MAX_BATCH_SIZE", "8")),
+    "batch_window": float(os.environ.get("AUGMENT_SERVER_BATCH_WINDOW", "0.005")),
+    "max_pending": int(os.environ.get("AUGMENT_SERVER_MAX_PENDING", "64")),
+    "max_streams": int(os.environ.get("AUGMENT_SERVER_MAX_STREAMS", "16")),
+    "timeout": float(os.environ.get("AUGMENT_SERVER_TIMEOUT", "120"))
+}
+
+# Maximum number of streamed chunks produced ahead of a slow client
+STREAM_BUFFER_SIZE = int(os.environ.get("AUGMENT_SERVER_STREAM_BUFFER", "16"))
+
 
 # Pydantic models for API
 class GenerateRequest(BaseModel):
@@ -60,10 +79,17 @@ class GenerateRequest(BaseModel):
     use_monte_carlo: Optional[bool] = None
 
 
+class Usage(BaseModel):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
 class GenerateResponse(BaseModel):
     text: str
     tokens: int
     time: float
+    usage: Optional[Usage] = None
 
 
 class ChatMessage(BaseModel):
@@ -83,6 +109,7 @@ class ChatResponse(BaseModel):
     message: ChatMessage
     tokens: int
     time: float
+    usage: Optional[Usage] = None
 
 
 class ModelInfo(BaseModel):
@@ -164,6 +191,190 @@ def get_agent(agent_id: str):
     return agent_registry[agent_id]
 
 
+def get_scheduler(model_id: str) -> ModelScheduler:
+    """Get the scheduler for a model, creating it if needed.
+    
+    Args:
+        model_id: ID of the model
+        
+    Returns:
+        The scheduler
+        
+    Raises:
+        HTTPException: If model not found
+    """
+    if model_id not in scheduler_registry:
+        scheduler_registry[model_id] = ModelScheduler(get_model(model_id), **SCHEDULER_SETTINGS)
+    
+    return scheduler_registry[model_id]
+
+
+def scheduling_error(error: Exception) -> HTTPException:
+    """Convert a scheduling error into an HTTP error.
+    
+    Args:
+        error: QueueFullError or asyncio.TimeoutError
+        
+    Returns:
+        429 with Retry-After if the scheduler is full, otherwise 504
+    """
+    if isinstance(error, QueueFullError):
+        return HTTPException(status_code=429, detail=f"Server busy: {error}", headers={"Retry-After": "1"})
+    
+    return HTTPException(status_code=504, detail="Request timed out")
+
+
+def generation_params(request: GenerateRequest) -> Dict[str, Any]:
+    """Get the model parameters of a generation request.
+    
+    Args:
+        request: Generation request
+        
+    Returns:
+        Keyword arguments for generate and generate_stream
+    """
+    params = {
+        "prompt": request.prompt,
+        "max_tokens": request.max_tokens,
+        "temperature": request.temperature,
+        "stop": request.stop
+    }
+    
+    # Add Monte Carlo parameter if provided
+    if request.use_monte_carlo is not None:
+        params["use_monte_carlo"] = request.use_monte_carlo
+    
+    return params
+
+
+def count_usage(model: Any, prompt: str, completion: str) -> Dict[str, int]:
+    """Count the tokens of a prompt and its completion with the model's tokenizer.
+    
+    Args:
+        model: The model
+        prompt: The prompt
+        completion: The generated text
+        
+    Returns:
+        Prompt, completion and total token counts (word counts if the
+        model cannot count)
+    """
+    try:
+        prompt_tokens = model.get_token_count(prompt)
+        completion_tokens = model.get_token_count(completion)
+    except Exception as e:
+        logger.warning(f"Failed to count tokens, counting words instead: {e}")
+        prompt_tokens = len(prompt.split())
+        completion_tokens = len(completion.split())
+    
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+async def get_usage(model: Any, prompt: str, completion: str) -> Dict[str, int]:
+    """Get the token usage of a generation.
+    
+    Models with a local tokenizer (local_token_count) count on the event
+    loop, which takes microseconds; others may count with a request to
+    their provider, so they count in the default thread pool, in one call.
+    
+    Args:
+        model: The model
+        prompt: The prompt
+        completion: The generated text
+        
+    Returns:
+        Prompt, completion and total token counts
+    """
+    if getattr(model, "local_token_count", False):
+        return count_usage(model, prompt, completion)
+    
+    return await asyncio.get_running_loop().run_in_executor(None, count_usage, model, prompt, completion)
+
+
+def single_response(agent: Any, message: str) -> Iterator[str]:
+    """Stream an agent's response as one chunk, for agents that cannot stream.
+    
+    Args:
+        agent: The agent
+        message: The user message
+        
+    Returns:
+        A generator yielding the whole response
+    """
+    yield agent.process(message)["response"]
+
+
+async def stream_events(
+    model: Any,
+    chunks: AsyncIterator[str],
+    prompt: str
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Turn streamed chunks into events, ending with the token usage.
+    
+    Each chunk gives a "chunk" event. The last event is "done", with the
+    usage counted by the model's tokenizer over the whole text, or "error".
+    If the consumer stops early, the upstream stream is closed, which
+    stops the model.
+    
+    Args:
+        model: The model whose tokenizer counts the usage
+        chunks: The streamed chunks
+        prompt: The prompt, for the usage
+        
+    Returns:
+        Async generator of (event, data) pairs
+    """
+    start_time = time.time()
+    first_token_time = None
+    completion = []
+    
+    try:
+        async for chunk in chunks:
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            completion.append(chunk)
+            yield "chunk", {"text": chunk}
+    except asyncio.TimeoutError:
+        yield "error", {"detail": "Request timed out"}
+        return
+    except Exception as e:
+        logger.error(f"Error streaming text: {e}")
+        yield "error", {"detail": str(e)}
+        return
+    finally:
+        await chunks.aclose()
+    
+    yield "done", {
+        "usage": await get_usage(model, prompt, "".join(completion)),
+        "time": time.time() - start_time,
+        "time_to_first_token": first_token_time
+    }
+
+
+def event_stream_response(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> StreamingResponse:
+    """Send events as server-sent events.
+    
+    Args:
+        events: Async generator of (event, data) pairs
+        
+    Returns:
+        The streaming response
+    """
+    async def encode():
+        async for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    return StreamingResponse(
+        encode(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # API routes
 @app.get("/")
 async def root():
@@ -300,41 +511,92 @@ async def generate_text(model_id: str, request: GenerateRequest):
     Returns:
         Generated text
     """
-    model = get_model(model_id)
+    scheduler = get_scheduler(model_id)
     
     try:
         # Generate text
         start_time = time.time()
         
-        # Prepare generation parameters
-        params = {
-            "prompt": request.prompt,
-            "max_tokens": request.max_tokens,
-            "temperature": request.temperature,
-            "stop": request.stop
-        }
-        
-        # Add Monte Carlo parameter if provided
-        if request.use_monte_carlo is not None:
-            params["use_monte_carlo"] = request.use_monte_carlo
-        
-        # Generate text
-        text = model.generate(**params)
+        # Generate text, batched with concurrent requests if the model supports it
+        text = await scheduler.generate(**generation_params(request))
         
         # Calculate time and tokens
         generation_time = time.time() - start_time
-        token_count = len(text.split())
+        usage = await get_usage(scheduler.model, request.prompt, text)
         
         return {
             "text": text,
-            "tokens": token_count,
-            "time": generation_time
+            "tokens": usage["completion_tokens"],
+            "time": generation_time,
+            "usage": usage
         }
+    except (QueueFullError, asyncio.TimeoutError) as e:
+        raise scheduling_error(e)
     except Exception as e:
         logger.error(f"Error generating text: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/models/{model_id}/generate/stream")
+async def generate_text_stream(model_id: str, request: GenerateRequest):
+    """Generate text with a model, streamed as server-sent events.
+    
+    Each chunk is sent as a "chunk" event with its text, and the last
+    event is "done", with the token usage and timings, or "error".
+    
+    Args:
+        model_id: ID of the model
+        request: Generation request
+        
+    Returns:
+        Event stream of the generated text
+    """
+    scheduler = get_scheduler(model_id)
+    
+    try:
+        chunks = scheduler.stream(scheduler.model.generate_stream, buffer_size=STREAM_BUFFER_SIZE, **generation_params(request))
+    except QueueFullError as e:
+        raise scheduling_error(e)
+    
+    return event_stream_response(stream_events(scheduler.model, chunks, request.prompt))
+
+
+@app.websocket("/models/{model_id}/generate/ws")
+async def generate_text_websocket(websocket: WebSocket, model_id: str):
+    """Generate text with a model over a WebSocket.
+    
+    Each message received is a generation request; the reply is one
+    message per event, as {"event": ..., **data}. Closing the socket stops
+    the current generation.
+    
+    Args:
+        websocket: The WebSocket
+        model_id: ID of the model
+    """
+    await websocket.accept()
+    
+    try:
+        while True:
+            request = GenerateRequest(**await websocket.receive_json())
+            
+            try:
+                scheduler = get_scheduler(model_id)
+                chunks = scheduler.stream(scheduler.model.generate_stream, buffer_size=STREAM_BUFFER_SIZE, **generation_params(request))
+            except (HTTPException, QueueFullError) as e:
+                error = e if isinstance(e, HTTPException) else scheduling_error(e)
+                await websocket.send_json({"event": "error", "status": error.status_code, "detail": error.detail})
+                continue
+            
+            events = stream_events(scheduler.model, chunks, request.prompt)
+            try:
+                async for event, data in events:
+                    await websocket.send_json({"event": event, **data})
+            finally:
+                await events.aclose()
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket for model {model_id} disconnected")
+
+
 @app.get("/agents", response_model=List[AgentInfo])
 async def list_agents():
     """List all agents."""
@@ -439,6 +701,7 @@ async def chat_with_agent(agent_id: str, request: ChatRequest):
         Agent response
     """
     agent = get_agent(agent_id)
+    scheduler = get_scheduler(agent.model_id)
     
     try:
         # Process chat
@@ -447,26 +710,61 @@ async def chat_with_agent(agent_id: str, request: ChatRequest):
         # Extract user message
         user_message = request.messages[-1].content
         
-        # Process message
-        response = agent.process(user_message)
+        # Process message in the thread pool of the agent's model
+        response = await scheduler.run(agent.process, user_message)
         
         # Calculate time and tokens
         chat_time = time.time() - start_time
-        token_count = len(response["response"].split())
+        usage = await get_usage(scheduler.model, user_message, response["response"])
         
         return {
             "message": {
                 "role": "assistant",
                 "content": response["response"]
             },
-            "tokens": token_count,
-            "time": chat_time
+            "tokens": usage["completion_tokens"],
+            "time": chat_time,
+            "usage": usage
         }
+    except (QueueFullError, asyncio.TimeoutError) as e:
+        raise scheduling_error(e)
     except Exception as e:
         logger.error(f"Error chatting with agent: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/agents/{agent_id}/chat/stream")
+async def chat_with_agent_stream(agent_id: str, request: ChatRequest):
+    """Chat with an agent, streamed as server-sent events.
+    
+    Agents with a process_stream method stream their response as it is
+    generated; other agents send it as one chunk when it is complete.
+    The events are the same as for generate/stream.
+    
+    Args:
+        agent_id: ID of the agent
+        request: Chat request
+        
+    Returns:
+        Event stream of the agent response
+    """
+    agent = get_agent(agent_id)
+    scheduler = get_scheduler(agent.model_id)
+    
+    # Extract user message
+    user_message = request.messages[-1].content
+    
+    try:
+        if hasattr(agent, "process_stream"):
+            chunks = scheduler.stream(agent.process_stream, user_message, buffer_size=STREAM_BUFFER_SIZE)
+        else:
+            chunks = scheduler.stream(single_response, agent, user_message, buffer_size=STREAM_BUFFER_SIZE)
+    except QueueFullError as e:
+        raise scheduling_error(e)
+    
+    return event_stream_response(stream_events(scheduler.model, chunks, user_message))
+
+
 # Create default models and agents on startup
 @app.on_event("startup")
 async def startup_event():
@@ -511,6 +809,15 @@ async def startup_event():
         logger.error(f"Error creating default models and agents: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shut down the schedulers' thread pools."""
+    for scheduler in scheduler_registry.values():
+        scheduler.shutdown()
+    
+    scheduler_registry.clear()
+
+
 def start_server(host: str = "0.0.0.0", port: int = 8000):
     """Start the FastAPI server.
     
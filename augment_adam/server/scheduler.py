@@ -0,0 +1,465 @@
+"""Request scheduling for the Augment Adam server.
+
+This module runs blocking model and agent calls in a bounded thread pool,
+so they do not stall the event loop, coalesces concurrent generate
+requests into micro-batches for models that can generate in batches, and
+bridges blocking streaming generators into async iterators.
+
+Version: 0.1.0
+Created: 2025-04-29
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Set, Any, Optional, Tuple, Callable, AsyncIterator, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stream in its queue
+_END = object()
+
+
+async def _get(queue: asyncio.Queue, timeout: Optional[float]) -> Any:
+    """Get an item from a queue with a timeout.
+    
+    Unlike asyncio.wait_for, this never swallows a cancellation that races
+    with an item arriving from another thread.
+    
+    Args:
+        queue: The queue
+        timeout: Timeout in seconds (None for no timeout)
+    
+    Returns:
+        The item
+    
+    Raises:
+        asyncio.TimeoutError: If no item arrives within the timeout
+    """
+    getter = asyncio.ensure_future(queue.get())
+    try:
+        done, _ = await asyncio.wait({getter}, timeout=timeout)
+    finally:
+        if not getter.done():
+            getter.cancel()
+    
+    if not done:
+        raise asyncio.TimeoutError()
+    return getter.result()
+
+
+class QueueFullError(Exception):
+    """Raised when a scheduler already holds its maximum number of requests."""
+
+
+class _StreamSlot:
+    """A stream's slot in its scheduler, freed at most once.
+    
+    Attributes:
+        scheduler: The scheduler holding the slot
+        started: Whether the stream has started running
+        released: Whether the slot has been freed
+    """
+    
+    def __init__(self, scheduler: "ModelScheduler"):
+        """Initialize the slot.
+        
+        Args:
+            scheduler: The scheduler holding the slot
+        """
+        self.scheduler = scheduler
+        self.started = False
+        self.released = False
+    
+    def release(self) -> None:
+        """Free the slot, unless it has already been freed."""
+        if not self.released:
+            self.released = True
+            self.scheduler.streams -= 1
+
+
+class _Stream:
+    """Async iterator over a stream that holds its slot from creation.
+    
+    Once the stream has started, it frees its own slot when its generator
+    stops; a stream closed or garbage-collected before it was ever iterated
+    frees its slot here.
+    """
+    
+    def __init__(self, slot: _StreamSlot, generator: AsyncIterator):
+        """Initialize the iterator.
+        
+        Args:
+            slot: The stream's slot
+            generator: The stream's async generator
+        """
+        self._slot = slot
+        self._generator = generator
+    
+    def __aiter__(self) -> "_Stream":
+        return self
+    
+    def __anext__(self) -> Any:
+        return self._generator.__anext__()
+    
+    async def aclose(self) -> None:
+        """Close the stream and free its slot."""
+        try:
+            await self._generator.aclose()
+        finally:
+            if not self._slot.started:
+                self._slot.release()
+    
+    def __del__(self) -> None:
+        if not self._slot.started:
+            self._slot.release()
+
+
+class ModelScheduler:
+    """Scheduler for the blocking calls to one model.
+    
+    Every call runs in the scheduler's thread pool. Generate requests with
+    the same parameters that arrive within batch_window seconds of each
+    other are passed to the model's generate_batch method together, up to
+    max_batch_size at a time; models without generate_batch get one
+    generate call per request.
+    
+    At most max_pending requests are admitted at a time (queued or
+    running); further requests raise QueueFullError. A request that takes
+    longer than its timeout raises asyncio.TimeoutError. A call already
+    running in the pool cannot be interrupted, so a timed-out request keeps
+    its slot until that call finishes; timed-out requests still waiting for
+    the pool or for a batch are dropped, and free their slot when dropped.
+    
+    Streams hold a thread for as long as they are open, so they run in a
+    separate pool of max_streams threads with their own limit, and never
+    hold up generate calls or each other.
+    
+    Attributes:
+        model: The model
+        max_workers: Number of threads running blocking calls
+        max_batch_size: Maximum number of prompts per batch
+        batch_window: Seconds to wait for more requests before running a batch
+        max_pending: Maximum number of admitted requests
+        max_streams: Maximum number of open streams
+        timeout: Default per-request timeout in seconds (None for no timeout)
+        pending: Number of admitted requests
+        streams: Number of open streams
+    """
+    
+    def __init__(
+        self,
+        model: Any,
+        max_workers: int = 4,
+        max_batch_size: int = 8,
+        batch_window: float = 0.005,
+        max_pending: int = 64,
+        max_streams: int = 16,
+        timeout: Optional[float] = 120.0
+    ):
+        """Initialize the scheduler.
+        
+        Args:
+            model: The model
+            max_workers: Number of threads running blocking calls
+            max_batch_size: Maximum number of prompts per batch
+            batch_window: Seconds to wait for more requests before running a batch
+            max_pending: Maximum number of admitted requests
+            max_streams: Maximum number of open streams
+            timeout: Default per-request timeout in seconds (None for no timeout)
+        """
+        self.model = model
+        self.max_workers = max_workers
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        self.max_streams = max_streams
+        self.timeout = timeout
+        self.pending = 0
+        self.streams = 0
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-scheduler")
+        self._stream_executor = ThreadPoolExecutor(max_workers=max_streams, thread_name_prefix="model-stream")
+        
+        # Open batches by parameter key: (parameters, [(prompt, future)], timer)
+        self._batches: Dict[str, Tuple[Dict[str, Any], List[Tuple[str, asyncio.Future]], asyncio.TimerHandle]] = {}
+        
+        # Running batch tasks, referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+    
+    @property
+    def can_batch(self) -> bool:
+        """Whether the model can generate for several prompts in one call."""
+        return self.max_batch_size > 1 and callable(getattr(self.model, "generate_batch", None))
+    
+    def _admit(self) -> None:
+        """Admit a request.
+        
+        Raises:
+            QueueFullError: If max_pending requests are already admitted
+        """
+        if self.pending >= self.max_pending:
+            raise QueueFullError(f"{self.pending} requests already pending")
+        self.pending += 1
+    
+    def _release(self, count: int = 1) -> None:
+        """Free the slots of requests whose work has finished or been dropped.
+        
+        Args:
+            count: Number of requests
+        """
+        self.pending -= count
+    
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a blocking call in the thread pool.
+        
+        Args:
+            fn: The function to call
+            *args: Positional arguments for the function
+            timeout: Timeout in seconds (if None, use the scheduler's)
+            **kwargs: Keyword arguments for the function
+        
+        Returns:
+            The result of the call
+        
+        Raises:
+            QueueFullError: If the scheduler is full
+            asyncio.TimeoutError: If the call takes longer than the timeout
+        """
+        loop = asyncio.get_running_loop()
+        self._admit()
+        try:
+            call = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        
+        # The slot is freed when the call finishes, or when it is cancelled
+        # before it starts; registered first, so it is freed before the
+        # result is delivered
+        call.add_done_callback(lambda _: loop.is_closed() or loop.call_soon_threadsafe(self._release))
+        return await asyncio.wait_for(
+            asyncio.wrap_future(call),
+            timeout if timeout is not None else self.timeout
+        )
+    
+    async def generate(self, prompt: str, timeout: Optional[float] = None, **params) -> str:
+        """Generate text for a prompt, batched with concurrent requests if possible.
+        
+        Args:
+            prompt: The prompt
+            timeout: Timeout in seconds (if None, use the scheduler's)
+            **params: Generation parameters for the model
+        
+        Returns:
+            The generated text
+        
+        Raises:
+            QueueFullError: If the scheduler is full
+            asyncio.TimeoutError: If the request takes longer than the timeout
+        """
+        if not self.can_batch:
+            return await self.run(self.model.generate, prompt=prompt, timeout=timeout, **params)
+        
+        self._admit()
+        return await asyncio.wait_for(
+            self._enqueue(prompt, params),
+            timeout if timeout is not None else self.timeout
+        )
+    
+    def _enqueue(self, prompt: str, params: Dict[str, Any]) -> asyncio.Future:
+        """Add an admitted prompt to the open batch for its parameters.
+        
+        The prompt's slot is freed by the batch that takes it.
+        
+        Args:
+            prompt: The prompt
+            params: Generation parameters for the model
+        
+        Returns:
+            Future for the generated text
+        """
+        loop = asyncio.get_running_loop()
+        key = json.dumps(params, sort_keys=True, default=str)
+        future = loop.create_future()
+        
+        if key not in self._batches:
+            timer = loop.call_later(self.batch_window, self._dispatch, key)
+            self._batches[key] = (params, [], timer)
+        
+        items = self._batches[key][1]
+        items.append((prompt, future))
+        if len(items) >= self.max_batch_size:
+            self._dispatch(key)
+        
+        return future
+    
+    def _dispatch(self, key: str) -> None:
+        """Close the open batch for a parameter key and start running it.
+        
+        Args:
+            key: The parameter key
+        """
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        
+        params, items, timer = batch
+        timer.cancel()
+        
+        # Requests that timed out while waiting are dropped
+        waiting = [(prompt, future) for prompt, future in items if not future.done()]
+        self._release(len(items) - len(waiting))
+        if waiting:
+            task = asyncio.ensure_future(self._run_batch(params, waiting))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, params: Dict[str, Any], items: List[Tuple[str, asyncio.Future]]) -> None:
+        """Run a batch in the thread pool, resolve its futures and free their slots.
+        
+        Args:
+            params: Generation parameters for the model
+            items: The prompts and the futures waiting for their results
+        """
+        loop = asyncio.get_running_loop()
+        prompts = [prompt for prompt, _ in items]
+        started = time.perf_counter()
+        
+        try:
+            texts = await loop.run_in_executor(
+                self._executor,
+                partial(self.model.generate_batch, prompts, **params)
+            )
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._release(len(items))
+        
+        if len(texts) != len(items):
+            error = RuntimeError(f"generate_batch returned {len(texts)} results for {len(items)} prompts")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        
+        logger.debug(f"Generated a batch of {len(prompts)} in {time.perf_counter() - started:.3f}s")
+        for (_, future), text in zip(items, texts):
+            if not future.done():
+                future.set_result(text)
+    
+    def stream(
+        self,
+        fn: Callable[..., Iterator],
+        *args,
+        buffer_size: int = 16,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator:
+        """Iterate a blocking generator in the stream thread pool.
+        
+        If max_streams streams are open, this raises before anything is
+        streamed, so that callers can still reject the request. The stream
+        takes its slot here and frees it once the generator has stopped, or
+        when it is closed or dropped without ever being iterated. The generator runs at most buffer_size items
+        ahead of the consumer. When the consumer stops early (for example
+        because the client disconnected), the generator is closed after its
+        current item.
+        
+        Args:
+            fn: Function returning the generator, such as a model's generate_stream
+            *args: Positional arguments for the function
+            buffer_size: Maximum number of items produced but not yet consumed
+            timeout: Maximum seconds to wait for each item (if None, use the scheduler's)
+            **kwargs: Keyword arguments for the function
+        
+        Returns:
+            Async iterator over the generator's items
+        
+        Raises:
+            QueueFullError: If max_streams streams are open
+        """
+        if self.streams >= self.max_streams:
+            raise QueueFullError(f"{self.streams} streams already open")
+        self.streams += 1
+        slot = _StreamSlot(self)
+        return _Stream(slot, self._stream(slot, fn, args, kwargs, buffer_size, timeout if timeout is not None else self.timeout))
+    
+    async def _stream(
+        self,
+        slot: _StreamSlot,
+        fn: Callable[..., Iterator],
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        buffer_size: int,
+        timeout: Optional[float]
+    ) -> AsyncIterator:
+        """Run a stream; see stream.
+        
+        Raises:
+            asyncio.TimeoutError: If an item takes longer than the timeout
+        """
+        slot.started = True
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(buffer_size)
+        cancelled = threading.Event()
+        errors: List[Exception] = []
+        
+        def produce() -> None:
+            iterator = None
+            try:
+                iterator = fn(*args, **kwargs)
+                for item in iterator:
+                    # Wait for room in the buffer, giving up if the consumer left
+                    while not slots.acquire(timeout=0.05):
+                        if cancelled.is_set():
+                            return
+                    if cancelled.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                close = getattr(iterator, "close", None)
+                if close:
+                    close()
+            if not cancelled.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, _END)
+        
+        try:
+            producer = self._stream_executor.submit(produce)
+        except BaseException:
+            slot.release()
+            raise
+        
+        finished = False
+        try:
+            while True:
+                item = await _get(queue, timeout)
+                if item is _END:
+                    finished = True
+                    if errors:
+                        raise errors[0]
+                    return
+                slots.release()
+                yield item
+        finally:
+            cancelled.set()
+            # A generator stopped early frees the slot once its thread is free
+            if finished or producer.done():
+                slot.release()
+            else:
+                producer.add_done_callback(lambda _: loop.is_closed() or loop.call_soon_threadsafe(slot.release))
+    
+    def shutdown(self) -> None:
+        """Shut down the thread pools without waiting for running calls."""
+        self._executor.shutdown(wait=False)
+        self._stream_executor.shutdown(wait=False)
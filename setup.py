@@ -32,6 +32,7 @@ setup(
             "pytest>=7.0.0",
             "pytest-asyncio>=0.20.0",
             "pytest-cov>=4.0.0",
+            "fakeredis>=2.0.0",
             "black>=23.0.0",
             "isort>=5.0.0",
             "flake8>=6.0.0",
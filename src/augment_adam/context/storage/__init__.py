@@ -11,10 +11,20 @@ from augment_adam.context.storage.base import (
     ChromaStorage,
     HybridStorage,
 )
+from augment_adam.context.storage.cache import (
+    ContextCache,
+    LRUCache,
+    ARCCache,
+    create_cache,
+)
 
 __all__ = [
     "ContextStorage",
     "RedisStorage",
     "ChromaStorage",
     "HybridStorage",
+    "ContextCache",
+    "LRUCache",
+    "ARCCache",
+    "create_cache",
 ]
@@ -6,12 +6,12 @@ the ContextStorage base class and various storage implementations.
 """
 
 import json
-import time
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.context.core.base import Context, ContextType
+from augment_adam.context.storage.cache import ContextCache, create_cache
 
 
 @tag("context.storage")
@@ -107,6 +107,34 @@ class ContextStorage(ABC):
         """
         pass
     
+    def add_contexts(self, contexts: List[Context]) -> bool:
+        """
+        Store several contexts.
+        
+        Backends override this to store the contexts in a single batch.
+        
+        Args:
+            contexts: The contexts to store.
+        
+        Returns:
+            True if all contexts were stored successfully, False otherwise.
+        """
+        return all([self.store_context(context) for context in contexts])
+    
+    def get_contexts(self, context_ids: List[str]) -> List[Optional[Context]]:
+        """
+        Retrieve several contexts by ID.
+        
+        Backends override this to retrieve the contexts in a single batch.
+        
+        Args:
+            context_ids: The IDs of the contexts to retrieve.
+        
+        Returns:
+            List with the context for each ID, or None where it doesn't exist.
+        """
+        return [self.retrieve_context(context_id) for context_id in context_ids]
+    
     def set_metadata(self, key: str, value: Any) -> None:
         """
         Set metadata for the storage backend.
@@ -139,12 +167,20 @@ class RedisStorage(ContextStorage):
     This class implements a context storage backend using Redis for efficient
     key-value storage and retrieval.
     
+    Each context is stored as a JSON string under {prefix}{id}, and its ID is
+    added to the {prefix}type:, {prefix}source: and {prefix}tag: index sets.
+    Writes go through transactional pipelines, so a context and its index
+    entries are written in one round trip; reads hydrate contexts with MGET.
+    Writes use SET ... GET and deletes use GETDEL, which need Redis 6.2 or
+    later.
+    
     Attributes:
         name: The name of the storage backend.
         metadata: Additional metadata for the storage backend.
         redis_client: The Redis client to use for storage.
         prefix: The prefix to use for Redis keys.
         ttl: The time-to-live for stored contexts in seconds (0 means no expiration).
+        scan_count: The number of keys to ask for per SCAN call.
     
     TODO(Issue #7): Add support for Redis Streams for real-time updates
     TODO(Issue #7): Implement storage validation
@@ -156,6 +192,7 @@ class RedisStorage(ContextStorage):
         redis_client: Optional[Any] = None,
         prefix: str = "context:",
         ttl: int = 0,
+        scan_count: int = 1000,
     ) -> None:
         """
         Initialize the Redis storage backend.
@@ -165,12 +202,14 @@ class RedisStorage(ContextStorage):
             redis_client: The Redis client to use for storage.
             prefix: The prefix to use for Redis keys.
             ttl: The time-to-live for stored contexts in seconds (0 means no expiration).
+            scan_count: The number of keys to ask for per SCAN call.
         """
         super().__init__(name)
         
         self.redis_client = redis_client
         self.prefix = prefix
         self.ttl = ttl
+        self.scan_count = scan_count
         
         self.metadata["prefix"] = prefix
         self.metadata["ttl"] = ttl
@@ -185,21 +224,62 @@ class RedisStorage(ContextStorage):
         Returns:
             True if the context was stored successfully, False otherwise.
         """
+        return self.add_contexts([context])
+    
+    def add_contexts(self, contexts: List[Context]) -> bool:
+        """
+        Store several contexts in Redis.
+        
+        The contexts and their index entries are written in one transactional
+        pipeline. If a context replaces one with different index entries, the
+        stale entries are removed in a second round trip.
+        
+        Args:
+            contexts: The contexts to store.
+        
+        Returns:
+            True if the contexts were stored successfully, False otherwise.
+        """
         if self.redis_client is None:
             return False
+        if not contexts:
+            return True
         
         try:
-            # Store the context as a JSON string
-            key = f"{self.prefix}{context.id}"
-            value = context.to_json()
+            index_keys = [self._index_keys(context) for context in contexts]
             
-            if self.ttl > 0:
-                self.redis_client.setex(key, self.ttl, value)
-            else:
-                self.redis_client.set(key, value)
+            # Store each context as a JSON string, getting back the one it replaces
+            pipeline = self.redis_client.pipeline(transaction=True)
+            for context, keys in zip(contexts, index_keys):
+                pipeline.set(
+                    f"{self.prefix}{context.id}",
+                    context.to_json(),
+                    ex=self.ttl if self.ttl > 0 else None,
+                    get=True,
+                )
+                for key in keys:
+                    pipeline.sadd(key, context.id)
+            results = pipeline.execute()
             
-            # Store the context in secondary indices
-            self._index_context(context)
+            # Remove the replaced contexts from indices they no longer belong to
+            stale = []
+            position = 0
+            for context, keys in zip(contexts, index_keys):
+                old_value = results[position]
+                position += 1 + len(keys)
+                
+                if old_value is not None:
+                    try:
+                        old_keys = self._index_keys(Context.from_json(self._decode(old_value)))
+                    except Exception:
+                        continue
+                    stale.extend((key, context.id) for key in old_keys if key not in keys)
+            
+            if stale:
+                pipeline = self.redis_client.pipeline(transaction=True)
+                for key, context_id in stale:
+                    pipeline.srem(key, context_id)
+                pipeline.execute()
             
             return True
         except Exception:
@@ -227,33 +307,44 @@ class RedisStorage(ContextStorage):
                 return None
             
             # Parse the JSON string to a Context object
-            return Context.from_json(value.decode("utf-8"))
+            return Context.from_json(self._decode(value))
         except Exception:
             return None
     
+    def get_contexts(self, context_ids: List[str]) -> List[Optional[Context]]:
+        """
+        Retrieve several contexts from Redis by ID with a single MGET.
+        
+        Args:
+            context_ids: The IDs of the contexts to retrieve.
+        
+        Returns:
+            List with the context for each ID, or None where it doesn't exist.
+        """
+        if self.redis_client is None or not context_ids:
+            return [None] * len(context_ids)
+        
+        try:
+            values = self.redis_client.mget([f"{self.prefix}{context_id}" for context_id in context_ids])
+        except Exception:
+            return [None] * len(context_ids)
+        
+        return [self._parse(value) for value in values]
+    
     def update_context(self, context: Context) -> bool:
         """
         Update a context in Redis.
         
+        The previous version is returned by the write itself, so no separate
+        read is needed to find the index entries to remove.
+        
         Args:
             context: The context to update.
             
         Returns:
             True if the context was updated successfully, False otherwise.
         """
-        if self.redis_client is None:
-            return False
-        
-        try:
-            # Remove old indices
-            old_context = self.retrieve_context(context.id)
-            if old_context is not None:
-                self._remove_indices(old_context)
-            
-            # Store the updated context
-            return self.store_context(context)
-        except Exception:
-            return False
+        return self.add_contexts([context])
     
     def delete_context(self, context_id: str) -> bool:
         """
@@ -269,14 +360,15 @@ class RedisStorage(ContextStorage):
             return False
         
         try:
-            # Retrieve the context to remove indices
-            context = self.retrieve_context(context_id)
-            if context is not None:
-                self._remove_indices(context)
-            
-            # Delete the context
+            # Delete the context, getting it back to remove its indices
             key = f"{self.prefix}{context_id}"
-            self.redis_client.delete(key)
+            context = self._parse(self.redis_client.getdel(key))
+            
+            if context is not None:
+                pipeline = self.redis_client.pipeline(transaction=True)
+                for index_key in self._index_keys(context):
+                    pipeline.srem(index_key, context_id)
+                pipeline.execute()
             
             return True
         except Exception:
@@ -286,20 +378,25 @@ class RedisStorage(ContextStorage):
         """
         Search for contexts in Redis.
         
+        Filters are resolved on the server by intersecting the index sets;
+        without filters, the keyspace is walked with SCAN. Either way, contexts
+        are hydrated with MGET in batches until the limit is reached.
+        
         Args:
             query: The query to search for.
             limit: The maximum number of results to return.
             **kwargs: Additional arguments for the search.
                 context_type: Filter by context type.
                 source: Filter by source.
-                tags: Filter by tags.
+                tags: Filter by tags (contexts must have all of them).
+                any_tags: Filter by tags (contexts must have at least one of them).
                 min_importance: Filter by minimum importance.
                 max_tokens: Filter by maximum tokens.
             
         Returns:
             List of contexts that match the query.
         """
-        if self.redis_client is None:
+        if self.redis_client is None or limit <= 0:
             return []
         
         try:
@@ -307,9 +404,13 @@ class RedisStorage(ContextStorage):
             context_type = kwargs.get("context_type")
             source = kwargs.get("source")
             tags = kwargs.get("tags", [])
+            any_tags = kwargs.get("any_tags", [])
             min_importance = kwargs.get("min_importance", 0.0)
             max_tokens = kwargs.get("max_tokens")
             
+            def accept(context: Context) -> bool:
+                return context.importance >= min_importance and (max_tokens is None or context.tokens <= max_tokens)
+            
             # Build filter sets
             filter_sets = []
             
@@ -326,51 +427,140 @@ class RedisStorage(ContextStorage):
             for tag in tags:
                 filter_sets.append(f"{self.prefix}tag:{tag}")
             
-            # If no filters, use all contexts
-            if not filter_sets:
-                all_keys = self.redis_client.keys(f"{self.prefix}*")
-                context_keys = [key for key in all_keys if b":" not in key[len(self.prefix):]]
+            any_sets = [f"{self.prefix}tag:{tag}" for tag in any_tags]
                 
-                # Retrieve contexts
-                contexts = []
-                for key in context_keys[:limit]:
-                    value = self.redis_client.get(key)
-                    if value is not None:
-                        try:
-                            context = Context.from_json(value.decode("utf-8"))
+            # If no filters, walk all contexts
+            if not filter_sets and not any_sets:
+                return self._scan_contexts(limit, accept)
                             
-                            # Apply additional filters
-                            if context.importance >= min_importance and (max_tokens is None or context.tokens <= max_tokens):
-                                contexts.append(context)
-                        except Exception:
-                            pass
+            # Resolve the filters on the server
+            if filter_sets and any_sets:
+                pipeline = self.redis_client.pipeline(transaction=False)
+                pipeline.sinter(filter_sets)
+                pipeline.sunion(any_sets)
+                all_of, any_of = pipeline.execute()
+                context_ids = set(all_of) & set(any_of)
+            elif filter_sets:
+                context_ids = self.redis_client.sinter(filter_sets)
+            else:
+                context_ids = self.redis_client.sunion(any_sets)
                 
+            if not context_ids:
+                return []
+            
+            return self._hydrate([self._decode(context_id) for context_id in context_ids], limit, accept)
+        except Exception:
+            return []
+    
+    @staticmethod
+    def _decode(value: Union[bytes, str]) -> str:
+        """
+        Decode a value returned by Redis.
+        
+        Args:
+            value: The value, as bytes or as a string if the client decodes responses.
+        
+        Returns:
+            The value as a string.
+        """
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+    
+    def _parse(self, value: Optional[Union[bytes, str]]) -> Optional[Context]:
+        """
+        Parse a stored context.
+        
+        Args:
+            value: The stored JSON string, or None.
+        
+        Returns:
+            The context, or None if the value is missing or invalid.
+        """
+        if value is None:
+            return None
+        
+        try:
+            return Context.from_json(self._decode(value))
+        except Exception:
+            return None
+    
+    def _hydrate(self, context_ids: List[str], limit: int, accept: Callable[[Context], bool]) -> List[Context]:
+        """
+        Retrieve accepted contexts by ID in MGET batches until the limit is reached.
+        
+        Args:
+            context_ids: The IDs of the candidate contexts.
+            limit: The maximum number of contexts to return.
+            accept: Function that returns True if a context should be returned.
+        
+        Returns:
+            List of accepted contexts.
+        """
+        batch_size = max(limit, 64)
+        contexts = []
+        
+        for start in range(0, len(context_ids), batch_size):
+            for context in self.get_contexts(context_ids[start:start + batch_size]):
+                if context is not None and accept(context):
+                    contexts.append(context)
+                    if len(contexts) >= limit:
+                        return contexts
+        
+        return contexts
+    
+    def _scan_contexts(self, limit: int, accept: Callable[[Context], bool]) -> List[Context]:
+        """
+        Walk the stored contexts with SCAN until the limit is reached.
+        
+        Unlike KEYS, SCAN returns the keyspace in small pages, so the server
+        is never blocked for longer than one page.
+        
+        Args:
+            limit: The maximum number of contexts to return.
+            accept: Function that returns True if a context should be returned.
+        
+        Returns:
+            List of accepted contexts.
+        """
+        contexts = []
+        cursor = 0
+        
+        while True:
+            cursor, keys = self.redis_client.scan(cursor, match=f"{self.prefix}*", count=self.scan_count)
+            
+            # Index sets have a ':' after the prefix, context keys don't
+            context_ids = [self._decode(key)[len(self.prefix):] for key in keys]
+            context_ids = [context_id for context_id in context_ids if ":" not in context_id]
+            
+            if context_ids:
+                contexts.extend(self._hydrate(context_ids, limit - len(contexts), accept))
+                if len(contexts) >= limit:
+                    return contexts
+            
+            if int(cursor) == 0:
                 return contexts
             
-            # Intersect filter sets
-            result_set = None
-            for filter_set in filter_sets:
-                members = self.redis_client.smembers(filter_set)
-                if result_set is None:
-                    result_set = set(members)
-                else:
-                    result_set &= set(members)
+    def _index_keys(self, context: Context) -> List[str]:
+        """
+        Get the keys of the index sets a context belongs to.
             
-            if not result_set:
-                return []
+        Args:
+            context: The context.
             
-            # Retrieve contexts
-            contexts = []
-            for context_id in list(result_set)[:limit]:
-                context = self.retrieve_context(context_id.decode("utf-8"))
-                if context is not None:
-                    # Apply additional filters
-                    if context.importance >= min_importance and (max_tokens is None or context.tokens <= max_tokens):
-                        contexts.append(context)
+        Returns:
+            List of index set keys.
+        """
+        # Index by context type
+        keys = [f"{self.prefix}type:{context.context_type.name}"]
             
-            return contexts
-        except Exception:
-            return []
+        # Index by source
+        if context.source:
+            keys.append(f"{self.prefix}source:{context.source}")
+        
+        # Index by tags
+        for tag in dict.fromkeys(context.tags):
+            keys.append(f"{self.prefix}tag:{tag}")
+        
+        return keys
     
     def _index_context(self, context: Context) -> None:
         """
@@ -382,19 +572,10 @@ class RedisStorage(ContextStorage):
         if self.redis_client is None:
             return
         
-        # Index by context type
-        type_key = f"{self.prefix}type:{context.context_type.name}"
-        self.redis_client.sadd(type_key, context.id)
-        
-        # Index by source
-        if context.source:
-            source_key = f"{self.prefix}source:{context.source}"
-            self.redis_client.sadd(source_key, context.id)
-        
-        # Index by tags
-        for tag in context.tags:
-            tag_key = f"{self.prefix}tag:{tag}"
-            self.redis_client.sadd(tag_key, context.id)
+        pipeline = self.redis_client.pipeline(transaction=True)
+        for key in self._index_keys(context):
+            pipeline.sadd(key, context.id)
+        pipeline.execute()
     
     def _remove_indices(self, context: Context) -> None:
         """
@@ -406,19 +587,10 @@ class RedisStorage(ContextStorage):
         if self.redis_client is None:
             return
         
-        # Remove from context type index
-        type_key = f"{self.prefix}type:{context.context_type.name}"
-        self.redis_client.srem(type_key, context.id)
-        
-        # Remove from source index
-        if context.source:
-            source_key = f"{self.prefix}source:{context.source}"
-            self.redis_client.srem(source_key, context.id)
-        
-        # Remove from tag indices
-        for tag in context.tags:
-            tag_key = f"{self.prefix}tag:{tag}"
-            self.redis_client.srem(tag_key, context.id)
+        pipeline = self.redis_client.pipeline(transaction=True)
+        for key in self._index_keys(context):
+            pipeline.srem(key, context.id)
+        pipeline.execute()
 
 
 @tag("context.storage.chroma")
@@ -745,12 +917,18 @@ class HybridStorage(ContextStorage):
     This class implements a context storage backend that combines multiple
     storage backends for more efficient storage and retrieval.
     
+    Retrieved and stored contexts are kept in a bounded cache tier (LRU or
+    ARC) in front of the backends. The cache holds the Context objects
+    themselves, so contexts returned by retrieve_context must not be
+    modified in place; pass modified contexts to update_context instead.
+    
     Attributes:
         name: The name of the storage backend.
         metadata: Additional metadata for the storage backend.
         primary_storage: The primary storage backend for metadata and content.
         vector_storage: The vector storage backend for similarity search.
         cache_ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+        cache: The cache tier.
     
     TODO(Issue #7): Add support for more storage backends
     TODO(Issue #7): Implement storage validation
@@ -762,6 +940,9 @@ class HybridStorage(ContextStorage):
         primary_storage: Optional[ContextStorage] = None,
         vector_storage: Optional[ContextStorage] = None,
         cache_ttl: int = 3600,
+        cache_policy: str = "lru",
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        cache: Optional[ContextCache] = None,
     ) -> None:
         """
         Initialize the hybrid storage backend.
@@ -771,16 +952,23 @@ class HybridStorage(ContextStorage):
             primary_storage: The primary storage backend for metadata and content.
             vector_storage: The vector storage backend for similarity search.
             cache_ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+            cache_policy: The eviction policy of the cache ("lru" or "arc").
+            cache_max_bytes: The maximum estimated size of the cached contexts.
+            cache: A cache to use instead of creating one from the settings above.
+        
+        Raises:
+            ValueError: If the cache policy is not supported.
         """
         super().__init__(name)
         
         self.primary_storage = primary_storage
         self.vector_storage = vector_storage
         self.cache_ttl = cache_ttl
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_timestamps: Dict[str, float] = {}
+        self.cache = cache if cache is not None else create_cache(cache_policy, cache_max_bytes, cache_ttl)
         
         self.metadata["cache_ttl"] = cache_ttl
+        self.metadata["cache_policy"] = type(self.cache).__name__
+        self.metadata["cache_max_bytes"] = self.cache.max_bytes
     
     def store_context(self, context: Context) -> bool:
         """
@@ -892,10 +1080,7 @@ class HybridStorage(ContextStorage):
             success = success or vector_success
         
         # Remove from cache
-        if context_id in self.cache:
-            del self.cache[context_id]
-            if context_id in self.cache_timestamps:
-                del self.cache_timestamps[context_id]
+        self.cache.remove(context_id)
         
         return success
     
@@ -921,6 +1106,16 @@ class HybridStorage(ContextStorage):
         
         return []
     
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the cache tier.
+        
+        Returns:
+            Dictionary with the hit, miss, eviction and expiration counts of
+            the cache, and the number and estimated size of its entries.
+        """
+        return self.cache.stats()
+    
     def _cache_context(self, context: Context) -> None:
         """
         Cache a context.
@@ -928,11 +1123,7 @@ class HybridStorage(ContextStorage):
         Args:
             context: The context to cache.
         """
-        self.cache[context.id] = context.to_dict()
-        self.cache_timestamps[context.id] = time.time()
-        
-        # Clean up expired cache entries
-        self._clean_cache()
+        self.cache.put(context)
     
     def _get_cached_context(self, context_id: str) -> Optional[Context]:
         """
@@ -944,38 +1135,4 @@ class HybridStorage(ContextStorage):
         Returns:
             The context, or None if it doesn't exist in the cache or is expired.
         """
-        # Check if context is in cache
-        if context_id not in self.cache:
-            return None
-        
-        # Check if context is expired
-        if self.cache_ttl > 0:
-            timestamp = self.cache_timestamps.get(context_id, 0)
-            if time.time() - timestamp > self.cache_ttl:
-                del self.cache[context_id]
-                del self.cache_timestamps[context_id]
-                return None
-        
-        # Return cached context
-        try:
-            return Context.from_dict(self.cache[context_id])
-        except Exception:
-            return None
-    
-    def _clean_cache(self) -> None:
-        """Clean up expired cache entries."""
-        if self.cache_ttl <= 0:
-            return
-        
-        current_time = time.time()
-        expired_ids = []
-        
-        for context_id, timestamp in self.cache_timestamps.items():
-            if current_time - timestamp > self.cache_ttl:
-                expired_ids.append(context_id)
-        
-        for context_id in expired_ids:
-            if context_id in self.cache:
-                del self.cache[context_id]
-            if context_id in self.cache_timestamps:
-                del self.cache_timestamps[context_id]
+        return self.cache.get(context_id)
@@ -0,0 +1,530 @@
+"""
+Cache tiers for context storage backends.
+
+This module provides bounded in-memory caches for contexts, used by
+HybridStorage in front of slower storage backends. Caches hold Context
+objects directly, so a hit costs a dictionary lookup instead of a rebuild,
+and they are bounded by an estimate of the bytes they hold.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+from augment_adam.utils.tagging import tag, TagCategory
+from augment_adam.utils.timing_wheel import TimingWheel
+from augment_adam.context.core.base import Context
+
+
+# Estimated size of a context without its content, in bytes
+CONTEXT_OVERHEAD = 512
+
+# Cache policies supported by create_cache
+CACHE_POLICIES = ("lru", "arc")
+
+
+def estimate_size(context: Context) -> int:
+    """
+    Estimate the memory used by a context.
+    
+    The estimate is dominated by the length of the content, plus a fixed
+    overhead for the other fields and 8 bytes per embedding dimension.
+    
+    Args:
+        context: The context.
+    
+    Returns:
+        Estimated size in bytes.
+    """
+    size = CONTEXT_OVERHEAD + len(context.content)
+    if context.embedding:
+        size += 8 * len(context.embedding)
+    return size
+
+
+@tag("context.storage.cache")
+class ContextCache(ABC):
+    """
+    Base class for bounded context caches.
+    
+    Subclasses decide which entries to evict when the cache is full. This
+    class handles the byte accounting, TTL expiry and statistics.
+    
+    Expired entries are dropped lazily: a lookup checks the deadline of its
+    own key, and writes advance a timer wheel that drops the entries whose
+    deadline passed since the last write.
+    
+    Cached contexts are shared with callers and must not be modified in
+    place; store a modified context again to update the cache.
+    
+    Attributes:
+        max_bytes: The maximum estimated size of the cached contexts.
+        ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+        size: The estimated size of the cached contexts.
+        hits: The number of lookups that found a context.
+        misses: The number of lookups that didn't find a context.
+        evictions: The number of contexts evicted to stay within max_bytes.
+        expirations: The number of contexts dropped because their TTL passed.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: The maximum estimated size of the cached contexts.
+            ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+            clock: Function that returns the current time in seconds.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.size = 0
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        self._wheel = TimingWheel(tick=max(ttl / 64, 0.01), now=clock()) if ttl > 0 else None
+    
+    @abstractmethod
+    def _lookup(self, key: str) -> Optional[Context]:
+        """
+        Get a cached context and record the access.
+        
+        Args:
+            key: The ID of the context.
+        
+        Returns:
+            The context, or None if it isn't cached.
+        """
+        pass
+    
+    @abstractmethod
+    def _insert(self, key: str, context: Context, size: int) -> None:
+        """
+        Insert or replace a context, evicting entries with _evicted if needed.
+        
+        Args:
+            key: The ID of the context.
+            context: The context.
+            size: The estimated size of the context.
+        """
+        pass
+    
+    @abstractmethod
+    def _discard(self, key: str) -> bool:
+        """
+        Remove a context without counting an eviction.
+        
+        Args:
+            key: The ID of the context.
+        
+        Returns:
+            True if the context was cached, False otherwise.
+        """
+        pass
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Get the number of cached contexts."""
+        pass
+    
+    @abstractmethod
+    def __contains__(self, key: object) -> bool:
+        """Check whether a context is cached."""
+        pass
+    
+    @abstractmethod
+    def keys(self) -> List[str]:
+        """Get the IDs of the cached contexts."""
+        pass
+    
+    def _evicted(self, key: str) -> None:
+        """
+        Record that a context was evicted.
+        
+        Args:
+            key: The ID of the context.
+        """
+        self.evictions += 1
+        if self._wheel is not None:
+            self._wheel.cancel(key)
+    
+    def _expire(self) -> None:
+        """Drop the contexts whose TTL passed since the last call."""
+        if self._wheel is None:
+            return
+        
+        for key in self._wheel.advance(self.clock()):
+            if self._discard(key):
+                self.expirations += 1
+    
+    def get(self, key: str) -> Optional[Context]:
+        """
+        Get a cached context.
+        
+        Args:
+            key: The ID of the context.
+        
+        Returns:
+            The context, or None if it isn't cached or has expired.
+        """
+        if self._wheel is not None:
+            deadline = self._wheel.deadline(key)
+            if deadline is not None and deadline <= self.clock():
+                self.remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+        
+        context = self._lookup(key)
+        if context is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        
+        return context
+    
+    def put(self, context: Context) -> None:
+        """
+        Cache a context, replacing any cached context with the same ID.
+        
+        Contexts larger than max_bytes are not cached.
+        
+        Args:
+            context: The context to cache.
+        """
+        self._expire()
+        
+        size = estimate_size(context)
+        if size > self.max_bytes:
+            self.remove(context.id)
+            return
+        
+        self._insert(context.id, context, size)
+        if self._wheel is not None:
+            self._wheel.schedule(context.id, self.clock() + self.ttl)
+    
+    def remove(self, key: str) -> bool:
+        """
+        Remove a context from the cache.
+        
+        Args:
+            key: The ID of the context.
+        
+        Returns:
+            True if the context was cached, False otherwise.
+        """
+        if self._wheel is not None:
+            self._wheel.cancel(key)
+        return self._discard(key)
+    
+    def clear(self) -> None:
+        """Remove all contexts from the cache, keeping the statistics."""
+        for key in list(self.keys()):
+            self._discard(key)
+        if self._wheel is not None:
+            self._wheel.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the cache.
+        
+        Returns:
+            Dictionary with the hit, miss, eviction and expiration counts,
+            the hit rate, and the number and estimated size of the entries.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "policy": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+@tag("context.storage.cache.lru")
+class LRUCache(ContextCache):
+    """
+    Least-recently-used context cache.
+    
+    Entries are kept in an ordered dictionary in order of last access, and
+    the least recently used ones are evicted first.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the LRU cache.
+        
+        Args:
+            max_bytes: The maximum estimated size of the cached contexts.
+            ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+            clock: Function that returns the current time in seconds.
+        """
+        super().__init__(max_bytes, ttl, clock)
+        
+        # ID -> (context, size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Context, int]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        """Get the number of cached contexts."""
+        return len(self._entries)
+    
+    def __contains__(self, key: object) -> bool:
+        """Check whether a context is cached."""
+        return key in self._entries
+    
+    def keys(self) -> List[str]:
+        """Get the IDs of the cached contexts."""
+        return list(self._entries)
+    
+    def _lookup(self, key: str) -> Optional[Context]:
+        """Get a cached context and mark it as most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        self._entries.move_to_end(key)
+        return entry[0]
+    
+    def _insert(self, key: str, context: Context, size: int) -> None:
+        """Insert a context as most recently used and evict down to max_bytes."""
+        self._discard(key)
+        self._entries[key] = (context, size)
+        self.size += size
+        
+        while self.size > self.max_bytes:
+            evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+            self._evicted(evicted_key)
+    
+    def _discard(self, key: str) -> bool:
+        """Remove a context without counting an eviction."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        
+        self.size -= entry[1]
+        return True
+
+
+@tag("context.storage.cache.arc")
+class ARCCache(ContextCache):
+    """
+    Adaptive replacement context cache.
+    
+    ARC splits the cache into T1, for contexts seen once recently, and T2,
+    for contexts seen at least twice. Ghost lists B1 and B2 remember the IDs
+    recently evicted from each, and a hit on a ghost shifts the target size
+    of T1 towards the list that would have kept it. This resists scans that
+    would flush an LRU cache, while still adapting to recency-heavy loads.
+    
+    Sizes are measured in estimated bytes rather than entries.
+    
+    Attributes:
+        target: The adaptive target size of T1 in bytes.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the ARC cache.
+        
+        Args:
+            max_bytes: The maximum estimated size of the cached contexts.
+            ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+            clock: Function that returns the current time in seconds.
+        """
+        super().__init__(max_bytes, ttl, clock)
+        
+        self.target = 0.0
+        
+        # Resident lists: ID -> (context, size), least recently used first
+        self._t1: "OrderedDict[str, Tuple[Context, int]]" = OrderedDict()
+        self._t2: "OrderedDict[str, Tuple[Context, int]]" = OrderedDict()
+        self._t1_size = 0
+        
+        # Ghost lists: ID -> size, least recently evicted first
+        self._b1: "OrderedDict[str, int]" = OrderedDict()
+        self._b2: "OrderedDict[str, int]" = OrderedDict()
+        self._b1_size = 0
+        self._b2_size = 0
+    
+    def __len__(self) -> int:
+        """Get the number of cached contexts."""
+        return len(self._t1) + len(self._t2)
+    
+    def __contains__(self, key: object) -> bool:
+        """Check whether a context is cached."""
+        return key in self._t1 or key in self._t2
+    
+    def keys(self) -> List[str]:
+        """Get the IDs of the cached contexts."""
+        return list(self._t1) + list(self._t2)
+    
+    def _lookup(self, key: str) -> Optional[Context]:
+        """Get a cached context, promoting it to T2."""
+        entry = self._t1.pop(key, None)
+        if entry is not None:
+            self._t1_size -= entry[1]
+            self._t2[key] = entry
+            return entry[0]
+        
+        entry = self._t2.get(key)
+        if entry is None:
+            return None
+        
+        self._t2.move_to_end(key)
+        return entry[0]
+    
+    def _replace(self, size: int, in_b2: bool) -> None:
+        """
+        Evict contexts to the ghost lists until size more bytes fit.
+        
+        Args:
+            size: The number of bytes to make room for.
+            in_b2: Whether the context being inserted was found in B2.
+        """
+        while self.size + size > self.max_bytes and (self._t1 or self._t2):
+            if self._t1 and (self._t1_size > self.target or (in_b2 and self._t1_size >= self.target) or not self._t2):
+                key, (_, evicted_size) = self._t1.popitem(last=False)
+                self._t1_size -= evicted_size
+                self._b1[key] = evicted_size
+                self._b1_size += evicted_size
+            else:
+                key, (_, evicted_size) = self._t2.popitem(last=False)
+                self._b2[key] = evicted_size
+                self._b2_size += evicted_size
+            
+            self.size -= evicted_size
+            self._evicted(key)
+    
+    def _trim_ghosts(self) -> None:
+        """Keep T1 + B1 within max_bytes and all lists within twice max_bytes."""
+        while self._b1 and self._t1_size + self._b1_size > self.max_bytes:
+            _, ghost_size = self._b1.popitem(last=False)
+            self._b1_size -= ghost_size
+        
+        while self._b2 and self.size + self._b1_size + self._b2_size > 2 * self.max_bytes:
+            _, ghost_size = self._b2.popitem(last=False)
+            self._b2_size -= ghost_size
+    
+    def _insert(self, key: str, context: Context, size: int) -> None:
+        """Insert a context, adapting the target on ghost hits."""
+        if key in self:
+            # Update: the context was seen again, so it belongs in T2
+            self._discard(key)
+            self._replace(size, in_b2=False)
+            self._t2[key] = (context, size)
+        elif key in self._b1:
+            # Recency would have kept it: grow T1
+            ratio = max(self._b2_size / self._b1_size, 1.0) if self._b1_size else 1.0
+            self.target = min(float(self.max_bytes), self.target + ratio * size)
+            self._b1_size -= self._b1.pop(key)
+            self._replace(size, in_b2=False)
+            self._t2[key] = (context, size)
+        elif key in self._b2:
+            # Frequency would have kept it: shrink T1
+            ratio = max(self._b1_size / self._b2_size, 1.0) if self._b2_size else 1.0
+            self.target = max(0.0, self.target - ratio * size)
+            self._b2_size -= self._b2.pop(key)
+            self._replace(size, in_b2=True)
+            self._t2[key] = (context, size)
+        else:
+            self._replace(size, in_b2=False)
+            self._t1[key] = (context, size)
+            self._t1_size += size
+        
+        self.size += size
+        self._trim_ghosts()
+    
+    def _discard(self, key: str) -> bool:
+        """Remove a context without counting an eviction."""
+        entry = self._t1.pop(key, None)
+        if entry is not None:
+            self._t1_size -= entry[1]
+        else:
+            entry = self._t2.pop(key, None)
+            if entry is None:
+                return False
+        
+        self.size -= entry[1]
+        return True
+    
+    def clear(self) -> None:
+        """Remove all contexts and ghosts from the cache, keeping the statistics."""
+        super().clear()
+        self._b1.clear()
+        self._b2.clear()
+        self._b1_size = 0
+        self._b2_size = 0
+        self.target = 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the cache.
+        
+        Returns:
+            Dictionary with the base statistics plus the T1 target and the
+            sizes of the resident and ghost lists.
+        """
+        stats = super().stats()
+        stats.update({
+            "target": self.target,
+            "t1_bytes": self._t1_size,
+            "t2_bytes": self.size - self._t1_size,
+            "b1_bytes": self._b1_size,
+            "b2_bytes": self._b2_size,
+        })
+        return stats
+
+
+def create_cache(
+    policy: str = "lru",
+    max_bytes: int = 64 * 1024 * 1024,
+    ttl: float = 0,
+    clock: Callable[[], float] = time.monotonic,
+) -> ContextCache:
+    """
+    Create a context cache.
+    
+    Args:
+        policy: The eviction policy ("lru" or "arc").
+        max_bytes: The maximum estimated size of the cached contexts.
+        ttl: The time-to-live for cached contexts in seconds (0 means no expiration).
+        clock: Function that returns the current time in seconds.
+    
+    Returns:
+        The cache.
+    
+    Raises:
+        ValueError: If the policy is not supported.
+    """
+    if policy == "lru":
+        return LRUCache(max_bytes, ttl, clock)
+    if policy == "arc":
+        return ARCCache(max_bytes, ttl, clock)
+    
+    raise ValueError(f"Unsupported cache policy: {policy}")
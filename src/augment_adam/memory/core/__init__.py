@@ -12,6 +12,10 @@ from augment_adam.memory.core.base import (
     MemoryManager,
     get_memory_manager,
 )
+from augment_adam.memory.core.filtering import MetadataIndex
+from augment_adam.memory.core.text_index import TextIndex
+from augment_adam.memory.core.interval_index import IntervalIndex
+from augment_adam.utils.timing_wheel import TimingWheel
 
 __all__ = [
     "Memory",
@@ -19,4 +23,8 @@ __all__ = [
     "MemoryType",
     "MemoryManager",
     "get_memory_manager",
+    "MetadataIndex",
+    "TextIndex",
+    "IntervalIndex",
+    "TimingWheel",
 ]
@@ -0,0 +1,169 @@
+"""
+Metadata filtering for memory systems.
+
+This module provides the MetadataIndex class, an inverted index from metadata
+key/value pairs to item IDs. Memory systems use it to turn a where filter into
+an allow-list of item IDs before running a search, instead of post-filtering
+the search results.
+"""
+
+from typing import Dict, List, Any, Optional, Set, Tuple, Hashable, Iterable
+
+from augment_adam.utils.tagging import tag, TagCategory
+
+
+# Operators supported in where filters
+FILTER_OPERATORS = ("$eq", "$in")
+
+
+@tag("memory.core.filtering")
+class MetadataIndex:
+    """
+    Inverted index over the metadata of memory items.
+    
+    Each (key, value) pair maps to the set of item IDs whose metadata contains
+    it. List-valued metadata (such as tags) is indexed per element, so a filter
+    matches an item if any element matches. Values that can't be hashed are
+    not indexed.
+    
+    Filters are dictionaries mapping metadata keys to conditions, where a
+    condition is either a plain value (equality), {"$eq": value} or
+    {"$in": [values]}. All conditions must hold for an item to match.
+    
+    Attributes:
+        postings: Mapping from metadata keys to values to item IDs.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the metadata index."""
+        self.postings: Dict[str, Dict[Hashable, Set[str]]] = {}
+        
+        # Indexed (key, value) pairs of each item, used to remove stale postings
+        self._entries: Dict[str, List[Tuple[str, Hashable]]] = {}
+    
+    @staticmethod
+    def _pairs(metadata: Dict[str, Any]) -> List[Tuple[str, Hashable]]:
+        """
+        Get the indexable (key, value) pairs of a metadata dictionary.
+        
+        Args:
+            metadata: The metadata to index.
+        
+        Returns:
+            List of (key, value) pairs.
+        """
+        pairs = []
+        for key, value in metadata.items():
+            values = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+            for element in values:
+                try:
+                    hash(element)
+                except TypeError:
+                    continue
+                pairs.append((key, element))
+        
+        return pairs
+    
+    def add(self, item_id: str, metadata: Dict[str, Any]) -> None:
+        """
+        Index the metadata of an item, replacing any previous entries.
+        
+        Args:
+            item_id: The ID of the item.
+            metadata: The metadata of the item.
+        """
+        self.remove(item_id)
+        
+        pairs = self._pairs(metadata)
+        for key, value in pairs:
+            self.postings.setdefault(key, {}).setdefault(value, set()).add(item_id)
+        self._entries[item_id] = pairs
+    
+    def remove(self, item_id: str) -> None:
+        """
+        Remove an item from the index.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        for key, value in self._entries.pop(item_id, ()):
+            values = self.postings[key]
+            ids = values[value]
+            ids.discard(item_id)
+            
+            if not ids:
+                del values[value]
+                if not values:
+                    del self.postings[key]
+    
+    def clear(self) -> None:
+        """Remove all items from the index."""
+        self.postings = {}
+        self._entries = {}
+    
+    def __len__(self) -> int:
+        """Get the number of indexed items."""
+        return len(self._entries)
+    
+    def _lookup(self, key: str, values: Iterable[Any]) -> Set[str]:
+        """
+        Get the IDs of items whose metadata matches any of the values for a key.
+        
+        Args:
+            key: The metadata key.
+            values: The accepted values.
+        
+        Returns:
+            Set of item IDs.
+        """
+        postings = self.postings.get(key, {})
+        matches = [postings[value] for value in values if value in postings]
+        
+        if len(matches) == 1:
+            return matches[0]
+        return set().union(*matches)
+    
+    def select(self, where: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """
+        Get the IDs of items that match a filter.
+        
+        Posting sets are intersected smallest first, so the cost is bounded by
+        the most selective condition.
+        
+        Args:
+            where: The filter to apply.
+        
+        Returns:
+            Set of matching item IDs, or None if the filter is empty (every item
+            matches). The set must not be modified.
+        
+        Raises:
+            ValueError: If the filter uses an unsupported operator.
+        """
+        if not where:
+            return None
+        
+        candidates = []
+        for key, condition in where.items():
+            if isinstance(condition, dict):
+                if len(condition) != 1 or next(iter(condition)) not in FILTER_OPERATORS:
+                    raise ValueError(f"Unsupported filter condition for {key!r}: {condition!r}")
+                
+                operator, operand = next(iter(condition.items()))
+                values = list(operand) if operator == "$in" else [operand]
+            else:
+                values = [condition]
+            
+            candidates.append(self._lookup(key, values))
+        
+        candidates.sort(key=len)
+        if len(candidates) == 1:
+            return candidates[0]
+        
+        selected = set(candidates[0])
+        for ids in candidates[1:]:
+            if not selected:
+                break
+            selected &= ids
+        
+        return selected
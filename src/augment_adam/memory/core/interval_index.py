@@ -0,0 +1,221 @@
+"""
+Interval indexing for memory systems.
+
+This module provides the IntervalIndex class, which answers "which intervals
+overlap this range" queries over keyed intervals, such as the start and end
+times of episodes, without scanning every interval.
+"""
+
+import bisect
+from typing import Dict, List, Any, Optional, Iterator
+
+from augment_adam.utils.tagging import tag, TagCategory
+
+
+@tag("memory.core.interval_index")
+class IntervalIndex:
+    """
+    Index of keyed intervals for overlap queries.
+    
+    Intervals are kept in arrays sorted by start, with a max-segment tree over
+    their ends. An overlap query bisects the starts to bound the candidates,
+    then descends the tree only into subtrees whose largest end reaches the
+    query start, so it runs in O(log n) per reported interval instead of O(n).
+    
+    Bounds can be any mutually comparable values (such as ISO timestamp
+    strings). Intervals added in order of start, the common case for events
+    that are recorded as they happen, are appended in O(log n); intervals that
+    start earlier than the latest one mark the index for a rebuild on the next
+    query. Removed intervals are left as tombstones until the next rebuild.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the interval index."""
+        self._starts: List[Any] = []
+        self._ends: List[Any] = []
+        self._keys: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self._tombstones = 0
+        
+        # Max-segment tree over the ends: leaves at [capacity, 2 * capacity),
+        # with None for empty slots and tombstones
+        self._capacity = 0
+        self._tree: List[Any] = []
+        self._dirty = False
+    
+    def __len__(self) -> int:
+        """Get the number of indexed intervals."""
+        return len(self._positions)
+    
+    def __contains__(self, key: object) -> bool:
+        """Check whether a key is indexed."""
+        return key in self._positions
+    
+    @staticmethod
+    def _max(a: Any, b: Any) -> Any:
+        """Get the larger of two tree values, where None is smallest."""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a if a >= b else b
+    
+    def _set_leaf(self, position: int, end: Any) -> None:
+        """
+        Set the end stored for a position and update its ancestors.
+        
+        Args:
+            position: The position in the sorted arrays.
+            end: The end of the interval, or None for a tombstone.
+        """
+        node = self._capacity + position
+        self._tree[node] = end
+        node //= 2
+        while node:
+            self._tree[node] = self._max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+    
+    def _rebuild(self) -> None:
+        """Drop tombstones, recompute positions and rebuild the segment tree."""
+        if self._tombstones:
+            live = [i for i, key in enumerate(self._keys) if key is not None]
+            self._starts = [self._starts[i] for i in live]
+            self._ends = [self._ends[i] for i in live]
+            self._keys = [self._keys[i] for i in live]
+            self._tombstones = 0
+        
+        self._positions = {key: position for position, key in enumerate(self._keys)}
+        
+        capacity = 1
+        while capacity < max(len(self._keys), 16):
+            capacity *= 2
+        self._capacity = capacity
+        
+        self._tree = [None] * (2 * capacity)
+        self._tree[capacity:capacity + len(self._ends)] = self._ends
+        for node in range(capacity - 1, 0, -1):
+            self._tree[node] = self._max(self._tree[2 * node], self._tree[2 * node + 1])
+        
+        self._dirty = False
+    
+    def add(self, key: str, start: Any, end: Any) -> None:
+        """
+        Index an interval, replacing any previous interval with the same key.
+        
+        Args:
+            key: The key of the interval.
+            start: The start of the interval (inclusive).
+            end: The end of the interval (inclusive).
+        """
+        if self._dirty:
+            self._rebuild()
+        
+        position = self._positions.get(key)
+        if position is not None:
+            # Only the end changed: update the leaf in place
+            if self._starts[position] == start:
+                self._ends[position] = end
+                self._set_leaf(position, end)
+                return
+            self.remove(key)
+        
+        if not self._starts or start >= self._starts[-1]:
+            position = len(self._keys)
+            self._starts.append(start)
+            self._ends.append(end)
+            self._keys.append(key)
+            self._positions[key] = position
+            
+            if position >= self._capacity:
+                self._rebuild()
+            else:
+                self._set_leaf(position, end)
+        else:
+            # Out-of-order start: insert in place and rebuild before the next query
+            position = bisect.bisect_right(self._starts, start)
+            self._starts.insert(position, start)
+            self._ends.insert(position, end)
+            self._keys.insert(position, key)
+            self._positions[key] = position
+            self._dirty = True
+    
+    def remove(self, key: str) -> None:
+        """
+        Remove an interval from the index.
+        
+        Args:
+            key: The key of the interval.
+        """
+        if key not in self._positions:
+            return
+        if self._dirty:
+            self._rebuild()
+        
+        position = self._positions.pop(key)
+        self._keys[position] = None
+        self._ends[position] = None
+        self._tombstones += 1
+        
+        if self._tombstones > len(self._keys) // 2:
+            self._rebuild()
+        else:
+            self._set_leaf(position, None)
+    
+    def clear(self) -> None:
+        """Remove all intervals from the index."""
+        self._starts = []
+        self._ends = []
+        self._keys = []
+        self._positions = {}
+        self._tombstones = 0
+        self._capacity = 0
+        self._tree = []
+        self._dirty = False
+    
+    def overlapping(self, start: Optional[Any] = None, end: Optional[Any] = None) -> Iterator[str]:
+        """
+        Iterate over the keys of the intervals that overlap a range.
+        
+        Keys are yielded lazily in order of interval start, so large ranges
+        can be consumed without materializing them.
+        
+        Args:
+            start: The start of the range (inclusive), or None for no lower bound.
+            end: The end of the range (inclusive), or None for no upper bound.
+        
+        Returns:
+            Iterator of keys.
+        """
+        if self._dirty:
+            self._rebuild()
+        
+        # Only intervals that start before the end of the range can overlap it
+        limit = len(self._starts) if end is None else bisect.bisect_right(self._starts, end)
+        if limit == 0:
+            return
+        
+        if start is None:
+            for key in self._keys[:limit]:
+                if key is not None:
+                    yield key
+            return
+        
+        # Of those, report the ones that end after the start of the range,
+        # visiting subtrees left to right so keys come out in start order
+        stack = [(1, 0, self._capacity)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit:
+                continue
+            
+            node_end = self._tree[node]
+            if node_end is None or node_end < start:
+                continue
+            
+            if high - low == 1:
+                yield self._keys[low]
+                continue
+            
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
@@ -0,0 +1,233 @@
+"""
+Full-text indexing for memory systems.
+
+This module provides the TextIndex class, an incrementally maintained inverted
+index from tokens to the items whose text contains them. Memory systems use it
+to answer text queries by ranking only the items that share a token with the
+query, instead of scanning the text of every item.
+"""
+
+import re
+import math
+import heapq
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Callable
+
+from augment_adam.utils.tagging import tag, TagCategory
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into lowercase word tokens.
+    
+    Args:
+        text: The text to tokenize.
+    
+    Returns:
+        List of tokens, in order of appearance.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@tag("memory.core.text_index")
+class TextIndex:
+    """
+    Inverted full-text index over memory items.
+    
+    Each item is indexed as a bag of tokens taken from one or more texts. The
+    index keeps a posting list (item ID -> term frequency) per token, so a
+    query only touches the items that contain at least one of its tokens.
+    
+    Results are ranked with BM25 by default. With bm25=False, items are
+    ranked by the number of query token occurrences they contain.
+    
+    Attributes:
+        postings: Mapping from tokens to item IDs to term frequencies.
+        k1: BM25 term frequency saturation.
+        b: BM25 document length normalization.
+        bm25: Whether results are ranked with BM25.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75, bm25: bool = True) -> None:
+        """
+        Initialize the text index.
+        
+        Args:
+            k1: BM25 term frequency saturation.
+            b: BM25 document length normalization.
+            bm25: Whether results are ranked with BM25.
+        """
+        self.k1 = k1
+        self.b = b
+        self.bm25 = bm25
+        
+        self.postings: Dict[str, Dict[str, int]] = {}
+        
+        # Term frequencies and token count of each item
+        self._documents: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+    
+    def add(self, item_id: str, texts: Iterable[str]) -> None:
+        """
+        Index the texts of an item, replacing any previous entries.
+        
+        Args:
+            item_id: The ID of the item.
+            texts: The texts of the item.
+        """
+        terms: Dict[str, int] = {}
+        length = 0
+        for text in texts:
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0) + 1
+                length += 1
+        
+        self._set_terms(item_id, terms, length)
+    
+    def _set_terms(self, item_id: str, terms: Dict[str, int], length: int) -> None:
+        """
+        Replace the term frequencies of an item.
+        
+        Args:
+            item_id: The ID of the item.
+            terms: Mapping from tokens to term frequencies.
+            length: The number of tokens in the item.
+        """
+        self.remove(item_id)
+        
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[item_id] = frequency
+        
+        self._documents[item_id] = terms
+        self._lengths[item_id] = length
+        self._total_length += length
+    
+    def remove(self, item_id: str) -> None:
+        """
+        Remove an item from the index.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        terms = self._documents.pop(item_id, None)
+        if terms is None:
+            return
+        
+        for term in terms:
+            posting = self.postings[term]
+            del posting[item_id]
+            if not posting:
+                del self.postings[term]
+        
+        self._total_length -= self._lengths.pop(item_id)
+    
+    def retain(self, item_ids: Iterable[str]) -> None:
+        """
+        Remove every item that is not in item_ids.
+        
+        Args:
+            item_ids: The IDs of the items to keep.
+        """
+        keep = set(item_ids)
+        for item_id in [item_id for item_id in self._documents if item_id not in keep]:
+            self.remove(item_id)
+    
+    def clear(self) -> None:
+        """Remove all items from the index."""
+        self.postings = {}
+        self._documents = {}
+        self._lengths = {}
+        self._total_length = 0
+    
+    def __len__(self) -> int:
+        """Get the number of indexed items."""
+        return len(self._documents)
+    
+    def __contains__(self, item_id: object) -> bool:
+        """Check whether an item is indexed."""
+        return item_id in self._documents
+    
+    def search(self, query: str, limit: int = 10, predicate: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank the items that contain any token of a query.
+        
+        The cost is proportional to the lengths of the posting lists of the
+        query tokens, not to the size of the index.
+        
+        Args:
+            query: The query text.
+            limit: The maximum number of results to return.
+            predicate: Function that takes an item ID and returns True if the
+                item may be returned.
+        
+        Returns:
+            List of (item ID, score) pairs, sorted by descending score.
+        """
+        if limit <= 0 or not self._documents:
+            return []
+        
+        count = len(self._documents)
+        average_length = self._total_length / count or 1.0
+        
+        scores: Dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            
+            if not self.bm25:
+                for item_id, frequency in posting.items():
+                    scores[item_id] = scores.get(item_id, 0.0) + frequency
+                continue
+            
+            idf = math.log(1.0 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for item_id, frequency in posting.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self._lengths[item_id] / average_length)
+                scores[item_id] = scores.get(item_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+        
+        candidates = scores.items() if predicate is None else ((item_id, score) for item_id, score in scores.items() if predicate(item_id))
+        return heapq.nlargest(limit, candidates, key=lambda pair: pair[1])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the text index to a dictionary.
+        
+        Only the term frequencies of each item are stored; the posting lists
+        are rebuilt from them without re-tokenizing any text.
+        
+        Returns:
+            Dictionary representation of the text index.
+        """
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "bm25": self.bm25,
+            "documents": self._documents,
+            "lengths": self._lengths,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TextIndex':
+        """
+        Create a text index from a dictionary.
+        
+        Args:
+            data: Dictionary representation of the text index.
+        
+        Returns:
+            Text index.
+        """
+        index = cls(
+            k1=data.get("k1", 1.2),
+            b=data.get("b", 0.75),
+            bm25=data.get("bm25", True),
+        )
+        
+        lengths = data.get("lengths", {})
+        for item_id, terms in data.get("documents", {}).items():
+            index._set_terms(item_id, dict(terms), lengths.get(item_id, sum(terms.values())))
+        
+        return index
@@ -6,12 +6,16 @@ including the EpisodicMemory class, Episode class, and Event class.
 """
 
 import uuid
+import bisect
+import itertools
 import datetime
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, Iterator, TypeVar
 from dataclasses import dataclass, field
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.core.base import Memory, MemoryItem, MemoryType
+from augment_adam.memory.core.text_index import TextIndex
+from augment_adam.memory.core.interval_index import IntervalIndex
 
 
 @dataclass
@@ -71,6 +75,38 @@ class Event:
         )
 
 
+class _EventList(list):
+    """List of events that counts its modifications, so sorted views can tell when they are stale."""
+    
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.version = 0
+    
+    def _modified(method: Callable) -> Callable:
+        """Wrap a list method so that calling it counts as a modification."""
+        def wrapper(self: '_EventList', *args: Any, **kwargs: Any) -> Any:
+            self.version += 1
+            return method(self, *args, **kwargs)
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+    
+    __setitem__ = _modified(list.__setitem__)
+    __delitem__ = _modified(list.__delitem__)
+    __iadd__ = _modified(list.__iadd__)
+    __imul__ = _modified(list.__imul__)
+    append = _modified(list.append)
+    extend = _modified(list.extend)
+    insert = _modified(list.insert)
+    pop = _modified(list.pop)
+    remove = _modified(list.remove)
+    clear = _modified(list.clear)
+    sort = _modified(list.sort)
+    reverse = _modified(list.reverse)
+    
+    del _modified
+
+
 @dataclass
 class Episode(MemoryItem):
     """
@@ -79,6 +115,13 @@ class Episode(MemoryItem):
     This class represents an episode in an episodic memory, including its events,
     metadata, and other attributes.
     
+    Events are also kept sorted by timestamp, so time-range queries bisect
+    instead of scanning every event. The sorted view is maintained by
+    add_event and remove_event, and rebuilt after any other change to the
+    events list (events counts its modifications, and assigning a new list
+    to events wraps it the same way). Changing the timestamp of an event
+    that is already in the episode is not detected.
+    
     Attributes:
         id: Unique identifier for the episode.
         content: The content of the episode.
@@ -100,6 +143,18 @@ class Episode(MemoryItem):
     start_time: Optional[str] = None
     end_time: Optional[str] = None
     
+    # Events sorted by timestamp, and their timestamps (built lazily), with
+    # the events list and its version they were built from
+    _events_by_time: List[Event] = field(default_factory=list, init=False, repr=False, compare=False)
+    _event_times: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _sorted_from: Optional[Tuple[List[Event], int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, wrapping a new events list so its changes are counted."""
+        if name == "events" and not isinstance(value, _EventList):
+            value = _EventList(value)
+        super().__setattr__(name, value)
+    
     def __post_init__(self) -> None:
         """Initialize the episode with timestamps."""
         super().__post_init__()
@@ -121,8 +176,16 @@ class Episode(MemoryItem):
         Returns:
             The ID of the added event.
         """
+        in_sync = self._is_sorted()
         self.events.append(event)
         
+        # Keep the sorted view in sync (events with equal timestamps stay in insertion order)
+        if in_sync:
+            position = bisect.bisect_right(self._event_times, event.timestamp)
+            self._event_times.insert(position, event.timestamp)
+            self._events_by_time.insert(position, event)
+            self._mark_sorted()
+        
         # Update start and end times
         if not self.start_time or event.timestamp < self.start_time:
             self.start_time = event.timestamp
@@ -163,12 +226,25 @@ class Episode(MemoryItem):
         """
         for i, event in enumerate(self.events):
             if event.id == event_id:
+                times, events_by_time = self._sorted_events()
                 del self.events[i]
                 
+                position = bisect.bisect_left(times, event.timestamp)
+                while position < len(events_by_time) and events_by_time[position] is not event:
+                    position += 1
+                
+                if position < len(events_by_time):
+                    del times[position]
+                    del events_by_time[position]
+                    self._mark_sorted()
+                else:
+                    # The event's timestamp was changed in place; rebuild the view
+                    times, events_by_time = self._sorted_events()
+                
                 # Update start and end times
                 if self.events:
-                    self.start_time = min(event.timestamp for event in self.events)
-                    self.end_time = max(event.timestamp for event in self.events)
+                    self.start_time = times[0]
+                    self.end_time = times[-1]
                 else:
                     self.start_time = None
                     self.end_time = None
@@ -180,6 +256,59 @@ class Episode(MemoryItem):
         
         return False
     
+    def _sorted_events(self) -> Tuple[List[str], List[Event]]:
+        """
+        Get the events sorted by timestamp, rebuilding the sorted view if needed.
+        
+        Returns:
+            The sorted timestamps and the events in the same order.
+        """
+        if not self._is_sorted():
+            self._events_by_time = sorted(self.events, key=lambda event: event.timestamp)
+            self._event_times = [event.timestamp for event in self._events_by_time]
+            self._mark_sorted()
+        
+        return self._event_times, self._events_by_time
+    
+    def _is_sorted(self) -> bool:
+        """
+        Check whether the sorted view matches the events list.
+        
+        Returns:
+            True if the sorted view was built from the current events list.
+        """
+        return (
+            self._sorted_from is not None and
+            self._sorted_from[0] is self.events and
+            self._sorted_from[1] == self.events.version
+        )
+    
+    def _mark_sorted(self) -> None:
+        """Record that the sorted view matches the current events list."""
+        self._sorted_from = (self.events, self.events.version)
+    
+    def iter_events_in_range(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> Iterator[Event]:
+        """
+        Iterate over events in a time range, in timestamp order.
+        
+        The range is located by bisecting the sorted timestamps, so the cost is
+        O(log n) plus the number of events yielded.
+        
+        Args:
+            start_time: The start of the time range (inclusive).
+            end_time: The end of the time range (inclusive).
+        
+        Returns:
+            Iterator of events in the time range.
+        """
+        times, events_by_time = self._sorted_events()
+        
+        low = bisect.bisect_left(times, start_time) if start_time else 0
+        high = bisect.bisect_right(times, end_time) if end_time else len(times)
+        
+        for position in range(low, high):
+            yield events_by_time[position]
+    
     def get_events_in_range(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Event]:
         """
         Get events in a time range.
@@ -189,20 +318,9 @@ class Episode(MemoryItem):
             end_time: The end of the time range (inclusive).
             
         Returns:
-            List of events in the time range.
+            List of events in the time range, in timestamp order.
         """
-        events = []
-        
-        for event in self.events:
-            if start_time and event.timestamp < start_time:
-                continue
-            
-            if end_time and event.timestamp > end_time:
-                continue
-            
-            events.append(event)
-        
-        return events
+        return list(self.iter_events_in_range(start_time, end_time))
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -249,6 +367,12 @@ class EpisodicMemory(Memory[T]):
     This class implements an episodic memory system for storing and retrieving
     temporal sequences of events.
     
+    Text search is served by a TextIndex over the content of each episode and
+    its events, and time-range queries by an IntervalIndex over episode start
+    and end times. Each index is built on first use and then kept up to date
+    by add, update, remove, add_event and remove_event; episodes that are
+    modified directly must be passed to reindex.
+    
     Attributes:
         name: The name of the memory system.
         items: Dictionary of episodes in memory, keyed by ID.
@@ -267,6 +391,121 @@ class EpisodicMemory(Memory[T]):
         """
         super().__init__(name, MemoryType.EPISODIC)
     
+        # Full-text index over episode and event content (built lazily)
+        self._text_index: Optional[TextIndex] = None
+    
+        # Interval index over episode start and end times (built lazily)
+        self._interval_index: Optional[IntervalIndex] = None
+    
+    @property
+    def text_index(self) -> TextIndex:
+        """The full-text index over episode and event content."""
+        if self._text_index is None:
+            self._text_index = TextIndex()
+            for episode in self.items.values():
+                self._text_index.add(episode.id, self._episode_texts(episode))
+        
+        return self._text_index
+    
+    @property
+    def interval_index(self) -> IntervalIndex:
+        """The interval index over episode start and end times."""
+        if self._interval_index is None:
+            self._interval_index = IntervalIndex()
+            for episode in sorted(self.items.values(), key=lambda episode: episode.start_time or ""):
+                if episode.start_time and episode.end_time:
+                    self._interval_index.add(episode.id, episode.start_time, episode.end_time)
+        
+        return self._interval_index
+    
+    @staticmethod
+    def _episode_texts(episode: Episode) -> List[str]:
+        """
+        Get the texts of an episode that are searchable.
+        
+        Args:
+            episode: The episode.
+        
+        Returns:
+            The string content of the episode and of its events.
+        """
+        contents = [episode.content] + [event.content for event in episode.events]
+        return [content for content in contents if isinstance(content, str)]
+    
+    def reindex(self, episode_id: str) -> None:
+        """
+        Update the search indexes after an episode was modified directly.
+        
+        Args:
+            episode_id: The ID of the episode.
+        """
+        episode = self.items.get(episode_id)
+        
+        if self._text_index is not None:
+            if episode is None:
+                self._text_index.remove(episode_id)
+            else:
+                self._text_index.add(episode_id, self._episode_texts(episode))
+        
+        if self._interval_index is not None:
+            if episode is None or not episode.start_time or not episode.end_time:
+                self._interval_index.remove(episode_id)
+            else:
+                self._interval_index.add(episode_id, episode.start_time, episode.end_time)
+    
+    def add(self, item: T) -> str:
+        """
+        Add an episode to memory.
+        
+        Args:
+            item: The episode to add to memory.
+        
+        Returns:
+            The ID of the added episode.
+        """
+        item_id = super().add(item)
+        self.reindex(item_id)
+        return item_id
+    
+    def update(self, item_id: str, content: Any = None, metadata: Dict[str, Any] = None) -> Optional[T]:
+        """
+        Update an episode in memory.
+        
+        Args:
+            item_id: The ID of the episode to update.
+            content: New content for the episode.
+            metadata: New metadata for the episode.
+        
+        Returns:
+            The updated episode, or None if it doesn't exist.
+        """
+        episode = super().update(item_id, content, metadata)
+        if episode is not None and content is not None:
+            self.reindex(item_id)
+        return episode
+    
+    def remove(self, item_id: str) -> bool:
+        """
+        Remove an episode from memory.
+        
+        Args:
+            item_id: The ID of the episode to remove.
+        
+        Returns:
+            True if the episode was removed, False otherwise.
+        """
+        if not super().remove(item_id):
+            return False
+        
+        self.reindex(item_id)
+        return True
+    
+    def clear(self) -> None:
+        """Remove all episodes from memory."""
+        super().clear()
+        self._text_index = None
+        self._interval_index = None
+    
     def add_event(self, episode_id: str, event: Event) -> Optional[str]:
         """
         Add an event to an episode.
@@ -282,7 +521,9 @@ class EpisodicMemory(Memory[T]):
         if episode is None:
             return None
         
-        return episode.add_event(event)
+        event_id = episode.add_event(event)
+        self.reindex(episode_id)
+        return event_id
     
     def get_event(self, episode_id: str, event_id: str) -> Optional[Event]:
         """
@@ -316,7 +557,11 @@ class EpisodicMemory(Memory[T]):
         if episode is None:
             return False
         
-        return episode.remove_event(event_id)
+        if not episode.remove_event(event_id):
+            return False
+        
+        self.reindex(episode_id)
+        return True
     
     def get_events_in_range(self, episode_id: str, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Event]:
         """
@@ -336,35 +581,53 @@ class EpisodicMemory(Memory[T]):
         
         return episode.get_events_in_range(start_time, end_time)
     
-    def get_episodes_in_range(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[T]:
+    def iter_episodes_in_range(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> Iterator[T]:
         """
-        Get episodes in a time range.
+        Iterate over episodes that overlap a time range, in start time order.
+        
+        Episodes are located with the interval index and yielded lazily, so
+        very large ranges can be consumed without materializing them.
         
         Args:
             start_time: The start of the time range (inclusive).
             end_time: The end of the time range (inclusive).
             
         Returns:
-            List of episodes in the time range.
+            Iterator of episodes in the time range.
         """
-        episodes = []
+        for episode_id in self.interval_index.overlapping(start_time or None, end_time or None):
+            yield self.items[episode_id]
         
-        for episode in self.items.values():
-            # If the episode has no start or end time, skip it
-            if not episode.start_time or not episode.end_time:
-                continue
+    def get_episodes_in_range(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[T]:
+        """
+        Get episodes in a time range.
             
-            # If the episode ends before the start time, skip it
-            if start_time and episode.end_time < start_time:
-                continue
+        Episodes without a start or end time are never returned.
             
-            # If the episode starts after the end time, skip it
-            if end_time and episode.start_time > end_time:
-                continue
+        Args:
+            start_time: The start of the time range (inclusive).
+            end_time: The end of the time range (inclusive).
             
-            episodes.append(episode)
+        Returns:
+            List of episodes in the time range, in start time order.
+        """
+        return list(self.iter_episodes_in_range(start_time, end_time))
         
-        return episodes
+    def iter_all_events_in_range(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> Iterator[Tuple[T, Event]]:
+        """
+        Iterate over the events of all episodes in a time range.
+        
+        Args:
+            start_time: The start of the time range (inclusive).
+            end_time: The end of the time range (inclusive).
+        
+        Returns:
+            Iterator of (episode, event) pairs, grouped by episode in start time
+            order and in timestamp order within each episode.
+        """
+        for episode in self.iter_episodes_in_range(start_time, end_time):
+            for event in episode.iter_events_in_range(start_time, end_time):
+                yield episode, event
     
     def search(self, query: Any, limit: int = 10) -> List[T]:
         """
@@ -377,27 +640,13 @@ class EpisodicMemory(Memory[T]):
         Returns:
             List of episodes that match the query.
         """
-        # If the query is a string, search for episodes with matching content
+        # If the query is a string, rank episodes whose content or events share a token with it
         if isinstance(query, str):
-            results = []
-            
-            for episode in self.items.values():
-                # Check if the episode content contains the query
-                if episode.content and isinstance(episode.content, str) and query.lower() in episode.content.lower():
-                    results.append(episode)
-                    continue
-                
-                # Check if any event content contains the query
-                for event in episode.events:
-                    if event.content and isinstance(event.content, str) and query.lower() in event.content.lower():
-                        results.append(episode)
-                        break
-            
-            return results[:limit]
+            return [self.items[episode_id] for episode_id, score in self.text_index.search(query, limit)]
         
         # If the query is a dictionary with a time range, search for episodes in that range
         elif isinstance(query, dict) and ("start_time" in query or "end_time" in query):
-            return self.get_episodes_in_range(query.get("start_time"), query.get("end_time"))[:limit]
+            return list(itertools.islice(self.iter_episodes_in_range(query.get("start_time"), query.get("end_time")), limit))
         
         # Otherwise, use the default search
         return super().search(query, limit)
@@ -409,7 +658,10 @@ class EpisodicMemory(Memory[T]):
         Returns:
             Dictionary representation of the episodic memory system.
         """
-        return super().to_dict()
+        data = super().to_dict()
+        if self._text_index is not None:
+            data["text_index"] = self._text_index.to_dict()
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'EpisodicMemory':
@@ -429,4 +681,9 @@ class EpisodicMemory(Memory[T]):
             item = Episode.from_dict(item_data)
             memory.add(item)
         
+        # Restore the text index instead of re-tokenizing every episode
+        if "text_index" in data:
+            memory._text_index = TextIndex.from_dict(data["text_index"])
+            memory._text_index.retain(memory.items)
+        
         return memory
@@ -7,6 +7,7 @@ This module provides graph-based memory systems, including Neo4j and NetworkX.
 from augment_adam.memory.graph.base import GraphMemory, GraphMemoryItem, Node, Edge, Relationship
 from augment_adam.memory.graph.neo4j import Neo4jMemory
 from augment_adam.memory.graph.networkx import NetworkXMemory
+from augment_adam.memory.graph.node_index import NodeIndex
 
 __all__ = [
     "GraphMemory",
@@ -16,4 +17,5 @@ __all__ = [
     "Relationship",
     "Neo4jMemory",
     "NetworkXMemory",
+    "NodeIndex",
 ]
\ No newline at end of file
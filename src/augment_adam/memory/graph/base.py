@@ -9,14 +9,19 @@ Edge class, and Relationship enum.
 import uuid
 import json
 import datetime
+from collections import deque
 from enum import Enum, auto
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar, Generic
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, Iterator, Iterable, TypeVar, Generic
 from dataclasses import dataclass, field
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.core.base import Memory, MemoryItem, MemoryType
 
 
+# Edge directions that can be followed during traversal
+DIRECTIONS = ("out", "in", "both")
+
+
 class Relationship(Enum):
     """
     Types of relationships in a graph memory.
@@ -46,6 +51,24 @@ class Relationship(Enum):
     CUSTOM = auto()
 
 
+def _to_relationship(relationship: Union[Relationship, str]) -> Relationship:
+    """
+    Convert a relationship name to a relationship, as Edge does.
+
+    Args:
+        relationship: The relationship or its name.
+
+    Returns:
+        The relationship, or Relationship.CUSTOM for unknown names.
+    """
+    if not isinstance(relationship, str):
+        return relationship
+    try:
+        return Relationship[relationship]
+    except KeyError:
+        return Relationship.CUSTOM
+
+
 @dataclass
 class Node:
     """
@@ -242,6 +265,13 @@ class GraphMemoryItem(MemoryItem):
     This class represents an item stored in graph memory, including its content,
     metadata, nodes, and edges.
 
+    Outgoing and incoming adjacency maps (node ID -> neighbor ID -> edge IDs)
+    are kept alongside the edges, so neighbor lookups, edge lookups between
+    two nodes and node removal only touch the edges of the nodes involved.
+    The maps are maintained by add_edge, remove_edge and remove_node, and
+    rebuilt if the number of edges no longer matches (for example, after
+    edges is written to directly).
+
     Attributes:
         id: Unique identifier for the memory item.
         content: The content of the memory item.
@@ -261,6 +291,56 @@ class GraphMemoryItem(MemoryItem):
     nodes: Dict[str, Node] = field(default_factory=dict)
     edges: Dict[str, Edge] = field(default_factory=dict)
 
+    # Adjacency maps: node ID -> neighbor ID -> edge IDs (in insertion order)
+    _out: Optional[Dict[str, Dict[str, Dict[str, None]]]] = field(default=None, init=False, repr=False, compare=False)
+    _in: Optional[Dict[str, Dict[str, Dict[str, None]]]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_edges: int = field(default=0, init=False, repr=False, compare=False)
+
+    def _adjacency(self) -> Tuple[Dict[str, Dict[str, Dict[str, None]]], Dict[str, Dict[str, Dict[str, None]]]]:
+        """
+        Get the adjacency maps, rebuilding them if they are out of date.
+
+        Returns:
+            The outgoing and incoming adjacency maps.
+        """
+        if self._out is None or self._indexed_edges != len(self.edges):
+            self._out = {}
+            self._in = {}
+            self._indexed_edges = 0
+            for edge in self.edges.values():
+                self._index_edge(edge)
+
+        return self._out, self._in
+
+    def _index_edge(self, edge: Edge) -> None:
+        """
+        Add an edge to the adjacency maps.
+
+        Args:
+            edge: The edge to add.
+        """
+        self._out.setdefault(edge.source_id, {}).setdefault(edge.target_id, {})[edge.id] = None
+        self._in.setdefault(edge.target_id, {}).setdefault(edge.source_id, {})[edge.id] = None
+        self._indexed_edges += 1
+
+    def _unindex_edge(self, edge: Edge) -> None:
+        """
+        Remove an edge from the adjacency maps.
+
+        Args:
+            edge: The edge to remove.
+        """
+        for adjacency, node_id, neighbor_id in ((self._out, edge.source_id, edge.target_id), (self._in, edge.target_id, edge.source_id)):
+            neighbors = adjacency[node_id]
+            edge_ids = neighbors[neighbor_id]
+            del edge_ids[edge.id]
+            if not edge_ids:
+                del neighbors[neighbor_id]
+                if not neighbors:
+                    del adjacency[node_id]
+
+        self._indexed_edges -= 1
+
     def add_node(self, node: Node) -> str:
         """
         Add a node to the graph.
@@ -317,13 +397,16 @@ class GraphMemoryItem(MemoryItem):
         """
         if node_id in self.nodes:
             # Remove all edges connected to this node
-            edges_to_remove = []
-            for edge_id, edge in self.edges.items():
-                if edge.source_id == node_id or edge.target_id == node_id:
-                    edges_to_remove.append(edge_id)
+            out_edges, in_edges = self._adjacency()
+            edges_to_remove = [
+                edge_id
+                for adjacency in (out_edges, in_edges)
+                for edge_ids in adjacency.get(node_id, {}).values()
+                for edge_id in edge_ids
+            ]
 
             for edge_id in edges_to_remove:
-                del self.edges[edge_id]
+                self.remove_edge(edge_id)
 
             # Remove the node
             del self.nodes[node_id]
@@ -341,7 +424,14 @@ class GraphMemoryItem(MemoryItem):
         Returns:
             The ID of the added edge.
         """
+        self._adjacency()
+
+        previous = self.edges.get(edge.id)
+        if previous is not None:
+            self._unindex_edge(previous)
+
         self.edges[edge.id] = edge
+        self._index_edge(edge)
         return edge.id
 
     def get_edge(self, edge_id: str) -> Optional[Edge]:
@@ -386,7 +476,8 @@ class GraphMemoryItem(MemoryItem):
             True if the edge was removed, False otherwise.
         """
         if edge_id in self.edges:
-            del self.edges[edge_id]
+            self._adjacency()
+            self._unindex_edge(self.edges.pop(edge_id))
             return True
 
         return False
@@ -399,19 +490,20 @@ class GraphMemoryItem(MemoryItem):
             node_id: The ID of the node.
 
         Returns:
-            List of neighboring nodes.
+            List of neighboring nodes, with one entry per connecting edge.
         """
+        out_edges, in_edges = self._adjacency()
         neighbors = []
 
-        for edge in self.edges.values():
-            if edge.source_id == node_id:
-                neighbor = self.get_node(edge.target_id)
-                if neighbor is not None:
-                    neighbors.append(neighbor)
-            elif edge.target_id == node_id:
-                neighbor = self.get_node(edge.source_id)
+        for adjacency in (out_edges, in_edges):
+            for neighbor_id, edge_ids in adjacency.get(node_id, {}).items():
+                # Self-loops are listed in both maps but only count once
+                if adjacency is in_edges and neighbor_id == node_id:
+                    continue
+
+                neighbor = self.get_node(neighbor_id)
                 if neighbor is not None:
-                    neighbors.append(neighbor)
+                    neighbors.extend([neighbor] * len(edge_ids))
 
         return neighbors
 
@@ -426,13 +518,133 @@ class GraphMemoryItem(MemoryItem):
         Returns:
             List of edges between the nodes.
         """
-        edges = []
+        out_edges, _ = self._adjacency()
+
+        edge_ids = list(out_edges.get(node1_id, {}).get(node2_id, {}))
+        if node2_id != node1_id:
+            edge_ids.extend(out_edges.get(node2_id, {}).get(node1_id, {}))
+
+        return [self.edges[edge_id] for edge_id in edge_ids]
+
+    def _follow(self, node_id: str, direction: str, relationships: Optional[Set[Relationship]]) -> Iterator[str]:
+        """
+        Iterate over the neighbors reachable from a node in one step.
+
+        Args:
+            node_id: The ID of the node.
+            direction: The edge direction to follow ("out", "in" or "both").
+            relationships: The relationships to follow (all if None).
+
+        Returns:
+            Iterator of neighbor IDs (a neighbor may appear once per map).
+        """
+        out_edges, in_edges = self._adjacency()
+        maps = {"out": (out_edges,), "in": (in_edges,), "both": (out_edges, in_edges)}[direction]
+
+        for adjacency in maps:
+            for neighbor_id, edge_ids in adjacency.get(node_id, {}).items():
+                if relationships is None or any(self.edges[edge_id].relationship in relationships for edge_id in edge_ids):
+                    yield neighbor_id
+
+    def bfs(
+        self,
+        start_id: str,
+        max_depth: Optional[int] = None,
+        direction: str = "both",
+        relationships: Optional[Iterable[Union[Relationship, str]]] = None,
+    ) -> Iterator[Tuple[Node, int]]:
+        """
+        Traverse the graph breadth-first from a node.
+
+        Each node is visited once, at its shortest distance from the start.
+        Nodes are yielded lazily, so callers can stop early. Arguments are
+        checked when bfs is called, not when iteration starts.
+
+        Args:
+            start_id: The ID of the node to start from.
+            max_depth: The maximum number of hops to traverse (unlimited if None).
+            direction: The edge direction to follow ("out", "in" or "both").
+            relationships: The relationships to follow (all if None). Unknown
+                relationship names follow custom relationships, as in Edge.
+
+        Returns:
+            Iterator of (node, depth) pairs, starting with (start node, 0).
+
+        Raises:
+            ValueError: If the direction is not supported.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unsupported direction: {direction}")
+
+        if relationships is not None:
+            relationships = {_to_relationship(relationship) for relationship in relationships}
+
+        return self._bfs(start_id, max_depth, direction, relationships)
+
+    def _bfs(
+        self,
+        start_id: str,
+        max_depth: Optional[int],
+        direction: str,
+        relationships: Optional[Set[Relationship]],
+    ) -> Iterator[Tuple[Node, int]]:
+        """
+        Traverse the graph breadth-first from a node; see bfs.
+
+        Args:
+            start_id: The ID of the node to start from.
+            max_depth: The maximum number of hops to traverse (unlimited if None).
+            direction: The edge direction to follow.
+            relationships: The relationships to follow (all if None).
+
+        Returns:
+            Iterator of (node, depth) pairs.
+        """
+        start = self.get_node(start_id)
+        if start is None:
+            return
+
+        visited = {start_id}
+        queue = deque([(start_id, 0)])
+        yield start, 0
 
-        for edge in self.edges.values():
-            if (edge.source_id == node1_id and edge.target_id == node2_id) or (edge.source_id == node2_id and edge.target_id == node1_id):
-                edges.append(edge)
+        while queue:
+            node_id, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
 
-        return edges
+            for neighbor_id in self._follow(node_id, direction, relationships):
+                if neighbor_id in visited:
+                    continue
+                visited.add(neighbor_id)
+
+                neighbor = self.get_node(neighbor_id)
+                if neighbor is None:
+                    continue
+
+                queue.append((neighbor_id, depth + 1))
+                yield neighbor, depth + 1
+
+    def get_k_hop_neighbors(
+        self,
+        node_id: str,
+        k: int,
+        direction: str = "both",
+        relationships: Optional[Iterable[Union[Relationship, str]]] = None,
+    ) -> List[Node]:
+        """
+        Get the nodes within k hops of a node.
+
+        Args:
+            node_id: The ID of the node.
+            k: The maximum number of hops.
+            direction: The edge direction to follow ("out", "in" or "both").
+            relationships: The relationships to follow (all if None).
+
+        Returns:
+            List of nodes within k hops, excluding the node itself, in order of distance.
+        """
+        return [node for node, depth in self.bfs(node_id, k, direction, relationships) if depth > 0]
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -677,6 +889,66 @@ class GraphMemory(Memory[T]):
 
         return item.get_edges_between(node1_id, node2_id)
 
+    def bfs(
+        self,
+        item_id: str,
+        start_id: str,
+        max_depth: Optional[int] = None,
+        direction: str = "both",
+        relationships: Optional[Iterable[Union[Relationship, str]]] = None,
+    ) -> Iterator[Tuple[Node, int]]:
+        """
+        Traverse a graph memory item breadth-first from a node.
+
+        Args:
+            item_id: The ID of the memory item.
+            start_id: The ID of the node to start from.
+            max_depth: The maximum number of hops to traverse (unlimited if None).
+            direction: The edge direction to follow ("out", "in" or "both").
+            relationships: The relationships to follow (all if None).
+
+        Returns:
+            Iterator of (node, depth) pairs, or an empty iterator if the memory item doesn't exist.
+
+        Raises:
+            ValueError: If the direction is not supported.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unsupported direction: {direction}")
+
+        item = self.get(item_id)
+        if item is None:
+            return iter(())
+
+        return item.bfs(start_id, max_depth, direction, relationships)
+
+    def get_k_hop_neighbors(
+        self,
+        item_id: str,
+        node_id: str,
+        k: int,
+        direction: str = "both",
+        relationships: Optional[Iterable[Union[Relationship, str]]] = None,
+    ) -> List[Node]:
+        """
+        Get the nodes within k hops of a node in a graph memory item.
+
+        Args:
+            item_id: The ID of the memory item.
+            node_id: The ID of the node.
+            k: The maximum number of hops.
+            direction: The edge direction to follow ("out", "in" or "both").
+            relationships: The relationships to follow (all if None).
+
+        Returns:
+            List of nodes within k hops, or an empty list if the memory item or node doesn't exist.
+        """
+        item = self.get(item_id)
+        if item is None:
+            return []
+
+        return item.get_k_hop_neighbors(node_id, k, direction, relationships)
+
     def search(self, query: Any, limit: int = 10) -> List[T]:
         """
         Search for items in memory.
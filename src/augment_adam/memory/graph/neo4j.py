@@ -8,13 +8,38 @@ which is a graph database management system.
 import os
 import json
 import uuid
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar, cast
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, TypeVar, cast
 from neo4j import GraphDatabase
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.graph.base import GraphMemory, GraphMemoryItem, Node, Edge, Relationship
 
 
+# Batched write statements. Values are passed as parameter lists, so the
+# statement text only varies with the label set and stays in the plan cache.
+MERGE_ITEMS_QUERY = """
+UNWIND $rows AS row
+MERGE (i:Item {id: row.id})
+SET i += row.properties
+"""
+
+MERGE_NODES_QUERY = """
+UNWIND $rows AS row
+MATCH (i:Item {{id: row.item_id}})
+MERGE (n:Node {{id: row.id}})
+SET n += row.properties{labels}
+MERGE (i)-[:CONTAINS]->(n)
+"""
+
+MERGE_EDGES_QUERY = """
+UNWIND $rows AS row
+MATCH (s:Node {id: row.source_id})
+MATCH (t:Node {id: row.target_id})
+MERGE (s)-[r:EDGE {id: row.id}]->(t)
+SET r += row.properties
+"""
+
+
 @tag("memory.graph.neo4j")
 class Neo4jMemory(GraphMemory[GraphMemoryItem]):
     """
@@ -29,6 +54,7 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
         username: The username for the Neo4j database.
         password: The password for the Neo4j database.
         driver: The Neo4j driver.
+        batch_size: The maximum number of rows sent per batched write statement.
         items: Dictionary of items in memory, keyed by ID.
         metadata: Additional metadata for the memory system.
     
@@ -36,7 +62,15 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
     TODO(Issue #6): Implement memory validation
     """
     
-    def __init__(self, name: str, uri: str, username: str, password: str) -> None:
+    def __init__(
+        self,
+        name: str,
+        uri: str,
+        username: str,
+        password: str,
+        batch_size: int = 1000,
+        driver: Optional[Any] = None,
+    ) -> None:
         """
         Initialize the Neo4j memory system.
         
@@ -45,15 +79,21 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
             uri: The URI of the Neo4j database.
             username: The username for the Neo4j database.
             password: The password for the Neo4j database.
+            batch_size: The maximum number of rows sent per batched write statement.
+            driver: An existing Neo4j driver to use instead of creating one.
         """
         super().__init__(name)
         
         self.uri = uri
         self.username = username
         self.password = password
+        self.batch_size = batch_size
         
         # Create Neo4j driver
-        self.driver = GraphDatabase.driver(uri, auth=(username, password))
+        self.driver = driver if driver is not None else GraphDatabase.driver(uri, auth=(username, password))
+        
+        # Session reused by the write path, opened on first use
+        self._write_session: Optional[Any] = None
         
         # Initialize the database
         self._init_database()
@@ -79,41 +119,131 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
         Returns:
             The ID of the added item.
         """
-        # Add the item to the dictionary
-        super().add(item)
-        
-        # Add the item to the Neo4j database
-        with self.driver.session() as session:
-            # Create the item node
-            session.run(
-                "CREATE (i:Item {id: $id, content: $content, created_at: $created_at, updated_at: $updated_at, expires_at: $expires_at, importance: $importance})",
-                id=item.id,
-                content=str(item.content) if item.content is not None else None,
-                created_at=item.created_at,
-                updated_at=item.updated_at,
-                expires_at=item.expires_at,
-                importance=item.importance
-            )
-            
-            # Add metadata
-            for key, value in item.metadata.items():
-                session.run(
-                    "MATCH (i:Item {id: $id}) SET i[$key] = $value",
-                    id=item.id,
-                    key=key,
-                    value=str(value)
-                )
-            
-            # Add nodes
-            for node in item.nodes.values():
-                self._add_node_to_neo4j(item.id, node)
-            
-            # Add edges
-            for edge in item.edges.values():
-                self._add_edge_to_neo4j(item.id, edge)
+        self.add_many([item])
         
         return item.id
     
+    def add_many(self, items: List[GraphMemoryItem]) -> List[str]:
+        """
+        Add several items to memory in one transaction.
+        
+        Items, nodes and edges are written with batched UNWIND statements:
+        one per chunk of items, one per chunk of nodes with the same labels,
+        and one per chunk of edges, all in a single explicit transaction on
+        the reused write session.
+        
+        Args:
+            items: The items to add to memory.
+        
+        Returns:
+            The IDs of the added items.
+        """
+        # Add the items to the dictionary
+        for item in items:
+            super().add(item)
+        
+        # Add the items to the Neo4j database
+        with self._session().begin_transaction() as tx:
+            self._run_batched(tx, MERGE_ITEMS_QUERY, [self._item_row(item) for item in items])
+            self._write_nodes(tx, [(item.id, node) for item in items for node in item.nodes.values()])
+            self._write_edges(tx, [edge for item in items for edge in item.edges.values()])
+            tx.commit()
+        
+        return [item.id for item in items]
+    
+    def _session(self) -> Any:
+        """
+        Get the session used for writes, opening it if needed.
+        
+        Returns:
+            The Neo4j session.
+        """
+        if self._write_session is None:
+            self._write_session = self.driver.session()
+        
+        return self._write_session
+    
+    def _run_batched(self, runner: Any, query: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Run an UNWIND statement over rows in chunks of batch_size.
+        
+        Args:
+            runner: The session or transaction to run the statement in.
+            query: The statement, which unwinds the $rows parameter.
+            rows: The rows to send.
+        """
+        for start in range(0, len(rows), self.batch_size):
+            runner.run(query, rows=rows[start:start + self.batch_size])
+    
+    @staticmethod
+    def _item_row(item: GraphMemoryItem) -> Dict[str, Any]:
+        """
+        Get the parameter row for an item.
+        
+        Args:
+            item: The item.
+        
+        Returns:
+            The row, with the item's fields and metadata as properties.
+        """
+        properties = {key: str(value) for key, value in item.metadata.items()}
+        properties.update({
+            "content": str(item.content) if item.content is not None else None,
+            "created_at": item.created_at,
+            "updated_at": item.updated_at,
+            "expires_at": item.expires_at,
+            "importance": item.importance,
+        })
+        
+        return {"id": item.id, "properties": properties}
+    
+    def _write_nodes(self, runner: Any, nodes: List[Tuple[str, Node]]) -> None:
+        """
+        Write nodes with one batched statement per label set.
+        
+        Labels can't be passed as parameters, so nodes are grouped by their
+        labels and each group gets its own statement.
+        
+        Args:
+            runner: The session or transaction to run the statements in.
+            nodes: (item ID, node) pairs to write.
+        """
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for item_id, node in nodes:
+            properties = {key: str(value) for key, value in node.properties.items()}
+            properties["created_at"] = node.created_at
+            properties["updated_at"] = node.updated_at
+            
+            labels = tuple(sorted(set(node.labels)))
+            groups.setdefault(labels, []).append({"item_id": item_id, "id": node.id, "properties": properties})
+        
+        for labels, rows in groups.items():
+            label_clause = ", n" + "".join(":`{}`".format(label.replace("`", "``")) for label in labels) if labels else ""
+            self._run_batched(runner, MERGE_NODES_QUERY.format(labels=label_clause), rows)
+    
+    def _write_edges(self, runner: Any, edges: List[Edge]) -> None:
+        """
+        Write edges with batched statements.
+        
+        Every edge is an EDGE relationship with its type as a property, so
+        all edges share one statement.
+        
+        Args:
+            runner: The session or transaction to run the statements in.
+            edges: The edges to write.
+        """
+        rows = []
+        for edge in edges:
+            properties = {key: str(value) for key, value in edge.properties.items()}
+            properties.update({
+                "type": edge.relationship.name if isinstance(edge.relationship, Relationship) else edge.relationship,
+                "created_at": edge.created_at,
+                "updated_at": edge.updated_at,
+            })
+            rows.append({"id": edge.id, "source_id": edge.source_id, "target_id": edge.target_id, "properties": properties})
+        
+        self._run_batched(runner, MERGE_EDGES_QUERY, rows)
+    
     def _add_node_to_neo4j(self, item_id: str, node: Node) -> None:
         """
         Add a node to the Neo4j database.
@@ -122,31 +252,7 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
             item_id: The ID of the memory item.
             node: The node to add.
         """
-        with self.driver.session() as session:
-            # Create the node
-            query = "MATCH (i:Item {id: $item_id}) CREATE (n:Node {id: $id, created_at: $created_at, updated_at: $updated_at})"
-            
-            # Add labels
-            for label in node.labels:
-                query += f" SET n:`{label}`"
-            
-            # Add properties
-            for key, value in node.properties.items():
-                query += f" SET n.`{key}` = ${key}"
-            
-            # Create relationship to item
-            query += " CREATE (i)-[:CONTAINS]->(n)"
-            
-            # Execute the query
-            params = {
-                "item_id": item_id,
-                "id": node.id,
-                "created_at": node.created_at,
-                "updated_at": node.updated_at,
-                **{key: str(value) for key, value in node.properties.items()}
-            }
-            
-            session.run(query, **params)
+        self._write_nodes(self._session(), [(item_id, node)])
     
     def _add_edge_to_neo4j(self, item_id: str, edge: Edge) -> None:
         """
@@ -156,34 +262,7 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
             item_id: The ID of the memory item.
             edge: The edge to add.
         """
-        with self.driver.session() as session:
-            # Create the edge
-            relationship_type = edge.relationship.name if isinstance(edge.relationship, Relationship) else edge.relationship
-            
-            query = """
-            MATCH (i:Item {id: $item_id})
-            MATCH (s:Node {id: $source_id})
-            MATCH (t:Node {id: $target_id})
-            CREATE (s)-[r:EDGE {id: $id, type: $type, created_at: $created_at, updated_at: $updated_at}]->(t)
-            """
-            
-            # Add properties
-            for key, value in edge.properties.items():
-                query += f" SET r.`{key}` = ${key}"
-            
-            # Execute the query
-            params = {
-                "item_id": item_id,
-                "id": edge.id,
-                "source_id": edge.source_id,
-                "target_id": edge.target_id,
-                "type": relationship_type,
-                "created_at": edge.created_at,
-                "updated_at": edge.updated_at,
-                **{key: str(value) for key, value in edge.properties.items()}
-            }
-            
-            session.run(query, **params)
+        self._write_edges(self._session(), [edge])
     
     def get(self, item_id: str) -> Optional[GraphMemoryItem]:
         """
@@ -660,7 +739,11 @@ class Neo4jMemory(GraphMemory[GraphMemoryItem]):
         return super().search(query, limit)
     
     def close(self) -> None:
-        """Close the Neo4j driver."""
+        """Close the write session and the Neo4j driver."""
+        if self._write_session is not None:
+            self._write_session.close()
+            self._write_session = None
+        
         self.driver.close()
     
     def __del__(self) -> None:
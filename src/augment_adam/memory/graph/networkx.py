@@ -8,11 +8,12 @@ which is a Python package for the creation, manipulation, and study of complex n
 import os
 import json
 import uuid
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar, cast
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, TypeVar, cast
 import networkx as nx
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.graph.base import GraphMemory, GraphMemoryItem, Node, Edge, Relationship
+from augment_adam.memory.graph.node_index import NodeIndex
 
 
 @tag("memory.graph.networkx")
@@ -23,26 +24,139 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
     This class implements a graph memory system using NetworkX for efficient
     in-memory storage and manipulation of graph data.
     
+    Dictionary queries are answered through a NodeIndex over the nodes of all
+    items: every node is indexed by label, and the property keys listed in
+    indexed_properties get a hash or sorted index. The index is built on first
+    use and then kept up to date as items and nodes are added, updated and
+    removed.
+    
     Attributes:
         name: The name of the memory system.
         graphs: Dictionary of NetworkX graphs, keyed by item ID.
         items: Dictionary of items in memory, keyed by ID.
         metadata: Additional metadata for the memory system.
+        indexed_properties: Mapping from indexed property keys to their index
+            kind ("hash" or "sorted").
     
     TODO(Issue #6): Add support for memory persistence
     TODO(Issue #6): Implement memory validation
     """
     
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, indexed_properties: Optional[Dict[str, str]] = None) -> None:
         """
         Initialize the NetworkX memory system.
         
         Args:
             name: The name of the memory system.
+            indexed_properties: Mapping from node property keys to index kinds
+                ("hash" for equality, "sorted" for equality and ranges).
         """
         super().__init__(name)
         
         self.graphs: Dict[str, nx.MultiDiGraph] = {}
+        self.indexed_properties: Dict[str, str] = dict(indexed_properties or {})
+        
+        # Built on first use, see node_index
+        self._node_index: Optional[NodeIndex] = None
+        self._item_positions: Dict[str, int] = {}
+        self._next_position = 0
+    
+    @property
+    def node_index(self) -> NodeIndex:
+        """
+        Get the node index, building it if needed.
+        
+        Returns:
+            The node index.
+        """
+        if self._node_index is None:
+            index = NodeIndex()
+            for key, kind in self.indexed_properties.items():
+                index.create_index(key, kind)
+            
+            self._item_positions = {}
+            self._next_position = 0
+            self._node_index = index
+            for item in self.items.values():
+                self._index_item(item)
+        
+        return self._node_index
+    
+    def _index_item(self, item: GraphMemoryItem) -> None:
+        """
+        Add the nodes of an item to the node index.
+        
+        Args:
+            item: The item to index.
+        """
+        if item.id not in self._item_positions:
+            self._item_positions[item.id] = self._next_position
+            self._next_position += 1
+        
+        for node in item.nodes.values():
+            self._node_index.add(item.id, node)
+    
+    def _unindex_item(self, item_id: str) -> None:
+        """
+        Remove the nodes of an item from the node index.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        item = self.items.get(item_id)
+        if item is not None:
+            self._node_index.remove_item(item_id, item.nodes)
+        self._item_positions.pop(item_id, None)
+    
+    def create_index(self, key: str, kind: str = "hash") -> None:
+        """
+        Create an index on a node property key.
+        
+        Args:
+            key: The property key to index.
+            kind: The kind of index ("hash" for equality, "sorted" for
+                equality and ranges).
+        
+        Raises:
+            ValueError: If the kind is not supported.
+        """
+        if self._node_index is not None:
+            nodes = ((item_id, node) for item_id, item in self.items.items() for node in item.nodes.values())
+            self._node_index.create_index(key, kind, nodes)
+        elif kind not in ("hash", "sorted"):
+            raise ValueError(f"Unsupported index kind: {kind}")
+        
+        self.indexed_properties[key] = kind
+    
+    def drop_index(self, key: str) -> None:
+        """
+        Drop the index on a node property key.
+        
+        Args:
+            key: The property key.
+        """
+        self.indexed_properties.pop(key, None)
+        if self._node_index is not None:
+            self._node_index.drop_index(key)
+    
+    def reindex(self, item_id: str) -> None:
+        """
+        Refresh the node index entries of an item.
+        
+        Call this after modifying the nodes of an item directly instead of
+        through add_node, update_node or remove_node.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        if self._node_index is None:
+            return
+        
+        self._node_index.remove_item(item_id)
+        
+        item = self.items.get(item_id)
+        if item is not None:
+            self._index_item(item)
     
     def add(self, item: GraphMemoryItem) -> str:
         """
@@ -54,9 +168,16 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         Returns:
             The ID of the added item.
         """
+        # Drop the index entries of any item this one replaces
+        if self._node_index is not None:
+            self._unindex_item(item.id)
+        
         # Add the item to the dictionary
         super().add(item)
         
+        if self._node_index is not None:
+            self._index_item(item)
+        
         # Create a NetworkX graph for the item
         graph = nx.MultiDiGraph()
         
@@ -125,6 +246,9 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         Returns:
             True if the item was removed, False otherwise.
         """
+        if self._node_index is not None:
+            self._unindex_item(item_id)
+        
         # Remove the item from the dictionary
         if not super().remove(item_id):
             return False
@@ -142,6 +266,11 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         # Clear the graphs
         self.graphs = {}
     
+        if self._node_index is not None:
+            self._node_index.clear()
+            self._item_positions = {}
+            self._next_position = 0
+    
     def add_node(self, item_id: str, node: Node) -> Optional[str]:
         """
         Add a node to a graph memory item.
@@ -156,6 +285,9 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         # Add the node to the item
         node_id = super().add_node(item_id, node)
         
+        if node_id is not None and self._node_index is not None:
+            self._node_index.add(item_id, node)
+        
         # If the node was added, add it to the graph
         if node_id is not None and item_id in self.graphs:
             self.graphs[item_id].add_node(
@@ -185,6 +317,9 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         # Update the node in the item
         node = super().update_node(item_id, node_id, labels, properties)
         
+        if node is not None and self._node_index is not None:
+            self._node_index.add(item_id, node)
+        
         # If the node was updated, update it in the graph
         if node is not None and item_id in self.graphs and node_id in self.graphs[item_id]:
             if labels is not None:
@@ -212,6 +347,9 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         if not super().remove_node(item_id, node_id):
             return False
         
+        if self._node_index is not None:
+            self._node_index.remove(item_id, node_id)
+        
         # Remove the node from the graph
         if item_id in self.graphs and node_id in self.graphs[item_id]:
             self.graphs[item_id].remove_node(node_id)
@@ -265,17 +403,16 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         
         # If the edge was updated, update it in the graph
         if edge is not None and item_id in self.graphs:
-            # Find the edge in the graph
-            for u, v, k, data in self.graphs[item_id].edges(keys=True, data=True):
-                if data.get("id") == edge_id:
-                    if relationship is not None:
-                        self.graphs[item_id][u][v][k]["relationship"] = relationship
+            key = self._find_edge(item_id, edge)
+            if key is not None:
+                u, v, k = key
+                if relationship is not None:
+                    self.graphs[item_id][u][v][k]["relationship"] = relationship
                     
-                    if properties is not None:
-                        self.graphs[item_id][u][v][k]["properties"].update(properties)
+                if properties is not None:
+                    self.graphs[item_id][u][v][k]["properties"].update(properties)
                     
-                    self.graphs[item_id][u][v][k]["updated_at"] = edge.updated_at
-                    break
+                self.graphs[item_id][u][v][k]["updated_at"] = edge.updated_at
         
         return edge
     
@@ -290,20 +427,48 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         Returns:
             True if the edge was removed, False otherwise.
         """
+        # Look up the edge before it is removed from the item
+        item = self.get(item_id)
+        edge = item.get_edge(edge_id) if item is not None else None
+        
         # Remove the edge from the item
         if not super().remove_edge(item_id, edge_id):
             return False
         
         # Remove the edge from the graph
-        if item_id in self.graphs:
-            # Find the edge in the graph
-            for u, v, k, data in self.graphs[item_id].edges(keys=True, data=True):
-                if data.get("id") == edge_id:
-                    self.graphs[item_id].remove_edge(u, v, k)
-                    break
+        if item_id in self.graphs and edge is not None:
+            key = self._find_edge(item_id, edge)
+            if key is not None:
+                self.graphs[item_id].remove_edge(*key)
         
         return True
     
+    def _find_edge(self, item_id: str, edge: Edge) -> Optional[Tuple[str, str, Any]]:
+        """
+        Find the (source, target, key) triple of an edge in the graph of an item.
+        
+        Edges are stored under their ID as key, so the triple is read off the
+        edge itself. Only the parallel edges between the same two nodes are
+        scanned if the graph uses different keys.
+        
+        Args:
+            item_id: The ID of the memory item.
+            edge: The edge to find.
+        
+        Returns:
+            The (source, target, key) triple, or None if the edge isn't in the graph.
+        """
+        graph = self.graphs[item_id]
+        if graph.has_edge(edge.source_id, edge.target_id, key=edge.id):
+            return edge.source_id, edge.target_id, edge.id
+        
+        if graph.has_edge(edge.source_id, edge.target_id):
+            for k, data in graph[edge.source_id][edge.target_id].items():
+                if data.get("id") == edge.id:
+                    return edge.source_id, edge.target_id, k
+        
+        return None
+    
     def get_neighbors(self, item_id: str, node_id: str) -> List[Node]:
         """
         Get the neighbors of a node in a graph memory item.
@@ -395,45 +560,50 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
         # If the query is a string, search for nodes with matching properties
         if isinstance(query, str):
             results = []
+            query_lower = query.lower()
             
-            for item_id, graph in self.graphs.items():
-                for node_id, data in graph.nodes(data=True):
-                    # Check if any property value contains the query
-                    properties = data.get("properties", {})
-                    for value in properties.values():
-                        if isinstance(value, str) and query.lower() in value.lower():
-                            item = self.get(item_id)
-                            if item is not None and item not in results:
-                                results.append(item)
-                                break
+            for item_id, item in self.items.items():
+                if len(results) >= limit:
+                    break
                     
-                    # If we've already added this item, move on
-                    if len(results) > 0 and results[-1].id == item_id:
-                        break
+                # Check if any property value of any node contains the query
+                if any(
+                    isinstance(value, str) and query_lower in value.lower()
+                    for node in item.nodes.values()
+                    for value in node.properties.values()
+                ):
+                    results.append(item)
             
-            return results[:limit]
+            return results
         
         # If the query is a dictionary, search for nodes with matching properties
         elif isinstance(query, dict):
-            results = []
+            index = self.node_index
+            candidates = index.lookup(query)
             
-            for item_id, graph in self.graphs.items():
-                for node_id, data in graph.nodes(data=True):
-                    # Check if all query properties match
-                    properties = data.get("properties", {})
-                    match = True
-                    for key, value in query.items():
-                        if key not in properties or properties[key] != value:
-                            match = False
-                            break
+            # No index applies: check the nodes of every item
+            if candidates is None:
+                results = []
+                for item_id, item in self.items.items():
+                    if len(results) >= limit:
+                        break
+                    if any(index.matches(node, query) for node in item.nodes.values()):
+                        results.append(item)
                     
-                    if match:
-                        item = self.get(item_id)
-                        if item is not None and item not in results:
-                            results.append(item)
-                            break
+                return results
+            
+            # Check only the candidate nodes against the full query
+            matched: Set[str] = set()
+            for item_id, node_id in candidates:
+                if item_id in matched:
+                    continue
+                item = self.items.get(item_id)
+                node = item.get_node(node_id) if item is not None else None
+                if node is not None and index.matches(node, query):
+                    matched.add(item_id)
             
-            return results[:limit]
+            ordered = sorted(matched, key=lambda item_id: self._item_positions.get(item_id, 0))
+            return [self.items[item_id] for item_id in ordered[:limit]]
         
         # Otherwise, use the default implementation
         return super().search(query, limit)
@@ -467,6 +637,7 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
                 "name": self.name,
                 "memory_type": self.memory_type.name,
                 "metadata": self.metadata,
+                "indexed_properties": self.indexed_properties,
             }, f)
     
     @classmethod
@@ -485,7 +656,10 @@ class NetworkXMemory(GraphMemory[GraphMemoryItem]):
             metadata_data = json.load(f)
         
         # Create the memory system
-        memory = cls(name=metadata_data.get("name", ""))
+        memory = cls(
+            name=metadata_data.get("name", ""),
+            indexed_properties=metadata_data.get("indexed_properties"),
+        )
         memory.metadata = metadata_data.get("metadata", {})
         
         # Load the items
@@ -0,0 +1,441 @@
+"""
+Secondary indexes over the nodes of graph memory systems.
+
+This module provides the NodeIndex class, which indexes the nodes of every
+graph in a memory system by label and by selected property keys, and plans
+dictionary queries against the most selective of those indexes.
+"""
+
+import bisect
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable, Hashable
+
+from augment_adam.utils.tagging import tag, TagCategory
+from augment_adam.memory.graph.base import Node
+
+
+# Kinds of property indexes
+INDEX_KINDS = ("hash", "sorted")
+
+# Operators supported in property conditions
+RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+QUERY_OPERATORS = ("$eq", "$in") + RANGE_OPERATORS
+
+# Reserved query key for label conditions
+LABEL_KEY = "$label"
+
+# Reference to a node: (item ID, node ID)
+NodeRef = Tuple[str, str]
+
+
+def _sort_class(value: Any) -> Optional[str]:
+    """
+    Get the class of values a value can be range-compared with.
+    
+    Args:
+        value: The value.
+    
+    Returns:
+        "number", "string", or None if the value can't be sorted.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return None
+
+
+def _hashable(value: Any) -> bool:
+    """Check whether a value can be used as a hash index key."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _is_operators(condition: Any) -> bool:
+    """
+    Check whether a condition is a dictionary of operators.
+    
+    Only dictionaries whose keys all start with "$" are read as operators;
+    other dictionaries are plain values compared for equality.
+    
+    Args:
+        condition: The condition.
+    
+    Returns:
+        True if the condition is a dictionary of operators.
+    """
+    return (
+        isinstance(condition, dict) and
+        bool(condition) and
+        all(isinstance(key, str) and key.startswith("$") for key in condition)
+    )
+
+
+def _matches(properties: Dict[str, Any], key: str, condition: Any) -> bool:
+    """
+    Check whether a node's properties satisfy a condition on one key.
+    
+    Args:
+        properties: The properties of the node.
+        key: The property key.
+        condition: A plain value (equality) or a dictionary of operators.
+    
+    Returns:
+        True if the condition holds.
+    """
+    if key not in properties:
+        return False
+    value = properties[key]
+    
+    if not _is_operators(condition):
+        return value == condition
+    
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            if value != operand:
+                return False
+        elif operator == "$in":
+            if value not in operand:
+                return False
+        else:
+            if _sort_class(value) is None or _sort_class(value) != _sort_class(operand):
+                return False
+            if operator == "$gt" and not value > operand:
+                return False
+            if operator == "$gte" and not value >= operand:
+                return False
+            if operator == "$lt" and not value < operand:
+                return False
+            if operator == "$lte" and not value <= operand:
+                return False
+    
+    return True
+
+
+@tag("memory.graph.node_index")
+class NodeIndex:
+    """
+    Label and property indexes over the nodes of a graph memory system.
+    
+    Every node is indexed by its labels. Property keys are only indexed once
+    an index is created for them: hash indexes answer equality and $in
+    conditions, and sorted indexes also answer range conditions ($gt, $gte,
+    $lt, $lte).
+    
+    Queries are dictionaries mapping property keys to conditions, where a
+    condition is a plain value (equality) or a dictionary of operators (a
+    dictionary whose keys all start with "$"). The
+    reserved key "$label" takes a label or a list of labels that a node must
+    all have. All conditions must hold for a node to match.
+    
+    Attributes:
+        labels: Mapping from labels to the nodes that have them.
+        property_indexes: Mapping from indexed property keys to their kind.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the node index."""
+        self.labels: Dict[str, Set[NodeRef]] = {}
+        self.property_indexes: Dict[str, str] = {}
+        
+        # Hash indexes: key -> value -> nodes
+        self._hash: Dict[str, Dict[Hashable, Set[NodeRef]]] = {}
+        
+        # Sorted indexes: key -> sort class -> sorted (value, item ID, node ID) entries
+        self._sorted: Dict[str, Dict[str, List[Tuple[Any, str, str]]]] = {}
+        
+        # Indexed labels and property values of each node, used to remove stale entries
+        self._entries: Dict[NodeRef, Tuple[List[str], Dict[str, Any]]] = {}
+    
+    def create_index(self, key: str, kind: str = "hash", nodes: Iterable[Tuple[str, Node]] = ()) -> None:
+        """
+        Create an index on a property key.
+        
+        Args:
+            key: The property key to index.
+            kind: The kind of index ("hash" or "sorted").
+            nodes: (item ID, node) pairs to add to the new index.
+        
+        Raises:
+            ValueError: If the kind is not supported.
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unsupported index kind: {kind}")
+        
+        self.drop_index(key)
+        self.property_indexes[key] = kind
+        if kind == "hash":
+            self._hash[key] = {}
+        else:
+            self._sorted[key] = {}
+        
+        for item_id, node in nodes:
+            ref = (item_id, node.id)
+            if ref in self._entries and key in node.properties:
+                self._entries[ref][1][key] = node.properties[key]
+                self._index_value(key, node.properties[key], ref)
+    
+    def drop_index(self, key: str) -> None:
+        """
+        Drop the index on a property key.
+        
+        Args:
+            key: The property key.
+        """
+        if self.property_indexes.pop(key, None) is None:
+            return
+        
+        self._hash.pop(key, None)
+        self._sorted.pop(key, None)
+        for _, values in self._entries.values():
+            values.pop(key, None)
+    
+    def _index_value(self, key: str, value: Any, ref: NodeRef) -> None:
+        """
+        Add a property value to the index on its key.
+        
+        Args:
+            key: The property key.
+            value: The property value.
+            ref: The node that has the value.
+        """
+        if key in self._hash:
+            if _hashable(value):
+                self._hash[key].setdefault(value, set()).add(ref)
+        else:
+            sort_class = _sort_class(value)
+            if sort_class is not None:
+                bisect.insort(self._sorted[key].setdefault(sort_class, []), (value, ref[0], ref[1]))
+    
+    def _unindex_value(self, key: str, value: Any, ref: NodeRef) -> None:
+        """
+        Remove a property value from the index on its key.
+        
+        Args:
+            key: The property key.
+            value: The property value.
+            ref: The node that had the value.
+        """
+        if key in self._hash:
+            if _hashable(value) and value in self._hash[key]:
+                refs = self._hash[key][value]
+                refs.discard(ref)
+                if not refs:
+                    del self._hash[key][value]
+        else:
+            entries = self._sorted[key].get(_sort_class(value), [])
+            entry = (value, ref[0], ref[1])
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+    
+    def add(self, item_id: str, node: Node) -> None:
+        """
+        Index a node, replacing any previous entries.
+        
+        Args:
+            item_id: The ID of the item that contains the node.
+            node: The node.
+        """
+        ref = (item_id, node.id)
+        self.remove(item_id, node.id)
+        
+        labels = list(dict.fromkeys(node.labels))
+        for label in labels:
+            self.labels.setdefault(label, set()).add(ref)
+        
+        values = {key: node.properties[key] for key in self.property_indexes if key in node.properties}
+        for key, value in values.items():
+            self._index_value(key, value, ref)
+        
+        self._entries[ref] = (labels, values)
+    
+    def remove(self, item_id: str, node_id: str) -> None:
+        """
+        Remove a node from the index.
+        
+        Args:
+            item_id: The ID of the item that contains the node.
+            node_id: The ID of the node.
+        """
+        ref = (item_id, node_id)
+        entry = self._entries.pop(ref, None)
+        if entry is None:
+            return
+        
+        labels, values = entry
+        for label in labels:
+            refs = self.labels[label]
+            refs.discard(ref)
+            if not refs:
+                del self.labels[label]
+        
+        for key, value in values.items():
+            self._unindex_value(key, value, ref)
+    
+    def remove_item(self, item_id: str, node_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Remove all nodes of an item from the index.
+        
+        Args:
+            item_id: The ID of the item.
+            node_ids: The IDs of the item's nodes, or None to find every
+                indexed node of the item.
+        """
+        if node_ids is None:
+            node_ids = [node_id for entry_item_id, node_id in self._entries if entry_item_id == item_id]
+        
+        for node_id in list(node_ids):
+            self.remove(item_id, node_id)
+    
+    def clear(self) -> None:
+        """Remove all nodes from the index, keeping the index definitions."""
+        self.labels = {}
+        self._hash = {key: {} for key in self._hash}
+        self._sorted = {key: {} for key in self._sorted}
+        self._entries = {}
+    
+    def _candidates(self, key: str, condition: Any) -> Optional[Tuple[int, Any]]:
+        """
+        Estimate how many nodes an index returns for a condition.
+        
+        Args:
+            key: The property key (or LABEL_KEY).
+            condition: The condition on the key.
+        
+        Returns:
+            (estimated count, lookup) if an index can answer the condition,
+            or None if it can't. Calling lookup() returns the matching nodes.
+        """
+        if key == LABEL_KEY:
+            labels = [condition] if isinstance(condition, str) else list(condition)
+            sets = [self.labels.get(label, set()) for label in labels]
+            if not sets:
+                return None
+            smallest = min(sets, key=len)
+            return len(smallest), lambda: smallest
+        
+        operators = condition if _is_operators(condition) else {"$eq": condition}
+        
+        if key in self._hash:
+            if "$eq" in operators:
+                values = [operators["$eq"]]
+            elif "$in" in operators:
+                values = list(operators["$in"])
+            else:
+                return None
+            if not all(_hashable(value) for value in values):
+                return None
+            
+            postings = self._hash[key]
+            sets = [postings[value] for value in values if value in postings]
+            return sum(len(refs) for refs in sets), lambda: set().union(*sets)
+        
+        if key in self._sorted:
+            if "$eq" in operators or "$in" in operators:
+                values = [operators["$eq"]] if "$eq" in operators else list(operators["$in"])
+                if not all(_sort_class(value) is not None for value in values):
+                    return None
+                ranges = [(value, True, value, True) for value in values]
+            elif any(operator in operators for operator in RANGE_OPERATORS):
+                low = operators.get("$gte", operators.get("$gt"))
+                high = operators.get("$lte", operators.get("$lt"))
+                ranges = [(low, "$gte" in operators, high, "$lte" in operators)]
+            else:
+                return None
+            
+            slices = []
+            for low, low_inclusive, high, high_inclusive in ranges:
+                sort_class = _sort_class(low if low is not None else high)
+                if low is not None and high is not None and _sort_class(high) != sort_class:
+                    # Bounds of different types can't both hold
+                    continue
+                entries = self._sorted[key].get(sort_class, [])
+                
+                # Entries are (value, item ID, node ID); bound them on value only
+                start = 0
+                if low is not None:
+                    start = bisect.bisect_left(entries, (low,)) if low_inclusive else bisect.bisect_right(entries, (low, chr(0x10FFFF)))
+                end = len(entries)
+                if high is not None:
+                    end = bisect.bisect_right(entries, (high, chr(0x10FFFF))) if high_inclusive else bisect.bisect_left(entries, (high,))
+                slices.append((entries, start, max(start, end)))
+            
+            count = sum(end - start for _, start, end in slices)
+            return count, lambda: {(entry[1], entry[2]) for entries, start, end in slices for entry in entries[start:end]}
+        
+        return None
+    
+    def plan(self, query: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+        """
+        Choose the most selective index for a query.
+        
+        Args:
+            query: The query.
+        
+        Returns:
+            (key, estimated count) of the chosen index, or None if no index
+            applies and the nodes have to be scanned.
+        """
+        best = None
+        for key, condition in query.items():
+            candidates = self._candidates(key, condition)
+            if candidates is not None and (best is None or candidates[0] < best[1]):
+                best = (key, candidates[0])
+        
+        return best
+    
+    def lookup(self, query: Dict[str, Any]) -> Optional[Set[NodeRef]]:
+        """
+        Get the nodes that may match a query, using the most selective index.
+        
+        The returned nodes still have to be checked against the full query
+        with matches().
+        
+        Args:
+            query: The query.
+        
+        Returns:
+            Set of candidate nodes, or None if no index applies.
+        """
+        plan = self.plan(query)
+        if plan is None:
+            return None
+        
+        return self._candidates(plan[0], query[plan[0]])[1]()
+    
+    @staticmethod
+    def matches(node: Node, query: Dict[str, Any]) -> bool:
+        """
+        Check whether a node matches a query.
+        
+        Args:
+            node: The node.
+            query: The query.
+        
+        Returns:
+            True if every condition of the query holds for the node.
+        
+        Raises:
+            ValueError: If the query uses an unsupported operator.
+        """
+        for key, condition in query.items():
+            if key == LABEL_KEY:
+                labels = [condition] if isinstance(condition, str) else condition
+                if not all(label in node.labels for label in labels):
+                    return False
+                continue
+            
+            if _is_operators(condition):
+                unsupported = [operator for operator in condition if operator not in QUERY_OPERATORS]
+                if unsupported:
+                    raise ValueError(f"Unsupported query operator for {key!r}: {unsupported[0]}")
+            
+            if not _matches(node.properties, key, condition):
+                return False
+        
+        return True
@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.core.base import Memory, MemoryItem, MemoryType
+from augment_adam.memory.core.text_index import TextIndex
 
 
 class RelationType(Enum):
@@ -364,6 +365,11 @@ class SemanticMemory(Memory[T]):
     This class implements a semantic memory system for storing and retrieving
     conceptual knowledge.
     
+    Text search is served by a TextIndex over the name, description and
+    examples of each concept. The index is built on the first text search and
+    then kept up to date by add, remove, add_example and remove_example;
+    concepts that are modified directly must be passed to reindex.
+    
     Attributes:
         name: The name of the memory system.
         items: Dictionary of concepts in memory, keyed by ID.
@@ -381,6 +387,83 @@ class SemanticMemory(Memory[T]):
             name: The name of the memory system.
         """
         super().__init__(name, MemoryType.SEMANTIC)
+        
+        # Full-text index over concept names, descriptions and examples (built lazily)
+        self._text_index: Optional[TextIndex] = None
+    
+    @property
+    def text_index(self) -> TextIndex:
+        """The full-text index over concept names, descriptions and examples."""
+        if self._text_index is None:
+            self._text_index = TextIndex()
+            for concept in self.items.values():
+                self._text_index.add(concept.id, self._concept_texts(concept))
+        
+        return self._text_index
+    
+    @staticmethod
+    def _concept_texts(concept: Concept) -> List[str]:
+        """
+        Get the texts of a concept that are searchable.
+        
+        Args:
+            concept: The concept.
+        
+        Returns:
+            The name, description and examples of the concept.
+        """
+        return [concept.name, concept.description] + list(concept.examples)
+    
+    def reindex(self, concept_id: str) -> None:
+        """
+        Update the text index after a concept was modified directly.
+        
+        Args:
+            concept_id: The ID of the concept.
+        """
+        if self._text_index is None:
+            return
+        
+        concept = self.items.get(concept_id)
+        if concept is None:
+            self._text_index.remove(concept_id)
+        else:
+            self._text_index.add(concept_id, self._concept_texts(concept))
+    
+    def add(self, item: T) -> str:
+        """
+        Add a concept to memory.
+        
+        Args:
+            item: The concept to add to memory.
+        
+        Returns:
+            The ID of the added concept.
+        """
+        item_id = super().add(item)
+        self.reindex(item_id)
+        return item_id
+    
+    def remove(self, item_id: str) -> bool:
+        """
+        Remove a concept from memory.
+        
+        Args:
+            item_id: The ID of the concept to remove.
+        
+        Returns:
+            True if the concept was removed, False otherwise.
+        """
+        if not super().remove(item_id):
+            return False
+        
+        self.reindex(item_id)
+        return True
+    
+    def clear(self) -> None:
+        """Remove all concepts from memory."""
+        super().clear()
+        self._text_index = None
     
     def add_relation(self, source_id: str, target_id: str, relation_type: Union[RelationType, str], metadata: Optional[Dict[str, Any]] = None, weight: float = 1.0) -> Optional[str]:
         """
@@ -561,6 +644,7 @@ class SemanticMemory(Memory[T]):
             return False
         
         concept.add_example(example)
+        self.reindex(concept_id)
         return True
     
     def remove_example(self, concept_id: str, example: str) -> bool:
@@ -578,7 +662,11 @@ class SemanticMemory(Memory[T]):
         if concept is None:
             return False
         
-        return concept.remove_example(example)
+        if not concept.remove_example(example):
+            return False
+        
+        self.reindex(concept_id)
+        return True
     
     def search(self, query: Any, limit: int = 10) -> List[T]:
         """
@@ -591,28 +679,9 @@ class SemanticMemory(Memory[T]):
         Returns:
             List of concepts that match the query.
         """
-        # If the query is a string, search for concepts with matching name or description
+        # If the query is a string, rank concepts whose name, description or examples share a token with it
         if isinstance(query, str):
-            results = []
-            
-            for concept in self.items.values():
-                # Check if the concept name contains the query
-                if query.lower() in concept.name.lower():
-                    results.append(concept)
-                    continue
-                
-                # Check if the concept description contains the query
-                if query.lower() in concept.description.lower():
-                    results.append(concept)
-                    continue
-                
-                # Check if any example contains the query
-                for example in concept.examples:
-                    if query.lower() in example.lower():
-                        results.append(concept)
-                        break
-            
-            return results[:limit]
+            return [self.items[concept_id] for concept_id, score in self.text_index.search(query, limit)]
         
         # If the query is a dictionary, search for concepts with matching attributes
         elif isinstance(query, dict):
@@ -641,7 +710,10 @@ class SemanticMemory(Memory[T]):
         Returns:
             Dictionary representation of the semantic memory system.
         """
-        return super().to_dict()
+        data = super().to_dict()
+        if self._text_index is not None:
+            data["text_index"] = self._text_index.to_dict()
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SemanticMemory':
@@ -661,4 +733,9 @@ class SemanticMemory(Memory[T]):
             item = Concept.from_dict(item_data)
             memory.add(item)
         
+        # Restore the text index instead of re-tokenizing every concept
+        if "text_index" in data:
+            memory._text_index = TextIndex.from_dict(data["text_index"])
+            memory._text_index.retain(memory.items)
+        
         return memory
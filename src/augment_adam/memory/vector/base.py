@@ -5,11 +5,14 @@ This module provides the base classes for vector-based memory systems,
 including the VectorMemory base class and VectorMemoryItem class.
 """
 
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, TypeVar
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.core.base import Memory, MemoryItem, MemoryType
+from augment_adam.memory.core.filtering import MetadataIndex
 
 
 @dataclass
@@ -84,6 +87,16 @@ class VectorMemory(Memory[T]):
     methods for adding, retrieving, updating, and removing items from memory,
     as well as methods for similarity search.
     
+    The default search keeps a contiguous matrix of L2-normalized float32
+    embeddings alongside the items. The matrix is built on the first search and
+    then maintained incrementally by add, update and remove, so backends that
+    override search never pay for it.
+    
+    Searches accept a where filter on item metadata (see MetadataIndex). The
+    metadata index is likewise built on the first filtered search and then
+    maintained incrementally, and filtered searches only score the items it
+    selects.
+    
     Attributes:
         name: The name of the memory system.
         dimension: The dimension of the vector embeddings.
@@ -105,6 +118,14 @@ class VectorMemory(Memory[T]):
         super().__init__(name, MemoryType.VECTOR)
         self.dimension = dimension
         self.metadata["dimension"] = dimension
+        
+        # Normalized embedding matrix used by the default search (built lazily)
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_rows: Dict[str, int] = {}
+        self._matrix_ids: List[str] = []
+    
+        # Inverted index over item metadata used by filtered searches (built lazily)
+        self._metadata_index: Optional[MetadataIndex] = None
     
     def add(self, item: T) -> str:
         """
@@ -120,7 +141,47 @@ class VectorMemory(Memory[T]):
         if item.embedding is None and item.text is not None:
             item.embedding = self.generate_embedding(item.text)
         
-        return super().add(item)
+        super().add(item)
+        self._set_matrix_row(item)
+        self._index_metadata(item)
+        
+        return item.id
+    
+    def add_many(self, items: List[T]) -> List[str]:
+        """
+        Add a batch of items to memory.
+        
+        Embeddings for items that don't have one are generated in a single batch.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The IDs of the added items, in input order.
+        """
+        self._embed_missing(items)
+        
+        item_ids = [Memory.add(self, item) for item in items]
+        for item in items:
+            self._set_matrix_row(item)
+            self._index_metadata(item)
+        
+        return item_ids
+    
+    def _embed_missing(self, items: List[T]) -> None:
+        """
+        Generate embeddings in one batch for items that have text but no embedding.
+        
+        Args:
+            items: The items to embed.
+        """
+        missing = [item for item in items if item.embedding is None and item.text is not None]
+        if not missing:
+            return
+        
+        embeddings = self.generate_embeddings([item.text for item in missing])
+        for item, embedding in zip(missing, embeddings):
+            item.embedding = embedding
     
     def update(self, item_id: str, content: Any = None, metadata: Dict[str, Any] = None) -> Optional[T]:
         """
@@ -144,36 +205,252 @@ class VectorMemory(Memory[T]):
             if item.text is not None:
                 item.embedding = self.generate_embedding(item.text)
         
+        if item is not None:
+            self._set_matrix_row(item)
+            self._index_metadata(item)
+        
         return item
     
-    def search(self, query: Union[str, List[float]], limit: int = 10) -> List[T]:
+    def remove(self, item_id: str) -> bool:
+        """
+        Remove an item from memory.
+        
+        Args:
+            item_id: The ID of the item to remove.
+            
+        Returns:
+            True if the item was removed, False otherwise.
+        """
+        if not super().remove(item_id):
+            return False
+        
+        self._drop_matrix_row(item_id)
+        if self._metadata_index is not None:
+            self._metadata_index.remove(item_id)
+        return True
+    
+    def clear(self) -> None:
+        """Remove all items from memory."""
+        super().clear()
+        
+        self._matrix = None
+        self._matrix_rows = {}
+        self._matrix_ids = []
+        self._metadata_index = None
+    
+    def search(self, query: Union[str, List[float]], limit: int = 10, where: Optional[Dict[str, Any]] = None) -> List[T]:
         """
         Search for items in memory by similarity.
         
         Args:
             query: The query to search for (either a string or a vector embedding).
             limit: The maximum number of results to return.
+            where: Filter on item metadata (see MetadataIndex.select).
             
         Returns:
             List of items that match the query, sorted by similarity.
         """
-        # If the query is a string, convert it to a vector embedding
-        if isinstance(query, str):
-            query_embedding = self.generate_embedding(query)
+        return [item for item, score in self.search_many([query], limit, where=where)[0]]
+    
+    def search_many(
+        self,
+        queries: List[Union[str, List[float]]],
+        limit: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[T, float]]]:
+        """
+        Search for items in memory by similarity for a batch of queries.
+        
+        Cosine similarities for all queries are computed with a single matrix
+        product against the normalized embedding matrix, and the top results
+        are selected with argpartition. With a where filter, only the rows of
+        the items selected by the metadata index are scored.
+        
+        Args:
+            queries: The queries to search for (strings or vector embeddings).
+            limit: The maximum number of results to return per query.
+            where: Filter on item metadata (see MetadataIndex.select).
+            
+        Returns:
+            One list of (item, score) pairs per query, sorted by similarity.
+        """
+        if not queries:
+            return []
+        
+        if self._matrix is None:
+            self._build_matrix()
+        
+        allowed = self._select(where)
+        if allowed is None:
+            rows = None
+            count = len(self._matrix_ids)
         else:
-            query_embedding = query
+            rows = np.fromiter((self._matrix_rows[item_id] for item_id in allowed if item_id in self._matrix_rows), dtype=np.int64)
+            count = len(rows)
+        
+        if count == 0 or limit <= 0:
+            return [[] for _ in queries]
+        
+        query_np = self._normalize(np.asarray(self._embed_queries(queries), dtype=np.float32))
+        candidates = self._matrix[:count] if rows is None else self._matrix[rows]
+        scores = query_np @ candidates.T
+        
+        # Select the top results without sorting every score
+        k = min(limit, count)
+        if k < count:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(count), (len(queries), count))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        if rows is not None:
+            top = rows[top]
+        
+        return [
+            [(self.items[self._matrix_ids[row]], float(score)) for row, score in zip(rows, row_scores)]
+            for rows, row_scores in zip(top, top_scores)
+        ]
+    
+    def _select(self, where: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """
+        Get the IDs of the items that match a metadata filter.
         
-        # Get items with embeddings
-        items_with_embeddings = [item for item in self.items.values() if item.embedding is not None]
+        Args:
+            where: Filter on item metadata.
         
-        # Calculate similarity scores
-        items_with_scores = [(item, self.calculate_similarity(query_embedding, item.embedding)) for item in items_with_embeddings]
+        Returns:
+            Set of matching item IDs, or None if there is no filter.
+        """
+        if not where:
+            return None
         
-        # Sort by similarity score (descending)
-        items_with_scores.sort(key=lambda x: x[1], reverse=True)
+        if self._metadata_index is None:
+            self._metadata_index = MetadataIndex()
+            for item_id in self.items:
+                self._metadata_index.add(item_id, self._item_metadata(item_id))
         
-        # Return the top results
-        return [item for item, score in items_with_scores[:limit]]
+        return self._metadata_index.select(where)
+    
+    def _item_metadata(self, item_id: str) -> Dict[str, Any]:
+        """
+        Get the metadata of an item while building the metadata index.
+        
+        Args:
+            item_id: The ID of the item.
+        
+        Returns:
+            The metadata of the item.
+        """
+        return self.items[item_id].metadata
+    
+    def _index_metadata(self, item: T) -> None:
+        """
+        Insert or replace an item's entries in the metadata index.
+        
+        Args:
+            item: The item whose metadata changed.
+        """
+        if self._metadata_index is not None:
+            self._metadata_index.add(item.id, item.metadata)
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize the rows of a matrix, leaving zero rows as zeros.
+        
+        Args:
+            vectors: The matrix to normalize.
+            
+        Returns:
+            The normalized matrix.
+        """
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    
+    def _build_matrix(self) -> None:
+        """Build the normalized embedding matrix from the items in memory."""
+        items = [item for item in self.items.values() if item.embedding is not None]
+        
+        self._matrix_ids = [item.id for item in items]
+        self._matrix_rows = {item_id: row for row, item_id in enumerate(self._matrix_ids)}
+        self._matrix = np.zeros((max(len(items), 16), self.dimension), dtype=np.float32)
+        
+        if items:
+            self._matrix[:len(items)] = self._normalize(np.asarray([item.embedding for item in items], dtype=np.float32))
+    
+    def _set_matrix_row(self, item: T) -> None:
+        """
+        Insert or replace an item's row in the embedding matrix.
+        
+        Args:
+            item: The item whose embedding changed.
+        """
+        if self._matrix is None:
+            return
+        
+        if item.embedding is None:
+            self._drop_matrix_row(item.id)
+            return
+        
+        row = self._matrix_rows.get(item.id)
+        if row is None:
+            row = len(self._matrix_ids)
+            
+            # Grow the matrix geometrically so appends are amortized O(1)
+            if row == self._matrix.shape[0]:
+                grown = np.zeros((2 * self._matrix.shape[0], self.dimension), dtype=np.float32)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            
+            self._matrix_ids.append(item.id)
+            self._matrix_rows[item.id] = row
+        
+        self._matrix[row] = self._normalize(np.asarray(item.embedding, dtype=np.float32))
+    
+    def _drop_matrix_row(self, item_id: str) -> None:
+        """
+        Remove an item's row from the embedding matrix.
+        
+        The last row is moved into the freed slot to keep the matrix contiguous.
+        
+        Args:
+            item_id: The ID of the item to remove.
+        """
+        if self._matrix is None or item_id not in self._matrix_rows:
+            return
+        
+        row = self._matrix_rows.pop(item_id)
+        last = len(self._matrix_ids) - 1
+        last_id = self._matrix_ids.pop()
+        
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._matrix_ids[row] = last_id
+            self._matrix_rows[last_id] = row
+    
+    def _embed_queries(self, queries: List[Union[str, List[float]]]) -> List[List[float]]:
+        """
+        Convert a batch of queries to vector embeddings.
+        
+        String queries are embedded together in a single batch.
+        
+        Args:
+            queries: The queries to convert (strings or vector embeddings).
+            
+        Returns:
+            One vector embedding per query, in input order.
+        """
+        text_positions = [i for i, query in enumerate(queries) if isinstance(query, str)]
+        embeddings = list(queries)
+        
+        if text_positions:
+            generated = self.generate_embeddings([queries[i] for i in text_positions])
+            for i, embedding in zip(text_positions, generated):
+                embeddings[i] = embedding
+        
+        return embeddings
     
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -189,6 +466,20 @@ class VectorMemory(Memory[T]):
         # In a real implementation, you would use a model to generate embeddings
         return [0.0] * self.dimension
     
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate vector embeddings for a batch of texts.
+        
+        Subclasses backed by a batching model should override this method.
+        
+        Args:
+            texts: The texts to generate embeddings for.
+            
+        Returns:
+            Vector embeddings for the texts, in input order.
+        """
+        return [self.generate_embedding(text) for text in texts]
+    
     def calculate_similarity(self, embedding1: List[float], embedding2: Optional[List[float]]) -> float:
         """
         Calculate the similarity between two vector embeddings.
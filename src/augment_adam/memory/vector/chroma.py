@@ -9,7 +9,7 @@ import os
 import json
 import uuid
 import numpy as np
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar, cast
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, TypeVar, cast
 import chromadb
 from chromadb.config import Settings
 
@@ -17,6 +17,11 @@ from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.vector.base import VectorMemory, VectorMemoryItem
 
 
+# Metadata field holding each item's ID in the Chroma collection, used to
+# pre-filter queries with a where clause
+ITEM_ID_KEY = "_item_id"
+
+
 @tag("memory.vector.chroma")
 class ChromaMemory(VectorMemory[VectorMemoryItem]):
     """
@@ -48,11 +53,11 @@ class ChromaMemory(VectorMemory[VectorMemoryItem]):
         """
         super().__init__(name, dimension)
         
-        # Create Chroma client
-        self.client = chromadb.Client(Settings(
-            persist_directory=persist_directory,
-            anonymized_telemetry=False
-        ))
+        # Create Chroma client (in memory unless a persist directory is given)
+        settings = {"anonymized_telemetry": False}
+        if persist_directory is not None:
+            settings.update(persist_directory=persist_directory, is_persistent=True)
+        self.client = chromadb.Client(Settings(**settings))
         
         # Create or get collection
         self.collection = self.client.get_or_create_collection(name)
@@ -82,17 +87,65 @@ class ChromaMemory(VectorMemory[VectorMemoryItem]):
                 ids=[item.id],
                 embeddings=[item.embedding],
                 documents=[item.text],
-                metadatas=[{
-                    "created_at": item.created_at,
-                    "updated_at": item.updated_at,
-                    "expires_at": item.expires_at,
-                    "importance": item.importance,
-                    **item.metadata
-                }]
+                metadatas=[self._collection_metadata(item)]
             )
         
         return item.id
     
+    def add_many(self, items: List[VectorMemoryItem]) -> List[str]:
+        """
+        Add a batch of items to memory.
+        
+        Missing embeddings are generated in one batch and all items are added
+        to the Chroma collection with a single add call.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The IDs of the added items, in input order.
+        """
+        item_ids = super().add_many(items)
+        
+        # If an ID appears more than once, the last item wins
+        batch = list({item.id: item for item in items if item.embedding is not None and item.text is not None}.values())
+        if batch:
+            self.collection.add(
+                ids=[item.id for item in batch],
+                embeddings=[item.embedding for item in batch],
+                documents=[item.text for item in batch],
+                metadatas=[self._collection_metadata(item) for item in batch]
+            )
+        
+        return item_ids
+    
+    def _collection_metadata(self, item: VectorMemoryItem) -> Dict[str, Any]:
+        """
+        Build the Chroma metadata record for an item.
+        
+        Args:
+            item: The item to build the record for.
+            
+        Returns:
+            The metadata stored alongside the item in the Chroma collection.
+        """
+        metadata = {
+            "created_at": item.created_at,
+            "updated_at": item.updated_at,
+            "expires_at": item.expires_at,
+            "importance": item.importance,
+            **item.metadata,
+            ITEM_ID_KEY: item.id
+        }
+        
+        # Chroma only accepts str, int, float and bool values; where filters
+        # are resolved locally, so other values are only stored as JSON
+        return {
+            key: value if isinstance(value, (str, int, float, bool)) else json.dumps(value, default=str)
+            for key, value in metadata.items()
+            if value is not None
+        }
+    
     def update(self, item_id: str, content: Any = None, metadata: Dict[str, Any] = None) -> Optional[VectorMemoryItem]:
         """
         Update an item in memory.
@@ -114,13 +167,7 @@ class ChromaMemory(VectorMemory[VectorMemoryItem]):
                 ids=[item_id],
                 embeddings=[updated_item.embedding],
                 documents=[updated_item.text],
-                metadatas=[{
-                    "created_at": updated_item.created_at,
-                    "updated_at": updated_item.updated_at,
-                    "expires_at": updated_item.expires_at,
-                    "importance": updated_item.importance,
-                    **updated_item.metadata
-                }]
+                metadatas=[self._collection_metadata(updated_item)]
             )
         
         return updated_item
@@ -151,42 +198,76 @@ class ChromaMemory(VectorMemory[VectorMemoryItem]):
         # Clear the Chroma collection
         self.collection.delete(ids=self.collection.get()["ids"])
     
-    def search(self, query: Union[str, List[float]], limit: int = 10) -> List[VectorMemoryItem]:
+    def search(self, query: Union[str, List[float]], limit: int = 10, where: Optional[Dict[str, Any]] = None) -> List[VectorMemoryItem]:
         """
         Search for items in memory by similarity.
         
         Args:
             query: The query to search for (either a string or a vector embedding).
             limit: The maximum number of results to return.
+            where: Filter on item metadata (see MetadataIndex.select).
             
         Returns:
             List of items that match the query, sorted by similarity.
         """
-        # If the collection is empty, return an empty list
-        if self.collection.count() == 0:
-            return []
-        
-        # If the query is a string, search by text
-        if isinstance(query, str):
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=limit
-            )
+        return [item for item, score in self.search_many([query], limit, where=where)[0]]
+    
+    def search_many(
+        self,
+        queries: List[Union[str, List[float]]],
+        limit: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[VectorMemoryItem, float]]]:
+        """
+        Search for items in memory by similarity for a batch of queries.
+        
+        All queries are answered with a single Chroma query call. Scores are
+        1 / (1 + distance).
+        
+        A where filter is resolved to an allow-list of item IDs with the local
+        metadata index and passed to Chroma as an $in filter on the stored
+        item IDs, so list-valued metadata such as tags matches on any element,
+        as it does for the other vector memories.
+        
+        Args:
+            queries: The queries to search for (strings or vector embeddings).
+            limit: The maximum number of results to return per query.
+            where: Filter on item metadata (see MetadataIndex.select).
+            
+        Returns:
+            One list of (item, score) pairs per query, sorted by similarity.
+        """
+        # If there are no queries or the collection is empty, return empty results
+        if not queries or limit <= 0 or self.collection.count() == 0:
+            return [[] for _ in queries]
+        
+        query_args: Dict[str, Any] = {"n_results": limit}
+        
+        allowed = self._select(where)
+        if allowed is not None:
+            if not allowed:
+                return [[] for _ in queries]
+            query_args["where"] = {ITEM_ID_KEY: {"$in": list(allowed)}}
+        
+        # If all queries are strings, let Chroma embed them
+        if all(isinstance(query, str) for query in queries):
+            results = self.collection.query(query_texts=list(queries), **query_args)
         # Otherwise, search by embedding
         else:
-            results = self.collection.query(
-                query_embeddings=[query],
-                n_results=limit
-            )
+            results = self.collection.query(query_embeddings=self._embed_queries(queries), **query_args)
         
         # Convert the results to memory items
-        items = []
-        for i, item_id in enumerate(results["ids"][0]):
-            item = self.get(item_id)
-            if item is not None:
-                items.append(item)
+        all_hits = []
+        for i, item_ids in enumerate(results["ids"]):
+            distances = results["distances"][i] if results.get("distances") else [0.0] * len(item_ids)
+            hits = []
+            for item_id, distance in zip(item_ids, distances):
+                item = self.get(item_id)
+                if item is not None:
+                    hits.append((item, 1.0 / (1.0 + float(distance))))
+            all_hits.append(hits)
         
-        return items
+        return all_hits
     
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -209,6 +290,23 @@ class ChromaMemory(VectorMemory[VectorMemoryItem]):
         
         return embedding.tolist()
     
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate vector embeddings for a batch of texts.
+        
+        Args:
+            texts: The texts to generate embeddings for.
+            
+        Returns:
+            Vector embeddings for the texts, in input order.
+        """
+        # This is a placeholder implementation, see generate_embedding
+        embeddings = np.random.randn(len(texts), self.dimension).astype(np.float32)
+        # Normalize the embeddings
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        
+        return embeddings.tolist()
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the Chroma memory system to a dictionary.
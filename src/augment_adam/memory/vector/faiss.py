@@ -7,12 +7,40 @@ which is a library for efficient similarity search and clustering of dense vecto
 
 import os
 import json
+import hashlib
 import numpy as np
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar, cast
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, Iterable, Iterator, TypeVar, cast
 import faiss
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.vector.base import VectorMemory, VectorMemoryItem
+from augment_adam.memory.vector.storage import (
+    FORMAT_VERSION,
+    LazyItemStore,
+    write_snapshot,
+    commit_snapshot,
+    temporary_path,
+    write_json,
+    append_changes,
+    read_changes,
+)
+
+
+# Index types supported by FAISSMemory
+INDEX_TYPES = ("Flat", "HNSW", "IVF", "IVFPQ", "OPQ", "auto")
+
+# Index types that must be trained before vectors can be added
+TRAINED_INDEX_TYPES = ("IVF", "IVFPQ", "OPQ")
+
+# Index type used by "auto" mode for collections below each size
+AUTO_INDEX_SCHEDULE = ((10_000, "Flat"), (100_000, "HNSW"), (1_000_000, "IVF"))
+AUTO_LARGEST_INDEX_TYPE = "IVFPQ"
+
+# Most vectors a search fetches per query, as a multiple of the first fetch
+SEARCH_OVERFETCH_FACTOR = 4
+
+# Order in which index types are migrated as a collection grows
+_INDEX_RANK = {"Flat": 0, "HNSW": 1, "IVF": 2, "IVFPQ": 3, "OPQ": 4}
 
 
 @tag("memory.vector.faiss")
@@ -23,46 +51,417 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
     This class implements a vector memory system using FAISS for efficient
     similarity search of dense vectors.
     
+    Supported index types are "Flat", "HNSW", "IVF", "IVFPQ" and "OPQ"
+    (OPQ rotation in front of IVF-PQ), plus "auto", which starts flat and
+    migrates to larger index types as the collection grows (see
+    AUTO_INDEX_SCHEDULE). Trained index types serve vectors from a flat
+    staging index until train_threshold vectors are present, then train on a
+    reservoir sample of everything added so far and move all vectors over.
+    
     Attributes:
         name: The name of the memory system.
         dimension: The dimension of the vector embeddings.
         index: The FAISS index for similarity search.
+        active_index_type: The type of the index currently in use.
         items: Dictionary of items in memory, keyed by ID.
         metadata: Additional metadata for the memory system.
-        id_to_index: Mapping from item IDs to FAISS index positions.
-        index_to_id: Mapping from FAISS index positions to item IDs.
+        id_to_index: Mapping from item IDs to FAISS int64 vector IDs.
+        index_to_id: Mapping from FAISS int64 vector IDs to item IDs.
+        compact_threshold: Tombstone ratio above which the index is rebuilt.
     
     TODO(Issue #6): Add support for memory persistence
     TODO(Issue #6): Implement memory validation
     """
     
-    def __init__(self, name: str, dimension: int = 1536, index_type: str = "Flat") -> None:
+    def __init__(
+        self,
+        name: str,
+        dimension: int = 1536,
+        index_type: str = "Flat",
+        compact_threshold: float = 0.2,
+        nlist: Optional[int] = None,
+        pq_m: Optional[int] = None,
+        hnsw_m: int = 32,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        train_threshold: int = 1024,
+        reservoir_size: int = 16384,
+        exact_filter_threshold: int = 2048,
+    ) -> None:
         """
         Initialize the FAISS memory system.
         
         Args:
             name: The name of the memory system.
             dimension: The dimension of the vector embeddings.
-            index_type: The type of FAISS index to use.
+            index_type: The type of FAISS index to use (see INDEX_TYPES).
+            compact_threshold: Tombstone ratio above which the index is rebuilt.
+            nlist: Number of IVF lists (derived from the collection size if None).
+            pq_m: Number of PQ sub-quantizers (derived from the dimension if None).
+            hnsw_m: Number of neighbors per HNSW node.
+            nprobe: Number of IVF lists visited per search.
+            ef_search: Size of the HNSW candidate list used during search.
+            train_threshold: Number of vectors required before training an index.
+            reservoir_size: Maximum number of vectors kept as a training sample.
+            exact_filter_threshold: Filtered searches that allow at most this many
+                items are answered by exact distances over the allowed items
+                instead of an index search.
         """
         super().__init__(name, dimension)
         
-        # Create FAISS index
-        if index_type == "Flat":
-            self.index = faiss.IndexFlatL2(dimension)
-        elif index_type == "IVF":
-            # IVF index requires training, so we use a flat index for now
-            # and will train it when we have enough data
-            quantizer = faiss.IndexFlatL2(dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, dimension, 100)
-            self.index.nprobe = 10
-        else:
+        if index_type not in INDEX_TYPES:
             raise ValueError(f"Unsupported index type: {index_type}")
         
+        self.metadata["index_type"] = index_type
+        self.metadata["index_params"] = {
+            "nlist": nlist,
+            "pq_m": pq_m,
+            "hnsw_m": hnsw_m,
+            "nprobe": nprobe,
+            "ef_search": ef_search,
+            "train_threshold": train_threshold,
+            "reservoir_size": reservoir_size,
+            "exact_filter_threshold": exact_filter_threshold,
+        }
+        self.compact_threshold = compact_threshold
+        
+        # Reservoir sample of added vectors, used to train IVF/PQ indexes
+        self._reservoir: Optional[np.ndarray] = None
+        self._reservoir_seen = 0
+        self._rng = np.random.default_rng()
+        
+        # Create FAISS index
+        self.active_index_type = index_type if index_type in ("Flat", "HNSW") else "Flat"
+        self.index = self._create_index(self.active_index_type)
+        
         self.id_to_index: Dict[str, int] = {}
         self.index_to_id: Dict[int, str] = {}
         
-        self.metadata["index_type"] = index_type
+        # Vector IDs that are still stored in the index but no longer live
+        # (only used when the underlying index cannot remove vectors)
+        self._tombstones: Set[int] = set()
+        
+        # Items changed since the last save (True if put, False if removed),
+        # and the snapshot that save appends these changes to
+        self._changes: Dict[str, bool] = {}
+        self._persist_state: Optional[Dict[str, Any]] = None
+    
+    def _create_index(self, index_type: str) -> faiss.Index:
+        """
+        Create an empty FAISS index of the given type.
+        
+        Trained index types are trained on the reservoir sample. Vectors are
+        addressed by int64 IDs derived from item IDs: IVF indexes store these
+        natively, while flat and HNSW indexes are wrapped in an IndexIDMap2.
+        
+        Args:
+            index_type: The type of index to create.
+            
+        Returns:
+            The FAISS index.
+        """
+        params = self.metadata["index_params"]
+        
+        if index_type == "Flat":
+            base_index = faiss.IndexFlatL2(self.dimension)
+        elif index_type == "HNSW":
+            base_index = faiss.IndexHNSWFlat(self.dimension, params["hnsw_m"])
+        else:
+            training_np = self._training_sample()
+            
+            nlist = params["nlist"] or max(1, min(int(4 * np.sqrt(max(len(self.id_to_index), len(training_np)))), len(training_np) // 39))
+            nlist = min(nlist, len(training_np))
+            pq_m = params["pq_m"] or self._default_pq_m()
+            # Keep at least 39 training points per PQ centroid, as FAISS recommends
+            nbits = max(1, min(8, int(np.log2(max(2, len(training_np) // 39)))))
+            
+            if index_type == "IVF":
+                factory_string = f"IVF{nlist},Flat"
+            elif index_type == "IVFPQ":
+                factory_string = f"IVF{nlist},PQ{pq_m}x{nbits}"
+            else:
+                factory_string = f"OPQ{pq_m},IVF{nlist},PQ{pq_m}x{nbits}"
+            
+            index = faiss.index_factory(self.dimension, factory_string)
+            index.train(training_np)
+        
+        if index_type in ("Flat", "HNSW"):
+            index = faiss.IndexIDMap2(base_index)
+        self._apply_search_params(index)
+        
+        return index
+    
+    def _default_pq_m(self) -> int:
+        """
+        Choose the number of PQ sub-quantizers for the embedding dimension.
+        
+        Returns:
+            The largest divisor of the dimension that is at most 64 and leaves
+            at least two dimensions per sub-quantizer.
+        """
+        for pq_m in range(min(64, self.dimension // 2), 0, -1):
+            if self.dimension % pq_m == 0:
+                return pq_m
+        return 1
+    
+    def _apply_search_params(self, index: faiss.Index) -> None:
+        """
+        Apply the configured nprobe/efSearch to an index, where supported.
+        
+        Args:
+            index: The index to configure.
+        """
+        params = self.metadata["index_params"]
+        parameter_space = faiss.ParameterSpace()
+        
+        for name, value in (("nprobe", params["nprobe"]), ("efSearch", params["ef_search"])):
+            try:
+                parameter_space.set_index_parameter(index, name, value)
+            except RuntimeError:
+                # The parameter doesn't apply to this index type
+                pass
+    
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None) -> None:
+        """
+        Set the search-time recall/latency trade-off of the index.
+        
+        Args:
+            nprobe: Number of IVF lists visited per search.
+            ef_search: Size of the HNSW candidate list used during search.
+        """
+        params = self.metadata["index_params"]
+        
+        if nprobe is not None:
+            params["nprobe"] = nprobe
+        if ef_search is not None:
+            params["ef_search"] = ef_search
+        
+        self._apply_search_params(self.index)
+    
+    def _target_index_type(self) -> str:
+        """
+        Get the index type the collection should use at its current size.
+        
+        Returns:
+            The target index type.
+        """
+        index_type = self.metadata["index_type"]
+        count = len(self.id_to_index)
+        
+        if index_type == "auto":
+            for max_count, scheduled_type in AUTO_INDEX_SCHEDULE:
+                if count < max_count:
+                    return scheduled_type
+            return AUTO_LARGEST_INDEX_TYPE
+        
+        if index_type in TRAINED_INDEX_TYPES and count < self.metadata["index_params"]["train_threshold"]:
+            return "Flat"
+        
+        return index_type
+    
+    def _maybe_migrate(self) -> bool:
+        """
+        Move the vectors to a larger index type if the collection outgrew the current one.
+        
+        Returns:
+            True if the index was migrated, False otherwise.
+        """
+        target_type = self._target_index_type()
+        if _INDEX_RANK[target_type] <= _INDEX_RANK[self.active_index_type]:
+            return False
+        
+        self._rebuild_index(target_type)
+        return True
+    
+    def _rebuild_index(self, index_type: str) -> None:
+        """
+        Replace the index with a new one of the given type holding all live vectors.
+        
+        Args:
+            index_type: The type of index to build.
+        """
+        self.index = self._create_index(index_type)
+        self.active_index_type = index_type
+        self.id_to_index = {}
+        self.index_to_id = {}
+        self._tombstones = set()
+        
+        live = list(self._iter_embeddings())
+        self._add_vectors([item_id for item_id, _ in live], [embedding for _, embedding in live], sample=False)
+    
+    def _iter_embeddings(self, item_ids: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the embeddings of items.
+        
+        Items that are still on disk are not hydrated; their embeddings are
+        read straight from the memory-mapped embedding matrix.
+        
+        Args:
+            item_ids: The IDs of the items (all items if None).
+        
+        Returns:
+            Iterator of (item ID, embedding) pairs for items with an embedding.
+        """
+        store = self.items if isinstance(self.items, LazyItemStore) else None
+        
+        for item_id in (self.items if item_ids is None else item_ids):
+            row = store.row_of(item_id) if store is not None else None
+            if row is not None:
+                if store.vector_ids[row] >= 0:
+                    yield item_id, store.embeddings[row]
+            else:
+                embedding = self.items[item_id].embedding
+                if embedding is not None:
+                    yield item_id, embedding
+    
+    def _sample_for_training(self, embeddings_np: np.ndarray) -> None:
+        """
+        Update the training reservoir with newly added vectors (Algorithm R).
+        
+        Args:
+            embeddings_np: The added vectors.
+        """
+        if self.metadata["index_type"] not in TRAINED_INDEX_TYPES + ("auto",):
+            return
+        
+        capacity = self.metadata["index_params"]["reservoir_size"]
+        if self._reservoir is None:
+            self._reservoir = np.empty((0, self.dimension), dtype=np.float32)
+        
+        # Fill the reservoir until it reaches capacity
+        free = max(0, min(capacity - len(self._reservoir), len(embeddings_np)))
+        if free:
+            self._reservoir = np.concatenate([self._reservoir, embeddings_np[:free]])
+        
+        # Then replace random entries with decreasing probability
+        seen = self._reservoir_seen + free
+        for vector in embeddings_np[free:]:
+            seen += 1
+            slot = self._rng.integers(seen)
+            if slot < capacity:
+                self._reservoir[slot] = vector
+        
+        self._reservoir_seen = seen
+    
+    def _training_sample(self) -> np.ndarray:
+        """
+        Get the vectors used to train an index.
+        
+        Returns:
+            The reservoir sample, or the live vectors if no sample has been kept.
+        """
+        if self._reservoir is not None and len(self._reservoir) > 0:
+            return self._reservoir
+        
+        return np.asarray([embedding for _, embedding in self._iter_embeddings()], dtype=np.float32).reshape(-1, self.dimension)
+    
+    def _derive_vector_id(self, item_id: str) -> int:
+        """
+        Derive a stable int64 FAISS vector ID from an item ID.
+        
+        Args:
+            item_id: The ID of the item.
+            
+        Returns:
+            A non-negative int64 vector ID that is not used by another item.
+        """
+        digest = hashlib.blake2b(item_id.encode("utf-8"), digest_size=8).digest()
+        vector_id = int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF
+        
+        # Resolve (very unlikely) hash collisions by linear probing
+        while (vector_id in self.index_to_id and self.index_to_id[vector_id] != item_id) or vector_id in self._tombstones:
+            vector_id = (vector_id + 1) & 0x7FFFFFFFFFFFFFFF
+        
+        return vector_id
+    
+    def _add_vector(self, item_id: str, embedding: List[float]) -> None:
+        """
+        Add an embedding to the FAISS index under the item's vector ID.
+        
+        Args:
+            item_id: The ID of the item.
+            embedding: The embedding to add.
+        """
+        self._add_vectors([item_id], [embedding])
+    
+    def _add_vectors(self, item_ids: List[str], embeddings: List[List[float]], sample: bool = True) -> None:
+        """
+        Add a batch of embeddings to the FAISS index with a single add call.
+        
+        Args:
+            item_ids: The IDs of the items.
+            embeddings: The embeddings to add, one per item.
+            sample: Whether to offer the embeddings to the training reservoir.
+        """
+        if not item_ids:
+            return
+        
+        embeddings_np = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if sample:
+            self._sample_for_training(embeddings_np)
+        
+        vector_ids = []
+        for item_id in item_ids:
+            vector_id = self._derive_vector_id(item_id)
+            vector_ids.append(vector_id)
+            
+            # Update the mappings
+            self.id_to_index[item_id] = vector_id
+            self.index_to_id[vector_id] = item_id
+        
+        self.index.add_with_ids(embeddings_np, np.array(vector_ids, dtype=np.int64))
+    
+    def _remove_vector(self, item_id: str) -> None:
+        """
+        Remove an item's embedding from the FAISS index.
+        
+        If the index cannot remove vectors, the vector is recorded as a
+        tombstone and skipped by search until the index is compacted.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        vector_id = self.id_to_index.pop(item_id, None)
+        if vector_id is None:
+            return
+        
+        self.index_to_id.pop(vector_id, None)
+        
+        try:
+            self.index.remove_ids(np.array([vector_id], dtype=np.int64))
+        except RuntimeError:
+            self._tombstones.add(vector_id)
+    
+    def tombstone_ratio(self) -> float:
+        """
+        Get the fraction of vectors in the index that are no longer live.
+        
+        Returns:
+            The tombstone ratio (0-1).
+        """
+        if self.index.ntotal == 0:
+            return 0.0
+        
+        return len(self._tombstones) / self.index.ntotal
+    
+    def compact(self, force: bool = False) -> bool:
+        """
+        Rebuild the FAISS index from the live items.
+        
+        The index is only rebuilt if the tombstone ratio exceeds the compaction
+        threshold, unless force is True.
+        
+        Args:
+            force: Whether to rebuild the index regardless of the tombstone ratio.
+            
+        Returns:
+            True if the index was rebuilt, False otherwise.
+        """
+        if not force and (not self._tombstones or self.tombstone_ratio() <= self.compact_threshold):
+            return False
+        
+        self._rebuild_index(self.active_index_type)
+        return True
     
     def add(self, item: VectorMemoryItem) -> str:
         """
@@ -80,29 +479,43 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         
         # Add the item to the dictionary
         super().add(item)
+        self._changes[item.id] = True
         
-        # Add the embedding to the FAISS index
+        # Add the embedding to the FAISS index, replacing any previous vector
         if item.embedding is not None:
-            embedding_np = np.array([item.embedding], dtype=np.float32)
-            
-            # If the index is IVF and not trained, train it
-            if isinstance(self.index, faiss.IndexIVFFlat) and not self.index.is_trained:
-                if len(self.items) >= 100:
-                    # Collect all embeddings
-                    embeddings = np.array([i.embedding for i in self.items.values() if i.embedding is not None], dtype=np.float32)
-                    # Train the index
-                    self.index.train(embeddings)
-            
-            # Add the embedding to the index
-            index = self.index.ntotal
-            self.index.add(embedding_np)
-            
-            # Update the mappings
-            self.id_to_index[item.id] = index
-            self.index_to_id[index] = item.id
+            self._remove_vector(item.id)
+            self._add_vector(item.id, item.embedding)
+            self._maybe_migrate()
         
         return item.id
     
+    def add_many(self, items: List[VectorMemoryItem]) -> List[str]:
+        """
+        Add a batch of items to memory.
+        
+        Missing embeddings are generated in one batch and all vectors are added
+        to the FAISS index with a single add call.
+        
+        Args:
+            items: The items to add to memory.
+            
+        Returns:
+            The IDs of the added items, in input order.
+        """
+        item_ids = super().add_many(items)
+        self._changes.update(dict.fromkeys(item_ids, True))
+        
+        # If an ID appears more than once, the last item wins
+        batch = {item.id: item for item in items if item.embedding is not None}
+        for item_id in batch:
+            self._remove_vector(item_id)
+        
+        self._add_vectors(list(batch), [item.embedding for item in batch.values()])
+        if not self._maybe_migrate():
+            self.compact()
+        
+        return item_ids
+    
     def update(self, item_id: str, content: Any = None, metadata: Dict[str, Any] = None) -> Optional[VectorMemoryItem]:
         """
         Update an item in memory.
@@ -120,37 +533,20 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         if original_item is None:
             return None
         
+        # The item is updated in place, so remember the old embedding
+        original_embedding = original_item.embedding
+        
         # Update the item
         updated_item = super().update(item_id, content, metadata)
+        self._changes[item_id] = True
         
-        # If the embedding changed, update the FAISS index
+        # If the embedding changed, replace the vector in the FAISS index
         if (updated_item is not None and updated_item.embedding is not None and
-                (original_item.embedding is None or original_item.embedding != updated_item.embedding)):
-            # FAISS doesn't support updating, so we need to remove and re-add
-            if item_id in self.id_to_index:
-                # Remove the old embedding
-                index = self.id_to_index[item_id]
-                # Note: FAISS doesn't support removing individual vectors
-                # In a real implementation, you would need to rebuild the index
-                
-                # Add the new embedding
-                embedding_np = np.array([updated_item.embedding], dtype=np.float32)
-                new_index = self.index.ntotal
-                self.index.add(embedding_np)
-                
-                # Update the mappings
-                self.id_to_index[item_id] = new_index
-                self.index_to_id[new_index] = item_id
-                del self.index_to_id[index]
-            else:
-                # Add the new embedding
-                embedding_np = np.array([updated_item.embedding], dtype=np.float32)
-                index = self.index.ntotal
-                self.index.add(embedding_np)
-                
-                # Update the mappings
-                self.id_to_index[item_id] = index
-                self.index_to_id[index] = item_id
+                (original_embedding is None or original_embedding != updated_item.embedding or
+                 item_id not in self.id_to_index)):
+            self._remove_vector(item_id)
+            self._add_vector(item_id, updated_item.embedding)
+            self.compact()
         
         return updated_item
     
@@ -167,74 +563,227 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         # Remove the item from the dictionary
         if not super().remove(item_id):
             return False
+        self._changes[item_id] = False
         
         # Remove the item from the FAISS index
-        if item_id in self.id_to_index:
-            index = self.id_to_index[item_id]
-            # Note: FAISS doesn't support removing individual vectors
-            # In a real implementation, you would need to rebuild the index
-            
-            # Update the mappings
-            del self.id_to_index[item_id]
-            del self.index_to_id[index]
+        self._remove_vector(item_id)
+        self.compact()
         
         return True
     
     def clear(self) -> None:
         """Remove all items from memory."""
+        self._close_items()
         super().clear()
         
         # Reset the FAISS index
-        dimension = self.dimension
-        index_type = self.metadata.get("index_type", "Flat")
-        
-        if index_type == "Flat":
-            self.index = faiss.IndexFlatL2(dimension)
-        elif index_type == "IVF":
-            quantizer = faiss.IndexFlatL2(dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, dimension, 100)
-            self.index.nprobe = 10
+        self._reservoir = None
+        self._reservoir_seen = 0
+        self.active_index_type = self.metadata["index_type"] if self.metadata["index_type"] in ("Flat", "HNSW") else "Flat"
+        self.index = self._create_index(self.active_index_type)
         
         self.id_to_index = {}
         self.index_to_id = {}
+        self._tombstones = set()
+        
+        # The next save has to write a full snapshot
+        self._changes = {}
+        self._persist_state = None
     
-    def search(self, query: Union[str, List[float]], limit: int = 10) -> List[VectorMemoryItem]:
+    def search(self, query: Union[str, List[float]], limit: int = 10, where: Optional[Dict[str, Any]] = None) -> List[VectorMemoryItem]:
         """
         Search for items in memory by similarity.
         
         Args:
             query: The query to search for (either a string or a vector embedding).
             limit: The maximum number of results to return.
+            where: Filter on item metadata (see MetadataIndex.select).
             
         Returns:
             List of items that match the query, sorted by similarity.
         """
-        # If the query is a string, convert it to a vector embedding
-        if isinstance(query, str):
-            query_embedding = self.generate_embedding(query)
+        return [item for item, score in self.search_many([query], limit, where=where)[0]]
+    
+    def search_many(
+        self,
+        queries: List[Union[str, List[float]]],
+        limit: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[VectorMemoryItem, float]]]:
+        """
+        Search for items in memory by similarity for a batch of queries.
+        
+        All queries are embedded in one batch and answered with a single FAISS
+        search call. Scores are 1 / (1 + squared L2 distance).
+        
+        A where filter is resolved to an allow-list of vector IDs with the
+        metadata index before searching. Small allow-lists (at most
+        exact_filter_threshold items) are scored exactly with one matrix
+        product over their embeddings; larger ones are passed to FAISS as an
+        IDSelector, so the index only ever returns allowed vectors.
+        
+        Args:
+            queries: The queries to search for (strings or vector embeddings).
+            limit: The maximum number of results to return per query.
+            where: Filter on item metadata (see MetadataIndex.select).
+        
+        Returns:
+            One list of (item, score) pairs per query, sorted by similarity.
+        """
+        # If there are no queries or no live vectors, return empty results
+        if not queries or not self.id_to_index or limit <= 0:
+            return [[] for _ in queries]
+        
+        # Resolve the filter to the vector IDs of the allowed items
+        allowed = self._select(where)
+        if allowed is not None:
+            allowed = [item_id for item_id in allowed if item_id in self.id_to_index]
+            if not allowed:
+                return [[] for _ in queries]
+        
+        # Convert the queries to a contiguous numpy matrix
+        query_np = np.ascontiguousarray(self._embed_queries(queries), dtype=np.float32)
+        
+        if allowed is not None and len(allowed) <= self.metadata["index_params"]["exact_filter_threshold"]:
+            return self._search_exact(query_np, allowed, limit)
+        
+        if allowed is None:
+            params = None
+            
+            # Over-fetch to make up for tombstones
+            k = limit + len(self._tombstones)
+            ceiling = self.index.ntotal
         else:
-            query_embedding = query
+            # Tombstoned vectors are never in the allow-list
+            selector = faiss.IDSelectorBatch(np.fromiter((self.id_to_index[item_id] for item_id in allowed), dtype=np.int64, count=len(allowed)))
+            params = self._search_parameters(selector)
+            k = limit
+            ceiling = len(allowed)
         
-        # Convert the query to a numpy array
-        query_np = np.array([query_embedding], dtype=np.float32)
+        # Hits can still be skipped (vectors of items that can no longer be
+        # loaded), so widen the search a bounded number of times. IVF probes
+        # that come back short are not helped by a larger k, so stop as soon
+        # as a round finds no new live hits.
+        ceiling = min(ceiling, k * SEARCH_OVERFETCH_FACTOR)
+        k = min(k, ceiling)
+        found = -1
+        while True:
+            distances, indices = self.index.search(query_np, k, params=params)
+            
+            # Convert the results to memory items
+            results = [self._collect_hits(row_distances, row_indices, limit) for row_distances, row_indices in zip(distances, indices)]
+            
+            total = sum(len(hits) for hits in results)
+            if all(len(hits) >= limit for hits in results) or k >= ceiling or total == found:
+                return results
+            
+            found = total
+            k = min(k * 2, ceiling)
+    
+    def _search_parameters(self, selector: faiss.IDSelector) -> faiss.SearchParameters:
+        """
+        Create search parameters that restrict a search to the selected vectors.
         
-        # If the index is empty, return an empty list
-        if self.index.ntotal == 0:
-            return []
+        Per-search parameters replace the ones set on the index, so the
+        configured nprobe/efSearch are carried over.
+        
+        Args:
+            selector: The selector of allowed vector IDs.
+        
+        Returns:
+            Search parameters for the active index type.
+        """
+        params = self.metadata["index_params"]
+        
+        if self.active_index_type in TRAINED_INDEX_TYPES:
+            return faiss.SearchParametersIVF(sel=selector, nprobe=params["nprobe"])
+        if self.active_index_type == "HNSW":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=params["ef_search"])
+        return faiss.SearchParameters(sel=selector)
+    
+    def _search_exact(self, query_np: np.ndarray, item_ids: List[str], limit: int) -> List[List[Tuple[VectorMemoryItem, float]]]:
+        """
+        Search a small set of items by exact squared L2 distance.
+        
+        Args:
+            query_np: The query embeddings.
+            item_ids: The IDs of the items to search (all with an embedding).
+            limit: The maximum number of results to return per query.
+            
+        Returns:
+            One list of (item, score) pairs per query, sorted by similarity.
+        """
+        live = list(self._iter_embeddings(item_ids))
+        embeddings_np = np.asarray([embedding for _, embedding in live], dtype=np.float32)
+        
+        # ||q - x||^2 = ||q||^2 - 2 q.x + ||x||^2
+        distances = (
+            np.einsum("ij,ij->i", query_np, query_np)[:, None]
+            - 2.0 * (query_np @ embeddings_np.T)
+            + np.einsum("ij,ij->i", embeddings_np, embeddings_np)[None, :]
+        )
+        np.maximum(distances, 0.0, out=distances)
+        
+        k = min(limit, len(live))
+        if k < len(live):
+            top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(live)), (len(query_np), len(live)))
+        top_distances = np.take_along_axis(distances, top, axis=1)
+        order = np.argsort(top_distances, axis=1, kind="stable")
+            
+        return [
+            [(self.get(live[row][0]), 1.0 / (1.0 + float(distance))) for row, distance in zip(rows, row_distances)]
+            for rows, row_distances in zip(np.take_along_axis(top, order, axis=1), np.take_along_axis(top_distances, order, axis=1))
+        ]
+            
+    def _close_items(self) -> None:
+        """Release the snapshot files of a lazily loaded item store before it is replaced."""
+        if isinstance(self.items, LazyItemStore):
+            self.items.close()
+    
+    def _item_metadata(self, item_id: str) -> Dict[str, Any]:
+        """
+        Get the metadata of an item while building the metadata index.
+            
+        Items that are still on disk are not hydrated.
+        
+        Args:
+            item_id: The ID of the item.
         
-        # Search the FAISS index
-        distances, indices = self.index.search(query_np, min(limit, self.index.ntotal))
+        Returns:
+            The metadata of the item.
+        """
+        if isinstance(self.items, LazyItemStore):
+            return self.items.metadata_of(item_id)
+        return super()._item_metadata(item_id)
+    
+    def _collect_hits(self, distances: np.ndarray, indices: np.ndarray, limit: int) -> List[Tuple[VectorMemoryItem, float]]:
+        """
+        Convert one row of FAISS search output to live (item, score) pairs.
         
-        # Convert the results to memory items
-        results = []
-        for i, idx in enumerate(indices[0]):
-            if idx in self.index_to_id:
-                item_id = self.index_to_id[idx]
-                item = self.get(item_id)
-                if item is not None:
-                    results.append(item)
+        Args:
+            distances: Squared L2 distances returned by FAISS.
+            indices: Vector IDs returned by FAISS (-1 for empty slots).
+            limit: The maximum number of hits to return.
+            
+        Returns:
+            List of (item, score) pairs, skipping tombstones and empty slots.
+        """
+        hits = []
+        for distance, idx in zip(distances, indices):
+            if idx < 0 or idx in self._tombstones:
+                continue
+            item_id = self.index_to_id.get(int(idx))
+            if item_id is None:
+                continue
+            item = self.get(item_id)
+            if item is not None:
+                hits.append((item, 1.0 / (1.0 + float(distance))))
+                if len(hits) >= limit:
+                    break
         
-        return results
+        return hits
     
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -257,6 +806,23 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         
         return embedding.tolist()
     
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate vector embeddings for a batch of texts.
+        
+        Args:
+            texts: The texts to generate embeddings for.
+            
+        Returns:
+            Vector embeddings for the texts, in input order.
+        """
+        # This is a placeholder implementation, see generate_embedding
+        embeddings = np.random.randn(len(texts), self.dimension).astype(np.float32)
+        # Normalize the embeddings
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        
+        return embeddings.tolist()
+    
     def calculate_similarity(self, embedding1: List[float], embedding2: Optional[List[float]]) -> float:
         """
         Calculate the similarity between two vector embeddings.
@@ -284,45 +850,81 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         
         return float(similarity)
     
-    def save(self, directory: str) -> None:
+    def save(self, directory: str, embedding_dtype: str = "float16", max_log_ratio: float = 0.25) -> None:
         """
         Save the memory system to disk.
         
+        The first save to a directory writes a binary snapshot: the FAISS index,
+        an embedding matrix (.npy) that load() memory-maps, and line-delimited
+        item records with a byte-offset index. Later saves to the same directory
+        only append the items changed since the previous save to a change log,
+        unless the index type changed or the log would grow past max_log_ratio
+        of the snapshot, in which case a new snapshot is written.
+        
         Args:
             directory: The directory to save the memory system to.
+            embedding_dtype: The dtype the embedding matrix is stored with.
+            max_log_ratio: Maximum size of the change log relative to the snapshot.
         """
-        os.makedirs(directory, exist_ok=True)
+        state = self._persist_state
+        incremental = (
+            state is not None and
+            state["directory"] == os.path.abspath(directory) and
+            state["active_index_type"] == self.active_index_type and
+            state["log_count"] + len(self._changes) <= max_log_ratio * max(state["snapshot_count"], 1)
+        )
         
-        # Save the FAISS index
-        faiss.write_index(self.index, os.path.join(directory, "index.faiss"))
+        metadata = {
+            "name": self.name,
+            "dimension": self.dimension,
+            "memory_type": self.memory_type.name,
+            "metadata": self.metadata,
+            "active_index_type": self.active_index_type,
+            "format": FORMAT_VERSION,
+        }
+        metadata_path = os.path.join(directory, "metadata.json")
         
-        # Save the items
-        items_data = {item_id: item.to_dict() for item_id, item in self.items.items()}
-        with open(os.path.join(directory, "items.json"), "w") as f:
-            json.dump(items_data, f)
+        if incremental:
+            # Append the changed items to the change log
+            changes = [(item_id, self.items.get(item_id) if live else None) for item_id, live in self._changes.items()]
+            append_changes(directory, changes)
+            state["log_count"] += len(changes)
+            
+            # Save the metadata
+            write_json(metadata_path, metadata)
+            os.replace(temporary_path(metadata_path), metadata_path)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            
+            # Write the items, the FAISS index, the mappings and the metadata to
+            # temporary files, and only then move them all into place
+            ids = write_snapshot(directory, self.items, self.id_to_index, self.dimension, embedding_dtype)
+            faiss.write_index(self.index, temporary_path(os.path.join(directory, "index.faiss")))
+            write_json(os.path.join(directory, "mappings.json"), {
+                "ids": ids,
+                "tombstones": sorted(self._tombstones),
+            })
+            write_json(metadata_path, metadata)
+            commit_snapshot(directory, ["index.faiss", "mappings.json", "metadata.json"])
+            
+            self._persist_state = {
+                "directory": os.path.abspath(directory),
+                "active_index_type": self.active_index_type,
+                "snapshot_count": len(ids),
+                "log_count": 0,
+            }
         
-        # Save the mappings
-        mappings_data = {
-            "id_to_index": self.id_to_index,
-            "index_to_id": {int(k): v for k, v in self.index_to_id.items()},
-        }
-        with open(os.path.join(directory, "mappings.json"), "w") as f:
-            json.dump(mappings_data, f)
-        
-        # Save the metadata
-        with open(os.path.join(directory, "metadata.json"), "w") as f:
-            json.dump({
-                "name": self.name,
-                "dimension": self.dimension,
-                "memory_type": self.memory_type.name,
-                "metadata": self.metadata,
-            }, f)
+        self._changes = {}
     
     @classmethod
     def load(cls, directory: str) -> 'FAISSMemory':
         """
         Load a memory system from disk.
         
+        Items are not parsed up front: they are read from the memory-mapped
+        snapshot when they are first accessed, and the change log is replayed
+        on top of the snapshot.
+        
         Args:
             directory: The directory to load the memory system from.
             
@@ -333,15 +935,96 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         with open(os.path.join(directory, "metadata.json"), "r") as f:
             metadata_data = json.load(f)
         
+        if metadata_data.get("format", 1) < FORMAT_VERSION:
+            return cls._load_json(directory, metadata_data)
+        
         # Create the memory system
         memory = cls(
             name=metadata_data.get("name", ""),
             dimension=metadata_data.get("dimension", 1536),
             index_type=metadata_data.get("metadata", {}).get("index_type", "Flat"),
+            **metadata_data.get("metadata", {}).get("index_params", {}),
         )
         
         # Load the FAISS index
         memory.index = faiss.read_index(os.path.join(directory, "index.faiss"))
+        memory.active_index_type = metadata_data["active_index_type"]
+        memory._apply_search_params(memory.index)
+        
+        # Open the item snapshot
+        with open(os.path.join(directory, "mappings.json"), "r") as f:
+            mappings_data = json.load(f)
+        
+        ids = mappings_data.get("ids", [])
+        store = LazyItemStore(directory, ids)
+        memory._close_items()
+        memory.items = store
+        
+        # Rebuild the mappings from the stored vector IDs
+        for item_id, vector_id in zip(ids, store.vector_ids.tolist()):
+            if vector_id >= 0:
+                memory.id_to_index[item_id] = vector_id
+                memory.index_to_id[vector_id] = item_id
+        memory._tombstones = set(mappings_data.get("tombstones", []))
+        
+        # Re-seed the training reservoir from a sample of the stored embeddings
+        if memory.metadata["index_type"] in TRAINED_INDEX_TYPES + ("auto",):
+            rows = np.flatnonzero(np.asarray(store.vector_ids) >= 0)
+            sample_size = min(len(rows), memory.metadata["index_params"]["reservoir_size"])
+            if sample_size:
+                sample_rows = np.sort(memory._rng.choice(rows, size=sample_size, replace=False))
+                memory._sample_for_training(np.asarray(store.embeddings[sample_rows], dtype=np.float32))
+                memory._reservoir_seen = len(rows)
+        
+        # Replay the changes saved after the snapshot
+        log_count = 0
+        for item_id, item in read_changes(directory):
+            log_count += 1
+            memory._remove_vector(item_id)
+            
+            if item is None:
+                memory.items.pop(item_id, None)
+            else:
+                memory.items[item_id] = item
+                if item.embedding is not None:
+                    memory._add_vector(item_id, item.embedding)
+        
+        memory._persist_state = {
+            "directory": os.path.abspath(directory),
+            "active_index_type": memory.active_index_type,
+            "snapshot_count": len(ids),
+            "log_count": log_count,
+        }
+        
+        memory.compact()
+        memory._maybe_migrate()
+        
+        return memory
+    
+    @classmethod
+    def _load_json(cls, directory: str, metadata_data: Dict[str, Any]) -> 'FAISSMemory':
+        """
+        Load a memory system saved in the JSON format used before format version 2.
+        
+        Args:
+            directory: The directory to load the memory system from.
+            metadata_data: The contents of metadata.json.
+        
+        Returns:
+            The loaded memory system.
+        """
+        # Create the memory system
+        memory = cls(
+            name=metadata_data.get("name", ""),
+            dimension=metadata_data.get("dimension", 1536),
+            index_type=metadata_data.get("metadata", {}).get("index_type", "Flat"),
+            **metadata_data.get("metadata", {}).get("index_params", {}),
+        )
+        
+        # Load the FAISS index
+        memory.index = faiss.read_index(os.path.join(directory, "index.faiss"))
+        memory.active_index_type = metadata_data.get("active_index_type", memory.active_index_type)
+        memory._apply_search_params(memory.index)
         
         # Load the items
         with open(os.path.join(directory, "items.json"), "r") as f:
@@ -357,5 +1040,17 @@ class FAISSMemory(VectorMemory[VectorMemoryItem]):
         
         memory.id_to_index = mappings_data.get("id_to_index", {})
         memory.index_to_id = {int(k): v for k, v in mappings_data.get("index_to_id", {}).items()}
+        memory._tombstones = set(mappings_data.get("tombstones", []))
+        
+        # Re-seed the training reservoir from the stored embeddings
+        embeddings = [item.embedding for item in memory.items.values() if item.embedding is not None]
+        if embeddings:
+            memory._sample_for_training(np.asarray(embeddings, dtype=np.float32))
+        
+        # Indexes saved before vectors were ID-mapped are addressed by position,
+        # so rebuild them from the stored embeddings
+        if "active_index_type" not in metadata_data:
+            memory.compact(force=True)
+        memory._maybe_migrate()
         
         return memory
@@ -0,0 +1,333 @@
+"""
+Binary storage for vector memory systems.
+
+This module provides the on-disk format used by FAISSMemory. Embeddings are
+stored as a raw .npy matrix that is opened with mmap_mode, item records are
+stored as line-delimited JSON with a byte-offset index, and changes made after
+a snapshot are appended to a change log instead of rewriting the snapshot.
+"""
+
+import os
+import json
+import mmap
+from collections.abc import MutableMapping
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+from augment_adam.memory.vector.base import VectorMemoryItem
+
+
+# Version of the on-disk format written by write_snapshot
+FORMAT_VERSION = 2
+
+EMBEDDINGS_FILE = "embeddings.npy"
+ITEMS_FILE = "items.jsonl"
+OFFSETS_FILE = "items_offsets.npy"
+VECTOR_IDS_FILE = "vector_ids.npy"
+CHANGES_FILE = "changes.jsonl"
+
+
+class LazyItemStore(MutableMapping):
+    """
+    Dictionary of vector memory items backed by a snapshot on disk.
+    
+    Items from the snapshot are only parsed when they are first accessed; their
+    embeddings are read from the memory-mapped embedding matrix. Items that are
+    added, replaced or accessed are kept in memory.
+    
+    Attributes:
+        directory: The directory containing the snapshot.
+        embeddings: The memory-mapped embedding matrix.
+        vector_ids: The FAISS vector ID of each row (-1 for rows without an embedding).
+    """
+    
+    def __init__(self, directory: str, ids: List[str]) -> None:
+        """
+        Open a snapshot.
+        
+        Args:
+            directory: The directory containing the snapshot.
+            ids: The item ID of each row, in row order.
+        """
+        self.directory = directory
+        self.embeddings = np.load(os.path.join(directory, EMBEDDINGS_FILE), mmap_mode="r")
+        self.vector_ids = np.load(os.path.join(directory, VECTOR_IDS_FILE), mmap_mode="r")
+        self._offsets = np.load(os.path.join(directory, OFFSETS_FILE), mmap_mode="r")
+        
+        self._items_file = open(os.path.join(directory, ITEMS_FILE), "rb")
+        self._records = mmap.mmap(self._items_file.fileno(), 0, access=mmap.ACCESS_READ) if self._offsets[-1] > 0 else b""
+        
+        # Rows that have not been hydrated yet, and items held in memory
+        self._rows: Dict[str, int] = {item_id: row for row, item_id in enumerate(ids)}
+        self._loaded: Dict[str, VectorMemoryItem] = {}
+    
+    def row_of(self, item_id: str) -> Optional[int]:
+        """
+        Get the snapshot row of an item that has not been hydrated yet.
+        
+        Args:
+            item_id: The ID of the item.
+        
+        Returns:
+            The row, or None if the item is in memory or doesn't exist.
+        """
+        return self._rows.get(item_id)
+    
+    def metadata_of(self, item_id: str) -> Dict[str, Any]:
+        """
+        Get the metadata of an item without hydrating it.
+        
+        Args:
+            item_id: The ID of the item.
+        
+        Returns:
+            The metadata of the item.
+        """
+        row = self._rows.get(item_id)
+        if row is None:
+            return self[item_id].metadata
+        
+        return json.loads(self._records[int(self._offsets[row]):int(self._offsets[row + 1])]).get("metadata", {})
+    
+    def raw_row(self, item_id: str) -> Optional[Tuple[bytes, Optional[np.ndarray]]]:
+        """
+        Get the stored record and embedding of an item that has not been hydrated yet.
+        
+        Args:
+            item_id: The ID of the item.
+        
+        Returns:
+            The record bytes (including the trailing newline) and the embedding
+            row (None if the item has no embedding), or None if the item is in
+            memory or doesn't exist.
+        """
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+        
+        record = self._records[int(self._offsets[row]):int(self._offsets[row + 1])]
+        embedding = self.embeddings[row] if self.vector_ids[row] >= 0 else None
+        return record, embedding
+    
+    def _hydrate(self, item_id: str) -> VectorMemoryItem:
+        """
+        Parse an item from the snapshot and move it into memory.
+        
+        Args:
+            item_id: The ID of the item.
+        
+        Returns:
+            The item.
+        """
+        row = self._rows.pop(item_id)
+        data = json.loads(self._records[int(self._offsets[row]):int(self._offsets[row + 1])])
+        
+        if self.vector_ids[row] >= 0:
+            data["embedding"] = self.embeddings[row].astype(np.float32).tolist()
+        
+        item = VectorMemoryItem.from_dict(data)
+        self._loaded[item_id] = item
+        return item
+    
+    def __getitem__(self, item_id: str) -> VectorMemoryItem:
+        """Get an item, hydrating it from the snapshot if needed."""
+        if item_id in self._loaded:
+            return self._loaded[item_id]
+        if item_id in self._rows:
+            return self._hydrate(item_id)
+        raise KeyError(item_id)
+    
+    def __setitem__(self, item_id: str, item: VectorMemoryItem) -> None:
+        """Add or replace an item in memory."""
+        self._rows.pop(item_id, None)
+        self._loaded[item_id] = item
+    
+    def __delitem__(self, item_id: str) -> None:
+        """Remove an item."""
+        if self._rows.pop(item_id, None) is None and self._loaded.pop(item_id, None) is None:
+            raise KeyError(item_id)
+    
+    def __contains__(self, item_id: object) -> bool:
+        """Check whether an item exists without hydrating it."""
+        return item_id in self._loaded or item_id in self._rows
+    
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the item IDs."""
+        # Iterate over a snapshot of the keys, since hydration moves items
+        yield from list(self._loaded)
+        yield from list(self._rows)
+    
+    def __len__(self) -> int:
+        """Get the number of items."""
+        return len(self._loaded) + len(self._rows)
+    
+    def close(self) -> None:
+        """Release the memory maps and file handles of the snapshot."""
+        if isinstance(self._records, mmap.mmap):
+            self._records.close()
+        self._items_file.close()
+
+
+# Files of a snapshot written by write_snapshot, in the order they are committed
+SNAPSHOT_FILES = (EMBEDDINGS_FILE, ITEMS_FILE, OFFSETS_FILE, VECTOR_IDS_FILE)
+
+
+def temporary_path(path: str) -> str:
+    """
+    Get the temporary path a file is written to before it replaces path.
+    
+    Args:
+        path: The final path of the file.
+    
+    Returns:
+        The temporary path.
+    """
+    return path + ".tmp"
+
+
+def write_json(path: str, data: Any) -> None:
+    """
+    Write a JSON file to its temporary path, to be moved into place later.
+    
+    Args:
+        path: The final path of the file.
+        data: The data to write.
+    """
+    with open(temporary_path(path), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def write_snapshot(
+    directory: str,
+    items: MutableMapping,
+    id_to_vector_id: Dict[str, int],
+    dimension: int,
+    embedding_dtype: str = "float16",
+) -> List[str]:
+    """
+    Write all items to the temporary files of a new binary snapshot.
+    
+    Nothing is moved into place until commit_snapshot is called, so readers
+    that still have the previous snapshot memory-mapped are unaffected, and a
+    crash while writing leaves the previous snapshot intact.
+    Items of a LazyItemStore that have not been hydrated are copied from the
+    previous snapshot without being parsed.
+    
+    Args:
+        directory: The directory to write the snapshot to.
+        items: The items to write, keyed by ID.
+        id_to_vector_id: Mapping from item IDs to FAISS vector IDs.
+        dimension: The dimension of the vector embeddings.
+        embedding_dtype: The dtype the embedding matrix is stored with.
+    
+    Returns:
+        The item ID of each row, in row order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    
+    ids = list(items)
+    paths = {name: os.path.join(directory, name) for name in SNAPSHOT_FILES}
+    
+    # Stream the embeddings into a memory-mapped .npy file
+    embeddings = np.lib.format.open_memmap(temporary_path(paths[EMBEDDINGS_FILE]), mode="w+", dtype=np.dtype(embedding_dtype), shape=(len(ids), dimension))
+    vector_ids = np.full(len(ids), -1, dtype=np.int64)
+    offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    
+    store = items if isinstance(items, LazyItemStore) else None
+    
+    with open(temporary_path(paths[ITEMS_FILE]), "wb") as f:
+        for row, item_id in enumerate(ids):
+            raw = store.raw_row(item_id) if store is not None else None
+            if raw is not None:
+                record, embedding = raw
+                if embedding is not None:
+                    embeddings[row] = embedding
+                    vector_ids[row] = id_to_vector_id.get(item_id, -1)
+                
+                f.write(record)
+                offsets[row + 1] = f.tell()
+                continue
+            
+            item = items[item_id]
+            data = item.to_dict()
+            data.pop("embedding", None)
+            
+            if item.embedding is not None:
+                embeddings[row] = item.embedding
+                vector_ids[row] = id_to_vector_id.get(item_id, -1)
+            
+            f.write(json.dumps(data).encode("utf-8") + b"\n")
+            offsets[row + 1] = f.tell()
+    
+    embeddings.flush()
+    del embeddings
+    for name, array in ((VECTOR_IDS_FILE, vector_ids), (OFFSETS_FILE, offsets)):
+        with open(temporary_path(paths[name]), "wb") as f:
+            np.save(f, array, allow_pickle=False)
+    
+    return ids
+
+
+def commit_snapshot(directory: str, names: List[str]) -> None:
+    """
+    Move a snapshot written by write_snapshot into place and clear the change log.
+    
+    The change log is cleared last: if the process stops before that, the
+    log is replayed on top of the new snapshot, which already contains its
+    changes, and replaying them again gives the same items.
+    
+    Args:
+        directory: The directory containing the snapshot.
+        names: Further files written to their temporary paths to move into
+            place with the snapshot, in order.
+    """
+    for name in list(SNAPSHOT_FILES) + list(names):
+        path = os.path.join(directory, name)
+        os.replace(temporary_path(path), path)
+    
+    # The snapshot now contains every change
+    open(os.path.join(directory, CHANGES_FILE), "wb").close()
+
+
+def append_changes(directory: str, changes: List[Tuple[str, Optional[VectorMemoryItem]]]) -> None:
+    """
+    Append changes made since the last snapshot to the change log.
+    
+    Args:
+        directory: The directory containing the snapshot.
+        changes: (item ID, item) pairs, where item is None for removed items.
+    """
+    with open(os.path.join(directory, CHANGES_FILE), "a", encoding="utf-8") as f:
+        for item_id, item in changes:
+            if item is None:
+                f.write(json.dumps({"op": "remove", "id": item_id}) + "\n")
+            else:
+                f.write(json.dumps({"op": "put", "item": item.to_dict()}) + "\n")
+
+
+def read_changes(directory: str) -> Iterator[Tuple[str, Optional[VectorMemoryItem]]]:
+    """
+    Read the change log of a snapshot.
+    
+    Args:
+        directory: The directory containing the snapshot.
+    
+    Returns:
+        Iterator of (item ID, item) pairs, where item is None for removed items.
+    """
+    path = os.path.join(directory, CHANGES_FILE)
+    if not os.path.exists(path):
+        return
+    
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            
+            change = json.loads(line)
+            if change["op"] == "remove":
+                yield change["id"], None
+            else:
+                item = VectorMemoryItem.from_dict(change["item"])
+                yield item.id, item
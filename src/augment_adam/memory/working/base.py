@@ -6,13 +6,17 @@ including the WorkingMemory class and WorkingMemoryItem class.
 """
 
 import uuid
+import heapq
 import datetime
+import itertools
 import time
-from typing import Dict, List, Any, Optional, Set, Union, Callable, TypeVar
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, TypeVar, Hashable
 from dataclasses import dataclass, field
 
 from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.memory.core.base import Memory, MemoryItem, MemoryType
+from augment_adam.memory.core.text_index import TextIndex
+from augment_adam.utils.timing_wheel import TimingWheel
 
 
 @dataclass
@@ -113,6 +117,22 @@ class WorkingMemory(Memory[T]):
     This class implements a working memory system for temporary storage of
     information during ongoing tasks.
     
+    Text search is served by a TextIndex over the string content of each item.
+    The index is built on the first text search and then kept up to date by
+    add, update and remove (including evictions and expiry); items that are
+    modified directly must be passed to reindex.
+    
+    Bookkeeping is incremental, so no operation scans every item:
+    
+    - Eviction uses a min-heap keyed by (importance * 10 + priority, priority,
+      last access). Entries are invalidated lazily: a changed or accessed
+      item gets a new entry, and outdated entries are skipped when popped.
+    - Items with a TTL are scheduled in a hierarchical timing wheel, which is
+      advanced at most every cleanup_interval seconds to remove the items
+      that expired, without scanning the other items.
+    - Hash indexes by task, status and priority answer get_by_task,
+      get_by_status and get_by_priority in O(1 + k).
+    
     Attributes:
         name: The name of the memory system.
         items: Dictionary of items in memory, keyed by ID.
@@ -143,6 +163,157 @@ class WorkingMemory(Memory[T]):
         self.metadata["capacity"] = capacity
         self.metadata["cleanup_interval"] = cleanup_interval
     
+        # Full-text index over item content (built lazily)
+        self._text_index: Optional[TextIndex] = None
+    
+        # Eviction heap of [score, priority, access, item ID] entries, and the
+        # current entry of each item; other entries are outdated
+        self._heap: List[List[Any]] = []
+        self._heap_entries: Dict[str, List[Any]] = {}
+        self._access = itertools.count()
+        
+        # Expiry times of items with a TTL
+        self._wheel = TimingWheel(now=time.time())
+        
+        # Hash indexes: value -> item IDs (in insertion order)
+        self._by_task: Dict[Optional[str], Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_priority: Dict[int, Dict[str, None]] = {}
+        self._indexed: Dict[str, Tuple[Optional[str], str, int]] = {}
+    
+    @property
+    def text_index(self) -> TextIndex:
+        """The full-text index over item content."""
+        if self._text_index is None:
+            self._text_index = TextIndex()
+            for item in self.items.values():
+                self._text_index.add(item.id, self._item_texts(item))
+        
+        return self._text_index
+    
+    @staticmethod
+    def _item_texts(item: WorkingMemoryItem) -> List[str]:
+        """
+        Get the texts of an item that are searchable.
+        
+        Args:
+            item: The item.
+        
+        Returns:
+            The content of the item, if it is a string.
+        """
+        return [item.content] if isinstance(item.content, str) else []
+    
+    @staticmethod
+    def _add_to_index(index: Dict[Any, Dict[str, None]], value: Any, item_id: str) -> None:
+        """Add an item ID to the bucket of a value in a hash index."""
+        index.setdefault(value, {})[item_id] = None
+    
+    @staticmethod
+    def _remove_from_index(index: Dict[Any, Dict[str, None]], value: Any, item_id: str) -> None:
+        """Remove an item ID from the bucket of a value in a hash index."""
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(item_id, None)
+            if not bucket:
+                del index[value]
+    
+    def _push(self, item: WorkingMemoryItem) -> None:
+        """
+        Push a new eviction heap entry for an item, outdating its previous one.
+        
+        Args:
+            item: The item.
+        """
+        entry = [item.importance * 10 + item.priority, item.priority, next(self._access), item.id]
+        self._heap_entries[item.id] = entry
+        heapq.heappush(self._heap, entry)
+        
+        # Drop outdated entries once they make up most of the heap
+        if len(self._heap) > 2 * len(self._heap_entries) + 64:
+            self._heap = list(self._heap_entries.values())
+            heapq.heapify(self._heap)
+    
+    @staticmethod
+    def _expiry_time(item: WorkingMemoryItem) -> Optional[float]:
+        """
+        Get the time at which an item expires.
+        
+        Args:
+            item: The item.
+        
+        Returns:
+            The expiry time as a timestamp, or None if the item never expires.
+        """
+        if item.ttl == 0 or item.expires_at is None:
+            return None
+        
+        return datetime.datetime.fromisoformat(item.expires_at).timestamp()
+    
+    def _track(self, item: WorkingMemoryItem) -> None:
+        """
+        Add an item to the eviction heap, the timing wheel and the hash indexes.
+        
+        Args:
+            item: The item.
+        """
+        self._push(item)
+        
+        expiry_time = self._expiry_time(item)
+        if expiry_time is not None:
+            self._wheel.schedule(item.id, expiry_time)
+        else:
+            self._wheel.cancel(item.id)
+        
+        # Only move the item between buckets whose value changed
+        values = (item.task_id, item.status, item.priority)
+        previous = self._indexed.get(item.id)
+        for position, index in enumerate((self._by_task, self._by_status, self._by_priority)):
+            if previous is not None:
+                if previous[position] == values[position]:
+                    continue
+                self._remove_from_index(index, previous[position], item.id)
+            self._add_to_index(index, values[position], item.id)
+        self._indexed[item.id] = values
+    
+    def _untrack(self, item_id: str) -> None:
+        """
+        Remove an item from the eviction heap, the timing wheel and the hash indexes.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        self._heap_entries.pop(item_id, None)
+        self._wheel.cancel(item_id)
+        
+        indexed = self._indexed.pop(item_id, None)
+        if indexed is not None:
+            task_id, status, priority = indexed
+            self._remove_from_index(self._by_task, task_id, item_id)
+            self._remove_from_index(self._by_status, status, item_id)
+            self._remove_from_index(self._by_priority, priority, item_id)
+    
+    def reindex(self, item_id: str) -> None:
+        """
+        Update the indexes after an item was modified directly.
+        
+        Args:
+            item_id: The ID of the item.
+        """
+        item = self.items.get(item_id)
+        if item is None:
+            self._untrack(item_id)
+        else:
+            self._track(item)
+        
+        if self._text_index is None:
+            return
+        
+        if item is None:
+            self._text_index.remove(item_id)
+        else:
+            self._text_index.add(item_id, self._item_texts(item))
+    
     def add(self, item: T) -> str:
         """
         Add an item to memory.
@@ -161,7 +332,9 @@ class WorkingMemory(Memory[T]):
             # Remove the least important item
             self._remove_least_important()
         
-        return super().add(item)
+        item_id = super().add(item)
+        self.reindex(item_id)
+        return item_id
     
     def get(self, item_id: str) -> Optional[T]:
         """
@@ -183,6 +356,9 @@ class WorkingMemory(Memory[T]):
             self.remove(item_id)
             return None
         
+        if item is not None:
+            self._push(item)
+        
         return item
     
     def update(self, item_id: str, content: Any = None, metadata: Dict[str, Any] = None) -> Optional[T]:
@@ -207,7 +383,41 @@ class WorkingMemory(Memory[T]):
             self.remove(item_id)
             return None
         
-        return super().update(item_id, content, metadata)
+        item = super().update(item_id, content, metadata)
+        if item is not None and content is not None:
+            self.reindex(item_id)
+        elif item is not None:
+            self._push(item)
+        return item
+    
+    def remove(self, item_id: str) -> bool:
+        """
+        Remove an item from memory.
+        
+        Args:
+            item_id: The ID of the item to remove.
+        
+        Returns:
+            True if the item was removed, False otherwise.
+        """
+        if not super().remove(item_id):
+            return False
+        
+        self.reindex(item_id)
+        return True
+    
+    def clear(self) -> None:
+        """Remove all items from memory."""
+        super().clear()
+        self._text_index = None
+        
+        self._heap = []
+        self._heap_entries = {}
+        self._wheel.clear()
+        self._by_task = {}
+        self._by_status = {}
+        self._by_priority = {}
+        self._indexed = {}
     
     def get_all(self) -> List[T]:
         """
@@ -235,7 +445,7 @@ class WorkingMemory(Memory[T]):
         # Check if cleanup is needed
         self._maybe_cleanup()
         
-        return [item for item in self.items.values() if item.task_id == task_id and not item.is_expired()]
+        return self._lookup(self._by_task.get(task_id, {}))
     
     def get_by_status(self, status: str) -> List[T]:
         """
@@ -250,7 +460,7 @@ class WorkingMemory(Memory[T]):
         # Check if cleanup is needed
         self._maybe_cleanup()
         
-        return [item for item in self.items.values() if item.status == status and not item.is_expired()]
+        return self._lookup(self._by_status.get(status, {}))
     
     def get_by_priority(self, min_priority: int = 0, max_priority: int = 10) -> List[T]:
         """
@@ -261,12 +471,30 @@ class WorkingMemory(Memory[T]):
             max_priority: The maximum priority (inclusive).
             
         Returns:
-            List of items with priority in the specified range.
+            List of items with priority in the specified range, by ascending
+            priority.
         """
         # Check if cleanup is needed
         self._maybe_cleanup()
         
-        return [item for item in self.items.values() if min_priority <= item.priority <= max_priority and not item.is_expired()]
+        results = []
+        for priority in sorted(self._by_priority):
+            if min_priority <= priority <= max_priority:
+                results.extend(self._lookup(self._by_priority[priority]))
+        
+        return results
+    
+    def _lookup(self, item_ids: Dict[str, None]) -> List[T]:
+        """
+        Get the unexpired items of a hash index bucket.
+        
+        Args:
+            item_ids: The bucket.
+        
+        Returns:
+            List of items.
+        """
+        return [self.items[item_id] for item_id in item_ids if not self.items[item_id].is_expired()]
     
     def update_status(self, item_id: str, status: str) -> Optional[T]:
         """
@@ -285,6 +513,7 @@ class WorkingMemory(Memory[T]):
         
         item.status = status
         item.updated_at = datetime.datetime.now().isoformat()
+        self._track(item)
         
         return item
     
@@ -305,6 +534,7 @@ class WorkingMemory(Memory[T]):
         
         item.priority = priority
         item.updated_at = datetime.datetime.now().isoformat()
+        self._track(item)
         
         return item
     
@@ -333,6 +563,8 @@ class WorkingMemory(Memory[T]):
         else:
             item.expires_at = None
         
+        self._track(item)
+        
         return item
     
     def search(self, query: Any, limit: int = 10) -> List[T]:
@@ -349,26 +581,24 @@ class WorkingMemory(Memory[T]):
         # Check if cleanup is needed
         self._maybe_cleanup()
         
-        # If the query is a string, search for items with matching content
+        # If the query is a string, rank unexpired items whose content shares a token with it
         if isinstance(query, str):
-            results = []
-            
-            for item in self.items.values():
-                # Skip expired items
-                if item.is_expired():
-                    continue
-                
-                # Check if the item content contains the query
-                if item.content and isinstance(item.content, str) and query.lower() in item.content.lower():
-                    results.append(item)
-            
-            return results[:limit]
+            hits = self.text_index.search(query, limit, predicate=lambda item_id: not self.items[item_id].is_expired())
+            return [self.items[item_id] for item_id, score in hits]
         
         # If the query is a dictionary, search for items with matching attributes
         elif isinstance(query, dict):
             results = []
             
-            for item in self.items.values():
+            # Only check the items in the smallest matching hash index bucket
+            item_ids = self.items
+            for key, index in (("task_id", self._by_task), ("status", self._by_status), ("priority", self._by_priority)):
+                if key in query and isinstance(query[key], Hashable):
+                    bucket = index.get(query[key], {})
+                    if len(bucket) < len(item_ids):
+                        item_ids = bucket
+            
+            for item in [self.items[item_id] for item_id in item_ids]:
                 # Skip expired items
                 if item.is_expired():
                     continue
@@ -416,44 +646,34 @@ class WorkingMemory(Memory[T]):
         """
         Clean up expired items.
         """
-        # Find expired items
-        expired_ids = []
-        for item_id, item in self.items.items():
+        for item_id in self._wheel.advance(time.time()):
+            item = self.items.get(item_id)
+            if item is None:
+                continue
+            
             if item.is_expired():
-                expired_ids.append(item_id)
-        
-        # Remove expired items
-        for item_id in expired_ids:
-            super().remove(item_id)
+                self.remove(item_id)
+            else:
+                # Not expired by the item's own clock yet: check again later
+                self._wheel.schedule(item_id, time.time() + self._wheel.tick)
     
     def _remove_least_important(self) -> None:
         """
         Remove the least important item from memory.
-        """
-        if not self.items:
-            return
         
-        # Find the item with the lowest importance and priority
-        least_important_id = None
-        least_importance = float('inf')
-        least_priority = float('inf')
+        Ties in importance and priority are broken by evicting the least
+        recently accessed item.
+        """
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            item_id = entry[3]
         
-        for item_id, item in self.items.items():
-            # Skip expired items (they will be cleaned up anyway)
-            if item.is_expired():
+            # Skip entries outdated by a later access or change
+            if self._heap_entries.get(item_id) is not entry:
                 continue
             
-            # Calculate a score based on importance and priority
-            score = item.importance * 10 + item.priority
-            
-            if score < least_importance or (score == least_importance and item.priority < least_priority):
-                least_important_id = item_id
-                least_importance = score
-                least_priority = item.priority
-        
-        # Remove the least important item
-        if least_important_id is not None:
-            super().remove(least_important_id)
+            self.remove(item_id)
+            return
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -465,6 +685,8 @@ class WorkingMemory(Memory[T]):
         data = super().to_dict()
         data["capacity"] = self.capacity
         data["cleanup_interval"] = self.cleanup_interval
+        if self._text_index is not None:
+            data["text_index"] = self._text_index.to_dict()
         return data
     
     @classmethod
@@ -493,4 +715,9 @@ class WorkingMemory(Memory[T]):
             if not item.is_expired():
                 memory.add(item)
         
+        # Restore the text index instead of re-tokenizing every item
+        if "text_index" in data:
+            memory._text_index = TextIndex.from_dict(data["text_index"])
+            memory._text_index.retain(memory.items)
+        
         return memory
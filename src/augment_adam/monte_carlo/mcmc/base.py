@@ -5,13 +5,20 @@ This module provides the base classes for Markov Chain Monte Carlo (MCMC),
 including the MarkovChainMonteCarlo class and sample interfaces.
 """
 
+import os
 import math
+import pickle
 import random
 import numpy as np
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Optional, Union, Tuple, Callable, TypeVar, Generic
 
 from augment_adam.utils.tagging import tag, TagCategory
+from augment_adam.monte_carlo.utils.statistics import (
+    compute_chain_effective_sample_size,
+    compute_split_r_hat,
+)
 
 
 T = TypeVar('T')  # Type of sample
@@ -70,6 +77,133 @@ class MCMCSample(Generic[T]):
         return self.metadata.get(key, default)
 
 
+@tag("monte_carlo.mcmc")
+class MultiChainResult:
+    """
+    Draws and diagnostics of several MCMC chains.
+    
+    Draws are stored in preallocated arrays rather than MCMCSample objects.
+    States are flattened to vectors, so scalar states have one dimension.
+    
+    Attributes:
+        draws: The draws, with shape (chains, draws, dimensions).
+        log_probabilities: The log probabilities of the draws, with shape (chains, draws).
+        accepted: Whether each draw was an accepted proposal, with shape (chains, draws).
+        num_draws: The number of draws per chain that were run (at most the
+            size of the arrays, if the chains stopped early).
+        r_hat: The split R-hat of each dimension.
+        effective_sample_size: The effective sample size of each dimension.
+        converged: Whether the convergence targets were met.
+        seed: The seed the per-chain random streams were derived from.
+    """
+    
+    def __init__(self, draws: np.ndarray, log_probabilities: np.ndarray, accepted: np.ndarray, seed: Optional[int] = None) -> None:
+        """
+        Initialize the result.
+        
+        Args:
+            draws: The preallocated draws array.
+            log_probabilities: The preallocated log probabilities array.
+            accepted: The preallocated acceptance array.
+            seed: The seed the per-chain random streams were derived from.
+        """
+        self.draws = draws
+        self.log_probabilities = log_probabilities
+        self.accepted = accepted
+        self.num_draws = 0
+        self.r_hat = np.full(draws.shape[2], np.nan)
+        self.effective_sample_size = np.zeros(draws.shape[2])
+        self.converged = False
+        self.seed = seed
+    
+    def update_diagnostics(self) -> None:
+        """Recompute R-hat and the effective sample size from the draws so far."""
+        draws = self.draws[:, :self.num_draws]
+        self.r_hat = compute_split_r_hat(draws)
+        self.effective_sample_size = compute_chain_effective_sample_size(draws)
+    
+    def trim(self) -> None:
+        """Drop the preallocated draws that weren't run because the chains stopped early."""
+        self.draws = self.draws[:, :self.num_draws]
+        self.log_probabilities = self.log_probabilities[:, :self.num_draws]
+        self.accepted = self.accepted[:, :self.num_draws]
+    
+    def get_values(self) -> np.ndarray:
+        """
+        Get the draws of all chains as one array.
+        
+        Returns:
+            The draws, with shape (chains * draws, dimensions).
+        """
+        return self.draws[:, :self.num_draws].reshape(-1, self.draws.shape[2])
+    
+    def acceptance_rate(self) -> float:
+        """
+        Compute the acceptance rate across all chains.
+        
+        Returns:
+            The acceptance rate.
+        """
+        if self.num_draws == 0:
+            return 0.0
+        return float(self.accepted[:, :self.num_draws].mean())
+
+
+def _advance_chain(
+    sampler: 'MarkovChainMonteCarlo[T]',
+    state: T,
+    cache: Any,
+    seed: Tuple[int, int],
+    num_burnin: int,
+    num_draws: int,
+    thin: int
+) -> Tuple[T, Any, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Advance one chain by a block of draws, in a worker process or in-process.
+    
+    The global random number generators that samplers and proposals use are
+    seeded from the chain's own stream for the block, and restored afterwards.
+    
+    Args:
+        sampler: The sampler.
+        state: The current state of the chain.
+        cache: The sampler's cached values for the current state.
+        seed: Seeds for numpy.random and random, drawn from the chain's stream.
+        num_burnin: The number of transitions to run and discard first.
+        num_draws: The number of draws to store.
+        thin: The number of transitions per stored draw.
+    
+    Returns:
+        Tuple of (state, cache, draws, log probabilities, accepted).
+    """
+    numpy_state = np.random.get_state()
+    random_state = random.getstate()
+    np.random.seed(seed[0])
+    random.seed(seed[1])
+    
+    try:
+        for _ in range(num_burnin):
+            state, cache, _, _ = sampler._transition(state, cache)
+        
+        draws = None
+        log_probabilities = np.empty(num_draws)
+        accepted = np.zeros(num_draws, dtype=bool)
+        for i in range(num_draws):
+            for _ in range(thin):
+                state, cache, log_probability, accepted[i] = sampler._transition(state, cache)
+            
+            value = np.asarray(state, dtype=float).reshape(-1)
+            if draws is None:
+                draws = np.empty((num_draws, len(value)))
+            draws[i] = value
+            log_probabilities[i] = log_probability
+    finally:
+        np.random.set_state(numpy_state)
+        random.setstate(random_state)
+    
+    return state, cache, draws, log_probabilities, accepted
+
+
 @tag("monte_carlo.mcmc")
 class ProposalDistribution(Generic[T], ABC):
     """
@@ -155,13 +289,16 @@ class MarkovChainMonteCarlo(Generic[T], ABC):
     This class defines the interface for Markov Chain Monte Carlo methods,
     which are used to sample from complex distributions.
     
+    Samplers that implement _initialize_chain() and _transition() can also
+    run several independent chains in parallel with run_chains(), which
+    stores the draws in arrays and checks convergence as it goes.
+    
     Attributes:
         name: The name of the MCMC method.
         metadata: Additional metadata for the MCMC method.
         samples: The samples generated by the MCMC method.
         target_log_prob_fn: The target log probability function.
     
-    TODO(Issue #9): Add support for MCMC diagnostics
     TODO(Issue #9): Implement MCMC validation
     """
     
@@ -205,6 +342,148 @@ class MarkovChainMonteCarlo(Generic[T], ABC):
         """
         pass
     
+    def _initialize_chain(self, state: T) -> Tuple[T, Any]:
+        """
+        Prepare a chain to start from a state.
+        
+        Args:
+            state: The initial state.
+        
+        Returns:
+            Tuple of (state, cache), where cache holds values the sampler
+            reuses between transitions (such as the log probability).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support run_chains")
+    
+    def _transition(self, state: T, cache: Any) -> Tuple[T, Any, float, bool]:
+        """
+        Run one transition of the Markov chain.
+        
+        Args:
+            state: The current state.
+            cache: The cached values for the current state.
+        
+        Returns:
+            Tuple of (state, cache, log probability, accepted).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support run_chains")
+    
+    def run_chains(
+        self,
+        n_chains: int,
+        initial_states: Union[List[T], Callable[[np.random.Generator], T]],
+        num_samples: int,
+        num_burnin: int = 0,
+        thin: int = 1,
+        seed: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        target_r_hat: Optional[float] = None,
+        target_ess: Optional[float] = None,
+        check_every: int = 100
+    ) -> MultiChainResult:
+        """
+        Run independent chains, in parallel worker processes, until a number
+        of draws or the convergence targets are reached.
+        
+        Every chain gets its own random stream spawned from the seed, so the
+        draws only depend on the seed and check_every, not on the number of
+        workers. Chains advance in blocks of check_every draws; after each
+        block, split R-hat and the effective sample size are computed, and
+        the chains stop once every target that was given is met.
+        
+        Args:
+            n_chains: The number of chains.
+            initial_states: One initial state per chain, or a function that
+                draws an initial state from a chain's random generator.
+            num_samples: The maximum number of draws per chain.
+            num_burnin: The number of burn-in transitions to discard per chain.
+            thin: The thinning factor.
+            seed: The seed for the per-chain random streams (random if None).
+            num_workers: The number of worker processes (by default, one per
+                chain up to the number of CPUs). With one worker, the chains
+                run in this process; with more, the sampler and its target
+                functions must be picklable.
+            target_r_hat: Stop once the split R-hat of every dimension is below this.
+            target_ess: Stop once the effective sample size of every dimension is above this.
+            check_every: The number of draws per chain between convergence checks.
+        
+        Returns:
+            The draws and diagnostics, trimmed to the draws that were run.
+        
+        Raises:
+            ValueError: If the number of initial states doesn't match
+                n_chains, or if the sampler can't be sent to worker processes.
+        """
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+        streams = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(n_chains)]
+        
+        if callable(initial_states):
+            states = [initial_states(stream) for stream in streams]
+        else:
+            states = list(initial_states)
+            if len(states) != n_chains:
+                raise ValueError(f"Expected {n_chains} initial states, got {len(states)}")
+        
+        if num_workers is None:
+            num_workers = min(n_chains, os.cpu_count() or 1)
+        if num_workers > 1:
+            try:
+                pickle.dumps(self)
+            except Exception as e:
+                raise ValueError(f"The sampler can't be sent to worker processes; use num_workers=1: {e}") from e
+        
+        chains = [self._initialize_chain(state) for state in states]
+        dimension = np.asarray(states[0], dtype=float).size
+        result = MultiChainResult(
+            np.empty((n_chains, num_samples, dimension)),
+            np.empty((n_chains, num_samples)),
+            np.zeros((n_chains, num_samples), dtype=bool),
+            seed,
+        )
+        
+        executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+        try:
+            burnin = num_burnin
+            while result.num_draws < num_samples:
+                block = min(check_every, num_samples - result.num_draws)
+                tasks = [
+                    (self, state, cache, tuple(int(value) for value in stream.integers(2 ** 32, size=2)), burnin, block, thin)
+                    for (state, cache), stream in zip(chains, streams)
+                ]
+                if executor is None:
+                    outputs = [_advance_chain(*task) for task in tasks]
+                else:
+                    outputs = list(executor.map(_advance_chain, *zip(*tasks)))
+                
+                start, end = result.num_draws, result.num_draws + block
+                for chain, (state, cache, draws, log_probabilities, accepted) in enumerate(outputs):
+                    chains[chain] = (state, cache)
+                    result.draws[chain, start:end] = draws
+                    result.log_probabilities[chain, start:end] = log_probabilities
+                    result.accepted[chain, start:end] = accepted
+                result.num_draws = end
+                burnin = 0
+                
+                if target_r_hat is None and target_ess is None:
+                    continue
+                
+                result.update_diagnostics()
+                result.converged = bool(
+                    (target_r_hat is None or np.all(result.r_hat < target_r_hat))
+                    and (target_ess is None or np.all(result.effective_sample_size > target_ess))
+                )
+                if result.converged:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        result.trim()
+        result.update_diagnostics()
+        self.metadata["last_run_chains"] = {"n_chains": n_chains, "num_draws": result.num_draws, "seed": seed}
+        return result
+    
     def get_samples(self) -> List[MCMCSample[T]]:
         """
         Get the samples generated by the MCMC method.
@@ -246,34 +525,9 @@ class MarkovChainMonteCarlo(Generic[T], ABC):
         if not self.samples:
             return 0.0
         
-        # Compute autocorrelation
-        values = self.get_sample_values()
-        if isinstance(values[0], np.ndarray):
-            # For vector samples, compute autocorrelation for each dimension
-            autocorr = np.zeros(min(50, len(values) // 2))
-            for i in range(len(autocorr)):
-                autocorr[i] = np.mean([
-                    np.corrcoef(
-                        [values[j][dim] for j in range(len(values) - i)],
-                        [values[j + i][dim] for j in range(len(values) - i)]
-                    )[0, 1]
-                    for dim in range(len(values[0]))
-                ])
-        else:
-            # For scalar samples, compute autocorrelation directly
-            autocorr = np.zeros(min(50, len(values) // 2))
-            for i in range(len(autocorr)):
-                autocorr[i] = np.corrcoef(
-                    values[:-i] if i > 0 else values,
-                    values[i:] if i > 0 else values
-                )[0, 1]
-        
-        # Compute effective sample size
-        if autocorr[1:].sum() == 0:
-            return len(values)
-        
-        ess = len(values) / (1 + 2 * autocorr[1:].sum())
-        return ess
+        # Autocorrelations come from the FFT; vector samples average the ESS of each dimension
+        values = np.array([np.asarray(value, dtype=float).reshape(-1) for value in self.get_sample_values()])
+        return float(np.mean(compute_chain_effective_sample_size(values[np.newaxis])))
     
     def set_metadata(self, key: str, value: Any) -> None:
         """
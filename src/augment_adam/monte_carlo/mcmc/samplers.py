@@ -54,6 +54,46 @@ class MetropolisHastings(MarkovChainMonteCarlo[T]):
         
         self.proposal_distribution = proposal_distribution
     
+    def _initialize_chain(self, state: T) -> Tuple[T, float]:
+        """
+        Prepare a chain to start from a state.
+        
+        Args:
+            state: The initial state.
+        
+        Returns:
+            Tuple of (state, log probability of the state).
+        """
+        return state, self.target_log_prob_fn(state)
+    
+    def _transition(self, state: T, cache: float) -> Tuple[T, float, float, bool]:
+        """
+        Run one Metropolis-Hastings transition.
+        
+        Args:
+            state: The current state.
+            cache: The log probability of the current state.
+        
+        Returns:
+            Tuple of (state, log probability, log probability, accepted).
+        """
+        current_state, current_log_prob = state, cache
+        
+        # Propose a new state
+        proposed_state = self.proposal_distribution.propose(current_state)
+        proposed_log_prob = self.target_log_prob_fn(proposed_state)
+        
+        # Compute the acceptance probability
+        log_accept_prob = proposed_log_prob - current_log_prob
+        log_accept_prob += self.proposal_distribution.log_probability(current_state, proposed_state)
+        log_accept_prob -= self.proposal_distribution.log_probability(proposed_state, current_state)
+        
+        # Accept or reject the proposal
+        if math.log(random.random()) < log_accept_prob:
+            return proposed_state, proposed_log_prob, proposed_log_prob, True
+        
+        return current_state, current_log_prob, current_log_prob, False
+    
     def sample(
         self,
         initial_state: T,
@@ -74,29 +114,14 @@ class MetropolisHastings(MarkovChainMonteCarlo[T]):
             The generated samples.
         """
         # Initialize the Markov chain
-        current_state = initial_state
-        current_log_prob = self.target_log_prob_fn(current_state)
+        current_state, current_log_prob = self._initialize_chain(initial_state)
         
         # Initialize samples
         samples = []
         
         # Run the Markov chain
         for i in range(num_burnin + num_samples * thin):
-            # Propose a new state
-            proposed_state = self.proposal_distribution.propose(current_state)
-            proposed_log_prob = self.target_log_prob_fn(proposed_state)
-            
-            # Compute the acceptance probability
-            log_accept_prob = proposed_log_prob - current_log_prob
-            log_accept_prob += self.proposal_distribution.log_probability(current_state, proposed_state)
-            log_accept_prob -= self.proposal_distribution.log_probability(proposed_state, current_state)
-            
-            # Accept or reject the proposal
-            accepted = False
-            if math.log(random.random()) < log_accept_prob:
-                current_state = proposed_state
-                current_log_prob = proposed_log_prob
-                accepted = True
+            current_state, current_log_prob, _, accepted = self._transition(current_state, current_log_prob)
             
             # Store the sample
             if i >= num_burnin and (i - num_burnin) % thin == 0:
@@ -147,6 +172,36 @@ class GibbsSampler(MarkovChainMonteCarlo[List[Any]]):
         
         self.conditional_samplers = conditional_samplers
     
+    def _initialize_chain(self, state: List[Any]) -> Tuple[List[Any], None]:
+        """
+        Prepare a chain to start from a state.
+        
+        Args:
+            state: The initial state.
+        
+        Returns:
+            Tuple of (copy of the state, None).
+        """
+        return list(state), None
+    
+    def _transition(self, state: List[Any], cache: None) -> Tuple[List[Any], None, float, bool]:
+        """
+        Run one Gibbs sweep over every dimension.
+        
+        Args:
+            state: The current state.
+            cache: Unused.
+        
+        Returns:
+            Tuple of (state, None, log probability, True).
+        """
+        state = list(state)
+        for j in range(len(state)):
+            # Sample from the conditional distribution
+            state[j] = self.conditional_samplers[j](state, j)
+        
+        return state, None, self.target_log_prob_fn(state), True
+    
     def sample(
         self,
         initial_state: List[Any],
@@ -167,21 +222,14 @@ class GibbsSampler(MarkovChainMonteCarlo[List[Any]]):
             The generated samples.
         """
         # Initialize the Markov chain
-        current_state = initial_state.copy()
-        current_log_prob = self.target_log_prob_fn(current_state)
+        current_state, _ = self._initialize_chain(initial_state)
         
         # Initialize samples
         samples = []
         
         # Run the Markov chain
         for i in range(num_burnin + num_samples * thin):
-            # Update each dimension
-            for j in range(len(current_state)):
-                # Sample from the conditional distribution
-                current_state[j] = self.conditional_samplers[j](current_state, j)
-            
-            # Compute the log probability
-            current_log_prob = self.target_log_prob_fn(current_state)
+            current_state, _, current_log_prob, _ = self._transition(current_state, None)
             
             # Store the sample
             if i >= num_burnin and (i - num_burnin) % thin == 0:
@@ -242,6 +290,81 @@ class HamiltonianMC(MarkovChainMonteCarlo[np.ndarray]):
         self.metadata["step_size"] = step_size
         self.metadata["num_steps"] = num_steps
     
+    def _initialize_chain(self, state: np.ndarray) -> Tuple[np.ndarray, Tuple[float, np.ndarray]]:
+        """
+        Prepare a chain to start from a state.
+        
+        Args:
+            state: The initial state.
+        
+        Returns:
+            Tuple of (copy of the state, (log probability, gradient)).
+        """
+        state = np.array(state, dtype=float)
+        return state, (self.target_log_prob_fn(state), self.target_log_prob_grad_fn(state))
+    
+    def _transition(
+        self,
+        state: np.ndarray,
+        cache: Tuple[float, np.ndarray]
+    ) -> Tuple[np.ndarray, Tuple[float, np.ndarray], float, bool]:
+        """
+        Run one Hamiltonian Monte Carlo transition.
+        
+        Args:
+            state: The current state.
+            cache: The log probability and gradient at the current state.
+        
+        Returns:
+            Tuple of (state, (log probability, gradient), log probability, accepted).
+        """
+        current_state = state
+        current_log_prob, current_grad = cache
+        
+        # Sample momentum
+        momentum = np.random.normal(0, 1, size=current_state.shape)
+        
+        # Compute Hamiltonian
+        current_hamiltonian = -current_log_prob + 0.5 * np.sum(momentum ** 2)
+        
+        # Leapfrog integration
+        proposed_state = current_state.copy()
+        proposed_momentum = momentum.copy()
+        
+        # Half step for momentum
+        proposed_momentum += 0.5 * self.step_size * current_grad
+        
+        # Full steps for position and momentum
+        for step in range(self.num_steps):
+            # Full step for position
+            proposed_state += self.step_size * proposed_momentum
+            
+            # Compute gradient at the new position
+            proposed_grad = self.target_log_prob_grad_fn(proposed_state)
+            
+            # Full step for momentum, except at the end
+            if step < self.num_steps - 1:
+                proposed_momentum += self.step_size * proposed_grad
+        
+        # Half step for momentum at the end
+        proposed_momentum += 0.5 * self.step_size * proposed_grad
+        
+        # Negate momentum for reversibility
+        proposed_momentum = -proposed_momentum
+        
+        # Compute proposed Hamiltonian
+        proposed_log_prob = self.target_log_prob_fn(proposed_state)
+        proposed_hamiltonian = -proposed_log_prob + 0.5 * np.sum(proposed_momentum ** 2)
+        
+        # Compute the acceptance probability
+        log_accept_prob = current_hamiltonian - proposed_hamiltonian
+        
+        # Accept or reject the proposal; the gradient at the proposal was computed by the last leapfrog step
+        if math.log(random.random()) < log_accept_prob:
+            return proposed_state, (proposed_log_prob, proposed_grad), proposed_log_prob, True
+        
+        return current_state, cache, current_log_prob, False
+    
     def sample(
         self,
         initial_state: np.ndarray,
@@ -262,60 +385,14 @@ class HamiltonianMC(MarkovChainMonteCarlo[np.ndarray]):
             The generated samples.
         """
         # Initialize the Markov chain
-        current_state = initial_state.copy()
-        current_log_prob = self.target_log_prob_fn(current_state)
-        current_grad = self.target_log_prob_grad_fn(current_state)
+        current_state, cache = self._initialize_chain(initial_state)
         
         # Initialize samples
         samples = []
         
         # Run the Markov chain
         for i in range(num_burnin + num_samples * thin):
-            # Sample momentum
-            momentum = np.random.normal(0, 1, size=current_state.shape)
-            
-            # Compute Hamiltonian
-            current_hamiltonian = -current_log_prob + 0.5 * np.sum(momentum ** 2)
-            
-            # Leapfrog integration
-            proposed_state = current_state.copy()
-            proposed_momentum = momentum.copy()
-            
-            # Half step for momentum
-            proposed_momentum += 0.5 * self.step_size * current_grad
-            
-            # Full steps for position and momentum
-            for _ in range(self.num_steps):
-                # Full step for position
-                proposed_state += self.step_size * proposed_momentum
-                
-                # Compute gradient at the new position
-                proposed_grad = self.target_log_prob_grad_fn(proposed_state)
-                
-                # Full step for momentum, except at the end
-                if _ < self.num_steps - 1:
-                    proposed_momentum += self.step_size * proposed_grad
-            
-            # Half step for momentum at the end
-            proposed_momentum += 0.5 * self.step_size * proposed_grad
-            
-            # Negate momentum for reversibility
-            proposed_momentum = -proposed_momentum
-            
-            # Compute proposed Hamiltonian
-            proposed_log_prob = self.target_log_prob_fn(proposed_state)
-            proposed_hamiltonian = -proposed_log_prob + 0.5 * np.sum(proposed_momentum ** 2)
-            
-            # Compute the acceptance probability
-            log_accept_prob = current_hamiltonian - proposed_hamiltonian
-            
-            # Accept or reject the proposal
-            accepted = False
-            if math.log(random.random()) < log_accept_prob:
-                current_state = proposed_state
-                current_log_prob = proposed_log_prob
-                current_grad = self.target_log_prob_grad_fn(current_state)
-                accepted = True
+            current_state, cache, current_log_prob, accepted = self._transition(current_state, cache)
             
             # Store the sample
             if i >= num_burnin and (i - num_burnin) % thin == 0:
@@ -19,6 +19,11 @@ from augment_adam.monte_carlo.mcts.policies import (
     EpsilonGreedyRolloutPolicy,
 )
 
+from augment_adam.monte_carlo.mcts.array_tree import (
+    ArrayTree,
+    ArrayMonteCarloTreeSearch,
+)
+
 __all__ = [
     # Base
     "MonteCarloTreeSearch",
@@ -32,4 +37,8 @@ __all__ = [
     "GreedyRolloutPolicy",
     "HeuristicRolloutPolicy",
     "EpsilonGreedyRolloutPolicy",
+    
+    # Array tree
+    "ArrayTree",
+    "ArrayMonteCarloTreeSearch",
 ]
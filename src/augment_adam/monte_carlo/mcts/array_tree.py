@@ -0,0 +1,718 @@
+"""
+Array-backed Monte Carlo Tree Search.
+
+This module provides the ArrayTree class, a search tree stored in flat NumPy
+arrays, and the ArrayMonteCarloTreeSearch class, which searches with it
+using vectorized UCT selection, an optional transposition table, and
+root-parallel or leaf-parallel search across worker processes.
+"""
+
+import math
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Callable, TypeVar, Generic, Set, Hashable
+
+from augment_adam.utils.tagging import tag, TagCategory
+from augment_adam.monte_carlo.mcts.base import RolloutPolicy
+
+
+S = TypeVar('S')  # Type of state
+A = TypeVar('A')  # Type of action
+
+# Parallel search modes
+PARALLEL_MODES = ("root", "leaf")
+
+
+def _rollout(
+    rollout_policy: RolloutPolicy[S, A],
+    get_available_actions: Callable[[S], Set[A]],
+    get_next_state: Callable[[S, A], S],
+    is_terminal: Callable[[S], bool],
+    get_reward: Callable[[S], float],
+    state: S,
+    max_depth: int
+) -> float:
+    """
+    Simulate a rollout from a state.
+    
+    Args:
+        rollout_policy: The rollout policy.
+        get_available_actions: Function that returns the available actions for a state.
+        get_next_state: Function that returns the next state given a state and an action.
+        is_terminal: Function that checks if a state is terminal.
+        get_reward: Function that returns the reward for a state.
+        state: The state to start the rollout from.
+        max_depth: The maximum number of rollout steps.
+    
+    Returns:
+        The reward for the final state.
+    """
+    depth = 0
+    while not is_terminal(state) and depth < max_depth:
+        available_actions = get_available_actions(state)
+        if not available_actions:
+            break
+        
+        state = get_next_state(state, rollout_policy.select_action(state, available_actions))
+        depth += 1
+    
+    return get_reward(state)
+
+
+# Rollout configuration of a leaf-parallel worker process, set by _init_rollout_worker
+_worker_rollout_args: Tuple[Any, ...] = ()
+
+
+def _init_rollout_worker(*rollout_args: Any) -> None:
+    """
+    Store the rollout policy and game functions in a worker process.
+    
+    Args:
+        rollout_args: The rollout policy, the four game functions and the maximum depth.
+    """
+    global _worker_rollout_args
+    _worker_rollout_args = rollout_args
+
+
+def _rollout_task(state: S, seed: int) -> float:
+    """
+    Run one seeded rollout in a leaf-parallel worker process.
+    
+    Args:
+        state: The state to start the rollout from.
+        seed: The seed for the random number generators.
+    
+    Returns:
+        The reward from the rollout.
+    """
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    policy, get_available_actions, get_next_state, is_terminal, get_reward, max_depth = _worker_rollout_args
+    return _rollout(policy, get_available_actions, get_next_state, is_terminal, get_reward, state, max_depth)
+
+
+def _root_parallel_task(
+    search: 'ArrayMonteCarloTreeSearch[S, A]',
+    functions: Tuple[Callable[..., Any], ...],
+    iterations: int,
+    seed: int
+) -> Dict[A, Tuple[float, float]]:
+    """
+    Build an independent tree in a root-parallel worker process.
+    
+    Args:
+        search: The search, which is copied into the worker.
+        functions: The four game functions.
+        iterations: The number of iterations.
+        seed: The seed for the random number generators.
+    
+    Returns:
+        Mapping from root actions to their (visits, value sum).
+    """
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    search.reset(search.tree.states[search.tree.root])
+    search._search_serial(*functions, iterations, np.random.default_rng(seed))
+    return search.tree.root_action_stats()
+
+
+@tag("monte_carlo.mcts")
+class ArrayTree(Generic[S, A]):
+    """
+    Search tree stored in flat NumPy arrays.
+    
+    Nodes are indices into the node arrays (visit counts, value sums, pending
+    visits, the first parent, the first child edge and the number of child
+    edges). The child edges of a node are allocated together when the node
+    is expanded, so the next sibling of an edge is the following edge and
+    the children of a node are a contiguous slice of the edge arrays. The
+    edges hold the statistics UCT selects with (visits, value sums, pending
+    visits, and the derived mean and 1/sqrt(visits)), so selection is a few
+    array operations over views of one slice. Each edge points to its child
+    node, or -1 until its action is first tried.
+    
+    The actions of a node are shuffled at expansion and tried in order, so
+    the tried edges of a node are a prefix of its slice.
+    
+    With a state hash, a transposition table maps hashes to nodes, so states
+    reached by different paths share one node (and its node statistics),
+    while each edge keeps the statistics of its own path.
+    
+    Attributes:
+        visits: The number of visits of each node.
+        value_sums: The sum of the rewards backpropagated through each node.
+        virtual_visits: The number of pending visits of each node.
+        parents: The parent through which each node was first reached (-1 for the root).
+        first_child: The first child edge of each node (-1 if not expanded).
+        num_children: The number of child edges of each node.
+        num_tried: The number of tried child edges of each node.
+        terminal: Whether each node's state is terminal.
+        states: The state of each node.
+        edge_children: The child node of each edge (-1 if not tried).
+        edge_visits: The number of visits of each edge.
+        edge_value_sums: The sum of the rewards backpropagated through each edge.
+        edge_virtual_visits: The number of pending visits of each edge.
+        edge_means: The mean reward of each edge.
+        edge_scales: 1/sqrt(visits) of each edge.
+        edge_actions: The action of each edge.
+        transpositions: Mapping from state hashes to nodes.
+        root: The root node.
+    """
+    
+    def __init__(
+        self,
+        root_state: S,
+        state_hash: Optional[Callable[[S], Hashable]] = None,
+        capacity: int = 1024
+    ) -> None:
+        """
+        Initialize the tree with a root node.
+        
+        Args:
+            root_state: The state of the root node.
+            state_hash: Function that returns a hashable key for a state; if
+                given, nodes are shared between equal keys.
+            capacity: The initial number of node and edge slots.
+        """
+        self.state_hash = state_hash
+        
+        self.visits = np.zeros(capacity)
+        self.value_sums = np.zeros(capacity)
+        self.virtual_visits = np.zeros(capacity)
+        self.parents = np.full(capacity, -1, dtype=np.int64)
+        self.first_child = np.full(capacity, -1, dtype=np.int64)
+        self.num_children = np.zeros(capacity, dtype=np.int64)
+        self.num_tried = np.zeros(capacity, dtype=np.int64)
+        self.terminal = np.zeros(capacity, dtype=bool)
+        self.states: List[S] = []
+        
+        self.edge_children = np.full(capacity, -1, dtype=np.int64)
+        self.edge_visits = np.zeros(capacity)
+        self.edge_value_sums = np.zeros(capacity)
+        self.edge_virtual_visits = np.zeros(capacity)
+        self.edge_means = np.zeros(capacity)
+        self.edge_scales = np.zeros(capacity)
+        self.edge_actions: List[A] = []
+        
+        self.transpositions: Dict[Hashable, int] = {}
+        self.root = self.add_node(root_state, -1, False)
+    
+    @property
+    def num_nodes(self) -> int:
+        """The number of nodes."""
+        return len(self.states)
+    
+    @property
+    def num_edges(self) -> int:
+        """The number of edges."""
+        return len(self.edge_actions)
+    
+    def _grow_nodes(self) -> None:
+        """Double the capacity of the node arrays."""
+        capacity = len(self.visits)
+        self.visits = np.concatenate((self.visits, np.zeros(capacity)))
+        self.value_sums = np.concatenate((self.value_sums, np.zeros(capacity)))
+        self.virtual_visits = np.concatenate((self.virtual_visits, np.zeros(capacity)))
+        self.parents = np.concatenate((self.parents, np.full(capacity, -1, dtype=np.int64)))
+        self.first_child = np.concatenate((self.first_child, np.full(capacity, -1, dtype=np.int64)))
+        self.num_children = np.concatenate((self.num_children, np.zeros(capacity, dtype=np.int64)))
+        self.num_tried = np.concatenate((self.num_tried, np.zeros(capacity, dtype=np.int64)))
+        self.terminal = np.concatenate((self.terminal, np.zeros(capacity, dtype=bool)))
+    
+    def _grow_edges(self, size: int) -> None:
+        """
+        Double the capacity of the edge arrays until they hold a number of edges.
+        
+        Args:
+            size: The number of edges.
+        """
+        capacity = len(self.edge_children)
+        while capacity < size:
+            capacity *= 2
+        
+        extra = capacity - len(self.edge_children)
+        self.edge_children = np.concatenate((self.edge_children, np.full(extra, -1, dtype=np.int64)))
+        self.edge_visits = np.concatenate((self.edge_visits, np.zeros(extra)))
+        self.edge_value_sums = np.concatenate((self.edge_value_sums, np.zeros(extra)))
+        self.edge_virtual_visits = np.concatenate((self.edge_virtual_visits, np.zeros(extra)))
+        self.edge_means = np.concatenate((self.edge_means, np.zeros(extra)))
+        self.edge_scales = np.concatenate((self.edge_scales, np.zeros(extra)))
+    
+    def add_node(self, state: S, parent: int, terminal: bool) -> int:
+        """
+        Add a node, or find the node of an equal state in the transposition table.
+        
+        Args:
+            state: The state.
+            parent: The parent node (-1 for the root).
+            terminal: Whether the state is terminal.
+        
+        Returns:
+            The node.
+        """
+        key = None
+        if self.state_hash is not None:
+            key = self.state_hash(state)
+            node = self.transpositions.get(key)
+            if node is not None:
+                return node
+        
+        node = self.num_nodes
+        if node == len(self.visits):
+            self._grow_nodes()
+        
+        self.states.append(state)
+        self.parents[node] = parent
+        self.terminal[node] = terminal
+        if key is not None:
+            self.transpositions[key] = node
+        
+        return node
+    
+    def expand(self, node: int, actions: List[A]) -> None:
+        """
+        Allocate the child edges of a node, one per action, in the order they will be tried.
+        
+        Args:
+            node: The node.
+            actions: The available actions.
+        """
+        start = self.num_edges
+        if start + len(actions) > len(self.edge_children):
+            self._grow_edges(start + len(actions))
+        
+        self.edge_actions.extend(actions)
+        self.first_child[node] = start
+        self.num_children[node] = len(actions)
+    
+    def select_edge(self, node: int, exploration_weight: float, virtual_loss: float) -> int:
+        """
+        Select a child edge of an expanded node.
+        
+        The next untried edge is selected first; once every edge has been
+        tried, the edge with the highest UCT value over the node's slice is
+        selected. Pending visits count as visits with a reward of
+        -virtual_loss.
+        
+        Args:
+            node: The node.
+            exploration_weight: The exploration weight.
+            virtual_loss: The loss assumed for each pending visit.
+        
+        Returns:
+            The selected edge.
+        """
+        start = self.first_child[node]
+        tried = self.num_tried[node]
+        if tried < self.num_children[node]:
+            self.num_tried[node] = tried + 1
+            return start + tried
+        
+        end = start + tried
+        parent_visits = self.visits[node] + self.virtual_visits[node]
+        exploration = exploration_weight * math.sqrt(math.log(max(parent_visits, 1.0)))
+        
+        if not self.virtual_visits[node]:
+            ucb = self.edge_means[start:end] + exploration * self.edge_scales[start:end]
+        else:
+            pending = self.edge_virtual_visits[start:end]
+            visits = self.edge_visits[start:end] + pending
+            ucb = (self.edge_value_sums[start:end] - virtual_loss * pending) / visits + exploration / np.sqrt(visits)
+        
+        return start + int(ucb.argmax())
+    
+    def backpropagate(self, nodes: List[int], edges: List[int], reward: float) -> None:
+        """
+        Add a visit with a reward to every node and edge of a path.
+        
+        Args:
+            nodes: The nodes of the path, from the root.
+            edges: The edges of the path, from the root.
+            reward: The reward.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        edges = np.asarray(edges, dtype=np.int64)
+        self.visits[nodes] += 1
+        self.value_sums[nodes] += reward
+        
+        visits = self.edge_visits[edges] + 1
+        value_sums = self.edge_value_sums[edges] + reward
+        self.edge_visits[edges] = visits
+        self.edge_value_sums[edges] = value_sums
+        self.edge_means[edges] = value_sums / visits
+        self.edge_scales[edges] = 1.0 / np.sqrt(visits)
+    
+    def add_virtual_visits(self, nodes: List[int], edges: List[int], count: float) -> None:
+        """
+        Add (or remove, with a negative count) pending visits along a path.
+        
+        Args:
+            nodes: The nodes of the path, from the root.
+            edges: The edges of the path, from the root.
+            count: The number of pending visits.
+        """
+        self.virtual_visits[nodes] += count
+        self.edge_virtual_visits[edges] += count
+    
+    def root_action_stats(self) -> Dict[A, Tuple[float, float]]:
+        """
+        Get the statistics of the root's tried actions.
+        
+        Returns:
+            Mapping from actions to their (visits, value sum).
+        """
+        start = self.first_child[self.root]
+        if start < 0:
+            return {}
+        
+        return {
+            self.edge_actions[edge]: (float(self.edge_visits[edge]), float(self.edge_value_sums[edge]))
+            for edge in range(start, start + self.num_tried[self.root])
+        }
+
+
+@tag("monte_carlo.mcts")
+class ArrayMonteCarloTreeSearch(Generic[S, A]):
+    """
+    Monte Carlo Tree Search over an array-backed tree.
+    
+    This class has the same search() interface as MonteCarloTreeSearch, but
+    stores the tree in an ArrayTree: available actions are fetched once per
+    node, and UCT is computed with array operations over each node's edges.
+    
+    The search can run in parallel across worker processes, in which case
+    the rollout policy and game functions must be picklable:
+    
+    - "root": every worker builds its own tree from the root, and the root
+      statistics are summed.
+    - "leaf": this process selects a batch of leaves, a few per worker, with
+      virtual loss so that the batch spreads over the tree, and the workers
+      run the rollouts.
+    
+    Attributes:
+        name: The name of the search.
+        metadata: Additional metadata for the search.
+        tree: The search tree.
+        rollout_policy: The rollout policy.
+        exploration_weight: The UCT exploration weight.
+        max_depth: The maximum depth of the rollouts.
+        max_iterations: The maximum number of iterations.
+        state_hash: Function that returns a key for the transposition table, or None.
+        num_workers: The number of worker processes.
+        parallel: The parallel search mode ("root" or "leaf").
+        virtual_loss: The loss assumed for each pending visit in leaf-parallel search.
+        leaf_batch_size: The number of leaves selected per batch in leaf-parallel search.
+    """
+    
+    def __init__(
+        self,
+        initial_state: S,
+        rollout_policy: RolloutPolicy[S, A],
+        exploration_weight: float = 1.0,
+        max_depth: int = 10,
+        max_iterations: int = 1000,
+        state_hash: Optional[Callable[[S], Hashable]] = None,
+        num_workers: int = 1,
+        parallel: str = "leaf",
+        virtual_loss: float = 1.0,
+        leaf_batch_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        name: str = "array_monte_carlo_tree_search"
+    ) -> None:
+        """
+        Initialize the search.
+        
+        Args:
+            initial_state: The initial state.
+            rollout_policy: The rollout policy.
+            exploration_weight: The UCT exploration weight.
+            max_depth: The maximum depth of the rollouts.
+            max_iterations: The maximum number of iterations.
+            state_hash: Function that returns a hashable key for a state, to
+                share nodes between equal states (None disables the table).
+            num_workers: The number of worker processes (1 searches in this process).
+            parallel: The parallel search mode ("root" or "leaf").
+            virtual_loss: The loss assumed for each pending visit in leaf-parallel search.
+            leaf_batch_size: The number of leaves selected per batch in
+                leaf-parallel search (None for 8 per worker). Larger batches
+                send fewer messages to the workers, but select more leaves
+                without the rewards of the rest of the batch.
+            seed: The seed for tie-breaking and for the workers' random numbers.
+            name: The name of the search.
+        
+        Raises:
+            ValueError: If the parallel mode is not supported.
+        """
+        if parallel not in PARALLEL_MODES:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
+        
+        self.name = name
+        self.metadata: Dict[str, Any] = {}
+        
+        self.rollout_policy = rollout_policy
+        self.exploration_weight = exploration_weight
+        self.max_depth = max_depth
+        self.max_iterations = max_iterations
+        self.state_hash = state_hash
+        self.num_workers = num_workers
+        self.parallel = parallel
+        self.virtual_loss = virtual_loss
+        self.leaf_batch_size = leaf_batch_size or 8 * num_workers
+        self.rng = np.random.default_rng(seed)
+        self.tree: ArrayTree[S, A] = ArrayTree(initial_state, state_hash)
+        
+        self.metadata["max_depth"] = max_depth
+        self.metadata["max_iterations"] = max_iterations
+        self.metadata["num_workers"] = num_workers
+        self.metadata["parallel"] = parallel
+    
+    def reset(self, state: S) -> None:
+        """
+        Discard the tree and start a new one from a state.
+        
+        Args:
+            state: The new root state.
+        """
+        self.tree = ArrayTree(state, self.state_hash)
+    
+    def update_root(self, action: A, next_state: S) -> None:
+        """
+        Update the root after taking an action.
+        
+        The array tree is not re-rooted; a new tree is started from the
+        resulting state.
+        
+        Args:
+            action: The action taken.
+            next_state: The resulting state.
+        """
+        self.reset(next_state)
+    
+    def search(
+        self,
+        get_available_actions: Callable[[S], Set[A]],
+        get_next_state: Callable[[S, A], S],
+        is_terminal: Callable[[S], bool],
+        get_reward: Callable[[S], float],
+        num_iterations: Optional[int] = None
+    ) -> A:
+        """
+        Perform the search.
+        
+        Args:
+            get_available_actions: Function that returns the available actions for a state.
+            get_next_state: Function that returns the next state given a state and an action.
+            is_terminal: Function that checks if a state is terminal.
+            get_reward: Function that returns the reward for a state.
+            num_iterations: The number of iterations to perform. If None, uses max_iterations.
+        
+        Returns:
+            The best action.
+        """
+        iterations = num_iterations or self.max_iterations
+        functions = (get_available_actions, get_next_state, is_terminal, get_reward)
+        
+        if self.num_workers <= 1:
+            self._search_serial(*functions, iterations, self.rng)
+            return self._best_action(self.tree.root_action_stats())
+        
+        if self.parallel == "root":
+            return self._best_action(self._search_root_parallel(functions, iterations))
+        
+        self._search_leaf_parallel(functions, iterations)
+        return self._best_action(self.tree.root_action_stats())
+    
+    def _select(
+        self,
+        get_available_actions: Callable[[S], Set[A]],
+        get_next_state: Callable[[S, A], S],
+        is_terminal: Callable[[S], bool],
+        rng: np.random.Generator
+    ) -> Tuple[List[int], List[int], int]:
+        """
+        Select a path from the root to a leaf, adding at most one new node.
+        
+        Args:
+            get_available_actions: Function that returns the available actions for a state.
+            get_next_state: Function that returns the next state given a state and an action.
+            is_terminal: Function that checks if a state is terminal.
+            rng: The random number generator for the order in which actions are tried.
+        
+        Returns:
+            Tuple of (nodes, edges, leaf): the nodes and edges of the path
+            from the root, and the node to run the rollout from.
+        """
+        tree = self.tree
+        node = tree.root
+        nodes = [node]
+        edges = []
+        
+        while not tree.terminal[node]:
+            if tree.first_child[node] < 0:
+                actions = list(get_available_actions(tree.states[node]))
+                rng.shuffle(actions)
+                tree.expand(node, actions)
+            if tree.num_children[node] == 0:
+                break
+            
+            edge = tree.select_edge(node, self.exploration_weight, self.virtual_loss)
+            edges.append(edge)
+            child = tree.edge_children[edge]
+            if child < 0:
+                # Try the action: add (or find, through a transposition) its child node
+                state = get_next_state(tree.states[node], tree.edge_actions[edge])
+                num_nodes = tree.num_nodes
+                child = tree.add_node(state, node, is_terminal(state))
+                tree.edge_children[edge] = child
+                if tree.num_nodes > num_nodes:
+                    nodes.append(child)
+                    return nodes, edges, child
+            
+            # A transposition can lead back into the path; stop instead of cycling
+            if tree.state_hash is not None and child in nodes:
+                return nodes, edges, child
+            
+            nodes.append(child)
+            node = child
+        
+        return nodes, edges, node
+    
+    def _search_serial(
+        self,
+        get_available_actions: Callable[[S], Set[A]],
+        get_next_state: Callable[[S, A], S],
+        is_terminal: Callable[[S], bool],
+        get_reward: Callable[[S], float],
+        iterations: int,
+        rng: np.random.Generator
+    ) -> None:
+        """
+        Run search iterations in this process.
+        
+        Args:
+            get_available_actions: Function that returns the available actions for a state.
+            get_next_state: Function that returns the next state given a state and an action.
+            is_terminal: Function that checks if a state is terminal.
+            get_reward: Function that returns the reward for a state.
+            iterations: The number of iterations.
+            rng: The random number generator.
+        """
+        for _ in range(iterations):
+            nodes, edges, leaf = self._select(get_available_actions, get_next_state, is_terminal, rng)
+            reward = _rollout(
+                self.rollout_policy, get_available_actions, get_next_state, is_terminal, get_reward,
+                self.tree.states[leaf], self.max_depth
+            )
+            self.tree.backpropagate(nodes, edges, reward)
+    
+    def _search_root_parallel(
+        self,
+        functions: Tuple[Callable[..., Any], ...],
+        iterations: int
+    ) -> Dict[A, Tuple[float, float]]:
+        """
+        Build one tree per worker process and sum their root statistics.
+        
+        Args:
+            functions: The four game functions.
+            iterations: The total number of iterations, split between the workers.
+        
+        Returns:
+            Mapping from root actions to their summed (visits, value sum).
+        """
+        shares = [iterations // self.num_workers + (worker < iterations % self.num_workers) for worker in range(self.num_workers)]
+        seeds = self.rng.integers(2 ** 63, size=self.num_workers)
+        
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            results = list(executor.map(
+                _root_parallel_task,
+                [self] * self.num_workers,
+                [functions] * self.num_workers,
+                shares,
+                [int(seed) for seed in seeds],
+            ))
+        
+        merged: Dict[A, Tuple[float, float]] = {}
+        for stats in results:
+            for action, (visits, value_sum) in stats.items():
+                total_visits, total_value = merged.get(action, (0.0, 0.0))
+                merged[action] = (total_visits + visits, total_value + value_sum)
+        
+        self.metadata["root_parallel_trees"] = len(results)
+        return merged
+    
+    def _search_leaf_parallel(self, functions: Tuple[Callable[..., Any], ...], iterations: int) -> None:
+        """
+        Select batches of leaves with virtual loss and run their rollouts in worker processes.
+        
+        Args:
+            functions: The four game functions.
+            iterations: The number of iterations.
+        """
+        get_available_actions, get_next_state, is_terminal, _ = functions
+        rollout_args = (self.rollout_policy,) + tuple(functions) + (self.max_depth,)
+        
+        with ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_init_rollout_worker,
+            initargs=rollout_args
+        ) as executor:
+            done = 0
+            while done < iterations:
+                batch = min(self.leaf_batch_size, iterations - done)
+                
+                # Pending visits steer later selections in the batch away from earlier ones
+                paths = []
+                for _ in range(batch):
+                    nodes, edges, leaf = self._select(get_available_actions, get_next_state, is_terminal, self.rng)
+                    self.tree.add_virtual_visits(nodes, edges, 1)
+                    paths.append((nodes, edges, leaf))
+                
+                states = [self.tree.states[leaf] for _, _, leaf in paths]
+                seeds = [int(seed) for seed in self.rng.integers(2 ** 63, size=batch)]
+                chunksize = -(-batch // self.num_workers)
+                rewards = list(executor.map(_rollout_task, states, seeds, chunksize=chunksize))
+                
+                for (nodes, edges, _), reward in zip(paths, rewards):
+                    self.tree.add_virtual_visits(nodes, edges, -1)
+                    self.tree.backpropagate(nodes, edges, reward)
+                done += batch
+    
+    def _best_action(self, stats: Dict[A, Tuple[float, float]]) -> A:
+        """
+        Get the root action with the highest mean reward.
+        
+        Args:
+            stats: Mapping from root actions to their (visits, value sum).
+        
+        Returns:
+            The best action.
+        """
+        return max(
+            ((action, value_sum / visits) for action, (visits, value_sum) in stats.items() if visits > 0),
+            key=lambda item: item[1]
+        )[0]
+    
+    def set_metadata(self, key: str, value: Any) -> None:
+        """
+        Set metadata for the search.
+        
+        Args:
+            key: The key for the metadata.
+            value: The value for the metadata.
+        """
+        self.metadata[key] = value
+    
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """
+        Get metadata for the search.
+        
+        Args:
+            key: The key for the metadata.
+            default: The default value to return if the key doesn't exist.
+        
+        Returns:
+            The metadata value, or the default value if the key doesn't exist.
+        """
+        return self.metadata.get(key, default)
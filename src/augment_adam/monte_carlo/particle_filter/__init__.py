@@ -7,9 +7,13 @@ This module provides particle filtering for state estimation in noisy environmen
 from augment_adam.monte_carlo.particle_filter.base import (
     ParticleFilter,
     Particle,
+    ParticleSet,
+    ParticleView,
+    ParticleSetView,
     ResamplingStrategy,
     SystemModel,
     ObservationModel,
+    gather_in_place,
 )
 
 from augment_adam.monte_carlo.particle_filter.resampling import (
@@ -17,6 +21,11 @@ from augment_adam.monte_carlo.particle_filter.resampling import (
     SystematicResampling,
     StratifiedResampling,
     ResidualResampling,
+    search_cumulative,
+    multinomial_indices,
+    systematic_indices,
+    stratified_indices,
+    residual_indices,
 )
 
 from augment_adam.monte_carlo.particle_filter.models import (
@@ -30,15 +39,24 @@ __all__ = [
     # Base
     "ParticleFilter",
     "Particle",
+    "ParticleSet",
+    "ParticleView",
+    "ParticleSetView",
     "ResamplingStrategy",
     "SystemModel",
     "ObservationModel",
+    "gather_in_place",
     
     # Resampling
     "MultinomialResampling",
     "SystematicResampling",
     "StratifiedResampling",
     "ResidualResampling",
+    "search_cumulative",
+    "multinomial_indices",
+    "systematic_indices",
+    "stratified_indices",
+    "residual_indices",
     
     # Models
     "LinearSystemModel",
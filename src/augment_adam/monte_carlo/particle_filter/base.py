@@ -9,6 +9,7 @@ import math
 import random
 import numpy as np
 from abc import ABC, abstractmethod
+from collections.abc import MutableSequence
 from typing import Dict, List, Any, Optional, Union, Tuple, Callable, TypeVar, Generic
 
 from augment_adam.utils.tagging import tag, TagCategory
@@ -18,6 +19,60 @@ T = TypeVar('T')  # Type of state
 O = TypeVar('O')  # Type of observation
 
 
+def log_sum_exp(values: np.ndarray) -> float:
+    """
+    Compute log(sum(exp(values))) without overflow or underflow.
+    
+    Args:
+        values: The values.
+    
+    Returns:
+        The log of the sum of the exponentials, or -inf if every value is -inf.
+    """
+    if len(values) == 0:
+        return -math.inf
+    
+    maximum = np.max(values)
+    if not np.isfinite(maximum):
+        return float(maximum)
+    
+    return float(maximum + np.log(np.sum(np.exp(values - maximum))))
+
+
+def gather_in_place(states: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Overwrite a state array with the states chosen by resampling.
+    
+    Particles that survive stay in their own row, and the rows of particles
+    that don't survive are overwritten with the extra copies of the others,
+    so only those rows are written and no per-particle objects are created.
+    The resampled states end up in a different order than indices; the
+    returned ancestors give the order.
+    
+    Args:
+        states: The states, with one particle per row. Modified in place.
+        indices: The indices of the resampled particles, with as many
+            entries as states has rows.
+    
+    Returns:
+        The ancestors: row i of states now holds the old state ancestors[i].
+    """
+    num_particles = len(states)
+    counts = np.bincount(indices, minlength=num_particles)
+    
+    # Rows that are overwritten, and the rows their extra copies come from
+    free_rows = np.flatnonzero(counts == 0)
+    survivors = np.flatnonzero(counts)
+    sources = np.repeat(survivors, counts[survivors] - 1)
+    
+    # Sources and free rows are disjoint, so the copy reads no overwritten row
+    states[free_rows] = states[sources]
+    
+    ancestors = np.arange(num_particles)
+    ancestors[free_rows] = sources
+    return ancestors
+
+
 @tag("monte_carlo.particle_filter")
 class Particle(Generic[T]):
     """
@@ -71,6 +126,146 @@ class Particle(Generic[T]):
         return self.metadata.get(key, default)
 
 
+@tag("monte_carlo.particle_filter")
+class ParticleSet(Generic[T]):
+    """
+    Array-backed set of particles for particle filtering.
+    
+    The states of all particles are stored in one array whose first axis
+    indexes the particles: shape (N,) for scalar states and (N, d) for vector
+    states. Weights are stored as a vector of log weights, which are kept
+    normalized (their exponentials sum to 1) by normalize().
+    
+    Attributes:
+        states: The states of the particles.
+        log_weights: The normalized log weights of the particles.
+    """
+    
+    def __init__(self, states: np.ndarray, log_weights: Optional[np.ndarray] = None) -> None:
+        """
+        Initialize the particle set.
+        
+        Args:
+            states: The states of the particles, with one particle per row.
+                The states are copied, since resampling overwrites them.
+            log_weights: The log weights of the particles (uniform if None).
+        """
+        self.states = np.array(states, dtype=float)
+        if log_weights is None:
+            log_weights = np.full(len(self.states), -math.log(len(self.states)))
+        self.log_weights = np.asarray(log_weights, dtype=float)
+    
+    @classmethod
+    def from_particles(cls, particles: List[Particle[T]]) -> Optional['ParticleSet[T]']:
+        """
+        Create a particle set from particle objects, if their states fit in an array.
+        
+        Args:
+            particles: The particles.
+        
+        Returns:
+            The particle set, or None if the states are not all floats or all
+            floating-point NumPy arrays of the same shape. Integer states are
+            left to the caller so that they keep their type.
+        """
+        states = [particle.state for particle in particles]
+        if not states:
+            return None
+        
+        if all(isinstance(state, float) for state in states):
+            array = np.array(states, dtype=float)
+        elif all(
+            isinstance(state, np.ndarray) and state.shape == states[0].shape and np.issubdtype(state.dtype, np.floating)
+            for state in states
+        ):
+            array = np.stack(states).astype(float)
+        else:
+            return None
+        
+        with np.errstate(divide="ignore"):
+            log_weights = np.log(np.array([particle.weight for particle in particles], dtype=float))
+        
+        particle_set = cls(array, log_weights)
+        particle_set.normalize()
+        return particle_set
+    
+    def __len__(self) -> int:
+        """Get the number of particles."""
+        return len(self.states)
+    
+    @property
+    def weights(self) -> np.ndarray:
+        """The normalized weights of the particles."""
+        return np.exp(self.log_weights)
+    
+    def normalize(self) -> float:
+        """
+        Normalize the log weights with log-sum-exp.
+        
+        If every weight is zero, the weights are reset to uniform weights.
+        
+        Returns:
+            The log of the sum of the weights before normalization.
+        """
+        total = log_sum_exp(self.log_weights)
+        if np.isfinite(total):
+            self.log_weights -= total
+        else:
+            self.log_weights = np.full(len(self), -math.log(len(self)))
+        return total
+    
+    def effective_sample_size(self) -> float:
+        """
+        Compute the effective sample size, 1 / sum(w ** 2).
+        
+        Returns:
+            The effective sample size.
+        """
+        return float(math.exp(-log_sum_exp(2 * self.log_weights)))
+    
+    def mean(self) -> Union[float, np.ndarray]:
+        """
+        Compute the weighted mean of the states.
+        
+        Returns:
+            The weighted mean, as a float for scalar states.
+        """
+        mean = np.tensordot(self.weights, self.states, axes=1)
+        return float(mean) if self.states.ndim == 1 else mean
+    
+    def select(self, indices: np.ndarray, in_place: bool = False) -> None:
+        """
+        Replace the particles with the particles at the given indices, with uniform weights.
+        
+        Args:
+            indices: The indices of the particles to keep (with repetition).
+            in_place: Whether to overwrite the existing state array (see
+                gather_in_place) instead of allocating a new one. This only
+                applies when there is one index per particle, and the
+                particles may be reordered.
+        """
+        if in_place and len(indices) == len(self.states):
+            gather_in_place(self.states, indices)
+        else:
+            self.states = self.states[indices]
+        self.log_weights = np.full(len(self.states), -math.log(len(self.states)))
+    
+    def to_particles(self) -> List[Particle[T]]:
+        """
+        Convert the particle set to particle objects.
+        
+        The particle objects are copies: changes to them are not reflected in
+        the particle set.
+        
+        Returns:
+            The particles.
+        """
+        weights = self.weights
+        if self.states.ndim == 1:
+            return [Particle(float(state), float(weight)) for state, weight in zip(self.states, weights)]
+        return [Particle(state.copy(), float(weight)) for state, weight in zip(self.states, weights)]
+
+
 @tag("monte_carlo.particle_filter")
 class SystemModel(Generic[T], ABC):
     """
@@ -111,6 +306,23 @@ class SystemModel(Generic[T], ABC):
         """
         pass
     
+    def sample_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Propagate the states of many particles forward in time.
+        
+        The default implementation calls propagate() once per particle;
+        models that can propagate all states with array operations should
+        override it.
+        
+        Args:
+            states: The current states, with one particle per row.
+            dt: The time step.
+        
+        Returns:
+            The propagated states, with the same shape as states.
+        """
+        return np.array([self.propagate(state, dt) for state in states], dtype=float).reshape(states.shape)
+    
     def set_metadata(self, key: str, value: Any) -> None:
         """
         Set metadata for the system model.
@@ -175,6 +387,25 @@ class ObservationModel(Generic[T, O], ABC):
         """
         pass
     
+    def log_likelihood_batch(self, states: np.ndarray, observation: O) -> np.ndarray:
+        """
+        Compute the log likelihood of an observation given the states of many particles.
+        
+        The default implementation calls likelihood() once per particle;
+        models that can evaluate all states with array operations should
+        override it.
+        
+        Args:
+            states: The states, with one particle per row.
+            observation: The observation.
+        
+        Returns:
+            The log likelihoods, one per particle (-inf for zero likelihoods).
+        """
+        likelihoods = np.array([self.likelihood(state, observation) for state in states], dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.log(likelihoods)
+    
     def set_metadata(self, key: str, value: Any) -> None:
         """
         Set metadata for the observation model.
@@ -238,6 +469,22 @@ class ResamplingStrategy(Generic[T], ABC):
         """
         pass
     
+    def resample_indices(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Choose which particles survive resampling.
+        
+        The default implementation runs resample() on particles whose states
+        are their own indices.
+        
+        Args:
+            weights: The normalized weights of the particles.
+        
+        Returns:
+            The indices of the resampled particles, one per new particle.
+        """
+        particles = [Particle(index, float(weight)) for index, weight in enumerate(weights)]
+        return np.array([particle.state for particle in self.resample(particles)], dtype=int)
+    
     def set_metadata(self, key: str, value: Any) -> None:
         """
         Set metadata for the resampling strategy.
@@ -262,6 +509,132 @@ class ResamplingStrategy(Generic[T], ABC):
         return self.metadata.get(key, default)
 
 
+class ParticleView(Particle[T]):
+    """
+    Particle that reads and writes one row of a particle set.
+    
+    Setting the state or the weight of a view changes the particle set. The
+    weight is stored as a log weight, and is not renormalized until the next
+    update. Metadata is kept on the view only, not in the particle set.
+    
+    Attributes:
+        particle_set: The particle set.
+        index: The row of the particle in the particle set.
+        metadata: Additional metadata for the particle.
+    """
+    
+    def __init__(self, particle_set: ParticleSet[T], index: int) -> None:
+        """
+        Initialize the view.
+        
+        Args:
+            particle_set: The particle set.
+            index: The row of the particle in the particle set.
+        """
+        self.particle_set = particle_set
+        self.index = index
+        self.metadata: Dict[str, Any] = {}
+    
+    @property
+    def state(self) -> T:
+        """The state of the particle, as a float for scalar states."""
+        state = self.particle_set.states[self.index]
+        return float(state) if self.particle_set.states.ndim == 1 else state
+    
+    @state.setter
+    def state(self, state: T) -> None:
+        self.particle_set.states[self.index] = state
+    
+    @property
+    def weight(self) -> float:
+        """The weight of the particle."""
+        return float(math.exp(self.particle_set.log_weights[self.index]))
+    
+    @weight.setter
+    def weight(self, weight: float) -> None:
+        self.particle_set.log_weights[self.index] = math.log(weight) if weight > 0 else -math.inf
+
+
+class ParticleSetView(MutableSequence):
+    """
+    List of particles backed by a particle set.
+    
+    Items are ParticleView objects, so changes to them and to the list
+    (setting, inserting, appending or deleting particles) are made in the
+    particle set. Getting the length does not create any particle objects.
+    
+    Attributes:
+        particle_set: The particle set.
+    """
+    
+    def __init__(self, particle_set: ParticleSet[T]) -> None:
+        """
+        Initialize the view.
+        
+        Args:
+            particle_set: The particle set.
+        """
+        self.particle_set = particle_set
+    
+    def _row(self, index: int) -> int:
+        """
+        Get the row of a particle, counting negative indices from the end.
+        
+        Args:
+            index: The index of the particle.
+        
+        Returns:
+            The row.
+        
+        Raises:
+            IndexError: If there is no particle at the index.
+        """
+        length = len(self.particle_set)
+        row = index + length if index < 0 else index
+        if not 0 <= row < length:
+            raise IndexError("particle index out of range")
+        return row
+    
+    def __len__(self) -> int:
+        """Get the number of particles."""
+        return len(self.particle_set)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[ParticleView[T], List[ParticleView[T]]]:
+        """Get the particle at an index, or a list of the particles in a slice."""
+        if isinstance(index, slice):
+            return [ParticleView(self.particle_set, row) for row in range(len(self))[index]]
+        return ParticleView(self.particle_set, self._row(index))
+    
+    def __setitem__(self, index: int, particle: Particle[T]) -> None:
+        """Replace the particle at an index."""
+        if isinstance(index, slice):
+            raise TypeError("particles can only be replaced one at a time")
+        row = self._row(index)
+        view = ParticleView(self.particle_set, row)
+        view.state = particle.state
+        view.weight = particle.weight
+    
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        """Remove the particle at an index, or the particles in a slice."""
+        rows = range(len(self))[index] if isinstance(index, slice) else self._row(index)
+        self.particle_set.states = np.delete(self.particle_set.states, rows, axis=0)
+        self.particle_set.log_weights = np.delete(self.particle_set.log_weights, rows)
+    
+    def insert(self, index: int, particle: Particle[T]) -> None:
+        """
+        Insert a particle before an index.
+        
+        Args:
+            index: The index to insert the particle before.
+            particle: The particle.
+        """
+        row = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        with np.errstate(divide="ignore"):
+            log_weight = np.log(float(particle.weight))
+        self.particle_set.states = np.insert(self.particle_set.states, row, np.asarray(particle.state, dtype=float), axis=0)
+        self.particle_set.log_weights = np.insert(self.particle_set.log_weights, row, log_weight)
+
+
 @tag("monte_carlo.particle_filter")
 class ParticleFilter(Generic[T, O]):
     """
@@ -271,14 +644,26 @@ class ParticleFilter(Generic[T, O]):
     environments, using a set of particles to represent the probability
     distribution of the state.
     
+    When the states are floats or floating-point NumPy arrays of one shape,
+    the particles are kept in a ParticleSet and every step runs as array
+    operations: the models are called once per step through sample_batch(),
+    log_likelihood_batch() and resample_indices(), weights are normalized in
+    log space, and the effective sample size and estimate are vectorized.
+    Other states are kept as a list of Particle objects.
+    
     Attributes:
         name: The name of the particle filter.
         metadata: Additional metadata for the particle filter.
-        particles: The particles in the filter.
+        particles: The particles in the filter. For array-backed filters,
+            this is a ParticleSetView, so changes to the particles are made
+            in the particle set.
+        particle_set: The array-backed particles, or None if the filter
+            keeps a list of particles.
         system_model: The system model.
         observation_model: The observation model.
         resampling_strategy: The resampling strategy.
         effective_sample_size_threshold: The threshold for effective sample size.
+        vectorized: Whether numeric states are kept in a ParticleSet.
     
     TODO(Issue #9): Add support for particle filter diagnostics
     TODO(Issue #9): Implement particle filter validation
@@ -291,7 +676,8 @@ class ParticleFilter(Generic[T, O]):
         resampling_strategy: ResamplingStrategy[T],
         num_particles: int = 100,
         effective_sample_size_threshold: float = 0.5,
-        name: str = "particle_filter"
+        name: str = "particle_filter",
+        vectorized: bool = True
     ) -> None:
         """
         Initialize the particle filter.
@@ -303,11 +689,15 @@ class ParticleFilter(Generic[T, O]):
             num_particles: The number of particles.
             effective_sample_size_threshold: The threshold for effective sample size.
             name: The name of the particle filter.
+            vectorized: Whether to keep numeric states in a ParticleSet. If
+                False, every step runs once per Particle object.
         """
         self.name = name
         self.metadata: Dict[str, Any] = {}
         
-        self.particles: List[Particle[T]] = []
+        self.vectorized = vectorized
+        self.particle_set: Optional[ParticleSet[T]] = None
+        self._particles: List[Particle[T]] = []
         self.system_model = system_model
         self.observation_model = observation_model
         self.resampling_strategy = resampling_strategy
@@ -315,14 +705,39 @@ class ParticleFilter(Generic[T, O]):
         
         self.metadata["num_particles"] = num_particles
         self.metadata["effective_sample_size_threshold"] = effective_sample_size_threshold
+        self.metadata["vectorized"] = vectorized
+    
+    @property
+    def particles(self) -> Union[List[Particle[T]], ParticleSetView]:
+        """The particles in the filter."""
+        if self.particle_set is not None:
+            return ParticleSetView(self.particle_set)
+        return self._particles
+    
+    @particles.setter
+    def particles(self, particles: List[Particle[T]]) -> None:
+        """
+        Replace the particles in the filter.
+        
+        Args:
+            particles: The new particles.
+        """
+        self.particle_set = ParticleSet.from_particles(particles) if self.vectorized else None
+        self._particles = [] if self.particle_set is not None else list(particles)
     
-    def initialize(self, initial_states: List[T]) -> None:
+    def initialize(self, initial_states: Union[List[T], np.ndarray]) -> None:
         """
         Initialize the particle filter with a set of states.
         
         Args:
-            initial_states: The initial states for the particles.
+            initial_states: The initial states for the particles, as a list
+                or as an array with one particle per row.
         """
+        if self.vectorized and isinstance(initial_states, np.ndarray) and np.issubdtype(initial_states.dtype, np.floating):
+            self.particle_set = ParticleSet(initial_states)
+            self._particles = []
+            return
+        
         self.particles = [Particle(state, 1.0 / len(initial_states)) for state in initial_states]
     
     def predict(self, dt: float) -> None:
@@ -332,7 +747,11 @@ class ParticleFilter(Generic[T, O]):
         Args:
             dt: The time step.
         """
-        for particle in self.particles:
+        if self.particle_set is not None:
+            self.particle_set.states = self.system_model.sample_batch(self.particle_set.states, dt)
+            return
+        
+        for particle in self._particles:
             particle.state = self.system_model.propagate(particle.state, dt)
     
     def update(self, observation: O) -> None:
@@ -342,25 +761,30 @@ class ParticleFilter(Generic[T, O]):
         Args:
             observation: The observation.
         """
-        # Compute likelihoods
-        likelihoods = [self.observation_model.likelihood(particle.state, observation) for particle in self.particles]
+        if self.particle_set is not None:
+            # Update and normalize log weights (reset to uniform if all are zero)
+            self.particle_set.log_weights += self.observation_model.log_likelihood_batch(self.particle_set.states, observation)
+            self.particle_set.normalize()
+        else:
+            # Compute likelihoods
+            likelihoods = [self.observation_model.likelihood(particle.state, observation) for particle in self._particles]
         
-        # Update weights
-        for i, particle in enumerate(self.particles):
-            particle.weight *= likelihoods[i]
+            # Update weights
+            for i, particle in enumerate(self._particles):
+                particle.weight *= likelihoods[i]
         
-        # Normalize weights
-        total_weight = sum(particle.weight for particle in self.particles)
-        if total_weight > 0:
-            for particle in self.particles:
-                particle.weight /= total_weight
-        else:
-            # If all weights are zero, reset to uniform weights
-            for particle in self.particles:
-                particle.weight = 1.0 / len(self.particles)
+            # Normalize weights
+            total_weight = sum(particle.weight for particle in self._particles)
+            if total_weight > 0:
+                for particle in self._particles:
+                    particle.weight /= total_weight
+            else:
+                # If all weights are zero, reset to uniform weights
+                for particle in self._particles:
+                    particle.weight = 1.0 / len(self._particles)
         
         # Check if resampling is needed
-        if self._compute_effective_sample_size() < self.effective_sample_size_threshold * len(self.particles):
+        if self._compute_effective_sample_size() < self.effective_sample_size_threshold * self._num_particles():
             self._resample()
     
     def estimate_state(self) -> T:
@@ -370,6 +794,9 @@ class ParticleFilter(Generic[T, O]):
         Returns:
             The estimated state.
         """
+        if self.particle_set is not None:
+            return self.particle_set.mean()
+        
         # Compute weighted average of states
         if isinstance(self.particles[0].state, (int, float)):
             # For scalar states
@@ -381,15 +808,26 @@ class ParticleFilter(Generic[T, O]):
             # For other types, return the state of the particle with the highest weight
             return max(self.particles, key=lambda p: p.weight).state
     
-    def get_particles(self) -> List[Particle[T]]:
+    def get_particles(self) -> Union[List[Particle[T]], ParticleSetView]:
         """
         Get the particles in the filter.
         
         Returns:
-            The particles.
+            The particles (see the particles attribute).
         """
         return self.particles
     
+    def _num_particles(self) -> int:
+        """
+        Get the number of particles.
+        
+        Returns:
+            The number of particles.
+        """
+        if self.particle_set is not None:
+            return len(self.particle_set)
+        return len(self._particles)
+    
     def _compute_effective_sample_size(self) -> float:
         """
         Compute the effective sample size of the particles.
@@ -397,13 +835,19 @@ class ParticleFilter(Generic[T, O]):
         Returns:
             The effective sample size.
         """
-        return 1.0 / sum(particle.weight ** 2 for particle in self.particles)
+        if self.particle_set is not None:
+            return self.particle_set.effective_sample_size()
+        return 1.0 / sum(particle.weight ** 2 for particle in self._particles)
     
     def _resample(self) -> None:
         """
         Resample the particles based on their weights.
         """
-        self.particles = self.resampling_strategy.resample(self.particles)
+        if self.particle_set is not None:
+            self.particle_set.select(self.resampling_strategy.resample_indices(self.particle_set.weights))
+            return
+        
+        self._particles = self.resampling_strategy.resample(self._particles)
     
     def set_metadata(self, key: str, value: Any) -> None:
         """
@@ -14,6 +14,37 @@ from augment_adam.utils.tagging import tag, TagCategory
 from augment_adam.monte_carlo.particle_filter.base import SystemModel, ObservationModel
 
 
+def gaussian_log_likelihood(innovations: np.ndarray, covariance: np.ndarray) -> np.ndarray:
+    """
+    Compute the log density of zero-mean Gaussian innovations, one per row.
+    
+    Args:
+        innovations: The innovations, with shape (N, k).
+        covariance: The (k, k) covariance matrix.
+    
+    Returns:
+        The log densities, with shape (N,).
+    """
+    cholesky = np.linalg.cholesky(covariance)
+    whitened = np.linalg.solve(cholesky, innovations.T)
+    log_determinant = 2.0 * np.sum(np.log(np.diag(cholesky)))
+    return -0.5 * (np.sum(whitened ** 2, axis=0) + covariance.shape[0] * math.log(2 * math.pi) + log_determinant)
+
+
+def gaussian_noise(covariance: np.ndarray, size: int) -> np.ndarray:
+    """
+    Draw zero-mean Gaussian noise vectors.
+    
+    Args:
+        covariance: The covariance matrix.
+        size: The number of vectors to draw.
+    
+    Returns:
+        The noise, with shape (size, d).
+    """
+    return np.random.multivariate_normal(np.zeros(covariance.shape[0]), covariance, size=size)
+
+
 @tag("monte_carlo.particle_filter")
 class LinearSystemModel(SystemModel[np.ndarray]):
     """
@@ -79,6 +110,20 @@ class LinearSystemModel(SystemModel[np.ndarray]):
         
         return propagated_state + noise
 
+    def sample_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Propagate the states of many particles forward in time.
+        
+        Args:
+            states: The current states, with shape (N, d).
+            dt: The time step.
+        
+        Returns:
+            The propagated states, with shape (N, d).
+        """
+        F = np.eye(self.state_transition_matrix.shape[0]) + dt * self.state_transition_matrix
+        return states @ F.T + gaussian_noise(dt * self.process_noise_covariance, len(states))
+
 
 @tag("monte_carlo.particle_filter")
 class NonlinearSystemModel(SystemModel[np.ndarray]):
@@ -93,6 +138,8 @@ class NonlinearSystemModel(SystemModel[np.ndarray]):
         metadata: Additional metadata for the system model.
         state_transition_function: The state transition function.
         process_noise_covariance: The covariance matrix of the process noise.
+        vectorized: Whether the state transition function accepts an (N, d)
+            array of states.
     
     TODO(Issue #9): Add support for control inputs
     TODO(Issue #9): Implement system model validation
@@ -102,7 +149,8 @@ class NonlinearSystemModel(SystemModel[np.ndarray]):
         self,
         state_transition_function: Callable[[np.ndarray, float], np.ndarray],
         process_noise_covariance: np.ndarray,
-        name: str = "nonlinear_system_model"
+        name: str = "nonlinear_system_model",
+        vectorized: bool = False
     ) -> None:
         """
         Initialize the nonlinear system model.
@@ -111,13 +159,18 @@ class NonlinearSystemModel(SystemModel[np.ndarray]):
             state_transition_function: The state transition function.
             process_noise_covariance: The covariance matrix of the process noise.
             name: The name of the system model.
+            vectorized: Whether the state transition function accepts an
+                (N, d) array of states. If False, sample_batch() calls it once
+                per particle.
         """
         super().__init__(name)
         
         self.state_transition_function = state_transition_function
         self.process_noise_covariance = process_noise_covariance
+        self.vectorized = vectorized
         
         self.metadata["process_noise_covariance"] = process_noise_covariance
+        self.metadata["vectorized"] = vectorized
     
     def propagate(self, state: np.ndarray, dt: float) -> np.ndarray:
         """
@@ -140,6 +193,24 @@ class NonlinearSystemModel(SystemModel[np.ndarray]):
         )
         
         return propagated_state + noise
+    
+    def sample_batch(self, states: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Propagate the states of many particles forward in time.
+        
+        Args:
+            states: The current states, with shape (N, d).
+            dt: The time step.
+        
+        Returns:
+            The propagated states, with shape (N, d).
+        """
+        if self.vectorized:
+            propagated_states = self.state_transition_function(states, dt)
+        else:
+            propagated_states = np.array([self.state_transition_function(state, dt) for state in states])
+        
+        return propagated_states + gaussian_noise(dt * self.process_noise_covariance, len(states))
 
 
 @tag("monte_carlo.particle_filter")
@@ -206,6 +277,20 @@ class LinearObservationModel(ObservationModel[np.ndarray, np.ndarray]):
         
         return normalization * math.exp(exponent)
 
+    def log_likelihood_batch(self, states: np.ndarray, observation: np.ndarray) -> np.ndarray:
+        """
+        Compute the log likelihood of an observation given the states of many particles.
+        
+        Args:
+            states: The states, with shape (N, d).
+            observation: The observation.
+        
+        Returns:
+            The log likelihoods, with shape (N,).
+        """
+        innovations = observation - states @ self.observation_matrix.T
+        return gaussian_log_likelihood(innovations, self.observation_noise_covariance)
+
 
 @tag("monte_carlo.particle_filter")
 class NonlinearObservationModel(ObservationModel[np.ndarray, np.ndarray]):
@@ -220,6 +305,8 @@ class NonlinearObservationModel(ObservationModel[np.ndarray, np.ndarray]):
         metadata: Additional metadata for the observation model.
         observation_function: The observation function.
         observation_noise_covariance: The covariance matrix of the observation noise.
+        vectorized: Whether the observation function accepts an (N, d) array
+            of states.
     
     TODO(Issue #9): Add support for time-varying observation models
     TODO(Issue #9): Implement observation model validation
@@ -229,7 +316,8 @@ class NonlinearObservationModel(ObservationModel[np.ndarray, np.ndarray]):
         self,
         observation_function: Callable[[np.ndarray], np.ndarray],
         observation_noise_covariance: np.ndarray,
-        name: str = "nonlinear_observation_model"
+        name: str = "nonlinear_observation_model",
+        vectorized: bool = False
     ) -> None:
         """
         Initialize the nonlinear observation model.
@@ -238,13 +326,18 @@ class NonlinearObservationModel(ObservationModel[np.ndarray, np.ndarray]):
             observation_function: The observation function.
             observation_noise_covariance: The covariance matrix of the observation noise.
             name: The name of the observation model.
+            vectorized: Whether the observation function accepts an (N, d)
+                array of states. If False, log_likelihood_batch() calls it
+                once per particle.
         """
         super().__init__(name)
         
         self.observation_function = observation_function
         self.observation_noise_covariance = observation_noise_covariance
+        self.vectorized = vectorized
         
         self.metadata["observation_noise_covariance"] = observation_noise_covariance
+        self.metadata["vectorized"] = vectorized
     
     def likelihood(self, state: np.ndarray, observation: np.ndarray) -> float:
         """
@@ -269,3 +362,22 @@ class NonlinearObservationModel(ObservationModel[np.ndarray, np.ndarray]):
         normalization = 1.0 / math.sqrt((2 * math.pi) ** len(observation) * np.linalg.det(self.observation_noise_covariance))
         
         return normalization * math.exp(exponent)
+
+    def log_likelihood_batch(self, states: np.ndarray, observation: np.ndarray) -> np.ndarray:
+        """
+        Compute the log likelihood of an observation given the states of many particles.
+        
+        Args:
+            states: The states, with shape (N, d).
+            observation: The observation.
+        
+        Returns:
+            The log likelihoods, with shape (N,).
+        """
+        if self.vectorized:
+            expected_observations = self.observation_function(states)
+        else:
+            expected_observations = np.array([self.observation_function(state) for state in states])
+        
+        innovations = observation - expected_observations.reshape(len(states), -1)
+        return gaussian_log_likelihood(innovations, self.observation_noise_covariance)
@@ -3,10 +3,16 @@ Resampling strategies for particle filtering.
 
 This module provides resampling strategies for particle filtering, including
 multinomial, systematic, stratified, and residual resampling.
+
+Every strategy works on arrays: it turns the normalized weights into the
+indices of the resampled particles with one np.searchsorted over the
+cumulative weights. For very large particle sets, the search can be split
+across worker threads, each of which handles one chunk of the cumulative
+weights.
 """
 
-import random
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union, Tuple, TypeVar, Generic
 
 from augment_adam.utils.tagging import tag, TagCategory
@@ -15,6 +21,183 @@ from augment_adam.monte_carlo.particle_filter.base import Particle, ResamplingSt
 
 T = TypeVar('T')  # Type of state
 
+# Smallest chunk of weights worth handing to a worker thread
+MIN_CHUNK_SIZE = 65536
+
+
+def _search_chunk(weights: np.ndarray, start: int, offset: float, positions: np.ndarray, total: float) -> np.ndarray:
+    """
+    Find the particles of one chunk of weights that the given positions fall on.
+    
+    Args:
+        weights: The weights of the chunk.
+        start: The index of the first particle of the chunk.
+        offset: The sum of the weights before the chunk.
+        positions: The sorted positions in [0, 1) that fall on the chunk.
+        total: The sum of all weights.
+    
+    Returns:
+        The indices of the particles.
+    """
+    cumulative = np.cumsum(weights)
+    cumulative += offset
+    cumulative /= total
+    
+    indices = np.searchsorted(cumulative, positions, side="right")
+    np.minimum(indices, len(weights) - 1, out=indices)
+    indices += start
+    return indices
+
+
+def search_cumulative(weights: np.ndarray, positions: np.ndarray, num_workers: int = 1) -> np.ndarray:
+    """
+    Find the particles that sorted positions fall on in the cumulative weights.
+    
+    Position u falls on particle i if the cumulative weight before i is at
+    most u and the cumulative weight up to i is greater than u. With several
+    workers, the weights are split into chunks and every thread computes the
+    cumulative weights of its chunk and searches the positions that fall on
+    it; only the chunk totals are computed up front.
+    
+    Args:
+        weights: The weights (normalized or not).
+        positions: Sorted positions in [0, 1).
+        num_workers: The number of worker threads.
+    
+    Returns:
+        The indices of the particles, one per position.
+    """
+    weights = np.asarray(weights, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    num_chunks = max(1, min(num_workers, len(weights) // MIN_CHUNK_SIZE))
+    
+    if num_chunks == 1:
+        return _search_chunk(weights, 0, 0.0, positions, float(np.sum(weights)))
+    
+    # Chunk boundaries, cumulative weight before each chunk, and the positions of each chunk
+    bounds = np.linspace(0, len(weights), num_chunks + 1).astype(int)
+    totals = np.add.reduceat(weights, bounds[:-1])
+    offsets = np.concatenate(([0.0], np.cumsum(totals)))
+    total = float(offsets[-1])
+    splits = np.searchsorted(positions, offsets[1:-1] / total, side="right")
+    splits = np.concatenate(([0], splits, [len(positions)]))
+    
+    indices = np.empty(len(positions), dtype=np.intp)
+    
+    def search(chunk: int) -> None:
+        start, end = bounds[chunk], bounds[chunk + 1]
+        low, high = splits[chunk], splits[chunk + 1]
+        if low < high:
+            indices[low:high] = _search_chunk(weights[start:end], start, offsets[chunk], positions[low:high], total)
+    
+    with ThreadPoolExecutor(max_workers=num_chunks) as executor:
+        list(executor.map(search, range(num_chunks)))
+    
+    return indices
+
+
+def multinomial_indices(weights: np.ndarray, num_samples: Optional[int] = None, num_workers: int = 1) -> np.ndarray:
+    """
+    Draw particle indices independently in proportion to the weights.
+    
+    The uniform positions are generated already sorted, from normalized
+    cumulative sums of exponential spacings, so no sort is needed.
+    
+    Args:
+        weights: The weights.
+        num_samples: The number of indices to draw (the number of weights if None).
+        num_workers: The number of worker threads for the search.
+    
+    Returns:
+        The sorted indices.
+    """
+    num_samples = len(weights) if num_samples is None else num_samples
+    spacings = np.cumsum(np.random.standard_exponential(num_samples + 1))
+    positions = spacings[:-1] / spacings[-1]
+    return search_cumulative(weights, positions, num_workers)
+
+
+def systematic_indices(weights: np.ndarray, num_samples: Optional[int] = None, num_workers: int = 1) -> np.ndarray:
+    """
+    Draw particle indices with evenly spaced positions and one random offset.
+    
+    Args:
+        weights: The weights.
+        num_samples: The number of indices to draw (the number of weights if None).
+        num_workers: The number of worker threads for the search.
+    
+    Returns:
+        The sorted indices.
+    """
+    num_samples = len(weights) if num_samples is None else num_samples
+    positions = (np.arange(num_samples) + np.random.random()) / num_samples
+    return search_cumulative(weights, positions, num_workers)
+
+
+def stratified_indices(weights: np.ndarray, num_samples: Optional[int] = None, num_workers: int = 1) -> np.ndarray:
+    """
+    Draw particle indices with one random position in each of num_samples equal strata.
+    
+    Args:
+        weights: The weights.
+        num_samples: The number of indices to draw (the number of weights if None).
+        num_workers: The number of worker threads for the search.
+    
+    Returns:
+        The sorted indices.
+    """
+    num_samples = len(weights) if num_samples is None else num_samples
+    positions = (np.arange(num_samples) + np.random.random(num_samples)) / num_samples
+    return search_cumulative(weights, positions, num_workers)
+
+
+def residual_indices(weights: np.ndarray, num_samples: Optional[int] = None, num_workers: int = 1) -> np.ndarray:
+    """
+    Draw particle indices by copying floor(num_samples * w) of each particle
+    and drawing the rest with multinomial resampling on the residual weights.
+    
+    Args:
+        weights: The normalized weights.
+        num_samples: The number of indices to draw (the number of weights if None).
+        num_workers: The number of worker threads for the search.
+    
+    Returns:
+        The indices: the deterministic copies first, then the residual draws.
+    """
+    weights = np.asarray(weights, dtype=float)
+    num_samples = len(weights) if num_samples is None else num_samples
+    
+    # Compute integer part and residual
+    expected_counts = weights * num_samples
+    integer_counts = np.floor(expected_counts).astype(np.intp)
+    residual_weights = expected_counts - integer_counts
+    
+    deterministic = np.repeat(np.arange(len(weights)), integer_counts)
+    num_residual = num_samples - len(deterministic)
+    if num_residual <= 0:
+        return deterministic
+    
+    # Rounding can leave draws without residual weight; draw those from the weights
+    if np.sum(residual_weights) <= 0:
+        residual_weights = weights
+    
+    return np.concatenate((deterministic, multinomial_indices(residual_weights, num_residual, num_workers)))
+
+
+def _particles_from_indices(particles: List[Particle[T]], indices: np.ndarray) -> List[Particle[T]]:
+    """
+    Create new particles with the states at the given indices and uniform weights.
+    
+    Args:
+        particles: The particles that were resampled.
+        indices: The indices of the resampled particles.
+    
+    Returns:
+        The resampled particles.
+    """
+    weight = 1.0 / len(indices)
+    return [Particle(state=particles[index].state, weight=weight) for index in indices.tolist()]
+
 
 @tag("monte_carlo.particle_filter")
 class MultinomialResampling(ResamplingStrategy[T]):
@@ -27,19 +210,35 @@ class MultinomialResampling(ResamplingStrategy[T]):
     Attributes:
         name: The name of the resampling strategy.
         metadata: Additional metadata for the resampling strategy.
+        num_workers: The number of worker threads for very large particle sets.
     
-    TODO(Issue #9): Add support for parallel resampling
     TODO(Issue #9): Implement resampling strategy validation
     """
     
-    def __init__(self, name: str = "multinomial_resampling") -> None:
+    def __init__(self, name: str = "multinomial_resampling", num_workers: int = 1) -> None:
         """
         Initialize the multinomial resampling strategy.
         
         Args:
             name: The name of the resampling strategy.
+            num_workers: The number of worker threads for very large particle sets.
         """
         super().__init__(name)
+        
+        self.num_workers = num_workers
+        self.metadata["num_workers"] = num_workers
+    
+    def resample_indices(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Choose which particles survive multinomial resampling.
+        
+        Args:
+            weights: The normalized weights of the particles.
+        
+        Returns:
+            The indices of the resampled particles.
+        """
+        return multinomial_indices(weights, num_workers=self.num_workers)
     
     def resample(self, particles: List[Particle[T]]) -> List[Particle[T]]:
         """
@@ -51,27 +250,8 @@ class MultinomialResampling(ResamplingStrategy[T]):
         Returns:
             The resampled particles.
         """
-        # Get weights
-        weights = [particle.weight for particle in particles]
-        
-        # Sample indices
-        indices = np.random.choice(
-            len(particles),
-            size=len(particles),
-            replace=True,
-            p=weights
-        )
-        
-        # Create new particles
-        resampled_particles = []
-        for index in indices:
-            # Create a new particle with the same state but uniform weight
-            resampled_particles.append(Particle(
-                state=particles[index].state,
-                weight=1.0 / len(particles)
-            ))
-        
-        return resampled_particles
+        weights = np.array([particle.weight for particle in particles])
+        return _particles_from_indices(particles, self.resample_indices(weights))
 
 
 @tag("monte_carlo.particle_filter")
@@ -85,19 +265,35 @@ class SystematicResampling(ResamplingStrategy[T]):
     Attributes:
         name: The name of the resampling strategy.
         metadata: Additional metadata for the resampling strategy.
+        num_workers: The number of worker threads for very large particle sets.
     
-    TODO(Issue #9): Add support for parallel resampling
     TODO(Issue #9): Implement resampling strategy validation
     """
     
-    def __init__(self, name: str = "systematic_resampling") -> None:
+    def __init__(self, name: str = "systematic_resampling", num_workers: int = 1) -> None:
         """
         Initialize the systematic resampling strategy.
         
         Args:
             name: The name of the resampling strategy.
+            num_workers: The number of worker threads for very large particle sets.
         """
         super().__init__(name)
+        
+        self.num_workers = num_workers
+        self.metadata["num_workers"] = num_workers
+    
+    def resample_indices(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Choose which particles survive systematic resampling.
+        
+        Args:
+            weights: The normalized weights of the particles.
+        
+        Returns:
+            The indices of the resampled particles.
+        """
+        return systematic_indices(weights, num_workers=self.num_workers)
     
     def resample(self, particles: List[Particle[T]]) -> List[Particle[T]]:
         """
@@ -109,35 +305,8 @@ class SystematicResampling(ResamplingStrategy[T]):
         Returns:
             The resampled particles.
         """
-        # Get weights
         weights = np.array([particle.weight for particle in particles])
-        
-        # Compute cumulative sum of weights
-        cumulative_sum = np.cumsum(weights)
-        
-        # Generate systematic samples
-        num_particles = len(particles)
-        u0 = random.random() / num_particles
-        u = np.array([u0 + i / num_particles for i in range(num_particles)])
-        
-        # Find indices of particles to resample
-        indices = np.zeros(num_particles, dtype=int)
-        j = 0
-        for i in range(num_particles):
-            while j < num_particles - 1 and u[i] > cumulative_sum[j]:
-                j += 1
-            indices[i] = j
-        
-        # Create new particles
-        resampled_particles = []
-        for index in indices:
-            # Create a new particle with the same state but uniform weight
-            resampled_particles.append(Particle(
-                state=particles[index].state,
-                weight=1.0 / num_particles
-            ))
-        
-        return resampled_particles
+        return _particles_from_indices(particles, self.resample_indices(weights))
 
 
 @tag("monte_carlo.particle_filter")
@@ -151,19 +320,35 @@ class StratifiedResampling(ResamplingStrategy[T]):
     Attributes:
         name: The name of the resampling strategy.
         metadata: Additional metadata for the resampling strategy.
+        num_workers: The number of worker threads for very large particle sets.
     
-    TODO(Issue #9): Add support for parallel resampling
     TODO(Issue #9): Implement resampling strategy validation
     """
     
-    def __init__(self, name: str = "stratified_resampling") -> None:
+    def __init__(self, name: str = "stratified_resampling", num_workers: int = 1) -> None:
         """
         Initialize the stratified resampling strategy.
         
         Args:
             name: The name of the resampling strategy.
+            num_workers: The number of worker threads for very large particle sets.
         """
         super().__init__(name)
+        
+        self.num_workers = num_workers
+        self.metadata["num_workers"] = num_workers
+    
+    def resample_indices(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Choose which particles survive stratified resampling.
+        
+        Args:
+            weights: The normalized weights of the particles.
+        
+        Returns:
+            The indices of the resampled particles.
+        """
+        return stratified_indices(weights, num_workers=self.num_workers)
     
     def resample(self, particles: List[Particle[T]]) -> List[Particle[T]]:
         """
@@ -175,36 +360,8 @@ class StratifiedResampling(ResamplingStrategy[T]):
         Returns:
             The resampled particles.
         """
-        # Get weights
         weights = np.array([particle.weight for particle in particles])
-        
-        # Compute cumulative sum of weights
-        cumulative_sum = np.cumsum(weights)
-        
-        # Generate stratified samples
-        num_particles = len(particles)
-        u = np.array([
-            (i + random.random()) / num_particles for i in range(num_particles)
-        ])
-        
-        # Find indices of particles to resample
-        indices = np.zeros(num_particles, dtype=int)
-        j = 0
-        for i in range(num_particles):
-            while j < num_particles - 1 and u[i] > cumulative_sum[j]:
-                j += 1
-            indices[i] = j
-        
-        # Create new particles
-        resampled_particles = []
-        for index in indices:
-            # Create a new particle with the same state but uniform weight
-            resampled_particles.append(Particle(
-                state=particles[index].state,
-                weight=1.0 / num_particles
-            ))
-        
-        return resampled_particles
+        return _particles_from_indices(particles, self.resample_indices(weights))
 
 
 @tag("monte_carlo.particle_filter")
@@ -219,19 +376,35 @@ class ResidualResampling(ResamplingStrategy[T]):
     Attributes:
         name: The name of the resampling strategy.
         metadata: Additional metadata for the resampling strategy.
+        num_workers: The number of worker threads for very large particle sets.
     
-    TODO(Issue #9): Add support for parallel resampling
     TODO(Issue #9): Implement resampling strategy validation
     """
     
-    def __init__(self, name: str = "residual_resampling") -> None:
+    def __init__(self, name: str = "residual_resampling", num_workers: int = 1) -> None:
         """
         Initialize the residual resampling strategy.
         
         Args:
             name: The name of the resampling strategy.
+            num_workers: The number of worker threads for very large particle sets.
         """
         super().__init__(name)
+        
+        self.num_workers = num_workers
+        self.metadata["num_workers"] = num_workers
+    
+    def resample_indices(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Choose which particles survive residual resampling.
+        
+        Args:
+            weights: The normalized weights of the particles.
+        
+        Returns:
+            The indices of the resampled particles.
+        """
+        return residual_indices(weights, num_workers=self.num_workers)
     
     def resample(self, particles: List[Particle[T]]) -> List[Particle[T]]:
         """
@@ -243,49 +416,6 @@ class ResidualResampling(ResamplingStrategy[T]):
         Returns:
             The resampled particles.
         """
-        # Get weights
         weights = np.array([particle.weight for particle in particles])
-        
-        # Compute expected counts
-        num_particles = len(particles)
-        expected_counts = weights * num_particles
-        
-        # Compute integer part and residual
-        integer_counts = np.floor(expected_counts).astype(int)
-        residual_weights = expected_counts - integer_counts
-        
-        # Normalize residual weights
-        residual_sum = np.sum(residual_weights)
-        if residual_sum > 0:
-            residual_weights = residual_weights / residual_sum
-        
-        # Compute number of particles to resample
-        num_residual = num_particles - np.sum(integer_counts)
-        
-        # Create new particles
-        resampled_particles = []
-        
-        # Add particles based on integer counts
-        for i, count in enumerate(integer_counts):
-            for _ in range(count):
-                resampled_particles.append(Particle(
-                    state=particles[i].state,
-                    weight=1.0 / num_particles
-                ))
-        
-        # Resample remaining particles based on residual weights
-        if num_residual > 0 and residual_sum > 0:
-            residual_indices = np.random.choice(
-                len(particles),
-                size=num_residual,
-                replace=True,
-                p=residual_weights
-            )
-            
-            for index in residual_indices:
-                resampled_particles.append(Particle(
-                    state=particles[index].state,
-                    weight=1.0 / num_particles
-                ))
-        
-        return resampled_particles
+        return _particles_from_indices(particles, self.resample_indices(weights))
+        
\ No newline at end of file
@@ -18,6 +18,10 @@ from augment_adam.monte_carlo.utils.statistics import (
     compute_effective_sample_size,
     compute_autocorrelation,
     compute_credible_interval,
+    compute_chain_autocovariance,
+    compute_chain_autocorrelation,
+    compute_chain_effective_sample_size,
+    compute_split_r_hat,
 )
 
 __all__ = [
@@ -33,4 +37,8 @@ __all__ = [
     "compute_effective_sample_size",
     "compute_autocorrelation",
     "compute_credible_interval",
+    "compute_chain_autocovariance",
+    "compute_chain_autocorrelation",
+    "compute_chain_effective_sample_size",
+    "compute_split_r_hat",
 ]
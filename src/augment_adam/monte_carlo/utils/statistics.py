@@ -199,3 +199,149 @@ def compute_credible_interval(
     upper_bound = sorted_samples[upper_index]
     
     return (lower_bound, upper_bound)
+
+
+def _as_chain_draws(draws: Union[np.ndarray, List[Any]]) -> Tuple[np.ndarray, bool]:
+    """
+    Convert MCMC draws to a (dimensions, chains, draws) array.
+    
+    Args:
+        draws: Draws with shape (chains, draws) or (chains, draws, dimensions).
+    
+    Returns:
+        Tuple of (array, scalar), where scalar is True for (chains, draws) input.
+    
+    Raises:
+        ValueError: If the draws don't have two or three dimensions.
+    """
+    draws_array = np.asarray(draws, dtype=float)
+    if draws_array.ndim == 2:
+        return draws_array[np.newaxis], True
+    if draws_array.ndim == 3:
+        return np.moveaxis(draws_array, 2, 0), False
+    raise ValueError(f"Expected draws with shape (chains, draws) or (chains, draws, dimensions), got {draws_array.shape}")
+
+
+def compute_chain_autocovariance(draws: np.ndarray) -> np.ndarray:
+    """
+    Compute the autocovariance of chains at every lag with the FFT.
+    
+    The series are zero-padded to a power of two of at least twice their
+    length, so the circular correlation computed by the FFT equals the
+    linear one. This costs O(n log n) per series instead of O(n * lags).
+    
+    Args:
+        draws: The chains, with the draws along the last axis.
+    
+    Returns:
+        The biased autocovariance (divided by n) at lags 0 to n - 1, with the
+        same shape as draws.
+    """
+    draws_array = np.asarray(draws, dtype=float)
+    length = draws_array.shape[-1]
+    centered = draws_array - draws_array.mean(axis=-1, keepdims=True)
+    
+    size = 1 << max(1, (2 * length - 1).bit_length())
+    spectrum = np.fft.rfft(centered, n=size, axis=-1)
+    autocovariance = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=-1)[..., :length]
+    return autocovariance / length
+
+
+def compute_chain_autocorrelation(draws: np.ndarray) -> np.ndarray:
+    """
+    Compute the autocorrelation of chains at every lag with the FFT.
+    
+    Args:
+        draws: The chains, with the draws along the last axis.
+    
+    Returns:
+        The autocorrelation at lags 0 to n - 1, with the same shape as draws.
+        Constant chains have zero autocorrelation after lag 0.
+    """
+    autocovariance = compute_chain_autocovariance(draws)
+    variance = autocovariance[..., :1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        autocorrelation = np.where(variance > 0, autocovariance / variance, 0.0)
+    autocorrelation[..., 0] = 1.0
+    return autocorrelation
+
+
+def compute_chain_effective_sample_size(draws: Union[np.ndarray, List[Any]]) -> Union[float, np.ndarray]:
+    """
+    Compute the effective sample size of one or more MCMC chains.
+    
+    The autocorrelation is estimated across chains from FFT autocovariances
+    and summed with Geyer's initial monotone sequence estimator: sums of
+    consecutive pairs of autocorrelations are added while they are positive,
+    and made non-increasing.
+    
+    Args:
+        draws: Draws with shape (chains, draws) or (chains, draws, dimensions).
+    
+    Returns:
+        The effective sample size, or one per dimension for 3-dimensional draws.
+    """
+    chains, scalar = _as_chain_draws(draws)
+    num_chains, length = chains.shape[1], chains.shape[2]
+    total = num_chains * length
+    if length < 4:
+        return float(total) if scalar else np.full(chains.shape[0], float(total))
+    
+    autocovariance = compute_chain_autocovariance(chains)
+    chain_variance = autocovariance[..., 0] * length / (length - 1)
+    mean_variance = chain_variance.mean(axis=-1)
+    variance_plus = mean_variance * (length - 1) / length
+    if num_chains > 1:
+        variance_plus = variance_plus + chains.mean(axis=-1).var(axis=-1, ddof=1)
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = 1.0 - (mean_variance[:, np.newaxis] - autocovariance.mean(axis=1)) / variance_plus[:, np.newaxis]
+    rho[:, 0] = 1.0
+    
+    # Pairs (rho[2t], rho[2t + 1]), truncated at the first non-positive pair and made non-increasing
+    num_pairs = length // 2
+    pairs = rho[:, 0:2 * num_pairs:2] + rho[:, 1:2 * num_pairs:2]
+    positive = np.cumprod(pairs > 0, axis=-1).astype(bool)
+    pairs = np.minimum.accumulate(np.where(positive, pairs, 0.0), axis=-1)
+    
+    tau = -1.0 + 2.0 * np.sum(pairs, axis=-1)
+    tau = np.maximum(tau, 1.0 / math.log10(total))
+    
+    # Constant draws carry no information about mixing; count them as independent
+    ess = np.where(variance_plus > 0, total / tau, float(total))
+    return float(ess[0]) if scalar else ess
+
+
+def compute_split_r_hat(draws: Union[np.ndarray, List[Any]]) -> Union[float, np.ndarray]:
+    """
+    Compute the split R-hat convergence diagnostic of MCMC chains.
+    
+    Every chain is split in half, and the between-half and within-half
+    variances are compared; values close to 1 indicate that the chains have
+    mixed.
+    
+    Args:
+        draws: Draws with shape (chains, draws) or (chains, draws, dimensions).
+    
+    Returns:
+        The split R-hat, or one per dimension for 3-dimensional draws. It is
+        NaN if the chains have fewer than 4 draws.
+    """
+    chains, scalar = _as_chain_draws(draws)
+    half = chains.shape[2] // 2
+    if half < 2:
+        return float("nan") if scalar else np.full(chains.shape[0], np.nan)
+    
+    # The middle draw of odd-length chains is dropped
+    split = np.concatenate((chains[..., :half], chains[..., -half:]), axis=1)
+    
+    within = split.var(axis=-1, ddof=1).mean(axis=-1)
+    between = half * split.mean(axis=-1).var(axis=-1, ddof=1)
+    variance_plus = (half - 1) / half * within + between / half
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_hat = np.sqrt(variance_plus / within)
+    
+    # Identical constant chains have converged
+    r_hat = np.where((within == 0) & (between == 0), 1.0, r_hat)
+    return float(r_hat[0]) if scalar else r_hat
@@ -0,0 +1,183 @@
+"""
+Timing wheel for expiring keyed entries.
+
+This module provides the TimingWheel class, a hierarchical timing wheel that
+tracks when keyed entries (such as working memory items or cached contexts
+with a time-to-live) expire, so expired entries can be collected without
+scanning every entry.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from augment_adam.utils.tagging import tag, TagCategory
+
+
+@tag("utils.timing_wheel")
+class TimingWheel:
+    """
+    Hierarchical timing wheel of keyed deadlines.
+    
+    Level 0 has one slot per tick; each higher level has one slot per full
+    rotation of the level below it. A deadline is placed in the lowest level
+    whose span covers it, and slots of higher levels are cascaded into lower
+    levels as time reaches them. Scheduling and cancelling are O(1), and
+    advancing costs O(levels) per elapsed tick plus O(1) amortized per
+    expired key, independent of how many keys are scheduled.
+    
+    Deadlines are timestamps in seconds, such as time.time() values.
+    
+    Attributes:
+        tick: The length of a tick in seconds.
+        slots: The number of slots per level (a power of two).
+        levels: The number of levels.
+    """
+    
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, now: float = 0.0) -> None:
+        """
+        Initialize the timing wheel.
+        
+        With the defaults, the wheel spans 64 ** 4 ticks (about 194 days at
+        one second per tick); later deadlines wait in the top level.
+        
+        Args:
+            tick: The length of a tick in seconds.
+            slots: The number of slots per level (rounded up to a power of two).
+            levels: The number of levels.
+            now: The current time.
+        """
+        self.bits = max(1, (slots - 1).bit_length())
+        self.slots = 1 << self.bits
+        self.levels = levels
+        self.tick = tick
+        
+        self._wheels: List[List[Set[str]]] = [[set() for _ in range(self.slots)] for _ in range(levels)]
+        
+        # Deadline and (level, slot) of each scheduled key
+        self._deadlines: Dict[str, float] = {}
+        self._locations: Dict[str, Tuple[int, int]] = {}
+        
+        self._current = int(now // tick)
+    
+    def __len__(self) -> int:
+        """Get the number of scheduled keys."""
+        return len(self._deadlines)
+    
+    def __contains__(self, key: object) -> bool:
+        """Check whether a key is scheduled."""
+        return key in self._deadlines
+    
+    def _place(self, key: str, deadline_tick: int) -> None:
+        """
+        Put a key in the lowest level whose span covers its deadline.
+        
+        Args:
+            key: The key.
+            deadline_tick: The tick of the key's deadline.
+        """
+        # Overdue keys go in the current slot, which is collected on the next tick
+        deadline_tick = max(deadline_tick, self._current)
+        delta = deadline_tick - self._current
+        
+        level = 0
+        while level < self.levels - 1 and delta >= 1 << (self.bits * (level + 1)):
+            level += 1
+        
+        slot = (deadline_tick >> (self.bits * level)) & (self.slots - 1)
+        self._wheels[level][slot].add(key)
+        self._locations[key] = (level, slot)
+    
+    def schedule(self, key: str, deadline: float) -> None:
+        """
+        Schedule a key to expire, replacing any previous deadline.
+        
+        Args:
+            key: The key.
+            deadline: The time at which the key expires.
+        """
+        self.cancel(key)
+        self._deadlines[key] = deadline
+        self._place(key, int(deadline // self.tick))
+    
+    def cancel(self, key: str) -> None:
+        """
+        Cancel the deadline of a key.
+        
+        Args:
+            key: The key.
+        """
+        if self._deadlines.pop(key, None) is None:
+            return
+        
+        level, slot = self._locations.pop(key)
+        self._wheels[level][slot].discard(key)
+    
+    def deadline(self, key: str) -> Optional[float]:
+        """
+        Get the deadline of a key.
+        
+        Args:
+            key: The key.
+        
+        Returns:
+            The deadline, or None if the key isn't scheduled.
+        """
+        return self._deadlines.get(key)
+    
+    def clear(self) -> None:
+        """Cancel all deadlines."""
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._deadlines = {}
+        self._locations = {}
+    
+    def _cascade(self, level: int) -> None:
+        """
+        Move the keys of the current slot of a level into lower levels.
+        
+        Args:
+            level: The level to cascade.
+        """
+        slot = (self._current >> (self.bits * level)) & (self.slots - 1)
+        keys = self._wheels[level][slot]
+        self._wheels[level][slot] = set()
+        
+        for key in keys:
+            self._place(key, int(self._deadlines[key] // self.tick))
+    
+    def advance(self, now: float) -> List[str]:
+        """
+        Advance the wheel and collect the keys that expired.
+        
+        Args:
+            now: The current time.
+        
+        Returns:
+            List of expired keys, which are no longer scheduled.
+        """
+        target = int(now // self.tick)
+        expired: List[str] = []
+        
+        while self._current < target:
+            if not self._deadlines:
+                self._current = target
+                break
+            
+            # Every key left in the current level 0 slot is due
+            slot = self._current & (self.slots - 1)
+            keys = self._wheels[0][slot]
+            if keys:
+                self._wheels[0][slot] = set()
+                for key in keys:
+                    del self._deadlines[key]
+                    del self._locations[key]
+                expired.extend(keys)
+            
+            self._current += 1
+            
+            # Cascade the levels whose lower levels just completed a rotation, top down
+            for level in range(self.levels - 1, 0, -1):
+                if self._current & ((1 << (self.bits * level)) - 1) == 0:
+                    self._cascade(level)
+        
+        return expired
@@ -0,0 +1,112 @@
+"""Performance tests for the Sequential Monte Carlo sampler and potentials."""
+
+import os
+import time
+import unittest
+
+import numpy as np
+
+from augment_adam.ai_agent.smc.parallel_sampler import ParallelSequentialMonteCarlo
+from augment_adam.ai_agent.smc.particle import Particle
+from augment_adam.ai_agent.smc.potential import GrammarPotential, RegexPotential
+
+
+class StubModel:
+    """Small deterministic model with a weight payload, like a loaded model."""
+
+    def __init__(self, payload_mb=16):
+        """Initialize the stub model with payload_mb megabytes of weights."""
+        self.weights = np.zeros(payload_mb * 1024 * 1024 // 8)
+
+    def generate(self, prompt, max_tokens=1, temperature=0.8, stop=None):
+        """Continue the prompt with a character chosen from its length."""
+        return prompt + "abcde "[len(prompt) % 6]
+
+
+class TestParallelSMCStepOverhead(unittest.TestCase):
+    """Per-step overhead of the parallel sampler with and without a persistent pool."""
+
+    def time_steps(self, persistent, num_steps=10):
+        """Get the mean time of an extend and reweight step."""
+        sampler = ParallelSequentialMonteCarlo(
+            num_particles=64,
+            potentials=[RegexPotential(pattern=r"[a-e ]*")],
+            model=StubModel(),
+            num_workers=max(2, min(4, os.cpu_count() or 1)),
+            persistent=persistent
+        )
+
+        with sampler:
+            sampler.initialize_particles("The prompt ")
+
+            # Warm up: starts the persistent pool
+            sampler.extend_particles(num_candidates=1)
+
+            started = time.perf_counter()
+            for _ in range(num_steps):
+                sampler.extend_particles(num_candidates=1)
+                sampler.reweight_particles()
+            return (time.perf_counter() - started) / num_steps
+
+    def test_step_overhead(self):
+        """Compare the step time of a persistent pool and a pool per call."""
+        per_call = self.time_steps(persistent=False)
+        persistent = self.time_steps(persistent=True)
+
+        print(
+            f"\nParallel SMC step: pool per call {per_call * 1000:.1f} ms, "
+            f"persistent pool {persistent * 1000:.1f} ms ({per_call / persistent:.1f}x)"
+        )
+        self.assertLess(persistent, per_call)
+
+
+class TestIncrementalPotentials(unittest.TestCase):
+    """Cost of re-matching whole sequences versus advancing automaton states."""
+
+    def grow(self, potential, incremental, num_particles=32, num_tokens=400):
+        """Get the time to evaluate particles after every token they generate."""
+        particles = [Particle(sequence=[]) for _ in range(num_particles)]
+        started = time.perf_counter()
+        for step in range(num_tokens):
+            particles = [particle.extend("word, "[step % 6]) for particle in particles]
+            for particle in particles:
+                if incremental:
+                    potential.evaluate_particle(particle)
+                else:
+                    potential.evaluate(particle.sequence)
+        return time.perf_counter() - started
+
+    def test_regex_potential(self):
+        """Compare full re-matching with incremental DFA evaluation."""
+        potential = RegexPotential(pattern=r"(\w+, )*\w+\.")
+
+        full = min(self.grow(potential, incremental=False) for _ in range(3))
+        incremental = min(self.grow(potential, incremental=True) for _ in range(3))
+
+        print(
+            f"\nRegexPotential, 400 tokens: re.match {full * 1000:.1f} ms, "
+            f"incremental {incremental * 1000:.1f} ms ({full / incremental:.1f}x)"
+        )
+        self.assertLess(incremental, full)
+
+    def test_grammar_token_masks(self):
+        """Time masking a vocabulary with the per-state cache."""
+        potential = GrammarPotential({"start": r"<item>(, <item>)*", "item": r"[a-z]+"})
+        vocabulary = [chr(c) for c in range(32, 127)] + ["word", ", ", "ab,", " x"]
+        particle = Particle(sequence=list("abc, de"))
+
+        started = time.perf_counter()
+        potential.mask_tokens(particle, vocabulary)
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(100):
+            potential.mask_tokens(particle, vocabulary)
+        warm = (time.perf_counter() - started) / 100
+
+        print(f"\nGrammarPotential mask of {len(vocabulary)} tokens: first {cold * 1e6:.0f} us, cached {warm * 1e6:.0f} us")
+        self.assertLess(warm, cold)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Performance tests for the Redis context storage backend."""
+
+import time
+import unittest
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from augment_adam.context.core.base import Context, ContextType
+from augment_adam.context.storage.base import RedisStorage
+
+
+class CountingPipeline:
+    """Pipeline wrapper that counts one round trip per execute()."""
+
+    def __init__(self, pipeline, counter):
+        """Wrap a pipeline."""
+        self._pipeline = pipeline
+        self._counter = counter
+
+    def execute(self):
+        """Send the queued commands in one round trip."""
+        self._counter.round_trips += 1
+        return self._pipeline.execute()
+
+    def __getattr__(self, name):
+        """Queue any other command without a round trip."""
+        return getattr(self._pipeline, name)
+
+
+class CountingRedis:
+    """Redis client wrapper that counts one round trip per command or pipeline."""
+
+    def __init__(self, client):
+        """Wrap a client."""
+        self._client = client
+        self.round_trips = 0
+
+    def pipeline(self, *args, **kwargs):
+        """Create a counting pipeline."""
+        return CountingPipeline(self._client.pipeline(*args, **kwargs), self)
+
+    def __getattr__(self, name):
+        """Count every other command as a round trip."""
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def command(*args, **kwargs):
+            self.round_trips += 1
+            return attribute(*args, **kwargs)
+
+        return command
+
+
+class TestRedisStorageRoundTrips(unittest.TestCase):
+    """Round trips and latency per operation for RedisStorage."""
+
+    num_contexts = 2000
+    limit = 50
+
+    def setUp(self):
+        """Create a storage backend over a counting fakeredis client."""
+        self.client = CountingRedis(fakeredis.FakeRedis())
+        self.storage = RedisStorage(redis_client=self.client)
+        self.contexts = [
+            Context(
+                id=f"ctx{i}",
+                content=f"context number {i}",
+                context_type=ContextType.TEXT if i % 2 else ContextType.CODE,
+                source=f"source{i % 10}",
+                tags=[f"tag{i % 7}", f"tag{i % 5}"],
+            )
+            for i in range(self.num_contexts)
+        ]
+        self.rows = []
+
+    def measure(self, name, operation, count=1):
+        """Run an operation and record its round trips and latency per call."""
+        self.client.round_trips = 0
+        start_time = time.perf_counter()
+        result = operation()
+        elapsed_time = time.perf_counter() - start_time
+        self.rows.append((name, self.client.round_trips / count, 1000 * elapsed_time / count))
+        return result
+
+    def report(self):
+        """Print the recorded measurements."""
+        print(f"\nRedisStorage with {self.num_contexts} contexts")
+        print(f"{'operation':<32} {'round trips':>12} {'ms/op':>10}")
+        for name, round_trips, latency in self.rows:
+            print(f"{name:<32} {round_trips:>12.1f} {latency:>10.3f}")
+
+    def test_round_trips(self):
+        """Measure the round trips of the bulk and single-context operations."""
+        self.measure("add_contexts (batch)", lambda: self.storage.add_contexts(self.contexts))
+        self.assertEqual(self.rows[-1][1], 1)
+
+        ids = [context.id for context in self.contexts[:self.limit]]
+        self.measure(f"get_contexts ({self.limit} ids)", lambda: self.storage.get_contexts(ids))
+        self.assertEqual(self.rows[-1][1], 1)
+
+        self.measure(
+            "retrieve_context (each)",
+            lambda: [self.storage.retrieve_context(context_id) for context_id in ids],
+            count=len(ids),
+        )
+
+        results = self.measure(
+            "search_contexts (type+tag)",
+            lambda: self.storage.search_contexts("", limit=self.limit, context_type=ContextType.TEXT, tags=["tag3"]),
+        )
+        self.assertEqual(len(results), self.limit)
+        self.assertEqual(self.rows[-1][1], 2)
+
+        results = self.measure("search_contexts (no filter)", lambda: self.storage.search_contexts("", limit=self.limit))
+        self.assertEqual(len(results), self.limit)
+
+        updated = self.contexts[:self.limit]
+        for context in updated:
+            context.tags = ["updated"]
+        self.measure(
+            "update_context (tags changed)",
+            lambda: [self.storage.update_context(context) for context in updated],
+            count=len(updated),
+        )
+        self.assertEqual(self.rows[-1][1], 2)
+        self.assertEqual(len(self.storage.search_contexts("", limit=self.num_contexts, tags=["updated"])), self.limit)
+
+        self.measure(
+            "update_context (same indices)",
+            lambda: [self.storage.update_context(context) for context in updated],
+            count=len(updated),
+        )
+        self.assertEqual(self.rows[-1][1], 1)
+
+        self.measure(
+            "delete_context",
+            lambda: [self.storage.delete_context(context.id) for context in updated],
+            count=len(updated),
+        )
+        self.assertEqual(self.rows[-1][1], 2)
+
+        self.report()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Performance tests for the vector memory systems."""
+
+import time
+import unittest
+
+import pytest
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from augment_adam.memory.vector.base import VectorMemoryItem
+from augment_adam.memory.vector.faiss import FAISSMemory
+
+
+def make_clustered_embeddings(num_vectors, dimension, num_clusters=50, seed=0):
+    """Create clustered embeddings, which resemble real text embeddings more than noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_clusters, dimension)).astype(np.float32)
+    labels = rng.integers(num_clusters, size=num_vectors)
+    return centers[labels] + 0.3 * rng.standard_normal((num_vectors, dimension)).astype(np.float32)
+
+
+def recall_at_k(results, ground_truth, k):
+    """Compute the average fraction of true top-k neighbors that were returned."""
+    hits = [len({item.id for item, _ in row[:k]} & set(truth[:k])) for row, truth in zip(results, ground_truth)]
+    return sum(hits) / (k * len(ground_truth))
+
+
+class TestFAISSMemoryRecallLatency(unittest.TestCase):
+    """Recall@k vs. latency sweeps for tuning nprobe and efSearch."""
+
+    num_vectors = 20000
+    dimension = 64
+    num_queries = 200
+    k = 10
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the dataset and exact ground truth once."""
+        cls.embeddings = make_clustered_embeddings(cls.num_vectors + cls.num_queries, cls.dimension)
+        cls.queries = cls.embeddings[cls.num_vectors:].tolist()
+        cls.items = [
+            VectorMemoryItem(id=f"item_{i}", content="x", embedding=cls.embeddings[i].tolist())
+            for i in range(cls.num_vectors)
+        ]
+
+        exact = FAISSMemory(name="exact", dimension=cls.dimension, index_type="Flat")
+        exact.add_many(cls.items)
+        cls.ground_truth = [[item.id for item, _ in row] for row in exact.search_many(cls.queries, cls.k)]
+
+    def sweep(self, memory, param_name, values):
+        """Measure recall@k and per-query latency for each search parameter value."""
+        rows = []
+        for value in values:
+            memory.set_search_params(**{param_name: value})
+
+            start_time = time.perf_counter()
+            results = memory.search_many(self.queries, self.k)
+            elapsed_time = time.perf_counter() - start_time
+
+            rows.append((value, recall_at_k(results, self.ground_truth, self.k), elapsed_time / self.num_queries))
+
+        print(f"\n{memory.active_index_type} recall@{self.k} vs. latency ({self.num_vectors} vectors, d={self.dimension}):")
+        for value, recall, latency in rows:
+            print(f"{param_name}={value:<5} recall@{self.k}={recall:.3f} latency={latency * 1e6:.1f} us/query")
+
+        return rows
+
+    def test_ivf_nprobe_sweep(self):
+        """Sweep nprobe on an IVF index."""
+        memory = FAISSMemory(name="ivf", dimension=self.dimension, index_type="IVF")
+        memory.add_many(self.items)
+
+        rows = self.sweep(memory, "nprobe", [1, 2, 4, 8, 16, 32, 64])
+
+        # Recall should not get worse as more lists are probed
+        recalls = [recall for _, recall, _ in rows]
+        self.assertEqual(recalls, sorted(recalls))
+        self.assertGreater(recalls[-1], 0.9)
+
+    def test_ivfpq_nprobe_sweep(self):
+        """Sweep nprobe on an IVF-PQ index."""
+        memory = FAISSMemory(name="ivfpq", dimension=self.dimension, index_type="IVFPQ")
+        memory.add_many(self.items)
+
+        rows = self.sweep(memory, "nprobe", [1, 4, 16, 64])
+
+        self.assertGreater(rows[-1][1], 0.3)
+
+    def test_hnsw_ef_search_sweep(self):
+        """Sweep efSearch on an HNSW index."""
+        memory = FAISSMemory(name="hnsw", dimension=self.dimension, index_type="HNSW")
+        memory.add_many(self.items)
+
+        rows = self.sweep(memory, "ef_search", [16, 32, 64, 128, 256])
+
+        self.assertGreater(rows[-1][1], 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
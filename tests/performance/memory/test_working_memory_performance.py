@@ -0,0 +1,71 @@
+"""Performance tests for the working memory system."""
+
+import os
+import time
+import random
+import unittest
+
+from augment_adam.memory.working.base import WorkingMemory, WorkingMemoryItem
+
+
+# Capacities to benchmark; set WORKING_MEMORY_BENCHMARK_MAX=1000000 for the full sweep
+MAX_CAPACITY = int(os.environ.get("WORKING_MEMORY_BENCHMARK_MAX", "100000"))
+CAPACITIES = [capacity for capacity in (1000, 10000, 100000, 1000000) if capacity <= MAX_CAPACITY]
+
+
+def per_operation_us(started, operations):
+    """Get the average time of an operation in microseconds."""
+    return (time.perf_counter() - started) / operations * 1e6
+
+
+class TestWorkingMemoryScaling(unittest.TestCase):
+    """Per-operation cost of add, evict, expire and lookup as capacity grows."""
+
+    operations = 2000
+
+    def fill(self, capacity, rng):
+        """Create a full working memory with a mix of tasks, priorities and TTLs."""
+        memory = WorkingMemory("bench", capacity=capacity)
+        for i in range(capacity):
+            memory.add(WorkingMemoryItem(
+                id=f"item{i}",
+                content=i,
+                task_id=f"task{i % 100}",
+                priority=rng.randrange(11),
+                importance=rng.random(),
+                ttl=rng.choice([0, 0, 3600]),
+            ))
+        return memory
+
+    def test_scaling(self):
+        """Time evicting adds, indexed lookups and status updates at each capacity."""
+        rng = random.Random(0)
+        print()
+        for capacity in CAPACITIES:
+            memory = self.fill(capacity, rng)
+
+            started = time.perf_counter()
+            for i in range(self.operations):
+                memory.add(WorkingMemoryItem(id=f"new{i}", content=i, priority=rng.randrange(11), ttl=60))
+            add_us = per_operation_us(started, self.operations)
+
+            started = time.perf_counter()
+            for i in range(self.operations):
+                memory.get_by_task(f"task{i % 100}")
+            lookup_us = per_operation_us(started, self.operations)
+
+            item_ids = rng.choices(list(memory.items), k=self.operations)
+            started = time.perf_counter()
+            for item_id in item_ids:
+                memory.update_status(item_id, "completed")
+            update_us = per_operation_us(started, self.operations)
+
+            self.assertEqual(len(memory.items), capacity)
+            print(
+                f"capacity={capacity:>8}: add+evict {add_us:7.1f} us, "
+                f"get_by_task {lookup_us:9.1f} us, update_status {update_us:6.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Performance tests for the model cache backends."""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import unittest
+
+from augment_adam.models.cache_store import SQLiteCacheStore, EMBEDDING
+from augment_adam.models.caching import ModelCache, CACHE_DB_NAME
+
+
+# Entry counts to benchmark; set MODEL_CACHE_BENCHMARK_MAX=1000000 for the full sweep.
+# The files backend writes one file per entry, so it is only built up to FILES_MAX.
+MAX_ENTRIES = int(os.environ.get("MODEL_CACHE_BENCHMARK_MAX", "100000"))
+FILES_MAX = 10000
+SIZES = [size for size in (1000, 10000, 100000, 1000000) if size <= MAX_ENTRIES]
+DIMENSIONS = 16
+
+
+def text_of(i):
+    """Get the text of the i-th cached embedding."""
+    return f"text {i}"
+
+
+def embedding_of(i):
+    """Get the i-th cached embedding."""
+    return [float(i % 97) / 97] * DIMENSIONS
+
+
+def fill_files(cache_dir, size):
+    """Write a cache in the files layout directly, with one metadata write."""
+    embeddings_dir = os.path.join(cache_dir, "embeddings")
+    os.makedirs(embeddings_dir)
+    metadata = {"embeddings": {}, "generations": {}, "tokenizer": {}, "model": {}, "last_access": {}}
+    for i in range(size):
+        key = hashlib.md5(text_of(i).encode()).hexdigest()
+        with open(os.path.join(embeddings_dir, f"{key}.pkl"), "wb") as f:
+            pickle.dump(embedding_of(i), f)
+        metadata["embeddings"][key] = {"text_hash": key, "size": 0, "dimensions": DIMENSIONS}
+        metadata["last_access"][key] = float(i)
+    with open(os.path.join(cache_dir, "metadata.json"), "w") as f:
+        json.dump(metadata, f)
+
+
+def fill_sqlite(cache_dir, size):
+    """Write a cache database directly, in large transactions."""
+    store = SQLiteCacheStore(os.path.join(cache_dir, CACHE_DB_NAME))
+    for start in range(0, size, 10000):
+        store.put_many(EMBEDDING, [
+            (hashlib.md5(text_of(i).encode()).hexdigest(), embedding_of(i), float(i))
+            for i in range(start, min(size, start + 10000))
+        ])
+    store.close()
+
+
+class TestModelCacheScaling(unittest.TestCase):
+    """Startup time and hit latency of the files and sqlite backends."""
+
+    hits = 2000
+
+    def measure(self, backend, size, working_set=None, **kwargs):
+        """Get the startup time in ms and the hit latency in us of a filled cache.
+
+        Hits cycle over working_set distinct keys (by default, every hit is
+        for a different key).
+        """
+        cache_dir = tempfile.mkdtemp()
+        try:
+            if backend == "files":
+                fill_files(cache_dir, size)
+            else:
+                fill_sqlite(cache_dir, size)
+
+            started = time.perf_counter()
+            cache = ModelCache("bench", "bench", cache_dir=cache_dir, backend=backend, **kwargs)
+            startup = (time.perf_counter() - started) * 1000
+
+            # Every hit of the files backend rewrites its whole metadata file
+            hits = min(self.hits, size, 200) if backend == "files" else self.hits
+            working_set = working_set or hits
+            keys = [text_of(i % working_set * 7919 % size) for i in range(hits)]
+            started = time.perf_counter()
+            for text in keys:
+                self.assertIsNotNone(cache.get_embedding(text))
+            latency = (time.perf_counter() - started) / hits * 1e6
+
+            cache.close()
+            return startup, latency
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_scaling(self):
+        """Compare the backends as the number of entries grows."""
+        print()
+        for size in SIZES:
+            line = f"{size:>8} entries: "
+            if size <= FILES_MAX:
+                startup, latency = self.measure("files", size)
+                line += f"files startup {startup:8.1f} ms, hit {latency:9.1f} us | "
+            startup, latency = self.measure("sqlite", size, memory_cache_size=256)
+            line += f"sqlite startup {startup:6.1f} ms, hit {latency:5.1f} us"
+            print(line)
+
+    def test_memory_tier(self):
+        """Compare hits served from the LRU tier with hits served from the database."""
+        size = min(SIZES[-1], 100000)
+        _, database = self.measure("sqlite", size, working_set=100, memory_cache_size=0)
+        _, memory = self.measure("sqlite", size, working_set=100, memory_cache_size=256)
+        print(f"\nsqlite hit at {size} entries: database {database:.1f} us, LRU tier {memory:.1f} us")
+        self.assertLess(memory, database)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Performance tests for batched embeddings on CPU.
+
+The model is a tiny, randomly initialized BERT built in a temporary
+directory, so the benchmark needs no downloads.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+
+import pytest
+
+torch = pytest.importorskip("torch")
+sentence_transformers = pytest.importorskip("sentence_transformers")
+transformers = pytest.importorskip("transformers")
+
+from sentence_transformers import SentenceTransformer, models
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+from augment_adam.models.huggingface_model import HuggingFaceModel
+
+
+WORDS = ["the", "model", "cache", "memory", "vector", "token", "agent", "search", "query", "result"]
+NUM_TEXTS = 512
+BATCH_SIZES = [1, 8, 32, 128]
+
+
+def tiny_sentence_transformer(directory):
+    """Build and save a tiny BERT, and wrap it with mean pooling."""
+    vocab_file = os.path.join(directory, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS))
+
+    config = BertConfig(
+        vocab_size=5 + len(WORDS),
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=128,
+        max_position_embeddings=256,
+    )
+    torch.manual_seed(0)
+    BertModel(config).save_pretrained(directory)
+    BertTokenizerFast(vocab_file=vocab_file).save_pretrained(directory)
+
+    transformer = models.Transformer(directory, max_seq_length=256)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension())
+    return SentenceTransformer(modules=[transformer, pooling], device="cpu")
+
+
+def embedding_model(sentence_transformer):
+    """Create a HuggingFaceModel that only has the embedding model loaded."""
+    model = HuggingFaceModel.__new__(HuggingFaceModel)
+    model.model_name = "tiny-bert"
+    model.has_embeddings = True
+    model.use_cache = False
+    model.cache = None
+    model.embedding_model = sentence_transformer
+    return model
+
+
+class TestEmbeddingThroughput(unittest.TestCase):
+    """Texts per second of get_embedding in a loop and of get_embeddings by batch size."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the tiny model and texts of mixed lengths."""
+        cls.directory = tempfile.mkdtemp()
+        cls.model = embedding_model(tiny_sentence_transformer(cls.directory))
+
+        rng = random.Random(0)
+        cls.texts = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.choice([4, 8, 16, 200])))
+            for _ in range(NUM_TEXTS)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the model directory."""
+        shutil.rmtree(cls.directory)
+
+    def throughput(self, embed, repeats=3):
+        """Get the best texts per second of an embedding function."""
+        best = 0.0
+        for _ in range(repeats):
+            started = time.perf_counter()
+            embeddings = embed(self.texts)
+            best = max(best, len(self.texts) / (time.perf_counter() - started))
+        self.assertEqual(len(embeddings), len(self.texts))
+        return best
+
+    def test_batch_size(self):
+        """Compare one text per call with batched, length-sorted calls."""
+        loop = self.throughput(lambda texts: [self.model.get_embedding(text, use_cache=False) for text in texts], repeats=1)
+        print(f"\nget_embedding loop: {loop:8.0f} texts/s")
+
+        for batch_size in BATCH_SIZES:
+            batched = self.throughput(lambda texts: self.model.get_embeddings(texts, batch_size=batch_size))
+            print(f"get_embeddings, batch size {batch_size:>3}: {batched:8.0f} texts/s ({batched / loop:4.1f}x)")
+
+    def test_batches_match_single_texts(self):
+        """Check that batching and reordering do not change the embeddings."""
+        texts = self.texts[:16]
+        single = [self.model.get_embedding(text, use_cache=False) for text in texts]
+        batched = self.model.get_embeddings(texts, batch_size=8)
+
+        for expected, actual in zip(single, batched):
+            for a, b in zip(expected, actual):
+                self.assertAlmostEqual(a, b, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
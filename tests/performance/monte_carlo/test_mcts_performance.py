@@ -0,0 +1,109 @@
+"""Performance tests for the array-backed Monte Carlo Tree Search."""
+
+import os
+import random
+import time
+import unittest
+
+from augment_adam.monte_carlo.mcts import (
+    MonteCarloTreeSearch,
+    ArrayMonteCarloTreeSearch,
+    UCB1Strategy,
+    RandomRolloutPolicy,
+)
+
+
+# A synthetic game: states are (depth, key) pairs, every move mixes the action
+# into the key, and the reward of a final state is a pseudo-random function of
+# its key. Moves that add a multiple of 4 to the key lead to the same state,
+# so a transposition table merges them.
+BRANCHING = 24
+DEPTH = 10
+
+
+def get_available_actions(state):
+    """Every non-final state has BRANCHING moves."""
+    return set(range(BRANCHING))
+
+
+def get_next_state(state, action):
+    """Advance the depth and mix the action into the key."""
+    return (state[0] + 1, (state[1] * 31 + action % (BRANCHING // 4)) % 1000003)
+
+
+def is_terminal(state):
+    """The game ends at depth DEPTH."""
+    return state[0] >= DEPTH
+
+
+def get_reward(state):
+    """Pseudo-random reward in [0, 1]."""
+    return (state[1] * 2654435761 % 4294967296) / 4294967296
+
+
+def state_key(state):
+    """States are hashable tuples."""
+    return state
+
+
+GAME = (get_available_actions, get_next_state, is_terminal, get_reward)
+
+
+def iterations_per_second(make_search, iterations, repeats=3):
+    """Get the best throughput of fresh searches."""
+    best = 0.0
+    for _ in range(repeats):
+        search = make_search()
+        random.seed(0)
+        started = time.perf_counter()
+        search.search(*GAME, num_iterations=iterations)
+        best = max(best, iterations / (time.perf_counter() - started))
+    return best
+
+
+class TestMCTSThroughput(unittest.TestCase):
+    """Iterations per second of the node-based and array-backed searches."""
+
+    def test_serial_throughput(self):
+        """Compare the serial searches, with and without a transposition table."""
+        print()
+        iterations = 20000
+        for rollout_depth in (2, DEPTH):
+            node_based = iterations_per_second(
+                lambda: MonteCarloTreeSearch((0, 0), UCB1Strategy(), RandomRolloutPolicy(), max_depth=rollout_depth),
+                iterations,
+            )
+            array = iterations_per_second(
+                lambda: ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), max_depth=rollout_depth, seed=0),
+                iterations,
+            )
+            transposed = iterations_per_second(
+                lambda: ArrayMonteCarloTreeSearch(
+                    (0, 0), RandomRolloutPolicy(), max_depth=rollout_depth, state_hash=state_key, seed=0
+                ),
+                iterations,
+            )
+            print(
+                f"rollout depth {rollout_depth:>2}: node-based {node_based:8.0f} it/s, "
+                f"array {array:8.0f} it/s ({array / node_based:4.1f}x), "
+                f"array + transpositions {transposed:8.0f} it/s ({transposed / node_based:4.1f}x)"
+            )
+
+    def test_parallel_throughput(self):
+        """Time root-parallel and leaf-parallel search, including process start-up."""
+        workers = max(2, min(4, os.cpu_count() or 1))
+        iterations = 8000
+        print()
+        for parallel in ("root", "leaf"):
+            throughput = iterations_per_second(
+                lambda: ArrayMonteCarloTreeSearch(
+                    (0, 0), RandomRolloutPolicy(), max_depth=DEPTH, num_workers=workers, parallel=parallel, seed=0
+                ),
+                iterations,
+                repeats=1,
+            )
+            print(f"{parallel}-parallel, {workers} workers: {throughput:8.0f} it/s")
+
+
+if __name__ == "__main__":
+    unittest.main()
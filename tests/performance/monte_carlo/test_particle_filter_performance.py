@@ -0,0 +1,60 @@
+"""Performance tests for the particle filter."""
+
+import time
+import unittest
+
+import numpy as np
+
+from augment_adam.monte_carlo.particle_filter import (
+    ParticleFilter,
+    SystematicResampling,
+    LinearSystemModel,
+    LinearObservationModel,
+)
+
+
+def make_filter(vectorized):
+    """Create a constant-velocity tracking filter with a position observation."""
+    A = np.array([[0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0], [0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]])
+    return ParticleFilter(
+        LinearSystemModel(A, 0.01 * np.eye(4)),
+        LinearObservationModel(np.eye(2, 4), 0.25 * np.eye(2)),
+        SystematicResampling(),
+        vectorized=vectorized,
+    )
+
+
+def time_steps(particle_filter, num_particles, num_steps):
+    """Run predict/update/estimate steps and return the average time of a step in ms."""
+    rng = np.random.default_rng(0)
+    particle_filter.initialize(rng.standard_normal((num_particles, 4)))
+
+    started = time.perf_counter()
+    for step in range(num_steps):
+        particle_filter.predict(0.1)
+        particle_filter.update(np.array([0.1 * step, 0.0]) + 0.5 * rng.standard_normal(2))
+        particle_filter.estimate_state()
+    return (time.perf_counter() - started) / num_steps * 1000
+
+
+class TestParticleFilterThroughput(unittest.TestCase):
+    """Per-step cost of the vectorized filter against the per-particle filter."""
+
+    def test_vectorized_vs_per_particle(self):
+        """Time filter steps at growing particle counts."""
+        print()
+        for num_particles in (1000, 10000, 100000):
+            vectorized_ms = time_steps(make_filter(True), num_particles, 10)
+            line = f"particles={num_particles:>6}: vectorized {vectorized_ms:8.2f} ms/step"
+
+            # The per-particle filter takes seconds per step at 100k particles
+            if num_particles <= 10000:
+                per_particle_ms = time_steps(make_filter(False), num_particles, 2)
+                line += f", per-particle {per_particle_ms:9.2f} ms/step ({per_particle_ms / vectorized_ms:.0f}x)"
+                self.assertLess(vectorized_ms, per_particle_ms)
+
+            print(line)
+
+
+if __name__ == "__main__":
+    unittest.main()
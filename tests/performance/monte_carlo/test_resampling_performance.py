@@ -0,0 +1,62 @@
+"""Performance tests for the resampling schemes."""
+
+import os
+import time
+import unittest
+
+import numpy as np
+
+from augment_adam.monte_carlo.particle_filter import (
+    gather_in_place,
+    multinomial_indices,
+    systematic_indices,
+    stratified_indices,
+    residual_indices,
+)
+
+
+def best_time(function, repeats=3):
+    """Get the best wall-clock time of a function in seconds."""
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+class TestResamplingThroughput(unittest.TestCase):
+    """Particles per second of each scheme, single-threaded and chunked."""
+
+    def test_scheme_throughput(self):
+        """Time every scheme at growing particle counts."""
+        workers = min(4, os.cpu_count() or 1)
+        print()
+        for num_particles in (10000, 100000, 1000000, 4000000):
+            weights = np.random.default_rng(0).gamma(0.5, size=num_particles)
+            weights /= weights.sum()
+            for scheme in (multinomial_indices, systematic_indices, stratified_indices, residual_indices):
+                single = best_time(lambda: scheme(weights))
+                chunked = best_time(lambda: scheme(weights, num_workers=workers))
+                print(
+                    f"N={num_particles:>7} {scheme.__name__:<20}: "
+                    f"{num_particles / single / 1e6:6.1f} M/s, "
+                    f"{workers} workers {num_particles / chunked / 1e6:6.1f} M/s"
+                )
+
+    def test_gather_in_place(self):
+        """Time the in-place gather against a copying gather of a state matrix."""
+        print()
+        rng = np.random.default_rng(0)
+        for num_particles in (100000, 1000000):
+            states = rng.standard_normal((num_particles, 8))
+            weights = rng.random(num_particles)
+            indices = systematic_indices(weights / weights.sum())
+
+            copying = best_time(lambda: states[indices])
+            in_place = best_time(lambda: gather_in_place(states.copy(), indices)) - best_time(lambda: states.copy())
+            print(f"N={num_particles:>7} gather: copying {copying * 1000:6.2f} ms, in place {in_place * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Load tests for the API server's scheduling.
+
+Concurrent clients call the generate endpoint of a stub model whose calls
+block like a real model: a fixed cost per call plus a smaller cost per
+prompt. The test reports latency percentiles and throughput with and
+without micro-batching.
+"""
+
+import asyncio
+import statistics
+import time
+import unittest
+
+import httpx
+
+from augment_adam.server import api
+from augment_adam.server.scheduler import ModelScheduler
+
+
+MODEL_ID = "stub_load"
+CLIENTS = 32
+REQUESTS = 256
+
+
+class StubModel:
+    """Model that sleeps for a fixed time per call and a smaller time per prompt."""
+
+    call_cost = 0.02
+    prompt_cost = 0.002
+    local_token_count = True
+
+    def generate(self, prompt, **params):
+        time.sleep(self.call_cost + self.prompt_cost)
+        return f"reply to {prompt}"
+
+    def generate_batch(self, prompts, **params):
+        time.sleep(self.call_cost + self.prompt_cost * len(prompts))
+        return [f"reply to {prompt}" for prompt in prompts]
+
+    def get_token_count(self, text):
+        return len(text.split())
+
+    def get_model_info(self):
+        return {"name": "stub", "type": "stub", "provider": "stub"}
+
+
+class TestAPILoad(unittest.IsolatedAsyncioTestCase):
+    """Latency and throughput of the generate endpoint under concurrent load."""
+
+    def setUp(self):
+        """Register the stub model."""
+        api.model_registry[MODEL_ID] = StubModel()
+
+    def tearDown(self):
+        """Remove the stub model and its scheduler."""
+        api.model_registry.pop(MODEL_ID, None)
+        scheduler = api.scheduler_registry.pop(MODEL_ID, None)
+        if scheduler:
+            scheduler.shutdown()
+
+    def use_scheduler(self, **settings):
+        """Replace the stub model's scheduler."""
+        old = api.scheduler_registry.pop(MODEL_ID, None)
+        if old:
+            old.shutdown()
+        api.scheduler_registry[MODEL_ID] = ModelScheduler(api.model_registry[MODEL_ID], **settings)
+
+    async def run_load(self, clients=CLIENTS, requests=REQUESTS):
+        """Send requests from concurrent clients.
+
+        Returns:
+            Tuple of (latencies of successful requests, status codes, seconds elapsed)
+        """
+        transport = httpx.ASGITransport(app=api.app)
+        latencies = []
+        statuses = []
+        queue = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+
+        async def client(http):
+            while not queue.empty():
+                i = queue.get_nowait()
+                started = time.perf_counter()
+                response = await http.post(f"/models/{MODEL_ID}/generate", json={"prompt": f"p{i}"})
+                statuses.append(response.status_code)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    self.assertIn("Retry-After", response.headers)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as http:
+            started = time.perf_counter()
+            await asyncio.gather(*(client(http) for _ in range(clients)))
+            elapsed = time.perf_counter() - started
+
+        return latencies, statuses, elapsed
+
+    def report(self, label, latencies, elapsed):
+        """Print latency percentiles and throughput, and return the throughput."""
+        percentiles = statistics.quantiles(latencies, n=100)
+        throughput = len(latencies) / elapsed
+        print(f"{label}: p50 {percentiles[49] * 1000:7.1f} ms, p99 {percentiles[98] * 1000:7.1f} ms, "
+              f"{throughput:7.1f} req/s")
+        return throughput
+
+    async def test_batching(self):
+        """Compare one call per request with micro-batches of up to 8 requests."""
+        print()
+        self.use_scheduler(max_workers=4, max_batch_size=1, max_pending=REQUESTS)
+        latencies, statuses, elapsed = await self.run_load()
+        self.assertEqual(set(statuses), {200})
+        unbatched = self.report("unbatched", latencies, elapsed)
+
+        self.use_scheduler(max_workers=4, max_batch_size=8, batch_window=0.005, max_pending=REQUESTS)
+        latencies, statuses, elapsed = await self.run_load()
+        self.assertEqual(set(statuses), {200})
+        batched = self.report("batched  ", latencies, elapsed)
+
+        self.assertGreater(batched, unbatched)
+
+    async def test_backpressure(self):
+        """Test that overload is rejected with 429 instead of queueing without bound."""
+        self.use_scheduler(max_workers=1, max_batch_size=1, max_pending=4)
+
+        latencies, statuses, _ = await self.run_load(clients=16, requests=64)
+
+        self.assertIn(429, statuses)
+        self.assertIn(200, statuses)
+        print(f"\nbackpressure: {statuses.count(429)} of {len(statuses)} requests rejected with 429")
+
+
+if __name__ == "__main__":
+    unittest.main()
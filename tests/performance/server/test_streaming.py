@@ -0,0 +1,194 @@
+"""Time-to-first-token tests for the API server's streaming endpoints.
+
+The server runs with uvicorn on a local port, because an in-process ASGI
+transport buffers whole responses. The stub model streams one word per
+chunk with a fixed delay, so the blocking endpoint only answers after all
+of them.
+"""
+
+import asyncio
+import json
+import socket
+import statistics
+import threading
+import time
+import unittest
+
+import httpx
+import uvicorn
+
+from augment_adam.server import api
+
+
+MODEL_ID = "stub_stream"
+AGENT_ID = "stub_agent"
+CHUNKS = 20
+CHUNK_DELAY = 0.02
+
+
+class StubStreamingModel:
+    """Model that streams words (CHUNKS by default), CHUNK_DELAY seconds apart."""
+
+    local_token_count = True
+
+    def __init__(self):
+        self.chunks = CHUNKS
+        self.produced = 0
+
+    def generate(self, prompt, **params):
+        return "".join(self.generate_stream(prompt, **params))
+
+    def generate_stream(self, prompt, **params):
+        for i in range(self.chunks):
+            time.sleep(CHUNK_DELAY)
+            self.produced += 1
+            yield f"word{i} "
+
+    def get_token_count(self, text):
+        # Count like a subword tokenizer would: each word is two tokens
+        return 2 * len(text.split())
+
+    def get_model_info(self):
+        return {"name": "stub", "type": "stub", "provider": "stub"}
+
+
+class StubAgent:
+    """Agent that answers with the stub model, without streaming."""
+
+    name = "stub"
+    agent_type = "stub"
+    description = "stub"
+    model_id = MODEL_ID
+
+    def __init__(self, model):
+        self.model = model
+
+    def process(self, message):
+        return {"response": self.model.generate(message)}
+
+
+async def parse_events(lines):
+    """Parse server-sent event lines into (event, data) pairs."""
+    event = None
+    async for line in lines:
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            yield event, json.loads(line[len("data: "):])
+
+
+class TestStreamingLatency(unittest.IsolatedAsyncioTestCase):
+    """Time to first token of the streaming endpoints against the blocking ones."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the server in a background thread."""
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            cls.port = s.getsockname()[1]
+        cls.server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=cls.port, log_level="warning", lifespan="off"))
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        while not cls.server.started:
+            time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server."""
+        cls.server.should_exit = True
+        cls.thread.join()
+
+    def setUp(self):
+        """Register the stub model and agent."""
+        self.model = StubStreamingModel()
+        api.model_registry[MODEL_ID] = self.model
+        api.agent_registry[AGENT_ID] = StubAgent(self.model)
+
+    def tearDown(self):
+        """Remove the stub model, agent and scheduler."""
+        api.model_registry.pop(MODEL_ID, None)
+        api.agent_registry.pop(AGENT_ID, None)
+        scheduler = api.scheduler_registry.pop(MODEL_ID, None)
+        if scheduler:
+            scheduler.shutdown()
+
+    def client(self):
+        """Create a client for the server."""
+        return httpx.AsyncClient(base_url=f"http://127.0.0.1:{self.port}", timeout=30)
+
+    async def stream(self, http, path, body):
+        """Stream an endpoint.
+
+        Returns:
+            Tuple of (seconds to the first chunk, seconds to the end, events)
+        """
+        started = time.perf_counter()
+        first_chunk = None
+        events = []
+        async with http.stream("POST", path, json=body) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["content-type"].split(";")[0], "text/event-stream")
+            async for event in parse_events(response.aiter_lines()):
+                if event[0] == "chunk" and first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                events.append(event)
+        return first_chunk, time.perf_counter() - started, events
+
+    async def test_time_to_first_token(self):
+        """Compare the time to the first chunk with the time of the blocking endpoint."""
+        async with self.client() as http:
+            blocking = []
+            streamed = []
+            for _ in range(5):
+                started = time.perf_counter()
+                response = await http.post(f"/models/{MODEL_ID}/generate", json={"prompt": "p"})
+                blocking.append(time.perf_counter() - started)
+                self.assertEqual(response.json()["usage"]["completion_tokens"], 2 * CHUNKS)
+
+                first_chunk, _, events = await self.stream(http, f"/models/{MODEL_ID}/generate/stream", {"prompt": "p"})
+                streamed.append(first_chunk)
+
+        print(f"\nblocking response {statistics.median(blocking) * 1000:.1f} ms, "
+              f"streamed first token {statistics.median(streamed) * 1000:.1f} ms")
+        self.assertLess(statistics.median(streamed) * 4, statistics.median(blocking))
+
+        chunks = [data["text"] for event, data in events if event == "chunk"]
+        self.assertEqual(len(chunks), CHUNKS)
+        self.assertEqual(events[-1][0], "done")
+        self.assertEqual(events[-1][1]["usage"], {
+            "prompt_tokens": 2,
+            "completion_tokens": 2 * CHUNKS,
+            "total_tokens": 2 + 2 * CHUNKS
+        })
+
+    async def test_disconnect_cancels_generation(self):
+        """Test that a client that leaves after the first chunk stops the model."""
+        self.model.chunks = 10 * CHUNKS
+
+        async with self.client() as http:
+            async with http.stream("POST", f"/models/{MODEL_ID}/generate/stream", json={"prompt": "p"}) as response:
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        break
+
+        await asyncio.sleep(10 * CHUNK_DELAY)
+        produced = self.model.produced
+        await asyncio.sleep(10 * CHUNK_DELAY)
+
+        self.assertLess(produced, CHUNKS)
+        self.assertEqual(self.model.produced, produced)
+        self.assertEqual(api.scheduler_registry[MODEL_ID].streams, 0)
+
+    async def test_agent_chat_stream(self):
+        """Test that an agent without process_stream sends its response as one chunk."""
+        async with self.client() as http:
+            _, _, events = await self.stream(http, f"/agents/{AGENT_ID}/chat/stream", {
+                "messages": [{"role": "user", "content": "hello there"}]
+            })
+
+        self.assertEqual([event for event, _ in events], ["chunk", "done"])
+        self.assertEqual(events[-1][1]["usage"]["prompt_tokens"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit tests for the regex and grammar automata."""
+
+import random
+import re
+import unittest
+
+from augment_adam.ai_agent.smc.automaton import (
+    DEAD, UnsupportedPatternError, compile_regex, compile_grammar, expand_grammar
+)
+
+
+class TestDFA(unittest.TestCase):
+    """Tests for the DFA class."""
+
+    def test_fullmatch_agrees_with_re(self):
+        """Test that the DFA accepts exactly what re.fullmatch accepts."""
+        patterns = [
+            r"(foo|bar)+baz",
+            r"[a-c]{2,3}x?",
+            r"\d+(\.\d*)?",
+            r"[^abc]*c",
+            r"a{,2}b",
+            r"x(?:y|z)*?",
+            r"[\w-]+@\w+\.com",
+            r".*\(\w+, \d{4}\).*",
+        ]
+        alphabet = "abcfoorxyz.@-_(),1 2\né"
+        rng = random.Random(0)
+
+        for pattern in patterns:
+            automaton = compile_regex(pattern)
+            regex = re.compile(pattern)
+            for _ in range(500):
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+                self.assertEqual(automaton.fullmatch(text), bool(regex.fullmatch(text)), (pattern, text))
+
+    def test_scan_stops_in_dead_state(self):
+        """Test that scanning stops at the first character with no way to a match."""
+        automaton = compile_regex(r"ab*c")
+
+        state, previous, accepted = automaton.scan(automaton.start, "abbxbc")
+
+        self.assertEqual(state, DEAD)
+        self.assertEqual(previous, DEAD)
+        self.assertFalse(accepted)
+
+    def test_scan_is_resumable(self):
+        """Test that scanning in pieces reaches the same state as scanning at once."""
+        automaton = compile_regex(r"(ab)*c")
+
+        state = automaton.scan(automaton.start, "aba")[0]
+        state, _, accepted = automaton.scan(state, "bc")
+
+        self.assertEqual(state, automaton.scan(automaton.start, "ababc")[0])
+        self.assertTrue(accepted)
+        self.assertTrue(automaton.accepting[state])
+
+    def test_allowed_characters(self):
+        """Test the characters that keep a prefix viable."""
+        automaton = compile_regex(r"[0-9]+(px|em)")
+
+        state = automaton.scan(automaton.start, "12")[0]
+
+        self.assertEqual(automaton.allowed_characters(state), ((ord("0"), ord("9")), (ord("e"), ord("e")), (ord("p"), ord("p"))))
+        self.assertEqual(automaton.allowed_characters(DEAD), ())
+
+    def test_anchors(self):
+        """Test a leading "^" and a trailing "$"."""
+        automaton = compile_regex(r"^ab$")
+
+        self.assertTrue(automaton.anchored_end)
+        self.assertTrue(automaton.fullmatch("ab"))
+
+    def test_unsupported_patterns(self):
+        """Test that non-regular constructs are rejected."""
+        for pattern in [r"(a)\1", r"a(?=b)", r"\bword", r"a|b$", r"(?i)a", r"a$b"]:
+            with self.assertRaises(UnsupportedPatternError):
+                compile_regex(pattern)
+
+
+class TestGrammar(unittest.TestCase):
+    """Tests for regular grammar compilation."""
+
+    def test_compile_grammar(self):
+        """Test that rule references are expanded."""
+        rules = {
+            "start": r"<call>(; <call>)*",
+            "call": r"<name>\((<name>(, <name>)*)?\)",
+            "name": r"[a-z_]+",
+        }
+
+        automaton = compile_grammar(rules)
+
+        self.assertTrue(automaton.fullmatch("f(); g(x, y)"))
+        self.assertFalse(automaton.fullmatch("f(x,)"))
+
+    def test_recursive_grammar(self):
+        """Test that recursive rules are rejected."""
+        with self.assertRaises(UnsupportedPatternError):
+            expand_grammar({"start": r"\(<start>?\)"})
+
+    def test_unknown_rule(self):
+        """Test that references to missing rules are rejected."""
+        with self.assertRaises(UnsupportedPatternError):
+            compile_grammar({"start": r"<missing>"})
+
+
+if __name__ == '__main__':
+    unittest.main()
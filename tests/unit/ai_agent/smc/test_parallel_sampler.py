@@ -0,0 +1,149 @@
+"""Unit tests for the ParallelSequentialMonteCarlo class."""
+
+import unittest
+
+from augment_adam.ai_agent.smc.parallel_sampler import (
+    ParallelSequentialMonteCarlo, TokenCodec, decode_batch
+)
+from augment_adam.ai_agent.smc.potential import Potential, RegexPotential
+
+
+class CountingModel:
+    """Deterministic stub model that always continues with one character."""
+
+    def __init__(self, token="x"):
+        """Initialize the stub model."""
+        self.token = token
+
+    def generate(self, prompt, max_tokens=1, temperature=0.8, stop=None):
+        """Continue the prompt with the model's token."""
+        return prompt + self.token
+
+
+def load_model():
+    """Load the stub model in a worker (module level so it can be pickled)."""
+    return CountingModel("y")
+
+
+class HalfPotential(Potential):
+    """Efficient potential that halves every weight."""
+
+    def evaluate(self, sequence):
+        """Return 0.5."""
+        return 0.5
+
+
+class TestTokenCodec(unittest.TestCase):
+    """Tests for the TokenCodec class."""
+
+    def test_round_trip(self):
+        """Test encoding and decoding single- and multi-character tokens."""
+        codec = TokenCodec()
+        sequences = [list("ab") + ["<s>"], [], ["é", "<s>", "</s>"]]
+
+        ids, offsets, table = codec.encode_batch(sequences)
+
+        self.assertEqual(ids.dtype.itemsize, 4)
+        self.assertEqual(offsets.tolist(), [0, 3, 3, 6])
+        self.assertEqual(ids[0], ord("a"))
+        self.assertEqual(sorted(table.values()), ["</s>", "<s>"])
+        self.assertEqual(decode_batch(ids, offsets, table), sequences)
+
+    def test_table_only_holds_used_tokens(self):
+        """Test that a batch only carries the multi-character tokens it uses."""
+        codec = TokenCodec()
+        codec.encode_batch([["<s>"]])
+
+        _, _, table = codec.encode_batch([list("plain")])
+
+        self.assertEqual(table, {})
+
+
+class TestParallelSequentialMonteCarlo(unittest.TestCase):
+    """Tests for the ParallelSequentialMonteCarlo class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sampler = ParallelSequentialMonteCarlo(
+            num_particles=8,
+            potentials=[HalfPotential(name="half"), RegexPotential(pattern=r".*")],
+            model=CountingModel(),
+            num_workers=2
+        )
+
+    def tearDown(self):
+        """Shut down the worker pool."""
+        self.sampler.close()
+
+    def test_pool_is_reused_between_steps(self):
+        """Test that extension and reweighting share one long-lived pool."""
+        self.sampler.initialize_particles("Hi")
+
+        self.sampler.extend_particles(num_candidates=1)
+        executor = self.sampler._executor
+        self.sampler.reweight_particles()
+        self.sampler.extend_particles(num_candidates=1)
+
+        self.assertIsNotNone(executor)
+        self.assertIs(self.sampler._executor, executor)
+        for particle in self.sampler.particles:
+            self.assertEqual(particle.sequence, list("Hixx"))
+
+    def test_reweight_in_workers(self):
+        """Test that the workers evaluate the efficient potentials."""
+        self.sampler.initialize_particles("Hi")
+
+        self.sampler.reweight_particles()
+
+        for particle in self.sampler.particles:
+            self.assertAlmostEqual(particle.weight, 1.0 / 8)
+            self.assertAlmostEqual(particle.log_weight, 0.5)
+
+    def test_context_manager_shuts_down_pool(self):
+        """Test that leaving the with block shuts the pool down."""
+        with self.sampler as sampler:
+            sampler.initialize_particles("Hi")
+            sampler.extend_particles(num_candidates=1)
+            self.assertIsNotNone(sampler._executor)
+
+        self.assertIsNone(self.sampler._executor)
+
+    def test_non_persistent_pool(self):
+        """Test that a non-persistent sampler shuts the pool down after each step."""
+        self.sampler.persistent = False
+        self.sampler.initialize_particles("Hi")
+
+        self.sampler.extend_particles(num_candidates=1)
+
+        self.assertIsNone(self.sampler._executor)
+        self.assertEqual(len(self.sampler.particles), 8)
+
+    def test_model_factory(self):
+        """Test that workers load the model from the factory."""
+        sampler = ParallelSequentialMonteCarlo(
+            num_particles=4,
+            potentials=[HalfPotential()],
+            model=CountingModel(),
+            num_workers=2,
+            model_factory=load_model
+        )
+
+        with sampler:
+            sampler.initialize_particles("Hi")
+            sampler.extend_particles(num_candidates=2)
+
+        for particle in sampler.particles:
+            self.assertEqual(particle.sequence, list("Hiy"))
+
+    def test_update_potentials_restarts_pool(self):
+        """Test that updating the potentials shuts down the pool holding the old ones."""
+        self.sampler.initialize_particles("Hi")
+        self.sampler.reweight_particles()
+
+        self.sampler.update_potentials([RegexPotential(pattern=r".*")])
+
+        self.assertIsNone(self.sampler._executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
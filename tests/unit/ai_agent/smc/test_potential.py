@@ -3,6 +3,7 @@
 import unittest
 from unittest.mock import MagicMock
 
+from augment_adam.ai_agent.smc.particle import Particle
 from augment_adam.ai_agent.smc.potential import (
     Potential, GrammarPotential, SemanticPotential, RegexPotential
 )
@@ -64,6 +65,42 @@ class TestGrammarPotential(unittest.TestCase):
         self.assertTrue(self.potential.is_efficient())
 
 
+class TestCompiledGrammarPotential(unittest.TestCase):
+    """Tests for the GrammarPotential class with a regular grammar."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.potential = GrammarPotential(
+            grammar={"start": r"<item>(,<item>)*", "item": r"[0-9]+"},
+            name="grammar_potential"
+        )
+    
+    def test_evaluate_prefixes(self):
+        """Test that viable prefixes are valid and others are not."""
+        self.assertEqual(self.potential.evaluate(["12", ","]), 1.0)
+        self.assertEqual(self.potential.evaluate(["12", ",,"]), 0.0)
+    
+    def test_evaluate_particle_incrementally(self):
+        """Test that extending a particle only advances over the new tokens."""
+        particle = Particle(sequence=["1"])
+        self.assertEqual(self.potential.evaluate_particle(particle), 1.0)
+        
+        extended = particle.extend(",")
+        self.assertEqual(self.potential.evaluate_particle(extended), 1.0)
+        self.assertFalse(self.potential.is_complete(extended))
+        
+        self.assertEqual(self.potential.evaluate_particle(extended.extend("x")), 0.0)
+        self.assertTrue(self.potential.is_complete(extended.extend("2")))
+        self.assertTrue(self.potential.is_incremental())
+    
+    def test_mask_tokens(self):
+        """Test masking candidate tokens for the next step."""
+        particle = Particle(sequence=list("1,"))
+        
+        self.assertEqual(self.potential.mask_tokens(particle, ["2", ",", "34", "5,6", "a"]), [True, False, True, True, False])
+        self.assertEqual(self.potential.allowed_characters(particle), ((ord("0"), ord("9")),))
+
+
 class TestSemanticPotential(unittest.TestCase):
     """Tests for the SemanticPotential class."""
 
@@ -123,6 +160,24 @@ class TestRegexPotential(unittest.TestCase):
         
         # The sequence doesn't match the pattern, so the potential should return 0.0
         self.assertEqual(self.potential.evaluate(sequence), 0.0)
+    
+    def test_evaluate_particle_agrees_with_evaluate(self):
+        """Test that incremental evaluation matches re.match on every prefix."""
+        for pattern in [r"Hello.*", r"[a-z]+\.$", r"(ab)+c", r"a(?=b)"]:
+            potential = RegexPotential(pattern=pattern)
+            particle = Particle(sequence=[])
+            for token in ["ab", "ab", "c", ".", "\n", "x"]:
+                particle = particle.extend(token)
+                self.assertEqual(
+                    potential.evaluate_particle(particle),
+                    potential.evaluate(particle.sequence),
+                    (pattern, particle.sequence)
+                )
+    
+    def test_is_incremental(self):
+        """Test that only supported patterns are evaluated incrementally."""
+        self.assertTrue(self.potential.is_incremental())
+        self.assertFalse(RegexPotential(pattern=r"(a)\1").is_incremental())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,247 @@
+"""
+Unit tests for the context cache tiers.
+
+This module contains tests for the LRU and ARC caches, their TTL expiry, and
+the cache tier of HybridStorage.
+"""
+
+import random
+import unittest
+
+from augment_adam.context.core.base import Context
+from augment_adam.context.storage.base import ContextStorage, HybridStorage
+from augment_adam.context.storage.cache import (
+    ARCCache,
+    CONTEXT_OVERHEAD,
+    LRUCache,
+    create_cache,
+    estimate_size,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Get the current time."""
+        return self.now
+
+
+class DictStorage(ContextStorage):
+    """Dictionary-backed storage backend that counts retrievals."""
+
+    def __init__(self):
+        """Initialize the storage backend."""
+        super().__init__("dict")
+        self.contexts = {}
+        self.retrievals = 0
+
+    def store_context(self, context):
+        self.contexts[context.id] = context
+        return True
+
+    def retrieve_context(self, context_id):
+        self.retrievals += 1
+        return self.contexts.get(context_id)
+
+    def update_context(self, context):
+        return self.store_context(context)
+
+    def delete_context(self, context_id):
+        return self.contexts.pop(context_id, None) is not None
+
+    def search_contexts(self, query, limit=10, **kwargs):
+        return list(self.contexts.values())[:limit]
+
+
+def make_context(i, length=100):
+    """Create a context whose estimated size is CONTEXT_OVERHEAD + length."""
+    return Context(id=f"c{i}", content="x" * length)
+
+
+class TestLRUCache(unittest.TestCase):
+    """Tests for LRUCache."""
+
+    def test_byte_bound_and_recency(self):
+        """Test that the least recently used contexts are evicted to stay within the bound."""
+        size = estimate_size(make_context(0))
+        cache = LRUCache(max_bytes=3 * size)
+        for i in range(3):
+            cache.put(make_context(i))
+        self.assertIsNotNone(cache.get("c0"))
+
+        cache.put(make_context(3))
+        self.assertEqual(sorted(cache.keys()), ["c0", "c2", "c3"])
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 0, 1))
+        self.assertEqual(stats["bytes"], 3 * size)
+
+    def test_returns_cached_object(self):
+        """Test that hits return the cached object without rebuilding it."""
+        cache = LRUCache()
+        context = make_context(0)
+        cache.put(context)
+        self.assertIs(cache.get("c0"), context)
+
+    def test_oversized_context_is_not_cached(self):
+        """Test that a context larger than the bound is not cached."""
+        cache = LRUCache(max_bytes=CONTEXT_OVERHEAD + 10)
+        cache.put(make_context(0, length=5))
+        cache.put(make_context(0, length=50))
+        self.assertNotIn("c0", cache)
+        self.assertEqual(cache.size, 0)
+
+    def test_ttl(self):
+        """Test lazy expiry on lookup and expiry through the timer wheel on writes."""
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.put(make_context(0))
+        cache.put(make_context(1))
+
+        clock.now = 11
+        self.assertIsNone(cache.get("c0"))
+
+        cache.put(make_context(2))
+        self.assertNotIn("c1", cache)
+        self.assertIn("c2", cache)
+        self.assertEqual(cache.stats()["expirations"], 2)
+
+
+class TestCacheTTL(unittest.TestCase):
+    """Tests for TTL expiry in both cache policies."""
+
+    def test_random_operations_match_deadlines(self):
+        """Test that lookups hit exactly the contexts written less than ttl ago."""
+        for cache_class in [LRUCache, ARCCache]:
+            with self.subTest(cache_class.__name__):
+                rng = random.Random(0)
+                clock = FakeClock()
+                cache = cache_class(max_bytes=10 ** 6, ttl=10, clock=clock)
+                written = {}
+
+                for step in range(3000):
+                    i = rng.randrange(50)
+                    operation = rng.random()
+                    if operation < 0.4:
+                        cache.put(make_context(i))
+                        written[i] = clock.now
+                    elif operation < 0.8:
+                        expected = i in written and clock.now < written[i] + 10
+                        self.assertEqual(cache.get(f"c{i}") is not None, expected, step)
+                        if not expected:
+                            written.pop(i, None)
+                    else:
+                        clock.now += rng.choice([0.1, 0.5, 2, 7, 15])
+
+                    self.assertLessEqual(len(cache.keys()), len(written))
+
+    def test_rewrite_renews_ttl(self):
+        """Test that writing a context again restarts its TTL."""
+        clock = FakeClock()
+        cache = ARCCache(ttl=10, clock=clock)
+        cache.put(make_context(0))
+        cache.put(make_context(1))
+
+        clock.now = 8
+        cache.put(make_context(0))
+
+        clock.now = 12
+        self.assertIsNotNone(cache.get("c0"))
+        self.assertIsNone(cache.get("c1"))
+
+        clock.now = 19
+        cache.put(make_context(2))
+        self.assertNotIn("c0", cache)
+        self.assertEqual(cache.stats()["expirations"], 2)
+
+
+class TestARCCache(unittest.TestCase):
+    """Tests for ARCCache."""
+
+    def test_scan_resistance(self):
+        """Test that a one-off scan doesn't flush frequently used contexts."""
+        size = estimate_size(make_context(0))
+        cache = ARCCache(max_bytes=10 * size)
+
+        for _ in range(3):
+            for i in range(5):
+                if cache.get(f"c{i}") is None:
+                    cache.put(make_context(i))
+
+        for i in range(100, 200):
+            cache.put(make_context(i))
+
+        for i in range(5):
+            self.assertIn(f"c{i}", cache)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_ghost_hit_adapts_target(self):
+        """Test that a hit on the recency ghost list grows the T1 target."""
+        size = estimate_size(make_context(0))
+        cache = ARCCache(max_bytes=4 * size)
+        for i in range(4):
+            cache.put(make_context(i))
+        cache.get("c2")
+        cache.get("c3")
+        cache.put(make_context(4))
+        self.assertNotIn("c0", cache)
+
+        cache.put(make_context(0))
+        self.assertGreater(cache.target, 0)
+        self.assertIn("c0", cache)
+
+    def test_matches_accounting_under_random_load(self):
+        """Test that byte accounting stays consistent under random operations."""
+        rng = random.Random(0)
+        cache = ARCCache(max_bytes=20000)
+        for _ in range(2000):
+            i = rng.randrange(100)
+            operation = rng.random()
+            if operation < 0.5:
+                cache.get(f"c{i}")
+            elif operation < 0.9:
+                cache.put(make_context(i, length=rng.randrange(2000)))
+            else:
+                cache.remove(f"c{i}")
+
+            self.assertLessEqual(cache.size, cache.max_bytes)
+            self.assertEqual(cache.size, sum(estimate_size(cache._lookup(key)) for key in cache.keys()))
+
+    def test_create_cache(self):
+        """Test creating caches by policy name."""
+        self.assertIsInstance(create_cache("arc"), ARCCache)
+        with self.assertRaises(ValueError):
+            create_cache("fifo")
+
+
+class TestHybridStorageCache(unittest.TestCase):
+    """Tests for the cache tier of HybridStorage."""
+
+    def test_cache_tier(self):
+        """Test that retrievals are served from the cache tier."""
+        primary = DictStorage()
+        storage = HybridStorage(primary_storage=primary, cache_policy="arc", cache_max_bytes=10 ** 6)
+        context = make_context(0)
+        storage.store_context(context)
+
+        self.assertIs(storage.retrieve_context("c0"), context)
+        self.assertIs(storage.retrieve_context("c0"), context)
+        self.assertEqual(primary.retrievals, 0)
+
+        storage.delete_context("c0")
+        self.assertIsNone(storage.retrieve_context("c0"))
+        self.assertEqual(primary.retrievals, 1)
+
+        stats = storage.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertEqual(stats["policy"], "ARCCache")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the Redis context storage backend.
+
+This module contains tests for RedisStorage against an in-process fakeredis
+server, covering batch operations, index maintenance and filtered search.
+"""
+
+import unittest
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from augment_adam.context.core.base import Context, ContextType
+from augment_adam.context.storage.base import RedisStorage
+
+
+class TestRedisStorage(unittest.TestCase):
+    """Tests for RedisStorage."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = fakeredis.FakeRedis()
+        self.storage = RedisStorage(redis_client=self.client, scan_count=7)
+        self.contexts = [
+            Context(
+                id=f"c{i}",
+                content=f"content {i}",
+                context_type=ContextType.TEXT if i % 2 else ContextType.CODE,
+                source="docs" if i % 3 == 0 else "web",
+                tags=["a"] if i % 4 == 0 else ["b"],
+                importance=i / 30,
+            )
+            for i in range(30)
+        ]
+        self.assertTrue(self.storage.add_contexts(self.contexts))
+
+    def ids(self, contexts):
+        """Get the sorted IDs of some contexts."""
+        return sorted(context.id for context in contexts)
+
+    def test_get_contexts(self):
+        """Test retrieving contexts in one batch."""
+        contexts = self.storage.get_contexts(["c3", "missing", "c7"])
+        self.assertEqual([context.id if context else None for context in contexts], ["c3", None, "c7"])
+        self.assertEqual(self.storage.retrieve_context("c5").content, "content 5")
+
+    def test_search_without_filters(self):
+        """Test that an unfiltered search walks every context with SCAN."""
+        results = self.storage.search_contexts("", limit=100)
+        self.assertEqual(self.ids(results), self.ids(self.contexts))
+
+        self.assertEqual(len(self.storage.search_contexts("", limit=5)), 5)
+
+        results = self.storage.search_contexts("", limit=100, min_importance=0.5)
+        self.assertEqual(self.ids(results), sorted(f"c{i}" for i in range(15, 30)))
+
+    def test_search_with_filters(self):
+        """Test filtered searches against the index sets."""
+        results = self.storage.search_contexts("", limit=100, context_type=ContextType.TEXT, source="docs")
+        self.assertEqual(self.ids(results), self.ids(c for c in self.contexts if c.context_type == ContextType.TEXT and c.source == "docs"))
+
+        results = self.storage.search_contexts("", limit=100, any_tags=["a", "missing"], source="web")
+        self.assertEqual(self.ids(results), self.ids(c for c in self.contexts if "a" in c.tags and c.source == "web"))
+
+        # The limit is filled even when some candidates are filtered out
+        results = self.storage.search_contexts("", limit=3, tags=["b"], min_importance=0.5)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(context.importance >= 0.5 for context in results))
+
+    def test_update_removes_stale_indices(self):
+        """Test that updating a context moves it between index sets."""
+        context = self.storage.retrieve_context("c0")
+        context.tags = ["z"]
+        context.source = None
+        self.assertTrue(self.storage.update_context(context))
+
+        self.assertFalse(self.client.sismember("context:tag:a", "c0"))
+        self.assertFalse(self.client.sismember("context:source:docs", "c0"))
+        self.assertTrue(self.client.sismember("context:tag:z", "c0"))
+        self.assertEqual(self.ids(self.storage.search_contexts("", tags=["z"])), ["c0"])
+
+    def test_delete_removes_indices(self):
+        """Test that deleting a context removes it from its index sets."""
+        self.assertTrue(self.storage.delete_context("c4"))
+        self.assertIsNone(self.storage.retrieve_context("c4"))
+        self.assertFalse(self.client.sismember("context:tag:a", "c4"))
+        self.assertFalse(self.client.sismember("context:type:CODE", "c4"))
+
+    def test_ttl(self):
+        """Test that contexts are stored with the configured TTL."""
+        storage = RedisStorage(redis_client=self.client, prefix="ttl:", ttl=60)
+        storage.store_context(Context(id="x", content="expiring"))
+        self.assertGreater(self.client.ttl("ttl:x"), 0)
+
+    def test_decoded_responses(self):
+        """Test a client that decodes responses to strings."""
+        storage = RedisStorage(redis_client=fakeredis.FakeRedis(decode_responses=True))
+        storage.add_contexts(self.contexts[:3])
+        self.assertEqual(self.ids(storage.search_contexts("", limit=10)), ["c0", "c1", "c2"])
+        self.assertEqual(self.ids(storage.search_contexts("", source="docs")), ["c0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
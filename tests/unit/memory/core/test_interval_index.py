@@ -0,0 +1,164 @@
+"""
+Unit tests for the interval index.
+
+This module contains tests for IntervalIndex and for the time-range queries
+of the episodic memory system that use it.
+"""
+
+import random
+import datetime
+import unittest
+
+from augment_adam.memory.core.interval_index import IntervalIndex
+from augment_adam.memory.episodic.base import EpisodicMemory, Episode, Event
+
+
+def timestamp(minutes):
+    """Get an ISO timestamp a number of minutes after a fixed origin."""
+    return (datetime.datetime(2024, 1, 1) + datetime.timedelta(minutes=minutes)).isoformat()
+
+
+class TestIntervalIndex(unittest.TestCase):
+    """Tests for overlap queries, updates and removals."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = random.Random(0)
+        self.index = IntervalIndex()
+        self.intervals = {}
+
+    def put(self, key, start, end):
+        """Add an interval to both the index and the reference dictionary."""
+        self.index.add(key, start, end)
+        self.intervals[key] = (start, end)
+
+    def drop(self, key):
+        """Remove an interval from both the index and the reference dictionary."""
+        self.index.remove(key)
+        del self.intervals[key]
+
+    def brute_force(self, start, end):
+        """Find overlapping intervals by scanning, in start order."""
+        keys = [
+            key for key, (low, high) in self.intervals.items()
+            if (start is None or high >= start) and (end is None or low <= end)
+        ]
+        return sorted(keys, key=lambda key: self.intervals[key][0])
+
+    def check_queries(self):
+        """Compare random overlap queries against a scan."""
+        for _ in range(50):
+            start = self.rng.choice([None, self.rng.randint(0, 1000)])
+            end = self.rng.choice([None, self.rng.randint(0, 1000)])
+            result = list(self.index.overlapping(start, end))
+
+            self.assertEqual(sorted(result), sorted(self.brute_force(start, end)))
+            self.assertEqual([self.intervals[key][0] for key in result], sorted(self.intervals[key][0] for key in result))
+
+    def test_in_order_and_out_of_order_adds(self):
+        """Test queries after appends and after out-of-order inserts."""
+        for i in range(200):
+            start = i * 5
+            self.put(f"k{i}", start, start + self.rng.randint(0, 100))
+        self.check_queries()
+
+        for i in range(200, 260):
+            start = self.rng.randint(0, 1000)
+            self.put(f"k{i}", start, start + self.rng.randint(0, 300))
+        self.check_queries()
+
+    def test_updates_and_removals(self):
+        """Test that replaced and removed intervals are never reported."""
+        for i in range(100):
+            self.put(f"k{i}", i * 10, i * 10 + 5)
+
+        for i in range(0, 100, 3):
+            self.drop(f"k{i}")
+        for i in range(1, 100, 3):
+            low, high = self.intervals[f"k{i}"]
+            self.put(f"k{i}", low, high + 400)
+        self.put("k2", 1, 2)
+
+        self.check_queries()
+        self.assertEqual(len(self.index), len(self.intervals))
+
+    def test_empty(self):
+        """Test queries on an empty index."""
+        self.assertEqual(list(self.index.overlapping(0, 10)), [])
+        self.index.add("a", 5, 6)
+        self.index.clear()
+        self.assertEqual(list(self.index.overlapping()), [])
+
+
+class TestEpisodicTimeRanges(unittest.TestCase):
+    """Tests for indexed time-range queries on episodes and events."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.memory = EpisodicMemory(name="episodic")
+        for i in range(10):
+            episode = Episode(id=f"e{i}", content=f"episode {i}")
+            self.memory.add(episode)
+            for minute in (i * 60, i * 60 + 30):
+                self.memory.add_event(episode.id, Event(id=f"e{i}-{minute}", timestamp=timestamp(minute)))
+
+    def test_episodes_in_range(self):
+        """Test that episodes overlapping a range are found in start order."""
+        self.memory.get_episodes_in_range()
+
+        episodes = self.memory.get_episodes_in_range(timestamp(150), timestamp(200))
+        self.assertEqual([episode.id for episode in episodes], ["e2", "e3"])
+
+        # Extending an episode through add_event updates the index
+        self.memory.add_event("e0", Event(id="late", timestamp=timestamp(175)))
+        episodes = self.memory.get_episodes_in_range(timestamp(150), timestamp(170))
+        self.assertEqual([episode.id for episode in episodes], ["e0", "e2"])
+
+        self.memory.remove_event("e0", "late")
+        self.memory.remove("e2")
+        self.assertEqual(self.memory.get_episodes_in_range(timestamp(150), timestamp(170)), [])
+
+    def test_events_in_range(self):
+        """Test that events are returned in timestamp order from a range."""
+        episode = self.memory.get("e3")
+        episode.add_event(Event(id="early", timestamp=timestamp(170)))
+
+        events = episode.get_events_in_range(timestamp(170), timestamp(200))
+        self.assertEqual([event.id for event in events], ["early", "e3-180"])
+
+        self.assertTrue(episode.remove_event("e3-180"))
+        self.assertEqual(episode.start_time, timestamp(170))
+        self.assertEqual(episode.end_time, timestamp(210))
+
+    def test_events_modified_directly(self):
+        """Test that replacing an event in the list directly rebuilds the sorted view."""
+        episode = self.memory.get("e3")
+        self.assertEqual(len(episode.get_events_in_range()), 2)
+
+        episode.events[0] = Event(id="moved", timestamp=timestamp(500))
+
+        events = episode.get_events_in_range(timestamp(170), None)
+        self.assertEqual([event.id for event in events], ["e3-210", "moved"])
+        self.assertTrue(episode.remove_event("moved"))
+        self.assertEqual([event.id for event in episode.get_events_in_range()], ["e3-210"])
+
+        episode.events = [Event(id="new", timestamp=timestamp(0))]
+        self.assertEqual([event.id for event in episode.get_events_in_range()], ["new"])
+
+    def test_streaming_events(self):
+        """Test iterating over events across episodes lazily."""
+        pairs = self.memory.iter_all_events_in_range(timestamp(100), None)
+
+        first_episode, first_event = next(pairs)
+        self.assertEqual((first_episode.id, first_event.id), ("e2", "e2-120"))
+        self.assertEqual(sum(1 for _ in pairs), 15)
+
+    def test_search_by_time_range(self):
+        """Test that dictionary queries use the interval index."""
+        results = self.memory.search({"start_time": timestamp(380)}, limit=2)
+
+        self.assertEqual([episode.id for episode in results], ["e6", "e7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Unit tests for the full-text index.
+
+This module contains tests for TextIndex and for the text search of the
+episodic, semantic and working memory systems that use it.
+"""
+
+import datetime
+import unittest
+
+from augment_adam.memory.core.text_index import TextIndex, tokenize
+from augment_adam.memory.episodic.base import EpisodicMemory, Episode, Event
+from augment_adam.memory.semantic.base import SemanticMemory, Concept
+from augment_adam.memory.working.base import WorkingMemory, WorkingMemoryItem
+
+
+class TestTextIndex(unittest.TestCase):
+    """Tests for the inverted index and BM25 ranking."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = TextIndex()
+        self.index.add("a", ["The cat sat on the mat"])
+        self.index.add("b", ["A dog chased the cat", "the cat ran"])
+        self.index.add("c", ["Dogs and birds"])
+
+    def test_tokenize(self):
+        """Test that tokens are lowercase words."""
+        self.assertEqual(tokenize("Hello, World! it's 2024"), ["hello", "world", "it", "s", "2024"])
+
+    def test_search_ranks_by_bm25(self):
+        """Test that rarer terms and higher term frequency rank higher."""
+        self.assertEqual([item_id for item_id, _ in self.index.search("cat")], ["b", "a"])
+        self.assertEqual(self.index.search("mat cat", limit=1)[0][0], "a")
+        self.assertEqual(self.index.search("elephant"), [])
+        self.assertEqual(self.index.search(""), [])
+
+    def test_search_without_bm25(self):
+        """Test ranking by raw term frequency."""
+        index = TextIndex(bm25=False)
+        index.add("a", ["cat"])
+        index.add("b", ["cat cat dog"])
+
+        self.assertEqual(index.search("cat dog"), [("b", 3.0), ("a", 1.0)])
+
+    def test_incremental_updates(self):
+        """Test that replacing and removing items updates the postings."""
+        self.index.add("a", ["birds only"])
+        self.index.remove("b")
+
+        self.assertEqual(self.index.search("cat"), [])
+        self.assertEqual({item_id for item_id, _ in self.index.search("birds")}, {"a", "c"})
+        self.assertNotIn("cat", self.index.postings)
+
+    def test_predicate(self):
+        """Test that the predicate is applied before the limit."""
+        results = self.index.search("cat", limit=1, predicate=lambda item_id: item_id != "b")
+
+        self.assertEqual([item_id for item_id, _ in results], ["a"])
+
+    def test_round_trip(self):
+        """Test that a restored index ranks like the original."""
+        restored = TextIndex.from_dict(self.index.to_dict())
+
+        self.assertEqual(restored.search("the cat dogs"), self.index.search("the cat dogs"))
+
+
+class TestMemoryTextSearch(unittest.TestCase):
+    """Tests for the indexed text search of episodic, semantic and working memory."""
+
+    def test_episodic_search(self):
+        """Test that episode and event content is indexed incrementally."""
+        memory = EpisodicMemory(name="episodic")
+        memory.add(Episode(id="e1", content="morning walk"))
+        memory.add(Episode(id="e2", content="lunch", events=[Event(id="v1", content="walk to the park")]))
+
+        self.assertEqual({episode.id for episode in memory.search("walk")}, {"e1", "e2"})
+
+        memory.add_event("e1", Event(id="v2", content="saw a heron"))
+        memory.remove_event("e2", "v1")
+        memory.update("e1", content="evening")
+
+        self.assertEqual([episode.id for episode in memory.search("heron walk")], ["e1"])
+        self.assertEqual(memory.search("morning"), [])
+
+        memory.remove("e1")
+        self.assertEqual(memory.search("heron"), [])
+
+    def test_semantic_search(self):
+        """Test that concept names, descriptions and examples are indexed."""
+        memory = SemanticMemory(name="semantic")
+        memory.add(Concept(id="c1", name="Dog", description="A domesticated canine"))
+        memory.add(Concept(id="c2", name="Wolf", description="A wild canine", examples=["grey wolf"]))
+
+        self.assertEqual([concept.id for concept in memory.search("wolf canine")], ["c2", "c1"])
+
+        memory.add_example("c1", "golden retriever")
+        self.assertEqual([concept.id for concept in memory.search("retriever")], ["c1"])
+
+        memory.remove_example("c1", "golden retriever")
+        self.assertEqual(memory.search("retriever"), [])
+
+    def test_working_search_skips_expired_and_evicted(self):
+        """Test that expired and evicted items are never returned."""
+        memory = WorkingMemory(name="working", capacity=2)
+        memory.add(WorkingMemoryItem(id="w1", content="draft the report", priority=1))
+        memory.add(WorkingMemoryItem(id="w2", content="review the report", priority=5))
+        memory.search("report")
+
+        memory.add(WorkingMemoryItem(id="w3", content="send the report", priority=9))
+        memory.items["w2"].expires_at = (datetime.datetime.now() - datetime.timedelta(seconds=1)).isoformat()
+        memory.items["w2"].ttl = 1
+
+        self.assertEqual([item.id for item in memory.search("report")], ["w3"])
+        self.assertNotIn("w1", memory.text_index)
+
+    def test_persistence(self):
+        """Test that the text index is saved and restored with the memory."""
+        memory = SemanticMemory(name="semantic")
+        memory.add(Concept(id="c1", name="Heron", description="A wading bird"))
+        memory.search("bird")
+
+        data = memory.to_dict()
+        restored = SemanticMemory.from_dict(data)
+
+        self.assertIn("text_index", data)
+        self.assertIsNotNone(restored._text_index)
+        self.assertEqual([concept.id for concept in restored.search("wading")], ["c1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
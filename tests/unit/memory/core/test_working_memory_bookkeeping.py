@@ -0,0 +1,95 @@
+"""
+Unit tests for the working memory bookkeeping.
+
+This module contains tests for the heap eviction, timing wheel expiry and
+hash indexes of the working memory system.
+"""
+
+import unittest
+from unittest import mock
+
+from augment_adam.memory.working.base import WorkingMemory, WorkingMemoryItem
+
+
+class TestWorkingMemoryBookkeeping(unittest.TestCase):
+    """Tests for eviction, expiry and hash-indexed lookups in WorkingMemory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.now = 1_000_000.0
+        patcher = mock.patch("augment_adam.memory.working.base.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_eviction_order(self):
+        """Test that the least important, least recently accessed item is evicted."""
+        memory = WorkingMemory("test", capacity=3)
+        for name in ["a", "b", "c"]:
+            memory.add(WorkingMemoryItem(id=name, content=name, priority=5))
+
+        # Touching "a" makes "b" the least recently accessed of the tied items
+        memory.get("a")
+        memory.add(WorkingMemoryItem(id="d", content="d", priority=5))
+        self.assertEqual(sorted(memory.items), ["a", "c", "d"])
+
+        # A priority change is picked up by the heap
+        memory.update_priority("d", 0)
+        memory.add(WorkingMemoryItem(id="e", content="e", priority=5))
+        self.assertEqual(sorted(memory.items), ["a", "c", "e"])
+
+        # Outdated heap entries are compacted
+        for _ in range(500):
+            memory.get("a")
+        self.assertLess(len(memory._heap), 2 * len(memory.items) + 65)
+
+    def test_expiry(self):
+        """Test that items are removed once their TTL passes, without a full scan."""
+        memory = WorkingMemory("test", cleanup_interval=10)
+        item = WorkingMemoryItem(id="short", content="x", created_at="2024-01-01T00:00:00", ttl=10)
+        expiry_time = WorkingMemory._expiry_time(item)
+        self.now = expiry_time - 5
+        memory.add(item)
+        memory.add(WorkingMemoryItem(id="forever", content="y"))
+        self.assertIn("short", memory._wheel)
+
+        # Nothing is collected until the cleanup interval has passed
+        self.now = expiry_time + 2
+        memory.get("forever")
+        self.assertIn("short", memory._wheel)
+
+        self.now = expiry_time + 20
+        memory.get("forever")
+        self.assertEqual(list(memory.items), ["forever"])
+        self.assertEqual(len(memory._wheel), 0)
+
+    def test_indexes_follow_mutations(self):
+        """Test that task, status and priority lookups follow every mutation."""
+        memory = WorkingMemory("test")
+        for i in range(20):
+            memory.add(WorkingMemoryItem(id=f"i{i}", content=str(i), task_id=f"t{i % 3}", priority=i % 5))
+
+        memory.update_status("i0", "completed")
+        memory.update_priority("i1", 9)
+        memory.remove("i2")
+
+        def scan(predicate):
+            return sorted(item_id for item_id, item in memory.items.items() if predicate(item))
+
+        self.assertEqual(sorted(item.id for item in memory.get_by_task("t0")), scan(lambda item: item.task_id == "t0"))
+        self.assertEqual([item.id for item in memory.get_by_status("completed")], ["i0"])
+        self.assertEqual(sorted(item.id for item in memory.get_by_status("active")), scan(lambda item: item.status == "active"))
+        self.assertEqual(
+            sorted(item.id for item in memory.get_by_priority(2, 9)),
+            scan(lambda item: 2 <= item.priority <= 9),
+        )
+        self.assertEqual(
+            sorted(item.id for item in memory.search({"task_id": "t1", "priority": 1}, limit=100)),
+            scan(lambda item: item.task_id == "t1" and item.priority == 1),
+        )
+
+        memory.clear()
+        self.assertEqual(memory.get_by_task("t0"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for the adjacency indexes of graph memory items.
+
+This module contains tests for neighbor and edge lookups, node removal and
+breadth-first traversal on GraphMemoryItem and GraphMemory.
+"""
+
+import random
+import unittest
+
+from augment_adam.memory.graph.base import GraphMemory, GraphMemoryItem, Node, Edge, Relationship
+
+
+class TestGraphAdjacency(unittest.TestCase):
+    """Tests for the adjacency maps of GraphMemoryItem."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = random.Random(0)
+        self.item = GraphMemoryItem(id="graph")
+        for i in range(30):
+            self.item.add_node(Node(id=f"n{i}"))
+        for i in range(120):
+            self.item.add_edge(Edge(id=f"e{i}", source_id=f"n{self.rng.randrange(30)}", target_id=f"n{self.rng.randrange(30)}"))
+
+    def scan_neighbors(self, node_id):
+        """Find neighbor IDs by scanning every edge, like the unindexed implementation."""
+        neighbors = []
+        for edge in self.item.edges.values():
+            if edge.source_id == node_id:
+                neighbors.append(edge.target_id)
+            elif edge.target_id == node_id:
+                neighbors.append(edge.source_id)
+        return sorted(neighbors)
+
+    def scan_edges_between(self, node1_id, node2_id):
+        """Find edge IDs between two nodes by scanning every edge."""
+        return sorted(
+            edge.id for edge in self.item.edges.values()
+            if {edge.source_id, edge.target_id} == {node1_id, node2_id}
+        )
+
+    def check_lookups(self):
+        """Compare indexed lookups against edge scans."""
+        for i in range(30):
+            node_id = f"n{i}"
+            if node_id not in self.item.nodes:
+                continue
+
+            self.assertEqual(sorted(node.id for node in self.item.get_neighbors(node_id)), self.scan_neighbors(node_id))
+            other = f"n{self.rng.randrange(30)}"
+            self.assertEqual(sorted(edge.id for edge in self.item.get_edges_between(node_id, other)), self.scan_edges_between(node_id, other))
+
+    def test_lookups_match_scan(self):
+        """Test neighbor and edge lookups, including self-loops and parallel edges."""
+        self.item.add_edge(Edge(id="loop", source_id="n1", target_id="n1"))
+        self.item.add_edge(Edge(id="parallel", source_id="n2", target_id="n3"))
+        self.item.add_edge(Edge(id="parallel2", source_id="n3", target_id="n2"))
+
+        self.check_lookups()
+        self.assertEqual([edge.id for edge in self.item.get_edges_between("n1", "n1")], ["loop"])
+
+    def test_remove_edge_and_node(self):
+        """Test that removals keep the adjacency maps in sync."""
+        for i in range(0, 120, 4):
+            self.item.remove_edge(f"e{i}")
+        self.item.add_edge(Edge(id="e1", source_id="n0", target_id="n29"))
+        self.assertTrue(self.item.remove_node("n5"))
+
+        self.check_lookups()
+        self.assertFalse(any("n5" in (edge.source_id, edge.target_id) for edge in self.item.edges.values()))
+
+    def test_direct_writes_are_detected(self):
+        """Test that edges written directly to the dictionary are picked up."""
+        self.item.get_neighbors("n0")
+        self.item.edges["direct"] = Edge(id="direct", source_id="n0", target_id="n29")
+
+        self.check_lookups()
+
+    def test_round_trip(self):
+        """Test that a restored item has working adjacency maps."""
+        restored = GraphMemoryItem.from_dict(self.item.to_dict())
+
+        self.assertEqual(sorted(node.id for node in restored.get_neighbors("n7")), self.scan_neighbors("n7"))
+
+
+class TestGraphTraversal(unittest.TestCase):
+    """Tests for breadth-first and k-hop traversal."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.memory = GraphMemory(name="graph_memory")
+        self.item = GraphMemoryItem(id="graph")
+        self.memory.add(self.item)
+
+        # a -> b -> c -> d, a -> e (IS_A), f isolated
+        for node_id in "abcdef":
+            self.memory.add_node("graph", Node(id=node_id))
+        for source_id, target_id in ("ab", "bc", "cd"):
+            self.memory.add_edge("graph", Edge(source_id=source_id, target_id=target_id))
+        self.memory.add_edge("graph", Edge(source_id="a", target_id="e", relationship=Relationship.IS_A))
+
+    def test_bfs_depths(self):
+        """Test that nodes are visited once at their shortest distance."""
+        self.memory.add_edge("graph", Edge(source_id="a", target_id="c"))
+
+        visited = {node.id: depth for node, depth in self.memory.bfs("graph", "a")}
+
+        self.assertEqual(visited, {"a": 0, "b": 1, "c": 1, "e": 1, "d": 2})
+
+    def test_k_hop_neighbors(self):
+        """Test k-hop neighborhoods with direction and relationship filters."""
+        self.assertEqual([node.id for node in self.memory.get_k_hop_neighbors("graph", "a", 2)], ["b", "e", "c"])
+        self.assertEqual([node.id for node in self.memory.get_k_hop_neighbors("graph", "c", 5, direction="in")], ["b", "a"])
+        self.assertEqual([node.id for node in self.memory.get_k_hop_neighbors("graph", "a", 3, relationships=["IS_A"])], ["e"])
+        self.assertEqual(self.memory.get_k_hop_neighbors("graph", "f", 3), [])
+        self.assertEqual(self.memory.get_k_hop_neighbors("missing", "a", 3), [])
+
+    def test_custom_relationship_names(self):
+        """Test that unknown relationship names follow custom relationships, as in Edge."""
+        self.memory.add_edge("graph", Edge(source_id="d", target_id="f", relationship="MENTORS"))
+
+        neighbors = self.memory.get_k_hop_neighbors("graph", "d", 1, relationships=["MENTORS"])
+
+        self.assertEqual([node.id for node in neighbors], ["f"])
+
+    def test_invalid_direction(self):
+        """Test that unsupported directions are rejected when bfs is called."""
+        with self.assertRaises(ValueError):
+            self.item.bfs("a", direction="sideways")
+        with self.assertRaises(ValueError):
+            self.memory.bfs("graph", "a", direction="sideways")
+        with self.assertRaises(ValueError):
+            self.memory.bfs("missing", "a", direction="sideways")
+
+
+if __name__ == "__main__":
+    unittest.main()
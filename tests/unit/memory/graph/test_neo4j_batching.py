@@ -0,0 +1,169 @@
+"""
+Unit tests for the batched write path of the Neo4j graph memory system.
+
+This module contains a mock Neo4j driver that records every statement, so the
+number of statements, sessions and round trips of a write can be checked
+without a live database.
+"""
+
+import random
+import unittest
+
+import pytest
+
+pytest.importorskip("neo4j")
+
+from augment_adam.memory.graph.base import GraphMemoryItem, Node, Edge
+from augment_adam.memory.graph.neo4j import Neo4jMemory
+
+
+class MockTransaction:
+    """Transaction that records statements in its driver."""
+
+    def __init__(self, driver):
+        """Initialize the transaction."""
+        self.driver = driver
+        self.committed = False
+
+    def run(self, query, **params):
+        """Record a statement as one round trip."""
+        self.driver.record(query, params)
+
+    def commit(self):
+        """Commit the transaction in one round trip."""
+        self.driver.round_trips += 1
+        self.committed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class MockSession:
+    """Session that records statements in its driver."""
+
+    def __init__(self, driver):
+        """Initialize the session."""
+        self.driver = driver
+
+    def run(self, query, **params):
+        """Record an auto-commit statement as one round trip."""
+        self.driver.record(query, params)
+
+    def begin_transaction(self):
+        """Begin an explicit transaction."""
+        self.driver.transactions.append(MockTransaction(self.driver))
+        return self.driver.transactions[-1]
+
+    def close(self):
+        """Close the session."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class MockDriver:
+    """Driver that counts sessions, transactions, statements and round trips."""
+
+    def __init__(self):
+        """Initialize the driver."""
+        self.statements = []
+        self.transactions = []
+        self.sessions = 0
+        self.round_trips = 0
+
+    def session(self):
+        """Open a session."""
+        self.sessions += 1
+        return MockSession(self)
+
+    def record(self, query, params):
+        """Record a statement."""
+        self.statements.append((query, params))
+        self.round_trips += 1
+
+    def reset(self):
+        """Forget the recorded statements."""
+        self.statements = []
+        self.transactions = []
+        self.sessions = 0
+        self.round_trips = 0
+
+    def close(self):
+        """Close the driver."""
+
+
+class TestNeo4jBatching(unittest.TestCase):
+    """Tests for the UNWIND-batched writes of Neo4jMemory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.driver = MockDriver()
+        self.memory = Neo4jMemory("test", "bolt://mock", "neo4j", "password", batch_size=100, driver=self.driver)
+        self.driver.reset()
+
+        rng = random.Random(0)
+        self.item = GraphMemoryItem(id="item", metadata={"source": "test", "version": 2})
+        for i in range(250):
+            labels = [["Person"], ["Place"], ["Person", "Author"]][i % 3]
+            self.item.nodes[f"n{i}"] = Node(id=f"n{i}", labels=labels, properties={"name": f"node {i}", f"key{i}": i})
+        for i in range(520):
+            self.item.edges[f"e{i}"] = Edge(id=f"e{i}", source_id=f"n{rng.randrange(250)}", target_id=f"n{rng.randrange(250)}")
+
+    def rows(self, fragment):
+        """Get the rows of every recorded statement that contains a fragment."""
+        return [row for query, params in self.driver.statements if fragment in query for row in params["rows"]]
+
+    def test_add_uses_batched_statements(self):
+        """Test that adding an item sends a handful of UNWIND statements in one transaction."""
+        self.memory.add(self.item)
+
+        # 1 item statement, 1 + 1 + 1 node statements (84/83/83 nodes per label set), 6 edge statements
+        self.assertEqual(len(self.driver.statements), 1 + 3 + 6)
+        self.assertEqual(self.driver.round_trips, len(self.driver.statements) + 1)
+        self.assertEqual(len(self.driver.transactions), 1)
+        self.assertTrue(self.driver.transactions[0].committed)
+
+        self.assertTrue(all(query.lstrip().startswith("UNWIND $rows AS row") for query, _ in self.driver.statements))
+        self.assertEqual(sorted(row["id"] for row in self.rows("MERGE (n:Node")), sorted(self.item.nodes))
+        self.assertEqual(sorted(row["id"] for row in self.rows("MERGE (s)-[r:EDGE")), sorted(self.item.edges))
+
+        item_row = self.rows("MERGE (i:Item")[0]
+        self.assertEqual(item_row["properties"]["source"], "test")
+        self.assertEqual(item_row["properties"]["version"], "2")
+
+    def test_statement_text_does_not_depend_on_values(self):
+        """Test that property keys and values are passed as parameters, not in the statement."""
+        self.memory.add(self.item)
+
+        queries = {query for query, _ in self.driver.statements}
+        self.assertEqual(len(queries), 1 + 3 + 1)
+        self.assertFalse(any("key1" in query for query in queries))
+        self.assertTrue(any(":`Author`:`Person`" in query for query in queries))
+
+    def test_session_is_reused(self):
+        """Test that writes reuse one session."""
+        self.memory.add(self.item)
+        self.memory.add(GraphMemoryItem(id="other"))
+        self.memory.add_node("other", Node(id="x", labels=["Thing"]))
+        self.memory.add_edge("other", Edge(id="y", source_id="x", target_id="x"))
+
+        self.assertEqual(self.driver.sessions, 1)
+
+    def test_add_many(self):
+        """Test that several items share one transaction and their statements."""
+        items = [GraphMemoryItem(id=f"item{i}", nodes={f"m{i}": Node(id=f"m{i}", labels=["Person"])}) for i in range(10)]
+        self.assertEqual(self.memory.add_many(items), [f"item{i}" for i in range(10)])
+
+        self.assertEqual(len(self.driver.transactions), 1)
+        self.assertEqual(len(self.driver.statements), 2)
+        self.assertEqual(len(self.memory.items), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
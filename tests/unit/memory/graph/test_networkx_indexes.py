@@ -0,0 +1,142 @@
+"""
+Unit tests for the node indexes of the NetworkX graph memory system.
+
+This module contains tests that compare indexed dictionary searches with a
+scan over every node, and tests for index maintenance, persistence and edge
+lookups by ID.
+"""
+
+import random
+import tempfile
+import unittest
+
+from augment_adam.memory.graph.base import GraphMemoryItem, Node, Edge
+from augment_adam.memory.graph.networkx import NetworkXMemory
+from augment_adam.memory.graph.node_index import NodeIndex
+
+
+class TestNetworkXIndexes(unittest.TestCase):
+    """Tests for indexed dictionary search in NetworkXMemory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = random.Random(0)
+        self.memory = NetworkXMemory("test", indexed_properties={"city": "hash", "age": "sorted"})
+        for i in range(40):
+            item = GraphMemoryItem(id=f"item{i}")
+            for j in range(5):
+                item.add_node(Node(
+                    id=f"n{j}",
+                    labels=[self.rng.choice(["Person", "Place", "Thing"])],
+                    properties={
+                        "city": self.rng.choice(["Paris", "Rome", "Oslo"]),
+                        "age": self.rng.randrange(100),
+                        "name": f"node {i}-{j}",
+                    },
+                ))
+            self.memory.add(item)
+
+    def scan(self, query):
+        """Find matching item IDs by checking every node."""
+        return [
+            item_id for item_id, item in self.memory.items.items()
+            if any(NodeIndex.matches(node, query) for node in item.nodes.values())
+        ]
+
+    def search_ids(self, query, limit=100):
+        """Run a dictionary search and return the item IDs."""
+        return [item.id for item in self.memory.search(query, limit=limit)]
+
+    def test_queries_match_scan(self):
+        """Test that indexed searches return the same items, in order, as a scan."""
+        queries = [
+            {"city": "Paris"},
+            {"city": {"$in": ["Rome", "Oslo"]}, "$label": "Person"},
+            {"age": {"$gte": 20, "$lt": 25}},
+            {"age": {"$gt": 90}, "city": "Oslo"},
+            {"age": 42},
+            {"$label": ["Thing"]},
+            {"name": "node 3-1"},
+            {"city": "Berlin"},
+        ]
+        for query in queries:
+            self.assertEqual(self.search_ids(query), self.scan(query), query)
+
+    def test_planner_picks_most_selective_index(self):
+        """Test that the planner picks the index with the fewest candidates."""
+        index = self.memory.node_index
+        self.assertEqual(index.plan({"$label": "Person", "age": {"$gte": 99}})[0], "age")
+        self.assertEqual(index.plan({"$label": "Person", "age": {"$gte": 0}})[0], "$label")
+        self.assertIsNone(index.plan({"name": "node 3-1"}))
+
+    def test_index_maintenance(self):
+        """Test that the index follows node and item changes."""
+        self.memory.search({"city": "Paris"})
+
+        self.memory.update_node("item0", "n0", labels=["Robot"], properties={"city": "Lima", "age": 500})
+        self.assertEqual(self.search_ids({"city": "Lima"}), ["item0"])
+        self.assertEqual(self.search_ids({"age": {"$gt": 400}, "$label": "Robot"}), ["item0"])
+
+        self.memory.add_node("item1", Node(id="extra", properties={"city": "Lima"}))
+        self.assertEqual(self.search_ids({"city": "Lima"}), ["item0", "item1"])
+
+        self.memory.remove_node("item0", "n0")
+        self.assertEqual(self.search_ids({"city": "Lima"}), ["item1"])
+
+        self.memory.remove("item1")
+        self.assertEqual(self.search_ids({"city": "Lima"}), [])
+
+        self.memory.clear()
+        self.assertEqual(self.search_ids({"city": "Paris"}), [])
+
+    def test_create_and_drop_index(self):
+        """Test creating and dropping an index on a populated memory."""
+        self.memory.search({"city": "Paris"})
+        self.memory.create_index("name")
+        self.assertEqual(self.memory.node_index.plan({"name": "node 3-1"}), ("name", 1))
+        self.assertEqual(self.search_ids({"name": "node 3-1"}), ["item3"])
+
+        self.memory.drop_index("name")
+        self.assertIsNone(self.memory.node_index.plan({"name": "node 3-1"}))
+
+        with self.assertRaises(ValueError):
+            self.memory.create_index("name", "tree")
+
+    def test_unsupported_operator(self):
+        """Test that unsupported query operators are rejected."""
+        with self.assertRaises(ValueError):
+            self.memory.search({"name": {"$regex": "node"}})
+
+    def test_dict_property_equality(self):
+        """Test that a dictionary without operator keys is compared for equality."""
+        self.memory.add_node("item2", Node(id="meta", properties={"meta": {"a": 1}, "city": {"name": "Lima"}}))
+
+        self.assertEqual(self.search_ids({"meta": {"a": 1}}), ["item2"])
+        self.assertEqual(self.search_ids({"city": {"name": "Lima"}}), ["item2"])
+        self.assertEqual(self.search_ids({"meta": {"a": 2}}), [])
+
+    def test_save_and_load(self):
+        """Test that index definitions survive a save and load."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.memory.save(directory)
+            loaded = NetworkXMemory.load(directory)
+
+        self.assertEqual(loaded.indexed_properties, {"city": "hash", "age": "sorted"})
+        query = {"age": {"$lte": 10}, "city": "Rome"}
+        self.assertEqual([item.id for item in loaded.search(query, limit=100)], self.scan(query))
+
+    def test_edge_lookup_by_id(self):
+        """Test that edges are updated and removed in the graph by ID."""
+        self.memory.add_edge("item0", Edge(id="e1", source_id="n0", target_id="n1"))
+        self.memory.add_edge("item0", Edge(id="e2", source_id="n0", target_id="n1"))
+
+        self.memory.update_edge("item0", "e2", properties={"weight": 2})
+        self.assertEqual(self.memory.graphs["item0"]["n0"]["n1"]["e2"]["properties"], {"weight": 2})
+
+        self.assertTrue(self.memory.remove_edge("item0", "e1"))
+        self.assertEqual(list(self.memory.graphs["item0"]["n0"]["n1"]), ["e2"])
+        self.assertFalse(self.memory.remove_edge("item0", "e1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
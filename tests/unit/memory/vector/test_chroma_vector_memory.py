@@ -0,0 +1,52 @@
+"""
+Unit tests for the Chroma-based vector memory system.
+
+This module contains tests for metadata-filtered search in ChromaMemory.
+"""
+
+import unittest
+import uuid
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from augment_adam.memory.vector.base import VectorMemoryItem
+from augment_adam.memory.vector.chroma import ChromaMemory
+
+
+class TestChromaMemoryFilteredSearch(unittest.TestCase):
+    """Tests for searching ChromaMemory with a where filter."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.memory = ChromaMemory(name=f"test_{uuid.uuid4().hex}", dimension=3)
+        self.memory.add_many([
+            VectorMemoryItem(id="a", content="a", embedding=[1.0, 0.0, 0.0], metadata={"tags": ["x"]}),
+            VectorMemoryItem(id="b", content="b", embedding=[0.9, 0.1, 0.0], metadata={"tags": ["y"]}),
+            VectorMemoryItem(id="c", content="c", embedding=[0.0, 1.0, 0.0], metadata={"tags": ["x", "y"]}),
+        ])
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.memory.client.delete_collection(self.memory.collection.name)
+
+    def test_filtered_search(self):
+        """Test that only items matching the filter are returned."""
+        results = self.memory.search_many([[1.0, 0.0, 0.0]], limit=3, where={"tags": "x"})[0]
+
+        self.assertEqual([item.id for item, score in results], ["a", "c"])
+
+    def test_filter_without_matches(self):
+        """Test that a filter matching no items returns no results."""
+        self.assertEqual(self.memory.search([1.0, 0.0, 0.0], where={"tags": "z"}), [])
+
+    def test_unfiltered_search(self):
+        """Test that a search without a filter returns the nearest items."""
+        results = self.memory.search([1.0, 0.0, 0.0], limit=2)
+
+        self.assertEqual([item.id for item in results], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
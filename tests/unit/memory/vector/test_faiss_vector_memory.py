@@ -0,0 +1,466 @@
+"""
+Unit tests for the FAISS-based vector memory system.
+
+This module contains tests for vector removal, replacement and compaction
+in the ID-mapped FAISS index used by FAISSMemory.
+"""
+
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import pytest
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from augment_adam.memory.vector.base import VectorMemoryItem
+from augment_adam.memory.vector import faiss as faiss_memory
+from augment_adam.memory.vector.faiss import FAISSMemory
+from augment_adam.memory.vector.storage import CHANGES_FILE, LazyItemStore
+
+
+class TestFAISSMemoryDeletion(unittest.TestCase):
+    """Tests for removing and replacing vectors in FAISSMemory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = np.random.default_rng(0)
+        self.memory = FAISSMemory(name="test_memory", dimension=8)
+        for i in range(20):
+            self.memory.add(VectorMemoryItem(
+                id=f"item_{i}",
+                content=f"content {i}",
+                embedding=self.rng.standard_normal(8).tolist(),
+            ))
+
+    def test_remove_deletes_vector(self):
+        """Test that removing an item removes its vector from the index."""
+        self.assertTrue(self.memory.remove("item_0"))
+        self.assertEqual(self.memory.index.ntotal, 19)
+        self.assertNotIn("item_0", self.memory.id_to_index)
+
+    def test_update_replaces_vector(self):
+        """Test that updating an item does not leave a dead vector behind."""
+        self.memory.update("item_1", content="new content")
+        self.assertEqual(self.memory.index.ntotal, 20)
+
+        results = self.memory.search(self.memory.get("item_1").embedding, limit=1)
+        self.assertEqual(results[0].id, "item_1")
+
+    def test_search_returns_limit_live_hits(self):
+        """Test that search returns limit results after removals."""
+        for i in range(10):
+            self.memory.remove(f"item_{i}")
+
+        results = self.memory.search(self.rng.standard_normal(8).tolist(), limit=10)
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(int(item.id.split("_")[1]) >= 10 for item in results))
+
+    def test_search_skips_tombstones(self):
+        """Test that search over-fetches past tombstoned vectors."""
+        vector_id = self.memory.id_to_index.pop("item_2")
+        del self.memory.index_to_id[vector_id]
+        self.memory._tombstones.add(vector_id)
+
+        results = self.memory.search(self.memory.get("item_2").embedding, limit=19)
+        self.assertEqual(len(results), 19)
+        self.assertNotIn("item_2", [item.id for item in results])
+
+    def test_compact(self):
+        """Test that compaction rebuilds the index without tombstones."""
+        self.assertFalse(self.memory.compact())
+
+        vector_id = self.memory.id_to_index.pop("item_3")
+        del self.memory.index_to_id[vector_id]
+        self.memory._tombstones.add(vector_id)
+
+        self.assertTrue(self.memory.compact(force=True))
+        self.assertEqual(self.memory.tombstone_ratio(), 0.0)
+        self.assertEqual(self.memory.index.ntotal, 20)
+
+    def test_save_load(self):
+        """Test that the ID-mapped index survives a save/load round trip."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = os.path.join(temp_dir, "faiss")
+            self.memory.remove("item_4")
+            self.memory.save(directory)
+
+            loaded = FAISSMemory.load(directory)
+            query = self.memory.get("item_5").embedding
+            self.assertEqual(loaded.index.ntotal, 19)
+            self.assertEqual(loaded.search(query, limit=1)[0].id, "item_5")
+
+
+class TestFAISSMemoryBatching(unittest.TestCase):
+    """Tests for the batched add_many and search_many APIs."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = np.random.default_rng(1)
+        self.memory = FAISSMemory(name="test_memory", dimension=8)
+
+    def test_add_many(self):
+        """Test adding a batch of items, some without embeddings."""
+        items = [
+            VectorMemoryItem(
+                id=f"item_{i}",
+                content=f"content {i}",
+                embedding=self.rng.standard_normal(8).tolist() if i % 2 else None,
+            )
+            for i in range(10)
+        ]
+
+        item_ids = self.memory.add_many(items)
+
+        self.assertEqual(item_ids, [f"item_{i}" for i in range(10)])
+        self.assertEqual(self.memory.index.ntotal, 10)
+        self.assertTrue(all(item.embedding is not None for item in items))
+
+    def test_add_many_replaces_existing(self):
+        """Test that re-adding items in a batch replaces their vectors."""
+        items = [VectorMemoryItem(id=f"item_{i}", content="x", embedding=self.rng.standard_normal(8).tolist()) for i in range(5)]
+        self.memory.add_many(items)
+        self.memory.add_many(items)
+
+        self.assertEqual(self.memory.index.ntotal, 5)
+
+    def test_search_many(self):
+        """Test that search_many returns one scored result list per query."""
+        items = [VectorMemoryItem(id=f"item_{i}", content="x", embedding=self.rng.standard_normal(8).tolist()) for i in range(10)]
+        self.memory.add_many(items)
+
+        results = self.memory.search_many([items[3].embedding, items[7].embedding, "text query"], limit=4)
+
+        self.assertEqual([len(hits) for hits in results], [4, 4, 4])
+        self.assertEqual(results[0][0][0].id, "item_3")
+        self.assertAlmostEqual(results[0][0][1], 1.0, places=5)
+        self.assertEqual(results[1][0][0].id, "item_7")
+        scores = [score for _, score in results[2]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+class TestFAISSMemoryIndexTypes(unittest.TestCase):
+    """Tests for the trainable and automatically selected index types."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(2)
+        self.embeddings = rng.standard_normal((1200, 16)).astype(np.float32)
+        self.items = [
+            VectorMemoryItem(id=f"item_{i}", content="x", embedding=self.embeddings[i].tolist())
+            for i in range(len(self.embeddings))
+        ]
+
+    def test_unsupported_index_type(self):
+        """Test that unknown index types are rejected."""
+        with self.assertRaises(ValueError):
+            FAISSMemory(name="test_memory", dimension=16, index_type="LSH")
+
+    def test_trained_index_types_keep_pretraining_vectors(self):
+        """Test that vectors added before training are searchable afterwards."""
+        for index_type in ("IVF", "IVFPQ", "OPQ"):
+            memory = FAISSMemory(name="test_memory", dimension=16, index_type=index_type, train_threshold=1000)
+
+            memory.add_many(self.items[:500])
+            self.assertEqual(memory.active_index_type, "Flat")
+
+            for item in self.items[500:]:
+                memory.add(item)
+            self.assertEqual(memory.active_index_type, index_type)
+            self.assertEqual(memory.index.ntotal, 1200)
+
+            memory.set_search_params(nprobe=64)
+            results = memory.search(self.embeddings[10].tolist(), limit=1)
+            self.assertEqual(results[0].id, "item_10")
+
+    def test_hnsw_remove_uses_tombstones(self):
+        """Test that HNSW removals are skipped by search and compacted."""
+        memory = FAISSMemory(name="test_memory", dimension=16, index_type="HNSW", compact_threshold=0.5)
+        memory.add_many(self.items[:100])
+
+        for i in range(10):
+            memory.remove(f"item_{i}")
+        self.assertEqual(len(memory._tombstones), 10)
+        self.assertEqual(len(memory.search(self.embeddings[0].tolist(), limit=90)), 90)
+
+        self.assertTrue(memory.compact(force=True))
+        self.assertEqual(memory.index.ntotal, 90)
+
+    def test_short_ivf_probes_do_not_widen_search(self):
+        """Test that a search whose IVF probes come back short is not repeated with a larger k."""
+        memory = FAISSMemory(name="test_memory", dimension=16, index_type="IVF", nlist=64, nprobe=1, train_threshold=1000)
+        memory.add_many(self.items)
+        self.assertEqual(memory.active_index_type, "IVF")
+
+        ks = []
+        index = memory.index
+        memory.index = Mock(wraps=index, ntotal=index.ntotal)
+        memory.index.search.side_effect = lambda x, k, params=None: ks.append(k) or index.search(x, k, params=params)
+
+        results = memory.search_many([self.embeddings[0].tolist()], limit=200)[0]
+
+        self.assertLess(len(results), 200)
+        self.assertLessEqual(len(ks), 2)
+        self.assertLessEqual(max(ks), 200 * faiss_memory.SEARCH_OVERFETCH_FACTOR)
+
+    def test_auto_migrates_as_collection_grows(self):
+        """Test that auto mode moves to larger index types as items are added."""
+        schedule = ((300, "Flat"), (600, "HNSW"), (1000, "IVF"))
+        with patch.object(faiss_memory, "AUTO_INDEX_SCHEDULE", schedule):
+            memory = FAISSMemory(name="test_memory", dimension=16, index_type="auto")
+
+            active_types = []
+            for start in range(0, 1200, 200):
+                memory.add_many(self.items[start:start + 200])
+                active_types.append(memory.active_index_type)
+
+        self.assertEqual(active_types, ["Flat", "HNSW", "IVF", "IVF", "IVFPQ", "IVFPQ"])
+        self.assertEqual(memory.index.ntotal, 1200)
+
+    def test_save_load_trained_index(self):
+        """Test that a trained index and its type survive a save/load round trip."""
+        memory = FAISSMemory(name="test_memory", dimension=16, index_type="IVF", train_threshold=1000)
+        memory.add_many(self.items)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            memory.save(temp_dir)
+            loaded = FAISSMemory.load(temp_dir)
+
+        self.assertEqual(loaded.active_index_type, "IVF")
+        self.assertEqual(loaded.index.ntotal, 1200)
+        self.assertEqual(loaded.search(self.embeddings[7].tolist(), limit=1)[0].id, "item_7")
+
+
+class TestFAISSMemoryPersistence(unittest.TestCase):
+    """Tests for the binary snapshot format and the change log."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "faiss")
+
+        rng = np.random.default_rng(3)
+        self.embeddings = rng.standard_normal((200, 8)).astype(np.float32)
+        self.memory = FAISSMemory(name="test_memory", dimension=8)
+        self.memory.add_many([
+            VectorMemoryItem(id=f"item_{i}", content=f"content {i}", metadata={"n": i}, embedding=self.embeddings[i].tolist())
+            for i in range(200)
+        ])
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.temp_dir.cleanup()
+
+    def count_changes(self):
+        """Count the entries in the change log."""
+        with open(os.path.join(self.directory, CHANGES_FILE)) as f:
+            return sum(1 for line in f if line.strip())
+
+    def test_load_hydrates_lazily(self):
+        """Test that loading doesn't parse items until they are accessed."""
+        self.memory.save(self.directory)
+
+        loaded = FAISSMemory.load(self.directory)
+
+        self.assertIsInstance(loaded.items, LazyItemStore)
+        self.assertEqual(loaded.count(), 200)
+        self.assertEqual(len(loaded.items._loaded), 0)
+
+        item = loaded.get("item_7")
+        self.assertEqual(item.metadata, {"n": 7})
+        np.testing.assert_allclose(item.embedding, self.embeddings[7], atol=1e-2)
+        self.assertEqual(len(loaded.items._loaded), 1)
+
+        self.assertEqual(loaded.search(self.embeddings[9].tolist(), limit=1)[0].id, "item_9")
+
+    def test_snapshot_copies_unhydrated_items(self):
+        """Test that writing a new snapshot doesn't hydrate items still on disk."""
+        self.memory.save(self.directory)
+        loaded = FAISSMemory.load(self.directory)
+        loaded.get("item_3")
+
+        loaded.save(os.path.join(self.temp_dir.name, "copy"))
+
+        self.assertEqual(len(loaded.items._loaded), 1)
+        copy = FAISSMemory.load(os.path.join(self.temp_dir.name, "copy"))
+        self.assertEqual(copy.count(), 200)
+        self.assertEqual(copy.get("item_8").metadata, {"n": 8})
+        np.testing.assert_allclose(copy.get("item_8").embedding, self.embeddings[8], atol=1e-2)
+        self.assertEqual(copy.search(self.embeddings[9].tolist(), limit=1)[0].id, "item_9")
+        self.assertFalse(any(name.endswith(".tmp") for name in os.listdir(self.directory)))
+
+    def test_clear_closes_snapshot(self):
+        """Test that clearing a loaded memory releases its snapshot files."""
+        self.memory.save(self.directory)
+        loaded = FAISSMemory.load(self.directory)
+        store = loaded.items
+
+        loaded.clear()
+
+        self.assertTrue(store._items_file.closed)
+        self.assertEqual(loaded.count(), 0)
+
+    def test_incremental_save_appends_changes(self):
+        """Test that a save after a small change only appends to the change log."""
+        self.memory.save(self.directory)
+        snapshot_mtime = os.path.getmtime(os.path.join(self.directory, "embeddings.npy"))
+
+        self.memory.remove("item_1")
+        self.memory.update("item_2", metadata={"updated": True})
+        self.memory.save(self.directory)
+
+        self.assertEqual(self.count_changes(), 2)
+        self.assertEqual(os.path.getmtime(os.path.join(self.directory, "embeddings.npy")), snapshot_mtime)
+
+        loaded = FAISSMemory.load(self.directory)
+        self.assertEqual(loaded.count(), 199)
+        self.assertNotIn("item_1", loaded.items)
+        self.assertTrue(loaded.get("item_2").metadata["updated"])
+        self.assertEqual(loaded.index.ntotal, 199)
+
+    def test_large_change_writes_new_snapshot(self):
+        """Test that the change log is folded into a new snapshot once it grows."""
+        self.memory.save(self.directory)
+
+        for i in range(100):
+            self.memory.remove(f"item_{i}")
+        self.memory.save(self.directory, max_log_ratio=0.25)
+
+        self.assertEqual(self.count_changes(), 0)
+        self.assertEqual(FAISSMemory.load(self.directory).count(), 100)
+
+    def test_interrupted_snapshot_keeps_previous_state(self):
+        """Test that a snapshot save that stops part way leaves the previous save loadable."""
+        self.memory.save(self.directory)
+        self.memory.remove("item_1")
+        self.memory.save(self.directory)
+
+        for i in range(2, 100):
+            self.memory.remove(f"item_{i}")
+        with patch.object(faiss_memory.faiss, "write_index", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.memory.save(self.directory, max_log_ratio=0.25)
+
+        self.assertEqual(self.count_changes(), 1)
+        loaded = FAISSMemory.load(self.directory)
+        self.assertEqual(loaded.count(), 199)
+        self.assertNotIn("item_1", loaded.items)
+        self.assertEqual(loaded.get("item_50").metadata, {"n": 50})
+        self.assertEqual(loaded.index.ntotal, 199)
+
+    def test_change_log_replayed_over_new_snapshot(self):
+        """Test that a change log left next to the snapshot it was folded into gives the same items."""
+        self.memory.save(self.directory)
+        self.memory.remove("item_1")
+        self.memory.update("item_2", metadata={"updated": True})
+        self.memory.save(self.directory)
+        with open(os.path.join(self.directory, CHANGES_FILE)) as f:
+            log = f.read()
+
+        self.memory.save(self.directory, max_log_ratio=0)
+        with open(os.path.join(self.directory, CHANGES_FILE), "w") as f:
+            f.write(log)
+
+        loaded = FAISSMemory.load(self.directory)
+        self.assertEqual(loaded.count(), 199)
+        self.assertNotIn("item_1", loaded.items)
+        self.assertTrue(loaded.get("item_2").metadata["updated"])
+        self.assertEqual(loaded.index.ntotal, 199)
+
+    def test_load_legacy_json_format(self):
+        """Test that memories saved in the JSON format can still be loaded."""
+        os.makedirs(self.directory)
+        faiss.write_index(faiss.IndexFlatL2(8), os.path.join(self.directory, "index.faiss"))
+        with open(os.path.join(self.directory, "items.json"), "w") as f:
+            json.dump({"a": VectorMemoryItem(id="a", content="a", embedding=[1.0] * 8).to_dict()}, f)
+        with open(os.path.join(self.directory, "mappings.json"), "w") as f:
+            json.dump({"id_to_index": {}, "index_to_id": {}}, f)
+        with open(os.path.join(self.directory, "metadata.json"), "w") as f:
+            json.dump({"name": "legacy", "dimension": 8, "metadata": {"index_type": "Flat"}}, f)
+
+        loaded = FAISSMemory.load(self.directory)
+
+        self.assertEqual(loaded.search([1.0] * 8, limit=1)[0].id, "a")
+
+
+class TestFAISSMemoryFiltering(unittest.TestCase):
+    """Tests for metadata-filtered search in FAISSMemory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = np.random.default_rng(0)
+        self.embeddings = self.rng.standard_normal((300, 8)).astype(np.float32)
+        self.items = [
+            VectorMemoryItem(
+                id=f"item_{i}",
+                content=f"content {i}",
+                metadata={"source": "web" if i % 10 == 0 else "file", "tags": [f"t{i % 3}"]},
+                embedding=self.embeddings[i].tolist(),
+            )
+            for i in range(300)
+        ]
+        self.query = self.rng.standard_normal(8).tolist()
+
+    def expected(self, memory, where_fn, limit):
+        """Rank the matching items by exact distance."""
+        distances = ((self.embeddings - np.asarray(self.query, dtype=np.float32)) ** 2).sum(axis=1)
+        ids = [f"item_{i}" for i in np.argsort(distances) if where_fn(self.items[i].metadata)]
+        return ids[:limit]
+
+    def check_filtered_search(self, memory):
+        """Check both filter paths against an exact filtered ranking."""
+        memory.add_many(self.items)
+
+        # 30 web items take the exact path, 200 file items the IDSelector path
+        for where, where_fn in (
+            ({"source": "web"}, lambda m: m["source"] == "web"),
+            ({"source": "file", "tags": {"$in": ["t0", "t2"]}}, lambda m: m["source"] == "file" and m["tags"][0] != "t1"),
+        ):
+            results = memory.search_many([self.query], limit=5, where=where)[0]
+
+            self.assertEqual([item.id for item, _ in results], self.expected(memory, where_fn, 5))
+            self.assertTrue(all(0.0 < score <= 1.0 for _, score in results))
+
+    def test_flat(self):
+        """Test filtered search over a flat index."""
+        self.check_filtered_search(FAISSMemory(name="test_memory", dimension=8, exact_filter_threshold=50))
+
+    def test_hnsw_with_tombstones(self):
+        """Test that removed items never match a filter on an HNSW index."""
+        memory = FAISSMemory(name="test_memory", dimension=8, index_type="HNSW", exact_filter_threshold=50, compact_threshold=1.0)
+        self.check_filtered_search(memory)
+
+        memory.remove("item_10")
+        result_ids = [item.id for item in memory.search(self.embeddings[10].tolist(), limit=29, where={"source": "web"})]
+
+        self.assertEqual(len(result_ids), 29)
+        self.assertNotIn("item_10", result_ids)
+
+    def test_ivf(self):
+        """Test that the IDSelector search carries over nprobe on IVF indexes."""
+        memory = FAISSMemory(name="test_memory", dimension=8, index_type="IVF", nlist=8, nprobe=8, train_threshold=100, exact_filter_threshold=50)
+        self.check_filtered_search(memory)
+
+        self.assertEqual(memory.active_index_type, "IVF")
+
+    def test_filter_after_load(self):
+        """Test that the metadata index is built from the snapshot without hydrating items."""
+        memory = FAISSMemory(name="test_memory", dimension=8)
+        memory.add_many(self.items)
+
+        with tempfile.TemporaryDirectory() as directory:
+            memory.save(directory, embedding_dtype="float32")
+            loaded = FAISSMemory.load(directory)
+
+            results = loaded.search(self.query, limit=5, where={"source": "web"})
+
+            self.assertEqual([item.id for item in results], self.expected(loaded, lambda m: m["source"] == "web", 5))
+            self.assertEqual(len(loaded.items._loaded), 5)
+            loaded.items.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Unit tests for the default vector memory search.
+
+This module contains tests for the normalized embedding matrix that backs
+VectorMemory.search when no vector index is available.
+"""
+
+import unittest
+
+import numpy as np
+
+from augment_adam.memory.core.filtering import MetadataIndex
+from augment_adam.memory.vector.base import VectorMemory, VectorMemoryItem
+
+
+class SimpleVectorMemory(VectorMemory[VectorMemoryItem]):
+    """Vector memory that only uses the default implementation."""
+
+
+class TestVectorMemorySearch(unittest.TestCase):
+    """Tests for the vectorized VectorMemory search."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = np.random.default_rng(0)
+        self.memory = SimpleVectorMemory(name="test_memory", dimension=8)
+        for i in range(30):
+            self.memory.add(VectorMemoryItem(
+                id=f"item_{i}",
+                content=f"content {i}",
+                embedding=self.rng.standard_normal(8).tolist(),
+            ))
+
+    def brute_force(self, query, limit):
+        """Rank items with calculate_similarity for comparison."""
+        scored = [(item.id, self.memory.calculate_similarity(query, item.embedding)) for item in self.memory.get_all()]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return [item_id for item_id, _ in scored[:limit]]
+
+    def test_search_matches_brute_force(self):
+        """Test that the matrix search ranks like calculate_similarity."""
+        query = self.rng.standard_normal(8).tolist()
+
+        results = self.memory.search(query, limit=5)
+
+        self.assertEqual([item.id for item in results], self.brute_force(query, 5))
+
+    def test_matrix_tracks_mutations(self):
+        """Test that add, update and remove keep the matrix in sync."""
+        self.memory.search([1.0] * 8, limit=1)
+
+        self.memory.remove("item_0")
+        self.memory.add(VectorMemoryItem(id="new", content="new", embedding=[1.0] * 8))
+        self.memory.items["item_5"].embedding = [-1.0] * 8
+        self.memory.update("item_5", metadata={"touched": True})
+
+        results = self.memory.search([1.0] * 8, limit=30)
+        result_ids = [item.id for item in results]
+
+        self.assertEqual(len(results), 30)
+        self.assertEqual(result_ids[0], "new")
+        self.assertNotIn("item_0", result_ids)
+        self.assertEqual(result_ids, self.brute_force([1.0] * 8, 30))
+
+    def test_search_many_scores(self):
+        """Test that search_many returns sorted cosine scores per query."""
+        item = self.memory.get("item_3")
+
+        results = self.memory.search_many([item.embedding, [0.0] * 8], limit=3)
+
+        self.assertEqual(results[0][0][0].id, "item_3")
+        self.assertAlmostEqual(results[0][0][1], 1.0, places=5)
+        self.assertTrue(all(score == 0.0 for _, score in results[1]))
+
+    def test_empty_memory(self):
+        """Test searching an empty memory."""
+        self.memory.clear()
+
+        self.assertEqual(self.memory.search([1.0] * 8), [])
+        self.assertEqual(self.memory.search_many([[1.0] * 8]), [[]])
+
+
+class TestMetadataIndex(unittest.TestCase):
+    """Tests for the inverted metadata index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = MetadataIndex()
+        self.index.add("a", {"source": "web", "tags": ["x", "y"]})
+        self.index.add("b", {"source": "web", "tags": ["y"]})
+        self.index.add("c", {"source": "file", "tags": ["z"], "extra": {"nested": 1}})
+
+    def test_select(self):
+        """Test equality, $eq and $in conditions."""
+        self.assertIsNone(self.index.select(None))
+        self.assertEqual(self.index.select({"source": "web"}), {"a", "b"})
+        self.assertEqual(self.index.select({"source": {"$eq": "file"}}), {"c"})
+        self.assertEqual(self.index.select({"tags": {"$in": ["x", "z"]}}), {"a", "c"})
+        self.assertEqual(self.index.select({"source": "web", "tags": "x"}), {"a"})
+        self.assertEqual(self.index.select({"source": "missing"}), set())
+
+    def test_replace_and_remove(self):
+        """Test that re-adding an item replaces its postings."""
+        self.index.add("a", {"source": "file"})
+        self.index.remove("b")
+
+        self.assertEqual(self.index.select({"source": "file"}), {"a", "c"})
+        self.assertEqual(self.index.select({"tags": "y"}), set())
+        self.assertNotIn("web", self.index.postings["source"])
+
+    def test_unsupported_operator(self):
+        """Test that unsupported operators are rejected."""
+        with self.assertRaises(ValueError):
+            self.index.select({"importance": {"$gt": 0.5}})
+
+
+class TestVectorMemoryFiltering(unittest.TestCase):
+    """Tests for metadata-filtered VectorMemory search."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = np.random.default_rng(0)
+        self.memory = SimpleVectorMemory(name="test_memory", dimension=8)
+        for i in range(40):
+            self.memory.add(VectorMemoryItem(
+                id=f"item_{i}",
+                content=f"content {i}",
+                metadata={"source": "web" if i % 4 == 0 else "file", "tags": [f"t{i % 3}"]},
+                embedding=self.rng.standard_normal(8).tolist(),
+            ))
+
+    def test_filtered_search_matches_post_filter(self):
+        """Test that filtered results equal the unfiltered ranking filtered afterwards."""
+        query = self.rng.standard_normal(8).tolist()
+
+        results = self.memory.search(query, limit=5, where={"source": "web", "tags": {"$in": ["t0", "t1"]}})
+        expected = [
+            item.id for item in self.memory.search(query, limit=40)
+            if item.metadata["source"] == "web" and item.metadata["tags"][0] in ("t0", "t1")
+        ][:5]
+
+        self.assertEqual([item.id for item in results], expected)
+
+    def test_filter_tracks_mutations(self):
+        """Test that add, update and remove keep the metadata index in sync."""
+        self.memory.search([1.0] * 8, where={"source": "web"})
+
+        self.memory.update("item_1", metadata={"source": "web"})
+        self.memory.remove("item_0")
+        self.memory.add(VectorMemoryItem(id="new", content="new", metadata={"source": "web"}, embedding=[1.0] * 8))
+
+        result_ids = {item.id for item in self.memory.search([1.0] * 8, limit=40, where={"source": "web"})}
+
+        self.assertEqual(result_ids, {f"item_{i}" for i in range(4, 40, 4)} | {"item_1", "new"})
+        self.assertEqual(self.memory.search_many([[1.0] * 8], where={"source": "none"}), [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""Unit tests for the model cache and its sqlite store."""
+
+import gc
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import weakref
+
+from augment_adam.models.cache_store import SQLiteCacheStore, EMBEDDING, GENERATION
+from augment_adam.models.caching import ModelCache, CACHE_DB_NAME
+
+
+class TestSQLiteCacheStore(unittest.TestCase):
+    """Tests for the SQLiteCacheStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "cache.db")
+        self.store = SQLiteCacheStore(self.path, memory_cache_size=2, flush_interval=3600)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def last_access(self, key):
+        """Read an entry's access time from disk through a separate connection."""
+        connection = sqlite3.connect(self.path)
+        try:
+            return connection.execute("SELECT last_access FROM entries WHERE key = ?", (key,)).fetchone()[0]
+        finally:
+            connection.close()
+
+    def test_round_trip(self):
+        """Test storing and loading embeddings as float32 and generations as text."""
+        size = self.store.put(EMBEDDING, "a", [0.5, -1.25, 3.0])
+        size += self.store.put(GENERATION, "a", "héllo")
+
+        self.assertEqual(size, 3 * 4 + 6)
+        self.assertEqual(self.store.total_size, size)
+        self.assertEqual(self.store.get(EMBEDDING, "a"), [0.5, -1.25, 3.0])
+        self.assertEqual(self.store.get(GENERATION, "a"), "héllo")
+        self.assertIsNone(self.store.get(GENERATION, "missing"))
+
+    def test_replace_updates_size(self):
+        """Test that replacing a value only counts its new size."""
+        self.store.put(GENERATION, "a", "long text")
+
+        self.assertEqual(self.store.put(GENERATION, "a", "short"), -4)
+        self.assertEqual(self.store.total_size, 5)
+        self.assertEqual(len(self.store), 1)
+
+    def test_memory_tier_is_bounded(self):
+        """Test that the LRU tier keeps only the most recently used values."""
+        for key in "abc":
+            self.store.put(GENERATION, key, key)
+            self.store.get(GENERATION, key)
+
+        self.assertEqual(list(self.store._memory), [(GENERATION, "b"), (GENERATION, "c")])
+
+    def test_embeddings_are_copies(self):
+        """Test that modifying a returned embedding does not modify the cache."""
+        self.store.put(EMBEDDING, "a", [1.0, 2.0])
+
+        self.store.get(EMBEDDING, "a").append(3.0)
+
+        self.assertEqual(self.store.get(EMBEDDING, "a"), [1.0, 2.0])
+
+    def test_access_times_are_batched(self):
+        """Test that hits only write access times when flushed."""
+        self.store.put(GENERATION, "a", "text", last_access=1.0)
+
+        self.store.get(GENERATION, "a")
+        self.assertEqual(self.last_access("a"), 1.0)
+
+        self.store.flush()
+        self.assertGreater(self.last_access("a"), 1.0)
+
+    def test_access_times_flush_at_threshold(self):
+        """Test that enough waiting access times are flushed without waiting for the interval."""
+        self.store.max_pending_access = 2
+        self.store.put(GENERATION, "a", "text", last_access=1.0)
+        self.store.put(GENERATION, "b", "text", last_access=1.0)
+
+        self.store.get(GENERATION, "a")
+        self.assertEqual(self.last_access("a"), 1.0)
+
+        self.store.get(GENERATION, "b")
+        self.assertGreater(self.last_access("a"), 1.0)
+        self.assertGreater(self.last_access("b"), 1.0)
+
+    def test_evict_least_recently_used(self):
+        """Test that eviction removes the entries accessed longest ago."""
+        self.store.put(GENERATION, "old", "1234", last_access=1.0)
+        self.store.put(GENERATION, "new", "1234", last_access=3.0)
+        self.store.put(GENERATION, "used", "1234", last_access=2.0)
+        self.store.get(GENERATION, "used")
+
+        freed = self.store.evict(5)
+
+        self.assertEqual(freed, 8)
+        self.assertEqual(self.store.total_size, 4)
+        self.assertIsNone(self.store.get(GENERATION, "old"))
+        self.assertIsNone(self.store.get(GENERATION, "new"))
+        self.assertEqual(self.store.get(GENERATION, "used"), "1234")
+
+    def test_reopen(self):
+        """Test that entries and the total size survive reopening."""
+        self.store.put(GENERATION, "a", "text")
+        self.store.close()
+
+        self.store = SQLiteCacheStore(self.path)
+
+        self.assertEqual(self.store.total_size, 4)
+        self.assertEqual(self.store.get(GENERATION, "a"), "text")
+
+    def test_unclosed_store_is_collected(self):
+        """Test that the exit hook does not keep an unclosed store alive."""
+        store = SQLiteCacheStore(os.path.join(self.temp_dir, "other.db"))
+        store.put(GENERATION, "a", "text")
+        reference = weakref.ref(store)
+
+        del store
+        gc.collect()
+
+        self.assertIsNone(reference())
+
+
+class TestModelCache(unittest.TestCase):
+    """Tests for the ModelCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_cache(self, **kwargs):
+        """Create a cache in the temporary directory."""
+        cache = ModelCache(model_name="test-model", provider="test", cache_dir=self.temp_dir, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_sqlite_backend(self):
+        """Test caching embeddings and generations in the database."""
+        cache = self.create_cache()
+
+        cache.save_embedding("text", [0.25, 0.5])
+        cache.save_generation("prompt", {"temperature": 0.5}, "output")
+
+        self.assertEqual(cache.get_embedding("text"), [0.25, 0.5])
+        self.assertEqual(cache.get_generation("prompt", {"temperature": 0.5}), "output")
+        self.assertIsNone(cache.get_generation("prompt", {"temperature": 0.7}))
+        self.assertEqual(os.listdir(cache.embeddings_dir), [])
+        self.assertEqual(cache.current_cache_size, 2 * 4 + 6)
+
+    def test_files_backend(self):
+        """Test that the files backend still stores one file per entry."""
+        cache = self.create_cache(backend="files")
+
+        cache.save_embedding("text", [0.25, 0.5])
+
+        self.assertIsNone(cache.store)
+        self.assertEqual(cache.get_embedding("text"), [0.25, 0.5])
+        self.assertEqual(len(os.listdir(cache.embeddings_dir)), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, CACHE_DB_NAME)))
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            self.create_cache(backend="redis")
+
+    def test_migration_from_files(self):
+        """Test that entries of the files backend are moved into the database."""
+        legacy = self.create_cache(backend="files")
+        legacy.save_embedding("text", [0.25, 0.5])
+        legacy.save_generation("prompt", {}, "output")
+
+        cache = self.create_cache()
+
+        self.assertEqual(cache.get_embedding("text"), [0.25, 0.5])
+        self.assertEqual(cache.get_generation("prompt", {}), "output")
+        self.assertEqual(os.listdir(cache.embeddings_dir), [])
+        self.assertEqual(os.listdir(cache.generations_dir), [])
+        self.assertEqual(cache.metadata["embeddings"], {})
+        self.assertEqual(cache.metadata["last_access"], {})
+
+    def test_cleanup_evicts_oldest(self):
+        """Test that exceeding the maximum size evicts the oldest entries."""
+        cache = self.create_cache(max_cache_size=10)
+
+        cache.save_generation("first", {}, "12345")
+        cache.save_generation("second", {}, "12345")
+        cache.save_generation("third", {}, "12345")
+
+        self.assertEqual(cache.current_cache_size, 10)
+        self.assertIsNone(cache.get_generation("first", {}))
+        self.assertEqual(cache.get_generation("third", {}), "12345")
+
+    def test_clear(self):
+        """Test that clearing keeps the database usable."""
+        cache = self.create_cache()
+        cache.save_generation("prompt", {}, "output")
+
+        cache.clear()
+        cache.save_generation("prompt", {}, "again")
+
+        self.assertEqual(cache.get_generation("prompt", {}), "again")
+
+
+if __name__ == '__main__':
+    unittest.main()
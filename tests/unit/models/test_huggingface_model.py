@@ -0,0 +1,58 @@
+"""Unit tests for batched embeddings of the Hugging Face model."""
+
+import unittest
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from augment_adam.models.huggingface_model import HuggingFaceModel
+
+
+class FailingEncoder:
+    """Embedding model that encodes each text as its length, and fails on batches containing "bad"."""
+
+    def encode(self, texts, **kwargs):
+        if "bad" in texts:
+            raise RuntimeError("encode failed")
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+class DictCache:
+    """Embedding cache backed by a dict."""
+
+    def __init__(self, embeddings):
+        self.embeddings = dict(embeddings)
+
+    def get_embedding(self, text):
+        return self.embeddings.get(text)
+
+    def save_embedding(self, text, embedding):
+        self.embeddings[text] = embedding
+
+
+class TestHuggingFaceModelEmbeddings(unittest.TestCase):
+    """Tests for HuggingFaceModel.get_embeddings."""
+
+    def setUp(self):
+        """Create a model with only a fake embedding model and cache."""
+        self.model = HuggingFaceModel.__new__(HuggingFaceModel)
+        self.model.model_name = "fake"
+        self.model.has_embeddings = True
+        self.model.use_cache = True
+        self.model.cache = DictCache({"cached": [7.0, 7.0]})
+        self.model.embedding_model = FailingEncoder()
+
+    def test_failed_batch_only_affects_its_texts(self):
+        """Test that a failed batch gets zero vectors while cached texts and other batches keep theirs."""
+        embeddings = self.model.get_embeddings(["cached", "bad", "longer text", "ok"], batch_size=1)
+
+        self.assertEqual(embeddings, [[7.0, 7.0], [0.0, 0.0], [11.0, 1.0], [2.0, 1.0]])
+        self.assertNotIn("bad", self.model.cache.embeddings)
+        self.assertEqual(self.model.cache.embeddings["ok"], [2.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Unit tests for the ModelInterface defaults and batched embedding backends."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from augment_adam.models.model_interface import ModelInterface
+
+
+class LengthModel(ModelInterface):
+    """Minimal model whose embedding is the length of the text."""
+
+    def generate(self, prompt, max_tokens=1000, temperature=0.7, top_p=1.0, stop=None, **kwargs):
+        return prompt
+
+    def generate_stream(self, prompt, max_tokens=1000, temperature=0.7, top_p=1.0, stop=None, **kwargs):
+        yield prompt
+
+    def get_token_count(self, text):
+        return len(text.split())
+
+    def get_embedding(self, text):
+        return [float(len(text))]
+
+    def get_model_info(self):
+        return {"name": "length"}
+
+
+class TestModelInterface(unittest.TestCase):
+    """Tests for the ModelInterface defaults."""
+
+    def test_get_embeddings_default(self):
+        """Test that the default embeds the texts one at a time, in order."""
+        model = LengthModel()
+
+        self.assertEqual(model.get_embeddings(["a", "abc", ""]), [[1.0], [3.0], [0.0]])
+        self.assertEqual(model.get_embeddings([]), [])
+
+
+class TestOpenAIModelEmbeddings(unittest.TestCase):
+    """Tests for batched embeddings with the OpenAI backend."""
+
+    def setUp(self):
+        """Create a model with a mock client."""
+        with patch("augment_adam.models.openai_model.OpenAI"), patch("augment_adam.models.openai_model.tiktoken"):
+            from augment_adam.models.openai_model import OpenAIModel
+            self.model = OpenAIModel(api_key="test")
+
+        def create(model, input):
+            # Return the embeddings out of order, as the API may
+            data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+            return SimpleNamespace(data=data[::-1])
+
+        self.model.client = MagicMock()
+        self.model.client.embeddings.create.side_effect = create
+
+    def test_get_embeddings_batches(self):
+        """Test that texts are sent in batches and come back in order."""
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        embeddings = self.model.get_embeddings(texts, batch_size=2)
+
+        self.assertEqual(embeddings, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        self.assertEqual(self.model.client.embeddings.create.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""Unit tests for the OllamaModel HTTP clients, against a local fake Ollama server."""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from augment_adam.models.ollama_model import OllamaModel
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Request handler that answers like Ollama and records its connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+    def send_json(self, body):
+        """Send a JSON response on a keep-alive connection."""
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        """Answer the model list."""
+        self.server.record(self.client_address, self.path)
+        self.send_json({"models": [{"name": "fake"}]})
+
+    def do_POST(self):
+        """Answer generate and embedding requests after a short delay."""
+        server = self.server
+        server.record(self.client_address, self.path)
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+        if self.path == "/api/embeddings":
+            self.send_json({"embedding": [float(len(data["prompt"])), 1.0]})
+        else:
+            self.send_json({"response": "ok " + data["prompt"]})
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """Fake Ollama server that counts connections and concurrent requests."""
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.05):
+        """Start listening on a free local port."""
+        super().__init__(("127.0.0.1", 0), FakeOllamaHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.paths = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def record(self, client_address, path):
+        """Record a request and the client port it arrived on."""
+        with self.lock:
+            self.connections.add(client_address)
+            self.paths.append(path)
+
+    @property
+    def url(self):
+        """The base URL of the server."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class OllamaServerTestCase(unittest.IsolatedAsyncioTestCase):
+    """Base test case with a fake server and a model pointing at it."""
+
+    def setUp(self):
+        """Start the fake server and create the model."""
+        self.server = FakeOllamaServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.model = OllamaModel(model_name="fake", base_url=self.server.url, max_concurrency=3)
+
+    async def asyncTearDown(self):
+        """Close the async session."""
+        await self.model.aclose()
+
+    def tearDown(self):
+        """Close the model and stop the fake server."""
+        self.model.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestOllamaModelSession(OllamaServerTestCase):
+    """Tests for the pooled synchronous session."""
+
+    def test_connection_reuse(self):
+        """Test that sequential calls share one keep-alive connection."""
+        self.server.delay = 0
+
+        for i in range(5):
+            self.assertEqual(self.model.generate(f"p{i}"), f"ok p{i}")
+        self.model.get_embedding("text")
+
+        # The availability check made at initialization uses the same connection
+        self.assertEqual(len(self.server.paths), 7)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_get_embeddings(self):
+        """Test that batched embeddings are requested concurrently and returned in order."""
+        texts = ["a", "bb", "ccc", "dddd"]
+
+        embeddings = self.model.get_embeddings(texts)
+
+        self.assertEqual(embeddings, [[float(len(text)), 1.0] for text in texts])
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+
+    def test_probability_samples_are_concurrent(self):
+        """Test that the sampling fallback issues its requests concurrently."""
+        probabilities = self.model.get_token_probabilities("x", top_k=5)
+
+        self.assertEqual(probabilities, [("o", 1.0)])
+        self.assertEqual(self.server.paths.count("/api/generate"), 6)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_async_session_closed_with_its_loop(self):
+        """Test that the session of an event loop is closed when asyncio.run ends it."""
+        self.assertEqual(asyncio.run(self.model.agenerate("a")), "ok a")
+        first = self.model._async_session
+        self.assertTrue(first.closed)
+
+        self.assertEqual(asyncio.run(self.model.agenerate("b")), "ok b")
+
+        self.assertIsNot(self.model._async_session, first)
+        self.assertTrue(self.model._async_session.closed)
+
+
+class TestOllamaModelAsync(OllamaServerTestCase):
+    """Tests for the async client."""
+
+    async def test_agenerate(self):
+        """Test generating text asynchronously."""
+        self.assertEqual(await self.model.agenerate("hi"), "ok hi")
+
+    async def test_bounded_concurrency(self):
+        """Test that concurrent calls are limited to max_concurrency requests."""
+        results = await asyncio.gather(*(self.model.agenerate(f"p{i}") for i in range(9)))
+
+        self.assertEqual(results, [f"ok p{i}" for i in range(9)])
+        self.assertEqual(self.server.max_in_flight, 3)
+
+    async def test_aget_embeddings(self):
+        """Test that embeddings come back in order over reused connections."""
+        texts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff"]
+
+        embeddings = await self.model.aget_embeddings(texts)
+
+        self.assertEqual(embeddings, [[float(len(text)), 1.0] for text in texts])
+        self.assertEqual(await self.model.aget_embedding("zz"), [2.0, 1.0])
+
+        # One connection for the sync availability check, at most three async ones
+        self.assertLessEqual(len(self.server.connections), 1 + 3)
+
+    async def test_error_fallback(self):
+        """Test that a failed request returns the usual fallback."""
+        self.model.base_url = "http://127.0.0.1:1"
+
+        self.assertEqual(await self.model.aget_embedding("text"), [0.0] * 4096)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for multi-chain MCMC and its diagnostics.
+
+This module contains tests for the FFT-based autocorrelation and effective
+sample size, split R-hat, and run_chains with its deterministic per-chain
+seeds and early stopping.
+"""
+
+import unittest
+
+import numpy as np
+
+from augment_adam.monte_carlo.mcmc import MetropolisHastings, GibbsSampler, HamiltonianMC, GaussianProposal
+from augment_adam.monte_carlo.utils import (
+    compute_chain_autocorrelation,
+    compute_chain_effective_sample_size,
+    compute_split_r_hat,
+)
+
+
+def standard_normal_log_prob(x):
+    """Log density of a standard normal, up to a constant (module level so it can be pickled)."""
+    return -0.5 * float(np.sum(x ** 2))
+
+
+def standard_normal_log_prob_grad(x):
+    """Gradient of standard_normal_log_prob."""
+    return -x
+
+
+def ar1_chains(phi, num_chains, length, seed=0):
+    """Simulate AR(1) chains with unit marginal variance."""
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((num_chains, length)) * np.sqrt(1 - phi ** 2)
+    chains = np.empty((num_chains, length))
+    chains[:, 0] = rng.standard_normal(num_chains)
+    for t in range(1, length):
+        chains[:, t] = phi * chains[:, t - 1] + noise[:, t]
+    return chains
+
+
+class TestChainDiagnostics(unittest.TestCase):
+    """Tests for autocorrelation, effective sample size and split R-hat."""
+
+    def test_fft_autocorrelation_matches_direct_sum(self):
+        """Test that the FFT autocorrelation equals the direct lagged sums."""
+        x = np.random.default_rng(0).standard_normal(300)
+        centered = x - x.mean()
+        direct = np.array([np.sum(centered[:len(x) - lag] * centered[lag:]) for lag in range(len(x))])
+        np.testing.assert_allclose(compute_chain_autocorrelation(x), direct / direct[0], atol=1e-10)
+
+    def test_effective_sample_size_of_ar1_chains(self):
+        """Test the ESS of AR(1) chains against N * (1 - phi) / (1 + phi)."""
+        for phi in (0.0, 0.5, 0.9):
+            chains = ar1_chains(phi, 4, 5000)
+            expected = chains.size * (1 - phi) / (1 + phi)
+            self.assertAlmostEqual(compute_chain_effective_sample_size(chains) / expected, 1.0, delta=0.15)
+
+    def test_vector_draws_give_one_value_per_dimension(self):
+        """Test that (chains, draws, dimensions) draws give per-dimension diagnostics."""
+        draws = np.stack([ar1_chains(0.0, 4, 1000, seed=1), ar1_chains(0.9, 4, 1000, seed=2)], axis=-1)
+        ess = compute_chain_effective_sample_size(draws)
+        self.assertEqual(ess.shape, (2,))
+        self.assertGreater(ess[0], 3 * ess[1])
+        self.assertEqual(compute_split_r_hat(draws).shape, (2,))
+
+    def test_split_r_hat(self):
+        """Test that R-hat is near 1 for mixed chains and large for separated or drifting chains."""
+        mixed = ar1_chains(0.5, 4, 2000)
+        self.assertLess(compute_split_r_hat(mixed), 1.01)
+
+        separated = mixed + np.arange(4)[:, np.newaxis]
+        self.assertGreater(compute_split_r_hat(separated), 1.1)
+
+        # A drift within each chain is caught by splitting the chains
+        drifting = mixed + np.linspace(0, 3, 2000)
+        self.assertGreater(compute_split_r_hat(drifting), 1.1)
+
+        self.assertEqual(compute_split_r_hat(np.ones((4, 100))), 1.0)
+
+
+class TestRunChains(unittest.TestCase):
+    """Tests for running several chains with run_chains."""
+
+    def make_sampler(self):
+        """Create a Metropolis-Hastings sampler for a 2-dimensional standard normal."""
+        return MetropolisHastings(standard_normal_log_prob, GaussianProposal(1.0))
+
+    def test_draws_and_shapes(self):
+        """Test that draws fill (chains, draws, dimensions) arrays and sample the target."""
+        result = self.make_sampler().run_chains(
+            4, lambda rng: rng.standard_normal(2), num_samples=2000, num_burnin=100, seed=0, num_workers=1
+        )
+        self.assertEqual(result.draws.shape, (4, 2000, 2))
+        self.assertEqual(result.log_probabilities.shape, (4, 2000))
+        np.testing.assert_allclose(result.get_values().mean(axis=0), [0.0, 0.0], atol=0.15)
+        np.testing.assert_allclose(result.get_values().var(axis=0), [1.0, 1.0], atol=0.2)
+        self.assertTrue(np.all(result.r_hat < 1.05))
+        self.assertTrue(0.2 < result.acceptance_rate() < 0.8)
+
+    def test_seeds_are_deterministic_across_workers(self):
+        """Test that the draws depend on the seed but not on the number of workers."""
+        start = [np.zeros(2), np.ones(2), -np.ones(2)]
+        in_process = self.make_sampler().run_chains(3, start, num_samples=200, seed=7, num_workers=1)
+        in_pool = self.make_sampler().run_chains(3, start, num_samples=200, seed=7, num_workers=2)
+        other_seed = self.make_sampler().run_chains(3, start, num_samples=200, seed=8, num_workers=1)
+
+        np.testing.assert_array_equal(in_process.draws, in_pool.draws)
+        self.assertFalse(np.array_equal(in_process.draws, other_seed.draws))
+        self.assertFalse(np.array_equal(in_process.draws[0], in_process.draws[1]))
+
+    def test_early_stopping(self):
+        """Test that chains stop once the R-hat and ESS targets are met."""
+        result = self.make_sampler().run_chains(
+            4, lambda rng: rng.standard_normal(2), num_samples=20000, seed=0, num_workers=1,
+            target_r_hat=1.05, target_ess=400, check_every=250,
+        )
+        self.assertTrue(result.converged)
+        self.assertLess(result.num_draws, 20000)
+        self.assertEqual(result.draws.shape[1], result.num_draws)
+        self.assertTrue(np.all(result.effective_sample_size > 400))
+
+    def test_unpicklable_sampler_needs_one_worker(self):
+        """Test that samplers with lambdas are rejected for worker processes."""
+        sampler = MetropolisHastings(lambda x: 0.0, GaussianProposal(1.0))
+        with self.assertRaises(ValueError):
+            sampler.run_chains(2, [np.zeros(1), np.zeros(1)], num_samples=10, num_workers=2)
+        with self.assertRaises(ValueError):
+            sampler.run_chains(2, [np.zeros(1)], num_samples=10, num_workers=1)
+
+    def test_hamiltonian_and_gibbs(self):
+        """Test that HMC and Gibbs samplers also run as multiple chains."""
+        hmc = HamiltonianMC(standard_normal_log_prob, standard_normal_log_prob_grad, step_size=0.3, num_steps=5)
+        result = hmc.run_chains(2, lambda rng: rng.standard_normal(3), num_samples=500, seed=0, num_workers=1)
+        self.assertEqual(result.draws.shape, (2, 500, 3))
+        np.testing.assert_allclose(result.get_values().var(axis=0), [1.0] * 3, atol=0.3)
+
+        gibbs = GibbsSampler(lambda state: 0.0, [lambda state, j: np.random.standard_normal()] * 2)
+        result = gibbs.run_chains(2, [[0.0, 0.0], [1.0, 1.0]], num_samples=300, seed=0, num_workers=1)
+        self.assertEqual(result.draws.shape, (2, 300, 2))
+        self.assertEqual(result.acceptance_rate(), 1.0)
+
+    def test_single_chain_effective_sample_size(self):
+        """Test the single-chain ESS of a sample() run."""
+        sampler = self.make_sampler()
+        np.random.seed(0)
+        sampler.sample(np.zeros(2), 2000)
+        self.assertTrue(100 < sampler.compute_effective_sample_size() < 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
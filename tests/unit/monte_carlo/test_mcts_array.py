@@ -0,0 +1,167 @@
+"""
+Unit tests for the array-backed Monte Carlo Tree Search.
+
+This module contains tests for ArrayTree and ArrayMonteCarloTreeSearch,
+including the transposition table and the root-parallel and leaf-parallel
+search modes.
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from augment_adam.monte_carlo.mcts import (
+    ArrayTree,
+    ArrayMonteCarloTreeSearch,
+    RandomRolloutPolicy,
+)
+
+
+# A counting game: three moves, each adds 0, 1 or 2; the reward is the final total.
+# The game functions are module level so they can be pickled for worker processes.
+
+def get_available_actions(state):
+    """Every move adds 0, 1 or 2."""
+    return {0, 1, 2}
+
+
+def get_next_state(state, action):
+    """Advance the move counter and add the action to the total."""
+    return (state[0] + 1, state[1] + action)
+
+
+def is_terminal(state):
+    """The game ends after three moves."""
+    return state[0] == 3
+
+
+def get_reward(state):
+    """The final total, scaled to [0, 1]."""
+    return state[1] / 6.0
+
+
+def state_key(state):
+    """States are hashable tuples."""
+    return state
+
+
+GAME = (get_available_actions, get_next_state, is_terminal, get_reward)
+
+
+class TestArrayTree(unittest.TestCase):
+    """Tests for ArrayTree."""
+
+    def test_expand_and_grow(self):
+        """Child edges are contiguous and the arrays grow past their capacity."""
+        tree = ArrayTree(0, capacity=2)
+        tree.expand(tree.root, ["a", "b", "c"])
+        self.assertEqual(tree.first_child[tree.root], 0)
+        self.assertEqual(tree.num_children[tree.root], 3)
+        self.assertTrue(np.all(tree.edge_children[:3] == -1))
+
+        for state in range(1, 5):
+            tree.add_node(state, tree.root, False)
+        self.assertEqual(tree.num_nodes, 5)
+        self.assertGreaterEqual(len(tree.visits), 5)
+        self.assertEqual(tree.states, [0, 1, 2, 3, 4])
+
+    def test_transposition_table(self):
+        """Equal states share a node when a state hash is given."""
+        tree = ArrayTree((0, 0), state_hash=state_key)
+        first = tree.add_node((1, 1), tree.root, False)
+        self.assertEqual(tree.add_node((1, 1), tree.root, False), first)
+        self.assertEqual(tree.num_nodes, 2)
+
+        plain = ArrayTree((0, 0))
+        self.assertNotEqual(plain.add_node((1, 1), 0, False), plain.add_node((1, 1), 0, False))
+
+    def test_select_edge_uct(self):
+        """Untried edges go first, in order, then the edge with the highest UCT value."""
+        tree = ArrayTree("root")
+        tree.expand(tree.root, ["low", "high"])
+        self.assertEqual(tree.select_edge(tree.root, 1.0, 1.0), 0)
+        self.assertEqual(tree.select_edge(tree.root, 1.0, 1.0), 1)
+        self.assertEqual(tree.num_tried[tree.root], 2)
+
+        low = tree.add_node("low", tree.root, False)
+        high = tree.add_node("high", tree.root, False)
+        tree.edge_children[0:2] = (low, high)
+        tree.backpropagate([tree.root, low], [0], 0.0)
+        tree.backpropagate([tree.root, high], [1], 1.0)
+        self.assertEqual(tree.edge_means[1], 1.0)
+        self.assertEqual(tree.select_edge(tree.root, 0.1, 1.0), 1)
+
+        # Pending visits with virtual loss steer selection away from the best edge
+        tree.add_virtual_visits([tree.root, high], [1], 3)
+        self.assertEqual(tree.select_edge(tree.root, 0.1, 1.0), 0)
+        self.assertEqual(tree.root_action_stats(), {"low": (1.0, 0.0), "high": (1.0, 1.0)})
+
+
+class TestArrayMonteCarloTreeSearch(unittest.TestCase):
+    """Tests for ArrayMonteCarloTreeSearch."""
+
+    def test_finds_best_action(self):
+        """The search finds the move that adds the most."""
+        search = ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), seed=0)
+        self.assertEqual(search.search(*GAME, num_iterations=300), 2)
+        self.assertEqual(search.tree.visits[search.tree.root], 300)
+
+    def test_transpositions_share_nodes(self):
+        """With a state hash the tree holds one node per distinct state."""
+        search = ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), state_hash=state_key, seed=0)
+        self.assertEqual(search.search(*GAME, num_iterations=500), 2)
+
+        # At most (0, 0) plus 3, 5 and 7 distinct totals after one, two and three moves
+        self.assertLessEqual(search.tree.num_nodes, 16)
+        self.assertEqual(len(set(search.tree.states)), search.tree.num_nodes)
+
+        plain = ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), seed=0)
+        plain.search(*GAME, num_iterations=500)
+        self.assertGreater(plain.tree.num_nodes, 16)
+
+    def test_seeded_search_is_deterministic(self):
+        """Equal seeds give equal trees when the rollout policy's random numbers are seeded too."""
+        trees = []
+        for _ in range(2):
+            random.seed(3)
+            search = ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), seed=3)
+            search.search(*GAME, num_iterations=100)
+            trees.append(search.tree)
+
+        self.assertEqual(trees[0].states, trees[1].states)
+        np.testing.assert_array_equal(trees[0].visits, trees[1].visits)
+
+    def test_root_parallel(self):
+        """Root-parallel search sums the root statistics of every worker."""
+        search = ArrayMonteCarloTreeSearch(
+            (0, 0), RandomRolloutPolicy(), num_workers=2, parallel="root", seed=0
+        )
+        self.assertEqual(search.search(*GAME, num_iterations=301), 2)
+        self.assertEqual(search.get_metadata("root_parallel_trees"), 2)
+
+    def test_leaf_parallel(self):
+        """Leaf-parallel search backpropagates every rollout and clears the virtual visits."""
+        search = ArrayMonteCarloTreeSearch(
+            (0, 0), RandomRolloutPolicy(), state_hash=state_key, num_workers=2, parallel="leaf", seed=0
+        )
+        self.assertEqual(search.search(*GAME, num_iterations=301), 2)
+        self.assertEqual(search.tree.visits[search.tree.root], 301)
+        self.assertFalse(np.any(search.tree.virtual_visits))
+
+    def test_update_root(self):
+        """Updating the root starts a new tree from the next state."""
+        search = ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), seed=0)
+        search.search(*GAME, num_iterations=50)
+        search.update_root(2, (1, 2))
+        self.assertEqual(search.tree.num_nodes, 1)
+        self.assertEqual(search.tree.states[search.tree.root], (1, 2))
+
+    def test_invalid_parallel_mode(self):
+        """Unknown parallel modes are rejected."""
+        with self.assertRaises(ValueError):
+            ArrayMonteCarloTreeSearch((0, 0), RandomRolloutPolicy(), parallel="tree")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""
+Unit tests for the array-backed particle filter.
+
+This module contains tests that compare the vectorized particle filter with
+the per-particle implementation, and tests for the ParticleSet and the
+per-particle model adapters.
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+from augment_adam.monte_carlo.particle_filter import (
+    ParticleFilter,
+    Particle,
+    ParticleSet,
+    SystemModel,
+    ObservationModel,
+    SystematicResampling,
+    LinearSystemModel,
+    LinearObservationModel,
+    NonlinearObservationModel,
+)
+
+
+class RandomWalkModel(SystemModel[float]):
+    """Scalar random walk that only implements the per-particle API."""
+
+    def __init__(self):
+        super().__init__("random_walk")
+
+    def propagate(self, state, dt):
+        return state + dt
+
+
+class GaussianObservationModel(ObservationModel[float, float]):
+    """Scalar Gaussian observation model that only implements the per-particle API."""
+
+    def __init__(self):
+        super().__init__("gaussian")
+
+    def likelihood(self, state, observation):
+        return math.exp(-0.5 * (observation - state) ** 2)
+
+
+class TestParticleSet(unittest.TestCase):
+    """Tests for log-weight normalization, ESS and estimates."""
+
+    def test_normalize_extreme_log_weights(self):
+        """Test that normalization doesn't underflow for very small weights."""
+        particle_set = ParticleSet(np.zeros((3, 2)), np.array([-1000.0, -1000.0, -1000.0 + math.log(2)]))
+        particle_set.normalize()
+        np.testing.assert_allclose(particle_set.weights, [0.25, 0.25, 0.5])
+        self.assertAlmostEqual(particle_set.effective_sample_size(), 1 / (0.25 ** 2 * 2 + 0.25))
+
+    def test_zero_weights_reset_to_uniform(self):
+        """Test that all-zero weights are reset to uniform weights."""
+        particle_set = ParticleSet(np.zeros(4), np.full(4, -np.inf))
+        particle_set.normalize()
+        np.testing.assert_allclose(particle_set.weights, [0.25] * 4)
+
+    def test_from_particles(self):
+        """Test conversion from particle objects and back."""
+        particles = [Particle(np.array([1.0, 2.0]), 1.0), Particle(np.array([3.0, 4.0]), 3.0)]
+        particle_set = ParticleSet.from_particles(particles)
+        np.testing.assert_allclose(particle_set.mean(), [2.5, 3.5])
+        self.assertAlmostEqual(particle_set.to_particles()[1].weight, 0.75)
+
+        self.assertIsNone(ParticleSet.from_particles([Particle(1), Particle(2)]))
+        self.assertIsNone(ParticleSet.from_particles([Particle("a"), Particle("b")]))
+
+
+class TestVectorizedParticleFilter(unittest.TestCase):
+    """Tests that compare the vectorized and per-particle filters."""
+
+    def make_filters(self):
+        """Create a vectorized and a per-particle filter with linear Gaussian models."""
+        A = np.array([[0.0, 1.0], [0.0, 0.0]])
+        Q = 0.01 * np.eye(2)
+        H = np.array([[1.0, 0.0]])
+        R = np.array([[0.25]])
+        return [
+            ParticleFilter(
+                LinearSystemModel(A, Q),
+                LinearObservationModel(H, R),
+                SystematicResampling(),
+                vectorized=vectorized,
+            )
+            for vectorized in (True, False)
+        ]
+
+    def test_update_matches_per_particle_filter(self):
+        """Test that a weight update gives the same weights, ESS and estimate."""
+        rng = np.random.default_rng(0)
+        states = rng.standard_normal((200, 2))
+        vectorized, per_particle = self.make_filters()
+        vectorized.effective_sample_size_threshold = per_particle.effective_sample_size_threshold = 0.0
+        vectorized.initialize(states)
+        per_particle.initialize(list(states))
+        self.assertIsNotNone(vectorized.particle_set)
+        self.assertIsNone(per_particle.particle_set)
+
+        observation = np.array([0.3])
+        vectorized.update(observation)
+        per_particle.update(observation)
+
+        np.testing.assert_allclose(
+            [particle.weight for particle in vectorized.particles],
+            [particle.weight for particle in per_particle.particles],
+        )
+        self.assertAlmostEqual(
+            vectorized._compute_effective_sample_size(), per_particle._compute_effective_sample_size()
+        )
+        np.testing.assert_allclose(vectorized.estimate_state(), per_particle.estimate_state())
+
+    def test_tracking(self):
+        """Test that the vectorized filter tracks a constant-velocity target."""
+        np.random.seed(0)
+        vectorized, _ = self.make_filters()
+        vectorized.initialize(np.random.standard_normal((2000, 2)))
+
+        position, velocity = 0.0, 1.0
+        for _ in range(20):
+            position += velocity * 0.1
+            vectorized.predict(0.1)
+            vectorized.update(np.array([position + 0.5 * np.random.standard_normal()]))
+
+        self.assertAlmostEqual(vectorized.estimate_state()[0], position, delta=0.5)
+        self.assertEqual(len(vectorized.particle_set), 2000)
+
+    def test_per_particle_models_are_adapted(self):
+        """Test that models without batch methods work on a particle set."""
+        particle_filter = ParticleFilter(RandomWalkModel(), GaussianObservationModel(), SystematicResampling())
+        particle_filter.initialize([0.0, 1.0, 2.0, 3.0])
+        self.assertEqual(particle_filter.particle_set.states.shape, (4,))
+
+        particle_filter.predict(1.0)
+        np.testing.assert_allclose(particle_filter.particle_set.states, [1.0, 2.0, 3.0, 4.0])
+
+        particle_filter.effective_sample_size_threshold = 0.0
+        particle_filter.update(2.0)
+        weights = np.exp(-0.5 * (2.0 - np.array([1.0, 2.0, 3.0, 4.0])) ** 2)
+        np.testing.assert_allclose(particle_filter.particle_set.weights, weights / weights.sum())
+        self.assertIsInstance(particle_filter.estimate_state(), float)
+
+        # Resampling goes through the per-particle resample() adapter
+        particle_filter._resample()
+        self.assertEqual(len(particle_filter.particles), 4)
+        self.assertTrue(set(particle_filter.particle_set.states) <= {1.0, 2.0, 3.0, 4.0})
+
+    def test_particles_write_through(self):
+        """Test that changes to the particles of an array-backed filter are made in the particle set."""
+        particle_filter = ParticleFilter(RandomWalkModel(), GaussianObservationModel(), SystematicResampling())
+        particle_filter.initialize(np.array([0.0, 1.0, 2.0, 3.0]))
+        particles = particle_filter.get_particles()
+        self.assertEqual(len(particles), 4)
+
+        particles[1].state = 5.0
+        particles[2].weight = 0.0
+        particles.append(Particle(7.0, 0.25))
+        del particles[0]
+
+        np.testing.assert_allclose(particle_filter.particle_set.states, [5.0, 2.0, 3.0, 7.0])
+        np.testing.assert_allclose(particle_filter.particle_set.weights, [0.25, 0.0, 0.25, 0.25])
+        self.assertEqual([particle.state for particle in particle_filter.particles], [5.0, 2.0, 3.0, 7.0])
+        self.assertEqual(particle_filter._num_particles(), 4)
+
+        with self.assertRaises(IndexError):
+            particles[4]
+
+    def test_integer_states_keep_per_particle_path(self):
+        """Test that integer states are kept as particle objects."""
+        particle_filter = ParticleFilter(RandomWalkModel(), GaussianObservationModel(), SystematicResampling())
+        particle_filter.initialize([0, 1, 2])
+        self.assertIsNone(particle_filter.particle_set)
+
+        particle_filter.predict(1)
+        self.assertEqual([particle.state for particle in particle_filter.particles], [1, 2, 3])
+
+    def test_nonlinear_observation_model_batch(self):
+        """Test that the batch log likelihood matches the per-particle likelihood."""
+        model = NonlinearObservationModel(lambda state: np.array([np.hypot(state[0], state[1])]), np.array([[0.5]]))
+        states = np.random.default_rng(1).standard_normal((10, 2))
+        observation = np.array([1.0])
+        np.testing.assert_allclose(
+            model.log_likelihood_batch(states, observation),
+            [math.log(model.likelihood(state, observation)) for state in states],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the array resampling schemes.
+
+This module contains statistical tests of the offspring counts of each
+resampling scheme, and tests for the chunked search and the in-place gather.
+"""
+
+import unittest
+
+import numpy as np
+
+from augment_adam.monte_carlo.particle_filter import (
+    Particle,
+    ParticleSet,
+    MultinomialResampling,
+    SystematicResampling,
+    StratifiedResampling,
+    ResidualResampling,
+    gather_in_place,
+    search_cumulative,
+    multinomial_indices,
+    systematic_indices,
+    stratified_indices,
+    residual_indices,
+)
+from augment_adam.monte_carlo.particle_filter import resampling
+
+
+class TestOffspringCounts(unittest.TestCase):
+    """Statistical tests of the offspring counts of each scheme."""
+
+    num_particles = 50
+    num_trials = 4000
+
+    @classmethod
+    def setUpClass(cls):
+        """Draw offspring counts for every scheme from the same weights."""
+        np.random.seed(0)
+        weights = np.random.gamma(0.5, size=cls.num_particles)
+        cls.weights = weights / weights.sum()
+        cls.counts = {
+            scheme.__name__: np.array([
+                np.bincount(scheme(cls.weights), minlength=cls.num_particles) for _ in range(cls.num_trials)
+            ])
+            for scheme in (multinomial_indices, systematic_indices, stratified_indices, residual_indices)
+        }
+
+    def test_unbiased(self):
+        """Test that every scheme gives each particle N * w offspring on average."""
+        expected = self.num_particles * self.weights
+        for name, counts in self.counts.items():
+            self.assertTrue((counts.sum(axis=1) == self.num_particles).all(), name)
+            # Allow 5 standard errors of the multinomial mean
+            tolerance = 5 * np.sqrt(expected * (1 - self.weights) / self.num_trials) + 1e-9
+            self.assertTrue((np.abs(counts.mean(axis=0) - expected) <= tolerance).all(), name)
+
+    def test_multinomial_variance(self):
+        """Test that multinomial offspring counts have variance N * w * (1 - w)."""
+        expected = self.num_particles * self.weights * (1 - self.weights)
+        variance = self.counts["multinomial_indices"].var(axis=0)
+        np.testing.assert_allclose(variance.sum(), expected.sum(), rtol=0.05)
+
+    def test_low_variance_schemes(self):
+        """Test that the other schemes have lower offspring-count variance than multinomial."""
+        multinomial = self.counts["multinomial_indices"].var(axis=0).sum()
+        for name in ("systematic_indices", "stratified_indices", "residual_indices"):
+            self.assertLess(self.counts[name].var(axis=0).sum(), multinomial, name)
+
+    def test_count_bounds(self):
+        """Test the deterministic bounds on systematic and residual counts."""
+        expected = self.num_particles * self.weights
+        systematic = self.counts["systematic_indices"]
+        self.assertTrue((systematic >= np.floor(expected) - 1e-9).all())
+        self.assertTrue((systematic <= np.ceil(expected) + 1e-9).all())
+        self.assertTrue((self.counts["residual_indices"] >= np.floor(expected)).all())
+
+
+class TestChunkedSearch(unittest.TestCase):
+    """Tests for the chunked search across worker threads."""
+
+    def setUp(self):
+        """Use small chunks so that small inputs are split."""
+        self.original_chunk_size = resampling.MIN_CHUNK_SIZE
+        resampling.MIN_CHUNK_SIZE = 16
+
+    def tearDown(self):
+        """Restore the chunk size."""
+        resampling.MIN_CHUNK_SIZE = self.original_chunk_size
+
+    def test_chunked_matches_single_thread(self):
+        """Test that splitting the search across threads gives the same indices."""
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            weights = rng.gamma(0.3, size=rng.integers(1, 500))
+            weights[rng.random(len(weights)) < 0.2] = 0.0
+            weights[0] += 1e-3
+            positions = np.sort(rng.random(rng.integers(1, 500)))
+            np.testing.assert_array_equal(
+                search_cumulative(weights, positions, num_workers=4),
+                search_cumulative(weights, positions, num_workers=1),
+            )
+
+    def test_zero_weight_particles_are_never_drawn(self):
+        """Test that particles without weight get no offspring."""
+        weights = np.zeros(200)
+        weights[[3, 50, 199]] = [0.2, 0.5, 0.3]
+        for workers in (1, 4):
+            indices = systematic_indices(weights, num_workers=workers)
+            self.assertEqual(set(indices.tolist()), {3, 50, 199})
+
+
+class TestGatherInPlace(unittest.TestCase):
+    """Tests for the in-place gather of resampled states."""
+
+    def test_gather_gives_resampled_multiset(self):
+        """Test that the gathered rows are the resampled states, in ancestor order."""
+        rng = np.random.default_rng(0)
+        original = rng.standard_normal((1000, 3))
+        weights = rng.random(1000) ** 4
+        indices = stratified_indices(weights / weights.sum())
+
+        states = original.copy()
+        ancestors = gather_in_place(states, indices)
+        np.testing.assert_array_equal(states, original[ancestors])
+        np.testing.assert_array_equal(np.sort(ancestors), np.sort(indices))
+
+    def test_select_keeps_index_order(self):
+        """Test that select gathers in index order unless in_place is requested."""
+        original = np.arange(8, dtype=float)
+        indices = np.array([5, 5, 0, 1, 1, 1, 7, 2])
+
+        particle_set = ParticleSet(original.copy(), np.zeros(8))
+        particle_set.select(indices)
+        np.testing.assert_array_equal(particle_set.states, original[indices])
+
+        particle_set = ParticleSet(original.copy(), np.zeros(8))
+        states = particle_set.states
+        particle_set.select(indices, in_place=True)
+        self.assertIs(particle_set.states, states)
+        np.testing.assert_array_equal(np.sort(particle_set.states), np.sort(original[indices]))
+        np.testing.assert_allclose(particle_set.weights, np.full(8, 1 / 8))
+
+    def test_strategies_return_particles(self):
+        """Test that the per-particle resample() API still returns uniform-weight particles."""
+        particles = [Particle(i, w) for i, w in enumerate([0.1, 0.0, 0.6, 0.3])]
+        for strategy in (MultinomialResampling(), SystematicResampling(), StratifiedResampling(), ResidualResampling()):
+            resampled = strategy.resample(particles)
+            self.assertEqual(len(resampled), 4)
+            self.assertTrue(all(particle.weight == 0.25 for particle in resampled))
+            self.assertNotIn(1, [particle.state for particle in resampled])
+
+
+if __name__ == "__main__":
+    unittest.main()
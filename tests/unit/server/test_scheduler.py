@@ -0,0 +1,477 @@
+"""Unit tests for the server's model scheduler."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from augment_adam.server.scheduler import ModelScheduler, QueueFullError
+
+try:
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    from augment_adam.models.huggingface_model import HuggingFaceModel
+except ImportError:
+    HuggingFaceModel = None
+
+
+class SlowModel:
+    """Model that blocks its thread like a real model and records its calls."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, **params):
+        with self.lock:
+            self.calls.append([prompt])
+        time.sleep(self.delay)
+        return f"out {prompt}"
+
+
+class StreamingModel:
+    """Model that streams chunks from a blocking generator and records how far it got."""
+
+    def __init__(self, first_delay=0.01, delay=0.05, chunks=10):
+        self.first_delay = first_delay
+        self.delay = delay
+        self.chunks = chunks
+        self.produced = 0
+        self.closed = threading.Event()
+
+    def generate_stream(self, prompt, fail_after=None, **params):
+        try:
+            time.sleep(self.first_delay)
+            for i in range(self.chunks):
+                if i == fail_after:
+                    raise RuntimeError("stream failed")
+                if i:
+                    time.sleep(self.delay)
+                self.produced += 1
+                yield f"{prompt}{i} "
+        finally:
+            self.closed.set()
+
+
+class SlowBatchModel(SlowModel):
+    """SlowModel that also generates for several prompts in one call."""
+
+    def generate_batch(self, prompts, **params):
+        with self.lock:
+            self.calls.append(list(prompts))
+        time.sleep(self.delay)
+        if "fail" in prompts:
+            raise RuntimeError("batch failed")
+        return [f"out {prompt} {params.get('temperature')}" for prompt in prompts]
+
+
+class TestModelScheduler(unittest.IsolatedAsyncioTestCase):
+    """Tests for the ModelScheduler class."""
+
+    def create_scheduler(self, model, **kwargs):
+        """Create a scheduler that is shut down after the test."""
+        scheduler = ModelScheduler(model, **kwargs)
+        self.addCleanup(scheduler.shutdown)
+        return scheduler
+
+    async def test_event_loop_not_blocked(self):
+        """Test that a blocking model call leaves the event loop free."""
+        scheduler = self.create_scheduler(SlowModel(delay=0.2))
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        self.assertEqual(await scheduler.generate("a"), "out a")
+        ticker.cancel()
+
+        self.assertGreater(ticks, 5)
+
+    async def test_batches_concurrent_requests(self):
+        """Test that concurrent requests are generated in one batch, in order."""
+        model = SlowBatchModel()
+        scheduler = self.create_scheduler(model, max_batch_size=8, batch_window=0.02)
+
+        results = await asyncio.gather(*(scheduler.generate(f"p{i}", temperature=0.5) for i in range(5)))
+
+        self.assertEqual(results, [f"out p{i} 0.5" for i in range(5)])
+        self.assertEqual(model.calls, [[f"p{i}" for i in range(5)]])
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_batch_size_cap(self):
+        """Test that a full batch runs without waiting for the window."""
+        model = SlowBatchModel(delay=0)
+        scheduler = self.create_scheduler(model, max_batch_size=2, batch_window=10)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(scheduler.generate(f"p{i}") for i in range(4))),
+            timeout=1
+        )
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(model.calls, [["p0", "p1"], ["p2", "p3"]])
+
+    async def test_parameters_are_not_mixed(self):
+        """Test that requests with different parameters go in different batches."""
+        model = SlowBatchModel(delay=0)
+        scheduler = self.create_scheduler(model, batch_window=0.01)
+
+        results = await asyncio.gather(
+            scheduler.generate("a", temperature=0.1),
+            scheduler.generate("b", temperature=0.9),
+            scheduler.generate("c", temperature=0.1)
+        )
+
+        self.assertEqual(results, ["out a 0.1", "out b 0.9", "out c 0.1"])
+        self.assertEqual(sorted(model.calls), [["a", "c"], ["b"]])
+
+    async def test_batch_error(self):
+        """Test that a failed batch fails every request in it."""
+        scheduler = self.create_scheduler(SlowBatchModel(delay=0), batch_window=0.01)
+
+        results = await asyncio.gather(
+            scheduler.generate("ok"),
+            scheduler.generate("fail"),
+            return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    async def test_short_batch_result(self):
+        """Test that a batch with too few results fails every request in it."""
+        model = SlowBatchModel(delay=0)
+        model.generate_batch = lambda prompts, **params: [f"out {prompts[0]}"]
+        scheduler = self.create_scheduler(model, batch_window=0.01, timeout=1)
+
+        results = await asyncio.gather(
+            scheduler.generate("a"),
+            scheduler.generate("b"),
+            return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_queue_full(self):
+        """Test that requests beyond max_pending are rejected at once."""
+        scheduler = self.create_scheduler(SlowModel(delay=0.1), max_workers=1, max_pending=2)
+
+        results = await asyncio.gather(
+            *(scheduler.generate(f"p{i}") for i in range(3)),
+            return_exceptions=True
+        )
+
+        self.assertEqual(results[:2], ["out p0", "out p1"])
+        self.assertIsInstance(results[2], QueueFullError)
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_timeout(self):
+        """Test that a slow request times out but keeps its slot until its call finishes."""
+        scheduler = self.create_scheduler(SlowModel(delay=0.2), timeout=0.05)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await scheduler.generate("a")
+
+        self.assertEqual(scheduler.pending, 1)
+        await asyncio.sleep(0.3)
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_timeout_while_queued(self):
+        """Test that a request that times out before its call starts is dropped and frees its slot."""
+        model = SlowModel(delay=0.2)
+        scheduler = self.create_scheduler(model, max_workers=1)
+
+        results = await asyncio.gather(
+            scheduler.generate("running"),
+            scheduler.generate("queued", timeout=0.05),
+            return_exceptions=True
+        )
+
+        self.assertEqual(results[0], "out running")
+        self.assertIsInstance(results[1], asyncio.TimeoutError)
+        self.assertEqual(model.calls, [["running"]])
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_timed_out_batch_request_keeps_slot(self):
+        """Test that a request that times out in a running batch keeps its slot until the batch ends."""
+        scheduler = self.create_scheduler(SlowBatchModel(delay=0.2), batch_window=0.01)
+
+        slow = asyncio.ensure_future(scheduler.generate("slow", timeout=0.05))
+        kept = asyncio.ensure_future(scheduler.generate("kept", timeout=1))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await slow
+        self.assertEqual(scheduler.pending, 2)
+
+        self.assertEqual(await kept, "out kept None")
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_batch_tasks_are_referenced(self):
+        """Test that running batch tasks are kept until they finish."""
+        scheduler = self.create_scheduler(SlowBatchModel(delay=0.05), batch_window=0.01)
+
+        request = asyncio.ensure_future(scheduler.generate("a"))
+        await asyncio.sleep(0.03)
+        self.assertEqual(len(scheduler._tasks), 1)
+
+        await request
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler._tasks, set())
+
+    async def test_timed_out_requests_leave_batch(self):
+        """Test that a request that timed out while waiting is not generated."""
+        model = SlowBatchModel(delay=0)
+        scheduler = self.create_scheduler(model, batch_window=0.1)
+
+        results = await asyncio.gather(
+            scheduler.generate("slow", timeout=0.01),
+            scheduler.generate("kept", timeout=1),
+            return_exceptions=True
+        )
+
+        self.assertIsInstance(results[0], asyncio.TimeoutError)
+        self.assertEqual(results[1], "out kept None")
+        self.assertEqual(model.calls, [["kept"]])
+
+    async def test_run(self):
+        """Test running an arbitrary blocking call."""
+        scheduler = self.create_scheduler(SlowModel())
+
+        self.assertEqual(await scheduler.run(sorted, [3, 1, 2], reverse=True), [3, 2, 1])
+
+
+WORDS = ["<pad>", "<eos>", "<unk>", "the", "cat", "sat", "on", "a", "mat", "dog", "ran", "far"]
+
+
+def create_tiny_huggingface_model():
+    """Create a HuggingFaceModel around a tiny randomly initialised GPT-2."""
+    torch.manual_seed(0)
+    tokenizer = Tokenizer(models.WordLevel({word: i for i, word in enumerate(WORDS)}, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+
+    model = HuggingFaceModel.__new__(HuggingFaceModel)
+    model.model_name = "tiny-gpt2"
+    model.model_type = "causal"
+    model.device = "cpu"
+    model.cache = None
+    model.use_cache = False
+    model.tokenizer = PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="<eos>", unk_token="<unk>")
+    model.model = GPT2LMHeadModel(GPT2Config(
+        vocab_size=len(WORDS), n_positions=32, n_embd=16, n_layer=1, n_head=2,
+        bos_token_id=1, eos_token_id=1
+    )).eval()
+    return model
+
+
+@unittest.skipIf(HuggingFaceModel is None, "torch and transformers are required")
+class TestModelSchedulerHuggingFace(unittest.IsolatedAsyncioTestCase):
+    """Tests for micro-batching with a real HuggingFaceModel."""
+
+    def setUp(self):
+        """Set up a tiny model and count its generate calls."""
+        self.model = create_tiny_huggingface_model()
+        self.generate_calls = 0
+        generate = self.model.model.generate
+
+        def counting_generate(*args, **kwargs):
+            self.generate_calls += 1
+            return generate(*args, **kwargs)
+
+        self.model.model.generate = counting_generate
+
+    def test_generate_batch_matches_single_prompts(self):
+        """Test that a padded batch generates the same text as each prompt alone."""
+        prompts = ["the cat sat on a mat", "dog ran", "the dog"]
+
+        batch = self.model.generate_batch(prompts, max_tokens=4, temperature=0)
+
+        self.assertEqual(self.generate_calls, 1)
+        self.assertEqual(len(batch), 3)
+        for prompt, text in zip(prompts, batch):
+            self.assertEqual(text, self.model.generate_batch([prompt], max_tokens=4, temperature=0)[0])
+            self.assertNotIn("Error", text)
+
+    def test_generate_batch_stop(self):
+        """Test that each text is cut at its first stop sequence."""
+        texts = self.model.generate_batch(["the cat", "dog ran"], max_tokens=6, temperature=0)
+        stop = texts[0].split()[1]
+
+        stopped = self.model.generate_batch(["the cat", "dog ran"], max_tokens=6, temperature=0, stop=[stop])
+
+        self.assertEqual(stopped[0], texts[0][:texts[0].find(stop)])
+        self.assertNotIn(stop, stopped[1])
+
+    async def test_scheduler_batches_model(self):
+        """Test that concurrent requests reach the model as one generate call."""
+        scheduler = ModelScheduler(self.model, max_batch_size=8, batch_window=0.05)
+        self.addCleanup(scheduler.shutdown)
+        prompts = ["the cat sat", "a dog ran far", "the mat"]
+        expected = [self.model.generate_batch([prompt], max_tokens=3, temperature=0)[0] for prompt in prompts]
+        self.generate_calls = 0
+
+        self.assertTrue(scheduler.can_batch)
+        results = await asyncio.gather(*[
+            scheduler.generate(prompt, max_tokens=3, temperature=0) for prompt in prompts
+        ])
+
+        self.assertEqual(results, expected)
+        self.assertEqual(self.generate_calls, 1)
+
+
+class TestModelSchedulerStream(unittest.IsolatedAsyncioTestCase):
+    """Tests for streaming through the ModelScheduler."""
+
+    def create_scheduler(self, **kwargs):
+        """Create a scheduler that is shut down after the test."""
+        scheduler = ModelScheduler(StreamingModel(), **kwargs)
+        self.addCleanup(scheduler.shutdown)
+        return scheduler
+
+    async def test_time_to_first_token(self):
+        """Test that the first chunk arrives long before the stream ends."""
+        scheduler = self.create_scheduler()
+        started = time.perf_counter()
+        arrivals = []
+
+        async for chunk in scheduler.stream(scheduler.model.generate_stream, "p"):
+            arrivals.append(time.perf_counter() - started)
+
+        self.assertEqual(len(arrivals), 10)
+        self.assertLess(arrivals[0], 0.1)
+        self.assertGreater(arrivals[-1], 0.4)
+        self.assertEqual(scheduler.streams, 0)
+
+    async def test_disconnect_stops_generator(self):
+        """Test that closing the stream early stops and closes the model's generator."""
+        scheduler = self.create_scheduler()
+
+        chunks = scheduler.stream(scheduler.model.generate_stream, "p")
+        self.assertEqual(await chunks.__anext__(), "p0 ")
+        await chunks.aclose()
+
+        self.assertTrue(await asyncio.get_running_loop().run_in_executor(None, scheduler.model.closed.wait, 1))
+        self.assertLess(scheduler.model.produced, 4)
+        await asyncio.sleep(0.01)
+        self.assertEqual(scheduler.streams, 0)
+
+    async def test_cancelled_consumer_stops_generator(self):
+        """Test that cancelling the consuming task stops the model's generator."""
+        scheduler = self.create_scheduler()
+        scheduler.model.delay = 0.01
+        scheduler.model.chunks = 100
+
+        async def consume():
+            async for _ in scheduler.stream(scheduler.model.generate_stream, "p"):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertTrue(await asyncio.get_running_loop().run_in_executor(None, scheduler.model.closed.wait, 1))
+        self.assertLess(scheduler.model.produced, 50)
+        await asyncio.sleep(0.01)
+        self.assertEqual(scheduler.streams, 0)
+
+    async def test_bounded_buffer(self):
+        """Test that the generator waits for a slow consumer."""
+        scheduler = self.create_scheduler()
+        scheduler.model.delay = 0
+
+        chunks = scheduler.stream(scheduler.model.generate_stream, "p", buffer_size=2)
+        await chunks.__anext__()
+        await asyncio.sleep(0.1)
+
+        self.assertLessEqual(scheduler.model.produced, 1 + 2 + 1)
+        await chunks.aclose()
+
+    async def test_error(self):
+        """Test that an error in the generator ends the stream with that error."""
+        scheduler = self.create_scheduler()
+        received = []
+
+        with self.assertRaises(RuntimeError):
+            async for chunk in scheduler.stream(scheduler.model.generate_stream, "p", fail_after=2):
+                received.append(chunk)
+
+        self.assertEqual(received, ["p0 ", "p1 "])
+        self.assertEqual(scheduler.streams, 0)
+
+    async def test_timeout(self):
+        """Test that a stream that stalls times out."""
+        scheduler = self.create_scheduler(timeout=0.02)
+        scheduler.model.first_delay = 0.2
+
+        with self.assertRaises(asyncio.TimeoutError):
+            async for _ in scheduler.stream(scheduler.model.generate_stream, "p"):
+                pass
+
+    async def test_more_streams_than_workers(self):
+        """Test that open streams neither wait for workers nor hold up generate calls."""
+        scheduler = self.create_scheduler(max_workers=1, max_streams=4)
+        scheduler.model.generate = lambda prompt, **params: f"out {prompt}"
+        started = time.perf_counter()
+
+        async def first_chunk_time(prompt):
+            chunks = scheduler.stream(scheduler.model.generate_stream, prompt)
+            await chunks.__anext__()
+            elapsed = time.perf_counter() - started
+            async for _ in chunks:
+                pass
+            return elapsed
+
+        streams = [asyncio.ensure_future(first_chunk_time(f"s{i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(await scheduler.generate("g"), "out g")
+        generate_time = time.perf_counter() - started
+        first_chunks = await asyncio.gather(*streams)
+
+        self.assertLess(max(first_chunks), 0.2)
+        self.assertLess(generate_time, 0.2)
+        self.assertEqual(scheduler.streams, 0)
+
+    async def test_queue_full(self):
+        """Test that a stream is rejected before it starts when max_streams are open."""
+        scheduler = self.create_scheduler(max_streams=1)
+
+        first = scheduler.stream(scheduler.model.generate_stream, "p")
+        await first.__anext__()
+
+        with self.assertRaises(QueueFullError):
+            scheduler.stream(scheduler.model.generate_stream, "q")
+        await first.aclose()
+
+    async def test_queue_full_before_iteration(self):
+        """Test that streams hold their slots before they are first iterated."""
+        scheduler = self.create_scheduler(max_streams=2)
+
+        opened = []
+        with self.assertRaises(QueueFullError):
+            for i in range(10):
+                opened.append(scheduler.stream(scheduler.model.generate_stream, f"p{i}"))
+
+        self.assertEqual(len(opened), 2)
+        self.assertEqual(scheduler.streams, 2)
+
+        # Unstarted streams free their slots when closed or dropped
+        await opened.pop().aclose()
+        self.assertEqual(scheduler.streams, 1)
+        opened.clear()
+        self.assertEqual(scheduler.streams, 0)
+
+        chunks = scheduler.stream(scheduler.model.generate_stream, "q")
+        self.assertEqual(await chunks.__anext__(), "q0 ")
+        await chunks.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Unit tests for the timing wheel.
+
+This module contains tests that compare TimingWheel with a dictionary of
+deadlines.
+"""
+
+import random
+import unittest
+
+from augment_adam.utils.timing_wheel import TimingWheel
+
+
+class TestTimingWheel(unittest.TestCase):
+    """Tests for scheduling, cancelling and advancing."""
+
+    def test_random_operations_match_reference(self):
+        """Test that keys expire on the first advance past their deadline tick."""
+        rng = random.Random(0)
+        wheel = TimingWheel(tick=1.0, slots=8, levels=3)
+        reference = {}
+        now = 0.0
+
+        for step in range(3000):
+            action = rng.random()
+            key = f"k{rng.randrange(300)}"
+            if action < 0.5:
+                # Include deadlines beyond the span of the wheel (8 ** 3 ticks)
+                deadline = now + rng.choice([rng.uniform(0, 10), rng.uniform(0, 100), rng.uniform(0, 2000)])
+                wheel.schedule(key, deadline)
+                reference[key] = deadline
+            elif action < 0.6:
+                wheel.cancel(key)
+                reference.pop(key, None)
+            else:
+                now += rng.choice([0.3, 1, 7, 60])
+                due = {key for key, deadline in reference.items() if int(deadline) < int(now)}
+                self.assertEqual(set(wheel.advance(now)), due, step)
+                for key in due:
+                    del reference[key]
+
+            self.assertEqual(len(wheel), len(reference))
+
+    def test_overdue_and_rescheduled_keys(self):
+        """Test overdue deadlines, rescheduling and deadline lookups."""
+        wheel = TimingWheel(now=100.0)
+        wheel.schedule("late", 50.0)
+        wheel.schedule("moved", 101.5)
+        wheel.schedule("moved", 5000.0)
+
+        self.assertEqual(wheel.deadline("moved"), 5000.0)
+        self.assertEqual(wheel.advance(102.0), ["late"])
+        self.assertIn("moved", wheel)
+        self.assertEqual(wheel.advance(5001.0), ["moved"])
+        self.assertIsNone(wheel.deadline("moved"))
+
+        wheel.schedule("a", 6000.0)
+        wheel.clear()
+        self.assertEqual(wheel.advance(7000.0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()